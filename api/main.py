@@ -2,10 +2,11 @@
 # API CREDIT RISK SCORING
 # =============================================================================
 # Point d'entrée de l'API FastAPI
-# Endpoints : /health, /predict, /explain
+# Endpoints : /health, /predict, /predict/batch, /predict/stream, /explain
 # =============================================================================
 
 from fastapi import FastAPI, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import joblib
@@ -13,9 +14,23 @@ import json
 import numpy as np
 import pandas as pd
 from pathlib import Path
+import os
 import shap
 import time
 
+from api.serialization import (
+    JSON_ENCODER, FastJSONResponse, arrow_response, loads, results_to_records, validated_response
+)
+from api.streaming import (
+    ARROW_MEDIA_TYPE, ArrowResultWriter, ArrowStreamBatcher, BodyStreamingResponse,
+    NdjsonBatcher, NdjsonResultWriter
+)
+from src.data.predictions import PredictionWriter
+from src.features.encoding import load_category_registry
+from src.models.artifacts import load_model_artifacts
+from src.models.calibration import decisions
+from src.utils.database import get_engine, load_database_config
+
 # Prometheus metrics
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 
@@ -50,6 +65,13 @@ PREDICTION_LATENCY = Histogram(
     buckets=[0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5]
 )
 
+SERIALIZATION_LATENCY = Histogram(
+    'credit_risk_serialization_seconds',
+    'Response serialization time in seconds',
+    ['endpoint', 'encoder'],
+    buckets=[0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05]
+)
+
 # Jauges
 MODEL_LOADED = Gauge(
     'credit_risk_model_loaded',
@@ -61,6 +83,18 @@ LAST_PREDICTION_PROBABILITY = Gauge(
     'Probability of the last prediction'
 )
 
+# Scoring en flux (/predict/stream)
+STREAM_ROWS_TOTAL = Counter(
+    'credit_risk_stream_rows_total',
+    'Rows received by /predict/stream',
+    ['status']
+)
+
+STREAM_ROWS_PER_SECOND = Gauge(
+    'credit_risk_stream_rows_per_second',
+    'Throughput of the last completed /predict/stream request'
+)
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -69,10 +103,28 @@ LAST_PREDICTION_PROBABILITY = Gauge(
 BASE_DIR = Path(__file__).parent.parent
 MODELS_DIR = BASE_DIR / "models"
 
-MODEL_PATH = MODELS_DIR / "xgboost_credit_risk_v1.pkl"
+MODEL_PATH = MODELS_DIR / "xgboost_credit_risk_v1.pkl"  # Ancien format (pickle), si pas de manifeste
+# Modèle natif (UBJSON) + checksums ; API_MODEL_MANIFEST pour servir une autre version
+# (ex. xgboost_credit_risk_v1_compressed.manifest.json, écrit par src.models.compress)
+MANIFEST_PATH = MODELS_DIR / os.getenv("API_MODEL_MANIFEST", "xgboost_credit_risk_v1.manifest.json")
 FEATURES_PATH = MODELS_DIR / "feature_names.json"
-ENCODERS_PATH = MODELS_DIR / "label_encoders.pkl"
+REGISTRY_PATH = MODELS_DIR / "category_codes.json"  # Dictionnaire des catégories (codes)
 METRICS_PATH = MODELS_DIR / "metrics.json"
+FILL_VALUES_PATH = MODELS_DIR / "feature_fill_values.json"  # Valeurs d'imputation de l'entraînement
+
+MODEL_VERSION = "v1.0.0"
+
+# Base de données (optionnelle) : pool de connexions partagé avec le pipeline
+DB_ENABLED = os.getenv("API_DB_ENABLED", "false").lower() == "true"
+
+# Lignes scorées par appel au modèle dans /predict/stream (borne la mémoire)
+STREAM_BATCH_SIZE = int(os.getenv("API_STREAM_BATCH_SIZE", "5000"))
+
+# Nombre maximal de clients par requête /predict/batch
+BATCH_MAX_ROWS = int(os.getenv("API_BATCH_MAX_ROWS", "10000"))
+
+# Réponses JSON encodées directement (orjson, sans revalidation Pydantic)
+FAST_JSON = os.getenv("API_FAST_JSON", "true").lower() == "true"
 
 # =============================================================================
 # CHARGEMENT DU MODÈLE (au démarrage)
@@ -81,33 +133,50 @@ METRICS_PATH = MODELS_DIR / "metrics.json"
 # Variables globales pour le modèle
 model = None
 feature_names = None
-label_encoders = None
+category_registry = None  # Codes des variables catégorielles (partagés avec l'entraînement)
+calibration = None  # Table de calibration des probabilités (None : anciens seuils 0.3 / 0.6)
 metrics = None
+fill_values = {}  # Valeur par défaut des features non fournies (0.0 sinon)
 shap_explainer = None  # Explainer SHAP pour l'explicabilité
+db_engine = None  # Engine SQLAlchemy partagé (si API_DB_ENABLED=true)
+prediction_writer = None  # Journal des décisions (écriture asynchrone par lots)
 
 def load_model():
     """Charge le modèle et les artefacts au démarrage."""
-    global model, feature_names, label_encoders, metrics, shap_explainer
+    global model, feature_names, category_registry, calibration, metrics, fill_values, shap_explainer, MODEL_VERSION
 
     print("Chargement du modèle...")
 
-    # Charger le modèle XGBoost
-    if MODEL_PATH.exists():
+    # Charger le modèle XGBoost : format natif vérifié par le manifeste, sinon pickle
+    if MANIFEST_PATH.exists():
+        artifacts = load_model_artifacts(MANIFEST_PATH)
+        model = artifacts.classifier
+        feature_names = artifacts.feature_names
+        category_registry = artifacts.registry
+        calibration = artifacts.calibration
+        MODEL_VERSION = artifacts.model_version
+        print(f"  - Modèle chargé: {artifacts.manifest['files']['model']['path']} "
+              f"({MODEL_VERSION}, checksum vérifié)")
+        print(f"  - Features chargées: {len(feature_names)} colonnes")
+        if calibration is not None:
+            print(f"  - Calibration chargée: {calibration.method} ({len(calibration.raw)} points)")
+    elif MODEL_PATH.exists():
         model = joblib.load(MODEL_PATH)
         print(f"  - Modèle chargé: {MODEL_PATH.name}")
-    else:
-        raise FileNotFoundError(f"Modèle non trouvé: {MODEL_PATH}")
 
-    # Charger les noms de features
-    if FEATURES_PATH.exists():
-        with open(FEATURES_PATH, 'r') as f:
-            feature_names = json.load(f)
-        print(f"  - Features chargées: {len(feature_names)} colonnes")
+        # Charger les noms de features
+        if FEATURES_PATH.exists():
+            with open(FEATURES_PATH, 'r') as f:
+                feature_names = json.load(f)
+            print(f"  - Features chargées: {len(feature_names)} colonnes")
+
+        # Charger le dictionnaire des catégories (category_codes.json, sinon label_encoders.pkl)
+        category_registry = load_category_registry(MODELS_DIR)
+    else:
+        raise FileNotFoundError(f"Modèle non trouvé: {MANIFEST_PATH} ou {MODEL_PATH}")
 
-    # Charger les encodeurs
-    if ENCODERS_PATH.exists():
-        label_encoders = joblib.load(ENCODERS_PATH)
-        print(f"  - Encodeurs chargés: {len(label_encoders)} colonnes")
+    if category_registry is not None:
+        print(f"  - Catégories chargées: {len(category_registry.columns)} colonnes")
 
     # Charger les métriques
     if METRICS_PATH.exists():
@@ -115,6 +184,12 @@ def load_model():
             metrics = json.load(f)
         print(f"  - Métriques chargées: AUC={metrics.get('auc_roc', 'N/A')}")
 
+    # Charger les valeurs d'imputation (médianes du jeu de features)
+    if FILL_VALUES_PATH.exists():
+        with open(FILL_VALUES_PATH, 'r') as f:
+            fill_values = json.load(f)
+        print(f"  - Valeurs d'imputation chargées: {len(fill_values)} colonnes")
+
     # Créer l'explainer SHAP pour XGBoost
     try:
         shap_explainer = shap.TreeExplainer(model)
@@ -128,6 +203,222 @@ def load_model():
 
     print("Modèle prêt!")
 
+
+def init_database():
+    """Initialise le pool PostgreSQL et le journal des prédictions (sans bloquer le démarrage)."""
+    global db_engine, prediction_writer
+
+    if not DB_ENABLED:
+        print("Base de données désactivée (API_DB_ENABLED=false)")
+        return
+
+    try:
+        # Aucune connexion n'est ouverte ici : le pool se remplit à la demande
+        db_engine = get_engine()
+        print(f"Pool de connexions initialisé: {db_engine.url.render_as_string(hide_password=True)}")
+
+        # Les décisions sont écrites par COPY depuis un thread dédié :
+        # /predict ne fait jamais d'aller-retour vers la base
+        writer_config = load_database_config().get('prediction_writer', {})
+        prediction_writer = PredictionWriter.for_engine(db_engine, writer_config)
+        prediction_writer.start()
+        print("Journal des prédictions démarré")
+    except Exception as e:
+        print(f"Warning: base de données non initialisée: {e}")
+        db_engine = None
+        prediction_writer = None
+
+
+def log_prediction(client_dict: Dict[str, Any], proba: float, score: int, risk_level: str):
+    """Ajoute une décision au journal d'audit (credit_risk.predictions)."""
+    if prediction_writer is None:
+        return
+
+    prediction_writer.submit({
+        'sk_id_curr': client_dict.get('sk_id_curr'),
+        'probability': round(float(proba), 6),
+        'score': score,
+        'decision': risk_level,
+        'model_version': MODEL_VERSION,
+    })
+
+
+def log_predictions(results: pd.DataFrame):
+    """Ajoute au journal d'audit les décisions d'un lot (lignes scorées de score_batch)."""
+    if prediction_writer is None:
+        return
+
+    for row in results[results['error'].isna()].itertuples(index=False):
+        prediction_writer.submit({
+            'sk_id_curr': None if pd.isna(row.sk_id_curr) else int(row.sk_id_curr),
+            'probability': round(float(row.probability), 6),
+            'score': int(row.score),
+            'decision': row.risk_level,
+            'model_version': MODEL_VERSION,
+        })
+
+
+# =============================================================================
+# CONSTRUCTION DES FEATURES
+# =============================================================================
+
+# Mapping des champs API vers les features numériques du modèle
+FIELD_MAPPING = {
+    'amt_income_total': 'amt_income_total',
+    'amt_credit': 'amt_credit',
+    'amt_annuity': 'amt_annuity',
+    'amt_goods_price': 'amt_goods_price',
+    'days_birth': 'days_birth',
+    'days_employed': 'days_employed',
+    'ext_source_1': 'ext_source_1',
+    'ext_source_2': 'ext_source_2',
+    'ext_source_3': 'ext_source_3',
+}
+
+
+def build_feature_frame(clients: pd.DataFrame) -> pd.DataFrame:
+    """
+    Construit le DataFrame (une ligne par client, toutes les features) attendu par le modèle.
+
+    Toutes les lignes sont traitées en une fois (opérations vectorisées sur
+    une matrice numpy), ce qui sert aussi bien /predict que /predict/stream.
+
+    Les variables catégorielles (code_gender, name_income_type, occupation_type...)
+    sont encodées avec les codes de l'entraînement (category_codes.json) :
+    une valeur absente prend la catégorie 'MISSING' si elle existe, une valeur
+    inconnue devient NaN (valeur manquante pour XGBoost).
+    """
+    n = len(clients)
+    column_index = {col: i for i, col in enumerate(feature_names)}
+
+    # Toutes les features initialisées aux valeurs d'imputation de
+    # l'entraînement si disponibles, 0.0 sinon
+    defaults = np.array([float(fill_values.get(col, 0.0)) for col in feature_names])
+    matrix = np.tile(defaults, (n, 1))
+
+    def numeric(field: str) -> np.ndarray:
+        if field not in clients.columns:
+            return np.full(n, np.nan)
+        return pd.to_numeric(clients[field], errors='coerce').to_numpy(dtype=np.float64)
+
+    # Remplir avec les valeurs fournies
+    for api_field, model_field in FIELD_MAPPING.items():
+        if model_field in column_index:
+            values = numeric(api_field)
+            j = column_index[model_field]
+            matrix[:, j] = np.where(np.isnan(values), matrix[:, j], values)
+
+    # Encoder toutes les variables catégorielles du modèle (lookup vectorisé)
+    if category_registry is not None:
+        for col in [c for c in feature_names if c in category_registry]:
+            values = clients[col] if col in clients.columns else [None] * n
+            matrix[:, column_index[col]] = category_registry.encode(col, values)
+
+    # Calculer des features dérivées importantes (scores externes > 0 uniquement)
+    sources = np.column_stack([numeric(f'ext_source_{i}') for i in (1, 2, 3)])
+    sources[~(sources > 0)] = np.nan
+    count = (~np.isnan(sources)).sum(axis=1)
+    has_source = count > 0
+    derived = {
+        'ext_source_mean': np.nansum(sources, axis=1) / np.maximum(count, 1),
+        'ext_source_max': np.nanmax(np.where(has_source[:, None], sources, 0.0), axis=1),
+        'ext_source_min': np.nanmin(np.where(has_source[:, None], sources, 0.0), axis=1),
+    }
+    for name, values in derived.items():
+        if name in column_index:
+            j = column_index[name]
+            matrix[:, j] = np.where(has_source, values, matrix[:, j])
+
+    return pd.DataFrame(matrix, columns=feature_names)
+
+
+def build_features(client_dict: Dict[str, Any]) -> pd.DataFrame:
+    """Construit le DataFrame (1 ligne) d'un client (voir build_feature_frame)."""
+    return build_feature_frame(pd.DataFrame([client_dict]))
+
+
+# Champs obligatoires (comme dans ClientData)
+REQUIRED_FIELDS = ['amt_income_total', 'amt_credit']
+
+# Bornes (exclues) d'un identifiant int64
+ID_BOUND = 2.0 ** 63
+
+
+def client_ids(clients: pd.DataFrame):
+    """
+    Identifiants sk_id_curr d'un lot (Int64, nuls si absents).
+
+    Retourne:
+        (identifiants, masque des identifiants fournis mais invalides :
+        non entiers ou hors de l'intervalle int64)
+    """
+    n = len(clients)
+    if 'sk_id_curr' not in clients.columns:
+        return pd.array([None] * n, dtype='Int64'), np.zeros(n, dtype=bool)
+
+    ids = pd.to_numeric(clients['sk_id_curr'], errors='coerce')
+    numeric = ids.astype(np.float64)
+    valid = numeric.notna() & (numeric % 1 == 0) & (numeric >= -ID_BOUND) & (numeric < ID_BOUND)
+    invalid = (clients['sk_id_curr'].notna() & ~valid).to_numpy()
+    return ids.where(valid).astype('Int64').to_numpy(), invalid
+
+
+def empty_results(clients: pd.DataFrame, error: Optional[str] = None) -> pd.DataFrame:
+    """Résultats d'un lot sans score (colonnes nulles), `error` pour chaque ligne."""
+    n = len(clients)
+    return pd.DataFrame({
+        'sk_id_curr': client_ids(clients)[0],
+        'probability': np.full(n, np.nan),
+        'prediction': pd.array([None] * n, dtype='Int8'),
+        'risk_level': pd.array([None] * n, dtype='object'),
+        'score': pd.array([None] * n, dtype='Int16'),
+        'error': pd.array([error] * n, dtype='object'),
+    })
+
+
+def score_batch(clients: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score un lot de clients en un seul appel au modèle.
+
+    Les lignes sans champ obligatoire numérique, ou dont sk_id_curr n'est
+    pas un entier int64, ne sont pas scorées : leurs colonnes de résultat
+    sont nulles et `error` explique pourquoi.
+
+    Retourne:
+        DataFrame (sk_id_curr, probability, prediction, risk_level, score, error)
+    """
+    n = len(clients)
+    fields = np.ones(n, dtype=bool)
+    for field in REQUIRED_FIELDS:
+        values = clients[field] if field in clients.columns else pd.Series([None] * n)
+        fields &= pd.to_numeric(values, errors='coerce').notna().to_numpy()
+    invalid_id = client_ids(clients)[1]
+    valid = fields & ~invalid_id
+
+    results = empty_results(clients)
+
+    if valid.any():
+        features = build_feature_frame(clients[valid].reset_index(drop=True))
+        # Mêmes règles que /predict (probabilité calibrée, niveau de risque, score)
+        decided = decisions(model.predict_proba(features)[:, 1], calibration)
+        risk_level = decided['risk_level']
+
+        results.loc[valid, 'probability'] = np.round(decided['probability'], 4)
+        results.loc[valid, 'prediction'] = decided['prediction']
+        results.loc[valid, 'risk_level'] = risk_level
+        results.loc[valid, 'score'] = decided['score'].astype(np.int16)
+
+        for level, count in zip(*np.unique(risk_level, return_counts=True)):
+            PREDICTIONS_TOTAL.labels(risk_level=level).inc(int(count))
+
+    if not fields.all():
+        results.loc[~fields, 'error'] = f"Champs requis manquants ou non numériques: {', '.join(REQUIRED_FIELDS)}"
+    if invalid_id.any():
+        results.loc[invalid_id, 'error'] = "sk_id_curr invalide: entier int64 attendu"
+
+    return results
+
+
 # =============================================================================
 # SCHÉMAS PYDANTIC (Validation des données)
 # =============================================================================
@@ -135,6 +426,9 @@ def load_model():
 class ClientData(BaseModel):
     """Données d'entrée pour la prédiction."""
 
+    # Identifiant client (journal d'audit des décisions)
+    sk_id_curr: Optional[int] = Field(None, description="Identifiant du client (SK_ID_CURR)")
+
     # Variables principales (exemples - à adapter selon les features réelles)
     amt_income_total: float = Field(..., description="Revenu total du client")
     amt_credit: float = Field(..., description="Montant du crédit demandé")
@@ -143,6 +437,10 @@ class ClientData(BaseModel):
 
     # Variables démographiques
     code_gender: Optional[str] = Field("M", description="Genre (M/F)")
+    name_income_type: Optional[str] = Field(None, description="Type de revenu (Working, Pensioner...)")
+    name_education_type: Optional[str] = Field(None, description="Niveau d'études")
+    name_family_status: Optional[str] = Field(None, description="Situation familiale")
+    occupation_type: Optional[str] = Field(None, description="Profession")
     days_birth: Optional[int] = Field(-10000, description="Âge en jours (négatif)")
     days_employed: Optional[int] = Field(-1000, description="Ancienneté emploi en jours")
 
@@ -178,7 +476,7 @@ class FeatureImpact(BaseModel):
     """Impact d'une feature sur la prédiction."""
 
     feature: str = Field(..., description="Nom de la feature")
-    value: float = Field(..., description="Valeur de la feature pour ce client")
+    value: Optional[float] = Field(None, description="Valeur de la feature pour ce client (null si manquante)")
     shap_value: float = Field(..., description="Impact SHAP (+ augmente risque, - réduit)")
     impact: str = Field(..., description="Direction de l'impact (increases_risk/reduces_risk)")
 
@@ -207,6 +505,14 @@ app = FastAPI(
 @app.on_event("startup")
 async def startup_event():
     load_model()
+    init_database()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Écrire les décisions encore en file avant l'arrêt
+    if prediction_writer is not None:
+        prediction_writer.stop()
 
 
 # Middleware pour mesurer la latence des requêtes
@@ -233,6 +539,26 @@ async def track_request_metrics(request: Request, call_next):
     return response
 
 
+# =============================================================================
+# SÉRIALISATION DES RÉPONSES
+# =============================================================================
+
+def respond(content: Dict[str, Any], response_model, endpoint: str) -> Response:
+    """
+    Encode une réponse construite par le serveur et mesure la sérialisation.
+
+    API_FAST_JSON=true (défaut) : encodage direct avec orjson ; sinon chemin
+    standard de FastAPI (validation Pydantic + json).
+    """
+    start = time.perf_counter()
+    if FAST_JSON:
+        response, encoder = FastJSONResponse(content), JSON_ENCODER
+    else:
+        response, encoder = validated_response(content, response_model), "pydantic"
+    SERIALIZATION_LATENCY.labels(endpoint=endpoint, encoder=encoder).observe(time.perf_counter() - start)
+    return response
+
+
 # =============================================================================
 # ENDPOINTS
 # =============================================================================
@@ -245,6 +571,8 @@ async def root():
         "endpoints": {
             "/health": "Vérifier l'état de l'API",
             "/predict": "Prédire le risque d'un client (POST)",
+            "/predict/batch": "Scorer une liste de clients, réponse JSON ou Arrow IPC (POST)",
+            "/predict/stream": "Scorer un flux NDJSON ou Arrow IPC (POST)",
             "/explain": "Expliquer la prédiction avec SHAP (POST)",
             "/metrics": "Métriques Prometheus (GET)",
             "/docs": "Documentation Swagger"
@@ -262,7 +590,9 @@ async def metrics():
     - credit_risk_predictions_total: Nombre de prédictions par niveau de risque
     - credit_risk_request_latency_seconds: Latence des requêtes
     - credit_risk_prediction_latency_seconds: Latence des prédictions
+    - credit_risk_serialization_seconds: Temps de sérialisation des réponses par endpoint
     - credit_risk_model_loaded: État du modèle (1=chargé, 0=non)
+    - credit_risk_db_pool_*: Attente et occupation du pool de connexions
     """
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
@@ -281,7 +611,7 @@ async def health_check():
     return HealthResponse(
         status="healthy" if model is not None else "unhealthy",
         model_loaded=model is not None,
-        model_version="v1.0.0",
+        model_version=MODEL_VERSION,
         auc_roc=metrics.get("auc_roc") if metrics else None
     )
 
@@ -310,69 +640,15 @@ async def predict(client: ClientData):
         # Convertir les données client en dictionnaire
         client_dict = client.model_dump()
 
-        # Créer un DataFrame avec TOUTES les features (initialisées à 0.0 en float)
-        df = pd.DataFrame({col: [0.0] for col in feature_names})
-
-        # Mapping des champs API vers les features du modèle
-        field_mapping = {
-            'amt_income_total': 'amt_income_total',
-            'amt_credit': 'amt_credit',
-            'amt_annuity': 'amt_annuity',
-            'amt_goods_price': 'amt_goods_price',
-            'days_birth': 'days_birth',
-            'days_employed': 'days_employed',
-            'ext_source_1': 'ext_source_1',
-            'ext_source_2': 'ext_source_2',
-            'ext_source_3': 'ext_source_3',
-        }
-
-        # Remplir avec les valeurs fournies
-        for api_field, model_field in field_mapping.items():
-            if api_field in client_dict and client_dict[api_field] is not None:
-                if model_field in feature_names:
-                    df.loc[0, model_field] = float(client_dict[api_field])
-
-        # Encoder code_gender (M=1, F=0)
-        if 'code_gender' in client_dict and 'code_gender' in feature_names:
-            gender = client_dict['code_gender']
-            if gender == 'M':
-                df.loc[0, 'code_gender'] = 1.0
-            elif gender == 'F':
-                df.loc[0, 'code_gender'] = 0.0
-            else:
-                df.loc[0, 'code_gender'] = 0.0
-
-        # Calculer des features dérivées importantes
-        ext_sources = [
-            client_dict.get('ext_source_1') or 0,
-            client_dict.get('ext_source_2') or 0,
-            client_dict.get('ext_source_3') or 0
-        ]
-        valid_sources = [float(s) for s in ext_sources if s and s > 0]
-
-        if valid_sources:
-            if 'ext_source_mean' in feature_names:
-                df.loc[0, 'ext_source_mean'] = float(np.mean(valid_sources))
-            if 'ext_source_max' in feature_names:
-                df.loc[0, 'ext_source_max'] = float(max(valid_sources))
-            if 'ext_source_min' in feature_names:
-                df.loc[0, 'ext_source_min'] = float(min(valid_sources))
-
-        # Prédiction
-        proba = model.predict_proba(df)[0][1]  # Probabilité de défaut
-        pred = int(proba >= 0.5)
-
-        # Niveau de risque
-        if proba < 0.3:
-            risk_level = "Faible"
-        elif proba < 0.6:
-            risk_level = "Moyen"
-        else:
-            risk_level = "Élevé"
+        # Construire le vecteur de features du modèle
+        df = build_features(client_dict)
 
-        # Score de crédit (inverse de la probabilité, échelle 300-850)
-        score = int(850 - (proba * 550))
-        score = max(300, min(850, score))  # Borner entre 300 et 850
+        # Prédiction : probabilité de défaut calibrée, niveau de risque et score (300-850)
+        decided = decisions(model.predict_proba(df)[:, 1], calibration)
+        proba = float(decided['probability'][0])
+        pred = int(decided['prediction'][0])
+        risk_level = str(decided['risk_level'][0])
+        score = int(decided['score'][0])
 
         # Enregistrer les métriques Prometheus
         prediction_latency = time.time() - prediction_start
@@ -380,17 +656,136 @@ async def predict(client: ClientData):
         PREDICTIONS_TOTAL.labels(risk_level=risk_level).inc()
         LAST_PREDICTION_PROBABILITY.set(proba)
 
-        return PredictionResponse(
-            probability=round(proba, 4),
-            prediction=pred,
-            risk_level=risk_level,
-            score=score
-        )
+        # Journal d'audit (non bloquant)
+        log_prediction(client_dict, proba, score, risk_level)
+
+        return respond({
+            "probability": round(float(proba), 4),
+            "prediction": pred,
+            "risk_level": risk_level,
+            "score": score
+        }, PredictionResponse, "/predict")
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Erreur de prédiction: {str(e)}")
 
 
+@app.post("/predict/batch", tags=["Prediction"])
+async def predict_batch(request: Request):
+    """
+    Score une liste de clients en un seul appel au modèle.
+
+    Corps de la requête (selon le Content-Type) :
+    - application/json : liste d'objets (champs de /predict)
+    - application/vnd.apache.arrow.stream : flux Arrow IPC
+
+    Réponse (selon l'en-tête Accept) :
+    - application/json (défaut) : {"results": [...]}
+    - application/vnd.apache.arrow.stream : flux Arrow IPC, plus compact
+
+    Retourne (une ligne par client, dans l'ordre) :
+        - sk_id_curr, probability, prediction, risk_level, score
+        - error : motif si la ligne n'a pas pu être scorée (sinon null)
+    """
+    if model is None:
+        raise HTTPException(status_code=503, detail="Modèle non chargé")
+
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith(ARROW_MEDIA_TYPE):
+            batcher = ArrowStreamBatcher(BATCH_MAX_ROWS + 1)
+            frames = list(batcher.feed(body)) + list(batcher.finish())
+            clients = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        else:
+            records = loads(body)
+            if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                raise ValueError("le corps doit être une liste d'objets JSON")
+            clients = pd.DataFrame.from_records(records)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Corps de requête invalide: {str(e)}")
+
+    if len(clients) > BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Trop de clients ({len(clients)}), maximum {BATCH_MAX_ROWS} (utiliser /predict/stream)"
+        )
+
+    results = await run_in_threadpool(score_batch, clients)
+    # Journal d'audit : chaque client scoré est une décision, comme /predict
+    await run_in_threadpool(log_predictions, results)
+
+    start = time.perf_counter()
+    if request.headers.get("accept", "").startswith(ARROW_MEDIA_TYPE):
+        response, encoder = arrow_response(results), "arrow"
+    else:
+        response, encoder = FastJSONResponse({"results": results_to_records(results)}), JSON_ENCODER
+    SERIALIZATION_LATENCY.labels(endpoint="/predict/batch", encoder=encoder).observe(time.perf_counter() - start)
+    return response
+
+
+@app.post("/predict/stream", tags=["Prediction"])
+async def predict_stream(request: Request):
+    """
+    Score un flux de clients (re-scoring en masse) et renvoie les résultats en flux.
+
+    Formats (selon le Content-Type de la requête, la réponse utilise le même) :
+    - application/x-ndjson : un objet JSON (champs de /predict) par ligne
+    - application/vnd.apache.arrow.stream : flux Arrow IPC
+
+    Le corps est lu au fil de l'eau et scoré par lots de API_STREAM_BATCH_SIZE
+    lignes : ni le client ni l'API ne chargent le fichier complet en mémoire.
+    Si un lot échoue, chacune de ses lignes est renvoyée avec `error` et le
+    flux continue : un flux complet a une ligne par client.
+
+    Retourne (une ligne par client, dans l'ordre) :
+        - sk_id_curr, probability, prediction, risk_level, score
+        - error : motif si la ligne n'a pas pu être scorée (sinon null)
+    """
+    if model is None:
+        raise HTTPException(status_code=503, detail="Modèle non chargé")
+
+    if request.headers.get("content-type", "").startswith(ARROW_MEDIA_TYPE):
+        batcher, writer = ArrowStreamBatcher(STREAM_BATCH_SIZE), ArrowResultWriter()
+    else:
+        batcher, writer = NdjsonBatcher(STREAM_BATCH_SIZE), NdjsonResultWriter()
+
+    async def results():
+        start = time.perf_counter()
+        rows = 0
+
+        async def score(batch: pd.DataFrame) -> bytes:
+            nonlocal rows
+            rows += len(batch)
+            try:
+                # Le modèle tourne hors de la boucle d'événements
+                results = await run_in_threadpool(score_batch, batch)
+                # Journal d'audit : chaque ligne scorée est une décision, comme /predict
+                await run_in_threadpool(log_predictions, results)
+                data = writer.write(results)
+            except Exception as e:
+                # Statut 200 déjà envoyé : l'échec est signalé sur chaque ligne du lot
+                STREAM_ROWS_TOTAL.labels(status='failed').inc(len(batch))
+                return writer.write(empty_results(batch, f"Erreur de scoring: {e}"))
+            invalid = int(results['error'].notna().sum())
+            STREAM_ROWS_TOTAL.labels(status='scored').inc(len(results) - invalid)
+            STREAM_ROWS_TOTAL.labels(status='invalid').inc(invalid)
+            return data
+
+        async for chunk in request.stream():
+            for batch in batcher.feed(chunk):
+                yield await score(batch)
+        for batch in batcher.finish():
+            yield await score(batch)
+        yield writer.close()
+
+        elapsed = time.perf_counter() - start
+        rows_per_second = rows / elapsed if elapsed > 0 else 0.0
+        STREAM_ROWS_PER_SECOND.set(rows_per_second)
+        print(f"/predict/stream: {rows:,} lignes en {elapsed:.1f}s ({rows_per_second:,.0f} lignes/s)")
+
+    return BodyStreamingResponse(results(), media_type=writer.media_type)
+
+
 @app.post("/explain", response_model=ExplainResponse, tags=["Explanation"])
 async def explain(client: ClientData):
     """
@@ -421,64 +816,13 @@ async def explain(client: ClientData):
         # Convertir les données client en dictionnaire
         client_dict = client.model_dump()
 
-        # Créer un DataFrame avec TOUTES les features (initialisées à 0.0 en float)
-        df = pd.DataFrame({col: [0.0] for col in feature_names})
-
-        # Mapping des champs API vers les features du modèle
-        field_mapping = {
-            'amt_income_total': 'amt_income_total',
-            'amt_credit': 'amt_credit',
-            'amt_annuity': 'amt_annuity',
-            'amt_goods_price': 'amt_goods_price',
-            'days_birth': 'days_birth',
-            'days_employed': 'days_employed',
-            'ext_source_1': 'ext_source_1',
-            'ext_source_2': 'ext_source_2',
-            'ext_source_3': 'ext_source_3',
-        }
+        # Construire le vecteur de features du modèle
+        df = build_features(client_dict)
 
-        # Remplir avec les valeurs fournies
-        for api_field, model_field in field_mapping.items():
-            if api_field in client_dict and client_dict[api_field] is not None:
-                if model_field in feature_names:
-                    df.loc[0, model_field] = float(client_dict[api_field])
-
-        # Encoder code_gender (M=1, F=0)
-        if 'code_gender' in client_dict and 'code_gender' in feature_names:
-            gender = client_dict['code_gender']
-            if gender == 'M':
-                df.loc[0, 'code_gender'] = 1.0
-            elif gender == 'F':
-                df.loc[0, 'code_gender'] = 0.0
-            else:
-                df.loc[0, 'code_gender'] = 0.0
-
-        # Calculer des features dérivées importantes
-        ext_sources = [
-            client_dict.get('ext_source_1') or 0,
-            client_dict.get('ext_source_2') or 0,
-            client_dict.get('ext_source_3') or 0
-        ]
-        valid_sources = [float(s) for s in ext_sources if s and s > 0]
-
-        if valid_sources:
-            if 'ext_source_mean' in feature_names:
-                df.loc[0, 'ext_source_mean'] = float(np.mean(valid_sources))
-            if 'ext_source_max' in feature_names:
-                df.loc[0, 'ext_source_max'] = float(max(valid_sources))
-            if 'ext_source_min' in feature_names:
-                df.loc[0, 'ext_source_min'] = float(min(valid_sources))
-
-        # Prédiction
-        proba = model.predict_proba(df)[0][1]
-
-        # Niveau de risque
-        if proba < 0.3:
-            risk_level = "Faible"
-        elif proba < 0.6:
-            risk_level = "Moyen"
-        else:
-            risk_level = "Élevé"
+        # Prédiction (mêmes règles que /predict)
+        decided = decisions(model.predict_proba(df)[:, 1], calibration)
+        proba = float(decided['probability'][0])
+        risk_level = str(decided['risk_level'][0])
 
         # Calcul des SHAP values
         shap_values = shap_explainer.shap_values(df)
@@ -505,7 +849,7 @@ async def explain(client: ClientData):
             if abs(shap_vals[i]) > 0.001:  # Ignorer les impacts négligeables
                 feature_impacts.append({
                     "feature": feat,
-                    "value": float(df.loc[0, feat]),
+                    "value": None if pd.isna(df.loc[0, feat]) else float(df.loc[0, feat]),
                     "shap_value": float(shap_vals[i]),
                     "impact": "increases_risk" if shap_vals[i] > 0 else "reduces_risk"
                 })
@@ -525,10 +869,10 @@ async def explain(client: ClientData):
         MIN_IMPACT_THRESHOLD = 0.025
 
         # Déterminer les limites selon le niveau de risque
-        if proba < 0.40:  # Profil FIABLE
+        if risk_level == "Faible":  # Profil FIABLE
             max_protective = 6  # Beaucoup d'atouts
             max_risk = 3        # Peu de vigilances
-        elif proba < 0.55:  # Profil MOYEN
+        elif risk_level == "Moyen":  # Profil MOYEN
             max_protective = 4  # Équilibré
             max_risk = 4
         else:  # Profil RISQUÉ
@@ -553,13 +897,14 @@ async def explain(client: ClientData):
         risk_factors = significant_risk[:max_risk]
         protective_factors = significant_protective[:max_protective]
 
-        return ExplainResponse(
-            probability=round(proba, 4),
-            base_probability=base_probability,
-            risk_level=risk_level,
-            top_risk_factors=[FeatureImpact(**f) for f in risk_factors],
-            top_protective_factors=[FeatureImpact(**f) for f in protective_factors]
-        )
+        # Facteurs renvoyés en dicts (mêmes champs que FeatureImpact)
+        return respond({
+            "probability": round(float(proba), 4),
+            "base_probability": base_probability,
+            "risk_level": risk_level,
+            "top_risk_factors": risk_factors,
+            "top_protective_factors": protective_factors
+        }, ExplainResponse, "/explain")
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Erreur d'explication: {str(e)}")
@@ -0,0 +1,78 @@
+# =============================================================================
+# SÉRIALISATION - Credit Risk Scoring API
+# =============================================================================
+# Encodage rapide des réponses JSON (orjson) et format binaire Arrow IPC
+# (utilisé par /predict, /explain et /predict/batch)
+# =============================================================================
+#
+# Par défaut, FastAPI revalide l'objet renvoyé contre `response_model`, le
+# convertit avec jsonable_encoder puis l'encode avec json.dumps. Les réponses
+# de l'API sont construites par le serveur : on les encode directement en
+# bytes avec orjson, sans repasser par Pydantic. `response_model` reste
+# déclaré pour la documentation OpenAPI.
+# =============================================================================
+
+import io
+import json
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse, Response
+
+from api.streaming import ARROW_MEDIA_TYPE, RESULT_SCHEMA
+
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle : repli sur json (plus lent)
+    orjson = None
+
+# Encodeur utilisé par FastJSONResponse (exposé dans les métriques)
+JSON_ENCODER = "orjson" if orjson is not None else "json"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Réponse JSON encodée avec orjson (types numpy acceptés).
+
+    Le contenu est encodé tel quel : aucune validation Pydantic. Sans
+    orjson, même sortie compacte avec json.dumps.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Décode un corps JSON (orjson si disponible)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def validated_response(content: dict, response_model) -> JSONResponse:
+    """
+    Chemin standard de FastAPI : validation par le modèle Pydantic,
+    jsonable_encoder puis json.dumps (API_FAST_JSON=false).
+    """
+    return JSONResponse(jsonable_encoder(response_model(**content)))
+
+
+def results_to_records(results: pd.DataFrame) -> list:
+    """Résultats de score_batch en liste de dicts (valeurs nulles -> None)."""
+    return pa.Table.from_pandas(results, schema=RESULT_SCHEMA, preserve_index=False).to_pylist()
+
+
+def arrow_response(results: pd.DataFrame) -> Response:
+    """Résultats de score_batch en flux Arrow IPC (un seul record batch)."""
+    table = pa.Table.from_pandas(results, schema=RESULT_SCHEMA, preserve_index=False)
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, RESULT_SCHEMA) as writer:
+        writer.write_table(table)
+    return Response(content=sink.getvalue(), media_type=ARROW_MEDIA_TYPE)
@@ -0,0 +1,247 @@
+# =============================================================================
+# STREAMING - Credit Risk Scoring API
+# =============================================================================
+# Lecture incrémentale des flux NDJSON / Arrow IPC et écriture des résultats
+# (utilisé par l'endpoint /predict/stream)
+# =============================================================================
+#
+# Le corps de la requête arrive par morceaux (chunks) de taille arbitraire :
+# les parseurs ne gardent en mémoire que la ligne ou le message Arrow en cours
+# et au plus `batch_size` lignes décodées. Les résultats sont encodés lot par
+# lot, sans jamais matérialiser le flux complet.
+# =============================================================================
+
+import io
+import json
+from typing import Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Marqueurs de fin de flux Arrow IPC (format actuel et format < 0.15)
+_ARROW_EOS_MARKERS = (b"\xff\xff\xff\xff\x00\x00\x00\x00", b"\x00\x00\x00\x00")
+
+# Schéma des résultats (colonnes nulles pour les lignes invalides)
+RESULT_SCHEMA = pa.schema([
+    ("sk_id_curr", pa.int64()),
+    ("probability", pa.float64()),
+    ("prediction", pa.int8()),
+    ("risk_level", pa.string()),
+    ("score", pa.int16()),
+    ("error", pa.string()),
+])
+
+
+# =============================================================================
+# RÉPONSE
+# =============================================================================
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse dont le générateur lit lui-même le corps de la requête.
+
+    StreamingResponse écoute la déconnexion du client en parallèle via
+    receive() (serveurs ASGI < 2.4) : cet écouteur consommerait les morceaux
+    du corps. Ici la déconnexion est détectée par la lecture du corps.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+# =============================================================================
+# LECTURE DES FLUX
+# =============================================================================
+
+class _Batcher:
+    """Regroupe les lignes décodées en DataFrames de `batch_size` lignes."""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self._frames: List[pd.DataFrame] = []
+        self._pending = 0
+
+    def _add(self, frame: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        if len(frame):
+            self._frames.append(frame)
+            self._pending += len(frame)
+        while self._pending >= self.batch_size:
+            merged = pd.concat(self._frames, ignore_index=True) if len(self._frames) > 1 else self._frames[0]
+            yield merged.iloc[:self.batch_size].reset_index(drop=True)
+            rest = merged.iloc[self.batch_size:].reset_index(drop=True)
+            self._frames = [rest] if len(rest) else []
+            self._pending = len(rest)
+
+    def _flush(self) -> Iterator[pd.DataFrame]:
+        if self._pending:
+            yield pd.concat(self._frames, ignore_index=True)
+        self._frames, self._pending = [], 0
+
+
+class NdjsonBatcher(_Batcher):
+    """
+    Parseur NDJSON incrémental : un objet JSON (client) par ligne.
+
+    Une ligne qui n'est pas un objet JSON valide donne une ligne vide
+    (signalée en erreur au scoring, sans interrompre le flux).
+    """
+
+    def __init__(self, batch_size: int):
+        super().__init__(batch_size)
+        self._buffer = b""
+        self._records: List[dict] = []
+
+    def _parse_lines(self, lines: List[bytes]) -> Iterator[pd.DataFrame]:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            self._records.append(record if isinstance(record, dict) else {})
+            if len(self._records) >= self.batch_size:
+                yield from self._add(pd.DataFrame.from_records(self._records))
+                self._records = []
+
+    def feed(self, chunk: bytes) -> Iterator[pd.DataFrame]:
+        """Ajoute un morceau du corps ; renvoie les lots complets."""
+        lines = (self._buffer + chunk).split(b"\n")
+        self._buffer = lines.pop()  # ligne incomplète
+        yield from self._parse_lines(lines)
+
+    def finish(self) -> Iterator[pd.DataFrame]:
+        """Fin du corps : renvoie le dernier lot (incomplet)."""
+        yield from self._parse_lines([self._buffer])
+        self._buffer = b""
+        if self._records:
+            yield from self._add(pd.DataFrame.from_records(self._records))
+            self._records = []
+        yield from self._flush()
+
+
+class ArrowStreamBatcher(_Batcher):
+    """
+    Parseur Arrow IPC (format stream) incrémental.
+
+    Les messages (schéma, puis record batches) sont décodés dès qu'ils sont
+    complets. Après un essai sur un message incomplet, on attend que le
+    tampon ait doublé avant de réessayer : le coût reste linéaire.
+    """
+
+    def __init__(self, batch_size: int):
+        super().__init__(batch_size)
+        self._buffer = bytearray()
+        self._schema: Optional[pa.Schema] = None
+        self._next_attempt = 0
+        self._ended = False
+
+    def _parse(self) -> Iterator[pd.DataFrame]:
+        data = pa.py_buffer(bytes(self._buffer))
+        reader = pa.BufferReader(data)
+        consumed = 0
+        batches = []
+
+        while consumed < len(data) and not self._ended:
+            if bytes(self._buffer[consumed:consumed + 8]).startswith(_ARROW_EOS_MARKERS):
+                self._ended = True
+                break
+            try:
+                message = ipc.read_message(reader)
+            except (pa.ArrowInvalid, EOFError, OSError):
+                break  # message incomplet : attendre la suite
+            consumed = reader.tell()
+
+            if message.type == "schema":
+                self._schema = ipc.read_schema(message)
+            elif message.type == "record batch":
+                if self._schema is None:
+                    raise ValueError("Flux Arrow invalide : record batch avant le schéma")
+                batches.append(ipc.read_record_batch(message, self._schema))
+            else:
+                raise ValueError(f"Message Arrow non supporté: {message.type}")
+
+        if batches:
+            frame = pa.Table.from_batches(batches, schema=self._schema).to_pandas()
+            del batches
+            yield from self._add(frame)
+
+        del self._buffer[:consumed]
+        self._next_attempt = 2 * len(self._buffer)
+
+    def feed(self, chunk: bytes) -> Iterator[pd.DataFrame]:
+        """Ajoute un morceau du corps ; renvoie les lots complets."""
+        if self._ended:
+            return
+        self._buffer.extend(chunk)
+        if len(self._buffer) >= self._next_attempt:
+            yield from self._parse()
+
+    def finish(self) -> Iterator[pd.DataFrame]:
+        """Fin du corps : décode les derniers messages et renvoie le dernier lot."""
+        if not self._ended and self._buffer:
+            yield from self._parse()
+            if self._buffer and not self._ended:
+                raise ValueError("Flux Arrow tronqué")
+        yield from self._flush()
+
+
+# =============================================================================
+# ÉCRITURE DES RÉSULTATS
+# =============================================================================
+
+class NdjsonResultWriter:
+    """
+    Encode chaque lot de résultats en lignes JSON.
+
+    Les valeurs passent par RESULT_SCHEMA, comme la réponse de /predict/batch :
+    sk_id_curr reste un entier même si une ligne du lot n'en a pas.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    def write(self, results: pd.DataFrame) -> bytes:
+        records = pa.Table.from_pandas(results, schema=RESULT_SCHEMA, preserve_index=False).to_pylist()
+        return "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records
+        ).encode()
+
+    def close(self) -> bytes:
+        return b""
+
+
+class ArrowResultWriter:
+    """Encode les résultats en un flux Arrow IPC (un record batch par lot)."""
+
+    media_type = ARROW_MEDIA_TYPE
+
+    def __init__(self):
+        self._sink = io.BytesIO()
+        self._writer = ipc.new_stream(self._sink, RESULT_SCHEMA)
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def write(self, results: pd.DataFrame) -> bytes:
+        batch = pa.RecordBatch.from_pandas(results, schema=RESULT_SCHEMA, preserve_index=False)
+        self._writer.write_batch(batch)
+        return self._drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._drain()
@@ -0,0 +1,145 @@
+"""
+API serialization benchmark for Credit Risk Scoring Project.
+
+Measures, per endpoint, the time spent turning a response into bytes:
+- /predict and /explain: orjson (FastJSONResponse, the API default)
+  against the standard FastAPI path (Pydantic validation +
+  jsonable_encoder + json.dumps, API_FAST_JSON=false)
+- /predict/batch: JSON records against the Arrow IPC binary format
+
+and the end-to-end latency of each endpoint through the ASGI app.
+
+Usage:
+    python scripts/benchmark_api.py [--repeat 2000] [--batch-size 1000]
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+import api.main as api
+from api.serialization import FastJSONResponse, arrow_response, results_to_records, validated_response
+
+CLIENT = {
+    "sk_id_curr": 100002,
+    "amt_income_total": 90000,
+    "amt_credit": 180000,
+    "amt_annuity": 9600,
+    "amt_goods_price": 162000,
+    "code_gender": "M",
+    "days_birth": -16425,
+    "days_employed": -5475,
+    "ext_source_1": 0.62,
+    "ext_source_2": 0.55,
+    "ext_source_3": 0.48,
+}
+
+
+def time_call(func: Callable, repeat: int) -> float:
+    """Median time of one call, in microseconds."""
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1e6)
+
+
+def make_batch(size: int, seed: int = 0) -> pd.DataFrame:
+    """Batch of clients around CLIENT."""
+    rng = np.random.default_rng(seed)
+    batch = pd.DataFrame([CLIENT] * size)
+    batch["sk_id_curr"] = np.arange(size)
+    for col in ["ext_source_1", "ext_source_2", "ext_source_3"]:
+        batch[col] = rng.uniform(0, 1, size)
+    return batch
+
+
+def benchmark_serialization(client: TestClient, repeat: int, batch_size: int) -> Dict[str, float]:
+    """Serialization time per endpoint and encoder (µs)."""
+    predict = client.post("/predict", json=CLIENT).json()
+    explain = client.post("/explain", json=CLIENT).json()
+    results = api.score_batch(make_batch(batch_size))
+
+    return {
+        "/predict orjson": time_call(lambda: FastJSONResponse(predict), repeat),
+        "/predict pydantic": time_call(lambda: validated_response(predict, api.PredictionResponse), repeat),
+        "/explain orjson": time_call(lambda: FastJSONResponse(explain), repeat),
+        "/explain pydantic": time_call(lambda: validated_response(explain, api.ExplainResponse), repeat),
+        f"/predict/batch json ({batch_size} rows)": time_call(
+            lambda: FastJSONResponse({"results": results_to_records(results)}), max(repeat // 20, 5)
+        ),
+        f"/predict/batch arrow ({batch_size} rows)": time_call(
+            lambda: arrow_response(results), max(repeat // 20, 5)
+        ),
+    }
+
+
+def benchmark_endpoints(client: TestClient, repeat: int, batch_size: int) -> Dict[str, float]:
+    """End-to-end latency per endpoint (µs), fast JSON path on and off."""
+    batch = make_batch(batch_size).to_dict("records")
+    arrow_headers = {"Accept": "application/vnd.apache.arrow.stream"}
+    timings = {}
+
+    for fast_json in [True, False]:
+        api.FAST_JSON = fast_json
+        label = "orjson" if fast_json else "pydantic"
+        timings[f"/predict {label}"] = time_call(lambda: client.post("/predict", json=CLIENT), repeat // 10)
+        timings[f"/explain {label}"] = time_call(lambda: client.post("/explain", json=CLIENT), repeat // 20)
+    api.FAST_JSON = True
+
+    timings[f"/predict/batch json ({batch_size} rows)"] = time_call(
+        lambda: client.post("/predict/batch", json=batch), max(repeat // 200, 3)
+    )
+    timings[f"/predict/batch arrow ({batch_size} rows)"] = time_call(
+        lambda: client.post("/predict/batch", json=batch, headers=arrow_headers), max(repeat // 200, 3)
+    )
+    return timings
+
+
+def print_table(title: str, timings: Dict[str, float]) -> None:
+    print(f"\n{title}")
+    print("-" * 60)
+    for name, micros in timings.items():
+        print(f"  {name:<40} {micros:>12,.1f} µs")
+
+
+def run_benchmark(repeat: int = 2000, batch_size: int = 1000) -> Dict[str, Dict[str, float]]:
+    """Main function to benchmark the API serialization."""
+    print("=" * 60)
+    print("Credit Risk Scoring - API Serialization Benchmark")
+    print("=" * 60)
+
+    api.load_model()
+    client = TestClient(api.app)
+
+    serialization = benchmark_serialization(client, repeat, batch_size)
+    print_table("Serialization (median per response)", serialization)
+
+    endpoints = benchmark_endpoints(client, repeat, batch_size)
+    print_table("End-to-end latency (median per request)", endpoints)
+
+    return {"serialization": serialization, "endpoints": endpoints}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API response serialization")
+    parser.add_argument("--repeat", type=int, default=2000,
+                        help="Serializations per measurement")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="Clients per /predict/batch request")
+    args = parser.parse_args()
+
+    run_benchmark(repeat=args.repeat, batch_size=args.batch_size)
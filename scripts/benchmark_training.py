@@ -0,0 +1,106 @@
+"""
+Training benchmark for Credit Risk Scoring Project.
+
+Trains the model on the same Parquet feature partitions twice:
+- in memory: the batches are loaded in a QuantileDMatrix
+- external memory: ExtMemQuantileDMatrix, quantized pages cached on disk
+
+and compares training time, peak memory and test AUC. The partitions
+are synthetic (--rows, --features) unless --features-path is given.
+
+Usage:
+    python scripts/benchmark_training.py [--rows 500000] [--features 200]
+    python scripts/benchmark_training.py --features-path data/features/partitions
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.train import ModelTrainer
+
+
+def make_partitions(output_dir: Path, rows: int, n_features: int, n_partitions: int, seed: int = 0) -> Path:
+    """Synthetic feature partitions: the target depends on a few features."""
+    rng = np.random.default_rng(seed)
+    rows_per_partition = -(-rows // n_partitions)
+    for i in range(n_partitions):
+        n = min(rows_per_partition, rows - i * rows_per_partition)
+        X = rng.normal(size=(n, n_features)).astype(np.float32)
+        X[rng.random(X.shape) < 0.05] = np.nan
+        part = pd.DataFrame(X, columns=[f"feature_{j}" for j in range(n_features)])
+        part.insert(0, "sk_id_curr", np.arange(i * rows_per_partition, i * rows_per_partition + n))
+        part["name_income_type"] = rng.choice(["Working", "Pensioner", "State servant"], n)
+        logit = -2.5 + np.nan_to_num(X[:, 0] - 0.7 * X[:, 1] + 0.5 * X[:, 2] * X[:, 3])
+        part["target"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(np.int8)
+        part.to_parquet(output_dir / f"part-{i:04d}.parquet", index=False)
+    return output_dir
+
+
+def train(features_path: Path, work_dir: Path, in_memory: bool, n_estimators: int) -> Dict:
+    """One training run, artifacts written to a scratch models directory."""
+    trainer = ModelTrainer()
+    trainer.models_dir = work_dir / ("in_memory" if in_memory else "external")
+    trainer.settings['external_cache_dir'] = str(work_dir / "xgb_cache")
+    params = trainer.load_params
+    trainer.load_params = lambda y_train: {**params(y_train), 'n_estimators': n_estimators}
+    return trainer.run_external(features_path, in_memory=in_memory)
+
+
+def run_benchmark(
+    rows: int = 500000,
+    n_features: int = 200,
+    n_partitions: int = 10,
+    n_estimators: int = 200,
+    features_path: Optional[str] = None
+) -> Dict[str, Dict]:
+    """Main function to benchmark in-memory against external-memory training."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Training Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        if features_path is None:
+            partitions = work_dir / "features"
+            partitions.mkdir()
+            print(f"Writing {rows:,} rows x {n_features} features in {n_partitions} partitions...")
+            features_path = make_partitions(partitions, rows, n_features, n_partitions)
+
+        results = {
+            'in_memory': train(Path(features_path), work_dir, True, n_estimators),
+            'external_memory': train(Path(features_path), work_dir, False, n_estimators),
+        }
+
+    print("\n" + "-" * 60)
+    print(f"  {'mode':<18} {'time (s)':>10} {'peak (MB)':>10} {'cache (MB)':>11} {'AUC':>8}")
+    for mode, metrics in results.items():
+        print(f"  {mode:<18} {metrics['training_time_seconds']:>10.1f} {metrics['peak_memory_mb']:>10.0f} "
+              f"{metrics['external_cache_mb']:>11.1f} {metrics['auc_roc']:>8.4f}")
+    gap = results['external_memory']['auc_roc'] - results['in_memory']['auc_roc']
+    print(f"\n  AUC difference (external - in memory): {gap:+.4f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark in-memory against external-memory training")
+    parser.add_argument("--rows", type=int, default=500000, help="Synthetic rows")
+    parser.add_argument("--features", type=int, default=200, help="Synthetic features")
+    parser.add_argument("--partitions", type=int, default=10, help="Synthetic Parquet partitions")
+    parser.add_argument("--n-estimators", type=int, default=200, help="Boosting rounds")
+    parser.add_argument("--features-path", default=None,
+                        help="Existing Parquet file or partition directory (instead of synthetic data)")
+    args = parser.parse_args()
+
+    run_benchmark(rows=args.rows, n_features=args.features, n_partitions=args.partitions,
+                  n_estimators=args.n_estimators, features_path=args.features_path)
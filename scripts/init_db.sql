@@ -152,21 +152,115 @@ CREATE TABLE IF NOT EXISTS features (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ====================================
+-- Aggregate Watermarks (incremental refresh of agg_* summary tables,
+-- see src/features/aggregates.py)
+-- ====================================
+CREATE TABLE IF NOT EXISTS aggregate_watermarks (
+    aggregate_name VARCHAR(50) PRIMARY KEY,
+    watermark BIGINT,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ====================================
 -- Predictions Table (for storing model predictions)
+-- Partitioned by month on created_at: old months are detached and
+-- archived to Parquet by src/data/retention.py
 -- ====================================
 CREATE TABLE IF NOT EXISTS predictions (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     SK_ID_CURR INTEGER,
     probability DECIMAL(10,6),
     score INTEGER,
     decision VARCHAR(20),
     model_version VARCHAR(50),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    reasons JSONB,  -- top-k SHAP reasons (batch scoring, src/models/score.py)
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Databases created before the reasons column
+ALTER TABLE predictions ADD COLUMN IF NOT EXISTS reasons JSONB;
+
+-- Catches rows outside the created partitions. It stays empty while the
+-- maintenance job runs; rows it catches during an outage are moved to their
+-- monthly partition by the next ensure_predictions_partitions()
+CREATE TABLE IF NOT EXISTS predictions_default PARTITION OF predictions DEFAULT;
 
 CREATE INDEX IF NOT EXISTS idx_predictions_sk_id_curr ON predictions(SK_ID_CURR);
-CREATE INDEX IF NOT EXISTS idx_predictions_created_at ON predictions(created_at);
+-- BRIN instead of B-tree: rows arrive in time order, so a few pages of
+-- min/max summaries replace a large, write-heavy index
+CREATE INDEX IF NOT EXISTS idx_predictions_created_at_brin ON predictions
+    USING BRIN (created_at) WITH (pages_per_range = 32);
+
+-- Create the monthly partition containing month_start (idempotent).
+-- PostgreSQL refuses to create a partition while the DEFAULT partition holds
+-- rows of its range, so those rows are moved into the new table before it is
+-- attached (all in the caller's transaction).
+CREATE OR REPLACE FUNCTION create_predictions_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    start_date DATE := date_trunc('month', month_start)::DATE;
+    end_date DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'predictions_' || to_char(start_date, 'YYYY_MM');
+BEGIN
+    IF to_regclass(format('credit_risk.%I', partition_name)) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM credit_risk.predictions_default
+        WHERE created_at >= start_date AND created_at < end_date
+    ) THEN
+        EXECUTE format(
+            'CREATE TABLE credit_risk.%I PARTITION OF credit_risk.predictions '
+            'FOR VALUES FROM (%L) TO (%L)',
+            partition_name, start_date, end_date
+        );
+        RETURN partition_name;
+    END IF;
+
+    -- Blocks inserts into the DEFAULT partition until the move commits
+    LOCK TABLE credit_risk.predictions_default IN EXCLUSIVE MODE;
+    EXECUTE format(
+        'CREATE TABLE credit_risk.%I (LIKE credit_risk.predictions INCLUDING DEFAULTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS ('
+        '    DELETE FROM credit_risk.predictions_default'
+        '    WHERE created_at >= %L AND created_at < %L RETURNING *'
+        ') INSERT INTO credit_risk.%I SELECT * FROM moved',
+        start_date, end_date, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE credit_risk.predictions ATTACH PARTITION credit_risk.%I '
+        'FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create the partitions for the current month and the next months_ahead
+-- months, plus the months of any row caught by the DEFAULT partition
+CREATE OR REPLACE FUNCTION ensure_predictions_partitions(months_ahead INTEGER DEFAULT 3)
+RETURNS SETOF TEXT AS $$
+BEGIN
+    RETURN QUERY
+    SELECT create_predictions_partition(months.month_start::DATE)
+    FROM (
+        SELECT DISTINCT date_trunc('month', created_at) AS month_start
+        FROM credit_risk.predictions_default
+        UNION
+        SELECT date_trunc('month', CURRENT_DATE) + make_interval(months => m)
+        FROM generate_series(0, months_ahead) AS m
+    ) AS months
+    ORDER BY months.month_start;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_predictions_partitions(3);
 
 -- ====================================
 -- Grant permissions
@@ -0,0 +1,132 @@
+-- ====================================
+-- Credit Risk Scoring Project
+-- Migration: partition credit_risk.predictions by month
+-- ====================================
+-- For databases created before predictions was partitioned
+-- (fresh databases get the partitioned table from init_db.sql).
+-- Run once, during a maintenance window:
+--   psql -d credit_risk -f scripts/migrate_predictions_partitioned.sql
+-- ====================================
+
+SET search_path TO credit_risk, public;
+
+BEGIN;
+
+ALTER TABLE predictions RENAME TO predictions_unpartitioned;
+ALTER INDEX IF EXISTS idx_predictions_sk_id_curr RENAME TO idx_predictions_unpartitioned_sk_id_curr;
+ALTER INDEX IF EXISTS idx_predictions_created_at RENAME TO idx_predictions_unpartitioned_created_at;
+
+CREATE TABLE predictions (
+    id BIGSERIAL,
+    SK_ID_CURR INTEGER,
+    probability DECIMAL(10,6),
+    score INTEGER,
+    decision VARCHAR(20),
+    model_version VARCHAR(50),
+    reasons JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE predictions_default PARTITION OF predictions DEFAULT;
+
+CREATE INDEX idx_predictions_sk_id_curr ON predictions(SK_ID_CURR);
+CREATE INDEX idx_predictions_created_at_brin ON predictions
+    USING BRIN (created_at) WITH (pages_per_range = 32);
+
+-- Same definitions as scripts/init_db.sql (keep both in sync)
+
+-- Create the monthly partition containing month_start (idempotent).
+-- PostgreSQL refuses to create a partition while the DEFAULT partition holds
+-- rows of its range, so those rows are moved into the new table before it is
+-- attached (all in the caller's transaction).
+CREATE OR REPLACE FUNCTION create_predictions_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    start_date DATE := date_trunc('month', month_start)::DATE;
+    end_date DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'predictions_' || to_char(start_date, 'YYYY_MM');
+BEGIN
+    IF to_regclass(format('credit_risk.%I', partition_name)) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM credit_risk.predictions_default
+        WHERE created_at >= start_date AND created_at < end_date
+    ) THEN
+        EXECUTE format(
+            'CREATE TABLE credit_risk.%I PARTITION OF credit_risk.predictions '
+            'FOR VALUES FROM (%L) TO (%L)',
+            partition_name, start_date, end_date
+        );
+        RETURN partition_name;
+    END IF;
+
+    -- Blocks inserts into the DEFAULT partition until the move commits
+    LOCK TABLE credit_risk.predictions_default IN EXCLUSIVE MODE;
+    EXECUTE format(
+        'CREATE TABLE credit_risk.%I (LIKE credit_risk.predictions INCLUDING DEFAULTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS ('
+        '    DELETE FROM credit_risk.predictions_default'
+        '    WHERE created_at >= %L AND created_at < %L RETURNING *'
+        ') INSERT INTO credit_risk.%I SELECT * FROM moved',
+        start_date, end_date, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE credit_risk.predictions ATTACH PARTITION credit_risk.%I '
+        'FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create the partitions for the current month and the next months_ahead
+-- months, plus the months of any row caught by the DEFAULT partition
+CREATE OR REPLACE FUNCTION ensure_predictions_partitions(months_ahead INTEGER DEFAULT 3)
+RETURNS SETOF TEXT AS $$
+BEGIN
+    RETURN QUERY
+    SELECT create_predictions_partition(months.month_start::DATE)
+    FROM (
+        SELECT DISTINCT date_trunc('month', created_at) AS month_start
+        FROM credit_risk.predictions_default
+        UNION
+        SELECT date_trunc('month', CURRENT_DATE) + make_interval(months => m)
+        FROM generate_series(0, months_ahead) AS m
+    ) AS months
+    ORDER BY months.month_start;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One partition per month already present in the old table
+SELECT create_predictions_partition(month::DATE)
+FROM (
+    SELECT DISTINCT date_trunc('month', COALESCE(created_at, CURRENT_TIMESTAMP)) AS month
+    FROM predictions_unpartitioned
+) months;
+
+SELECT ensure_predictions_partitions(3);
+
+INSERT INTO predictions (id, SK_ID_CURR, probability, score, decision, model_version, created_at)
+SELECT id, SK_ID_CURR, probability, score, decision, model_version,
+       COALESCE(created_at, CURRENT_TIMESTAMP)
+FROM predictions_unpartitioned;
+
+-- Continue ids after the migrated rows
+SELECT setval(
+    pg_get_serial_sequence('credit_risk.predictions', 'id'),
+    COALESCE((SELECT MAX(id) FROM predictions), 0) + 1,
+    false
+);
+
+DROP TABLE predictions_unpartitioned;
+
+GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA credit_risk TO credit_user;
+GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA credit_risk TO credit_user;
+
+COMMIT;
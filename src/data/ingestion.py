@@ -13,14 +13,16 @@ import numpy as np
 from pathlib import Path
 from typing import Optional, List
 import yaml
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Engine
-import os
-from dotenv import load_dotenv
 import time
 
-# Load environment variables
-load_dotenv()
+from src.features.aggregates import AggregateStore
+from src.utils.database import get_engine
+
+# History tables (aggregated per client by src/features/aggregates.py)
+HISTORY_TABLES = ["installments_payments", "pos_cash_balance", "credit_card_balance"]
+HISTORY_CSV_FILES = ["installments_payments.csv", "POS_CASH_balance.csv", "credit_card_balance.csv"]
 
 
 class DataIngestion:
@@ -40,6 +42,7 @@ class DataIngestion:
         self.config = self._load_config(config_path)
         self.raw_path = Path(self.config['paths']['data']['raw'])
         self.engine = self._create_engine()
+        self.aggregates = AggregateStore(config_path, engine=self.engine)
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
@@ -47,16 +50,8 @@ class DataIngestion:
             return yaml.safe_load(f)
 
     def _create_engine(self) -> Engine:
-        """Create SQLAlchemy engine for PostgreSQL connection."""
-        host = os.getenv('POSTGRES_HOST', 'localhost')
-        port = os.getenv('POSTGRES_PORT', '5432')
-        database = os.getenv('POSTGRES_DB', 'credit_risk')
-        user = os.getenv('POSTGRES_USER', 'credit_user')
-        password = os.getenv('POSTGRES_PASSWORD', '')
-
-        connection_string = f"postgresql://{user}:{password}@{host}:{port}/{database}"
-
-        return create_engine(connection_string)
+        """Get the shared, pooled SQLAlchemy engine for PostgreSQL."""
+        return get_engine(self.config)
 
     def test_connection(self) -> bool:
         """
@@ -85,6 +80,10 @@ class DataIngestion:
         """
         Load a CSV file into PostgreSQL table.
 
+        Aggregate summaries built from the table are invalidated first
+        (see AggregateStore.invalidate), so feature builds never read
+        aggregates of the previous contents.
+
         Args:
             table_name: Name of the target table
             csv_filename: CSV filename (defaults to table_name.csv)
@@ -109,6 +108,9 @@ class DataIngestion:
         file_size_mb = file_path.stat().st_size / (1024 * 1024)
         print(f"  File size: {file_size_mb:.1f} MB")
 
+        if schema == self.aggregates.schema:
+            self.aggregates.invalidate(table_name)
+
         start_time = time.time()
         total_rows = 0
 
@@ -173,12 +175,47 @@ class DataIngestion:
 
         return results
 
-    def verify_load(self, schema: str = "credit_risk") -> pd.DataFrame:
+    def load_history_tables(self) -> dict:
+        """
+        Load the large history tables into PostgreSQL.
+
+        Once loaded, their per-client aggregates can be kept as summary
+        tables (see src/features/aggregates.py) instead of being recomputed
+        from CSV on every feature build.
+
+        Tables loaded:
+        - installments_payments
+        - pos_cash_balance (POS_CASH_balance.csv)
+        - credit_card_balance
+
+        Returns:
+            Dictionary with table names and row counts
+        """
+        tables_to_load = list(zip(HISTORY_TABLES, HISTORY_CSV_FILES))
+
+        results = {}
+
+        for table_name, csv_file in tables_to_load:
+            try:
+                rows = self.load_csv_to_postgres(
+                    table_name=table_name,
+                    csv_filename=csv_file,
+                    chunk_size=50000
+                )
+                results[table_name] = rows
+            except Exception as e:
+                print(f"  Error loading {table_name}: {e}")
+                results[table_name] = -1
+
+        return results
+
+    def verify_load(self, schema: str = "credit_risk", include_history: bool = False) -> pd.DataFrame:
         """
         Verify data was loaded correctly by checking row counts.
 
         Args:
             schema: Database schema
+            include_history: Also check the history tables
 
         Returns:
             DataFrame with table names and row counts
@@ -192,20 +229,24 @@ class DataIngestion:
         AND table_type = 'BASE TABLE'
         """
 
-        # Simpler approach - check each table individually
+        # Simpler approach - check each table individually (one connection)
         tables = ['application_train', 'bureau', 'previous_application']
+        if include_history:
+            tables += HISTORY_TABLES
         results = []
 
-        for table in tables:
-            try:
-                with self.engine.connect() as conn:
+        with self.engine.connect() as conn:
+            for table in tables:
+                try:
                     result = conn.execute(
                         text(f"SELECT COUNT(*) FROM {schema}.{table}")
                     )
                     count = result.scalar()
                     results.append({'table': table, 'rows': count})
-            except Exception as e:
-                results.append({'table': table, 'rows': f'Error: {e}'})
+                except Exception as e:
+                    # Reset the aborted transaction before the next table
+                    conn.rollback()
+                    results.append({'table': table, 'rows': f'Error: {e}'})
 
         return pd.DataFrame(results)
 
@@ -235,8 +276,14 @@ class DataIngestion:
             return pd.read_sql(query, conn)
 
 
-def run_ingestion():
-    """Main function to run the data ingestion process."""
+def run_ingestion(include_history: bool = True):
+    """
+    Main function to run the data ingestion process.
+
+    Args:
+        include_history: Also load installments, POS cash and credit card
+            balances, so their aggregates can be kept as summary tables
+    """
     print("=" * 60)
     print("Credit Risk Scoring - Data Ingestion")
     print("=" * 60)
@@ -253,6 +300,11 @@ def run_ingestion():
     print("\nLoading main tables...")
     results = ingestion.load_main_tables()
 
+    # Load history tables
+    if include_history:
+        print("\nLoading history tables...")
+        results.update(ingestion.load_history_tables())
+
     # Summary
     print("\n" + "=" * 60)
     print("INGESTION SUMMARY")
@@ -263,13 +315,22 @@ def run_ingestion():
 
     # Verify
     print("\nVerifying loaded data...")
-    verification = ingestion.verify_load()
+    verification = ingestion.verify_load(include_history=include_history)
     print(verification.to_string(index=False))
 
     print("\nIngestion complete!")
+    print("Run `make refresh-aggregates` to rebuild the aggregate summary tables.")
+    return results
 
 
 if __name__ == "__main__":
+    import argparse
     import os
     os.chdir(Path(__file__).parent.parent.parent)  # Change to project root
-    run_ingestion()
+
+    parser = argparse.ArgumentParser(description="Load the Home Credit CSVs into PostgreSQL")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Skip installments, POS cash and credit card balances (large tables)")
+    args = parser.parse_args()
+
+    run_ingestion(include_history=not args.no_history)
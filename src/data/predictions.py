@@ -0,0 +1,277 @@
+"""
+Prediction audit log for Credit Risk Scoring Project.
+
+This module records scoring decisions in credit_risk.predictions:
+- Bulk loading with COPY (one round trip per batch)
+- A background writer that buffers records in a bounded queue and
+  flushes them at a size or time threshold, off the request path
+- Backpressure (block briefly) or drop-with-counter when the DB is slow
+- Prometheus metrics on queue depth and flush latency
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import csv
+import io
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.engine import Engine
+
+PREDICTION_COLUMNS = [
+    'sk_id_curr',
+    'probability',
+    'score',
+    'decision',
+    'model_version',
+    'created_at',
+]
+
+# Used when config.yaml has no database.prediction_writer section
+DEFAULT_WRITER_CONFIG = {
+    'queue_size': 10000,
+    'batch_size': 500,
+    'flush_interval_seconds': 1.0,
+    'overflow_policy': 'drop',  # 'drop' or 'block'
+    'block_timeout_seconds': 0.05,
+}
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+WRITER_QUEUE_DEPTH = Gauge(
+    'credit_risk_prediction_log_queue_depth',
+    'Prediction records waiting to be written'
+)
+
+WRITER_FLUSH_LATENCY = Histogram(
+    'credit_risk_prediction_log_flush_seconds',
+    'Time to write one batch of prediction records',
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+
+WRITER_RECORDS_WRITTEN = Counter(
+    'credit_risk_prediction_log_written_total',
+    'Prediction records written to the database'
+)
+
+WRITER_RECORDS_DROPPED = Counter(
+    'credit_risk_prediction_log_dropped_total',
+    'Prediction records dropped before reaching the database',
+    ['reason']
+)
+
+
+# =============================================================================
+# BULK COPY
+# =============================================================================
+
+def copy_predictions(
+    engine: Engine,
+    records: Iterable[Dict],
+    schema: str = "credit_risk",
+    table_name: str = "predictions",
+    columns: Sequence[str] = PREDICTION_COLUMNS
+) -> int:
+    """
+    Bulk-insert prediction records with a single COPY statement.
+
+    Args:
+        engine: SQLAlchemy engine (PostgreSQL / psycopg2)
+        records: Dictionaries keyed by `columns`
+        schema: Database schema
+        table_name: Target table
+        columns: Columns written (PREDICTION_COLUMNS by default)
+
+    Returns:
+        Number of rows written
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    rows = 0
+    for record in records:
+        writer.writerow([
+            '' if record.get(col) is None else record[col]
+            for col in columns
+        ])
+        rows += 1
+
+    if rows == 0:
+        return 0
+    buffer.seek(0)
+
+    column_list = ", ".join(columns)
+    statement = f"COPY {schema}.{table_name} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.copy_expert(statement, buffer)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return rows
+
+
+# =============================================================================
+# BACKGROUND WRITER
+# =============================================================================
+
+class PredictionWriter:
+    """
+    Buffers prediction records and writes them in batches from a background thread.
+
+    submit() never waits on the database: records go into a bounded queue and
+    a daemon thread flushes them when `batch_size` records are pending or
+    `flush_interval_seconds` has elapsed. When the queue is full, records are
+    dropped (policy 'drop') or the caller waits up to `block_timeout_seconds`
+    before dropping (policy 'block').
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[List[Dict]], int],
+        queue_size: int = DEFAULT_WRITER_CONFIG['queue_size'],
+        batch_size: int = DEFAULT_WRITER_CONFIG['batch_size'],
+        flush_interval_seconds: float = DEFAULT_WRITER_CONFIG['flush_interval_seconds'],
+        overflow_policy: str = DEFAULT_WRITER_CONFIG['overflow_policy'],
+        block_timeout_seconds: float = DEFAULT_WRITER_CONFIG['block_timeout_seconds']
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            sink: Function writing a batch of records (e.g. copy_predictions)
+            queue_size: Maximum number of buffered records
+            batch_size: Records per flush
+            flush_interval_seconds: Maximum time a record waits before a flush
+            overflow_policy: 'drop' or 'block' when the queue is full
+            block_timeout_seconds: Maximum wait under the 'block' policy
+        """
+        if overflow_policy not in ('drop', 'block'):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
+        self.block_timeout_seconds = block_timeout_seconds
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        WRITER_QUEUE_DEPTH.set_function(self._queue.qsize)
+
+    @classmethod
+    def for_engine(cls, engine: Engine, config: Optional[dict] = None) -> "PredictionWriter":
+        """
+        Build a writer that COPYs batches into credit_risk.predictions.
+
+        Args:
+            engine: SQLAlchemy engine
+            config: `database.prediction_writer` configuration section
+
+        Returns:
+            PredictionWriter (not started)
+        """
+        settings = {**DEFAULT_WRITER_CONFIG, **(config or {})}
+        return cls(
+            sink=lambda records: copy_predictions(engine, records),
+            **{k: settings[k] for k in DEFAULT_WRITER_CONFIG}
+        )
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread after flushing the records still queued."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, record: Dict) -> bool:
+        """
+        Queue a prediction record for writing.
+
+        Args:
+            record: Dictionary keyed by PREDICTION_COLUMNS
+                    (created_at defaults to now)
+
+        Returns:
+            True if queued, False if dropped
+        """
+        if record.get('created_at') is None:
+            record = {**record, 'created_at': datetime.now()}
+
+        try:
+            if self.overflow_policy == 'block':
+                self._queue.put(record, timeout=self.block_timeout_seconds)
+            else:
+                self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            WRITER_RECORDS_DROPPED.labels(reason='queue_full').inc()
+            return False
+
+    @property
+    def pending(self) -> int:
+        """Number of records waiting to be written."""
+        return self._queue.qsize()
+
+    def _drain(self, max_records: int, timeout: float) -> List[Dict]:
+        """Collect up to max_records, waiting at most `timeout` (or until stop) for the batch to fill."""
+        batch = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < max_records:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    # Short waits so stop() is noticed without waiting a full interval
+                    batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                if remaining <= 0 or self._stop_event.is_set():
+                    break
+        return batch
+
+    def _flush(self, batch: List[Dict]) -> None:
+        start_time = time.perf_counter()
+        try:
+            written = self.sink(batch)
+            WRITER_RECORDS_WRITTEN.inc(written)
+        except Exception as e:
+            WRITER_RECORDS_DROPPED.labels(reason='flush_error').inc(len(batch))
+            print(f"Warning: failed to write {len(batch)} prediction records: {e}")
+        finally:
+            WRITER_FLUSH_LATENCY.observe(time.perf_counter() - start_time)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            batch = self._drain(self.batch_size, self.flush_interval_seconds)
+            if batch:
+                self._flush(batch)
+
+        # Final drain on shutdown
+        while True:
+            batch = self._drain(self.batch_size, 0)
+            if not batch:
+                break
+            self._flush(batch)
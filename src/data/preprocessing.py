@@ -7,18 +7,35 @@ This module handles:
 - Outlier treatment
 - Anomaly correction
 - Data type optimization
+- Fit/transform split: statistics are fitted once and persisted to
+  models/preprocessing_state.json, then replayed on new data
+- In-place mode: steps mutate the caller's frame column by column
+  instead of copying it, with peak RSS reported per step
+- Streaming mode for tables larger than memory: statistics from
+  mergeable sketches, then chunks transformed to partitioned Parquet
+- Polars engine (features.engine = 'polars'): transform() replays the
+  fitted state as one lazy multi-threaded Polars plan
+- Stable categories: category dtypes follow the shared registry
+  (models/category_codes.json), so codes match training and serving
 
 Author: Daniela Samo
 Date: January 2026
 """
 
+import json
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple, Union
+from typing import Callable, Iterable, Iterator, Optional, Dict, List, Tuple, Union
 import yaml
 import warnings
 
+from src.data.sketches import DEFAULT_KLL_K, FLOAT32_TOLERANCE, StreamingStatistics
+from src.data.statistics import ColumnStatistics, compute_column_stats
+from src.features import polars_engine
+from src.features.encoding import load_category_registry
+from src.utils.memory import MemoryTracker
+
 warnings.filterwarnings('ignore')
 
 
@@ -43,9 +60,23 @@ class DataPreprocessor:
         # Ensure processed directory exists
         self.processed_path.mkdir(parents=True, exist_ok=True)
 
+        # Streaming mode settings
+        self.chunk_size = self.config['data'].get('chunk_size', 100000)
+        self.sketch_k = self.config['data'].get('sketch_k', DEFAULT_KLL_K)
+
         # Store preprocessing statistics
         self.stats = {}
 
+        # Fitted preprocessing state (see fit / transform)
+        self.state: Optional[dict] = None
+        self.state_path = Path(self.config['paths']['models']) / "preprocessing_state.json"
+
+        # Execution engine of transform() ('pandas' or 'polars')
+        self.engine = polars_engine.check_engine(self.config['features'].get('engine', 'pandas'))
+
+        # Shared category codes (None until the first model is trained)
+        self.category_registry = load_category_registry(self.config['paths']['models'])
+
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
         with open(config_path, 'r') as f:
@@ -92,7 +123,7 @@ class DataPreprocessor:
 
         return stats[stats['missing_count'] > 0]
 
-    def fix_anomalies(self, df: pd.DataFrame) -> pd.DataFrame:
+    def fix_anomalies(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
         Fix known anomalies in the application data.
 
@@ -102,11 +133,13 @@ class DataPreprocessor:
 
         Args:
             df: Input DataFrame (application_train or application_test)
+            inplace: Modify df instead of a copy
 
         Returns:
             DataFrame with fixed anomalies
         """
-        df = df.copy()
+        if not inplace:
+            df = df.copy()
 
         # Fix DAYS_EMPLOYED anomaly (365243 = ~1000 years, obviously a placeholder)
         if 'DAYS_EMPLOYED' in df.columns:
@@ -127,7 +160,9 @@ class DataPreprocessor:
         df: pd.DataFrame,
         numeric_strategy: str = 'median',
         categorical_strategy: str = 'mode',
-        special_value: Optional[float] = None
+        special_value: Optional[float] = None,
+        stats: Optional[ColumnStatistics] = None,
+        inplace: bool = False
     ) -> pd.DataFrame:
         """
         Impute missing values in the DataFrame.
@@ -137,48 +172,51 @@ class DataPreprocessor:
             numeric_strategy: Strategy for numeric columns ('median', 'mean', 'zero', 'special')
             categorical_strategy: Strategy for categorical columns ('mode', 'unknown')
             special_value: Value to use when strategy is 'special'
+            stats: Precomputed column statistics (computed here if None)
+            inplace: Modify df instead of a copy
 
         Returns:
             DataFrame with imputed values
         """
-        df = df.copy()
+        if stats is None:
+            stats = compute_column_stats(df)
 
         # Identify column types
         numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
         categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+        with_missing = set(stats.null_counts[stats.null_counts > 0].index)
 
         # Impute numeric columns
-        for col in numeric_cols:
-            if df[col].isnull().sum() > 0:
-                if numeric_strategy == 'median':
-                    fill_value = df[col].median()
-                elif numeric_strategy == 'mean':
-                    fill_value = df[col].mean()
-                elif numeric_strategy == 'zero':
-                    fill_value = 0
-                elif numeric_strategy == 'special':
-                    fill_value = special_value if special_value is not None else -999
-                else:
-                    fill_value = df[col].median()
-
-                df[col] = df[col].fillna(fill_value)
+        numeric_missing = [c for c in numeric_cols if c in with_missing]
+        if numeric_strategy == 'mean':
+            fill_values = df[numeric_missing].mean().to_dict()
+        elif numeric_strategy == 'zero':
+            fill_values = dict.fromkeys(numeric_missing, 0)
+        elif numeric_strategy == 'special':
+            fill_values = dict.fromkeys(numeric_missing, special_value if special_value is not None else -999)
+        else:
+            fill_values = stats.medians[numeric_missing].to_dict()
 
         # Impute categorical columns
         for col in categorical_cols:
-            if df[col].isnull().sum() > 0:
+            if col in with_missing:
                 if categorical_strategy == 'mode':
-                    fill_value = df[col].mode()[0] if not df[col].mode().empty else 'Unknown'
+                    mode = df[col].mode()
+                    fill_values[col] = mode[0] if not mode.empty else 'Unknown'
                 else:
-                    fill_value = 'Unknown'
+                    fill_values[col] = 'Unknown'
 
-                df[col] = df[col].fillna(fill_value)
-
-        return df
+        if inplace:
+            # Block-wise fill of the existing arrays, no new column allocated
+            df.fillna(fill_values, inplace=True)
+            return df
+        return df.fillna(fill_values)
 
     def drop_high_missing_columns(
         self,
         df: pd.DataFrame,
-        threshold: float = 0.8
+        threshold: float = 0.8,
+        stats: Optional[ColumnStatistics] = None
     ) -> Tuple[pd.DataFrame, List[str]]:
         """
         Drop columns with missing values above threshold.
@@ -186,11 +224,15 @@ class DataPreprocessor:
         Args:
             df: Input DataFrame
             threshold: Maximum allowed missing ratio (default 0.8 = 80%)
+            stats: Precomputed column statistics (computed here if None)
 
         Returns:
             Tuple of (cleaned DataFrame, list of dropped columns)
         """
-        missing_pct = df.isnull().sum() / len(df)
+        if stats is None:
+            stats = compute_column_stats(df)
+
+        missing_pct = stats.missing_ratio.reindex(df.columns)
         cols_to_drop = missing_pct[missing_pct > threshold].index.tolist()
 
         if cols_to_drop:
@@ -204,7 +246,9 @@ class DataPreprocessor:
         df: pd.DataFrame,
         columns: Optional[List[str]] = None,
         lower_percentile: float = 0.01,
-        upper_percentile: float = 0.99
+        upper_percentile: float = 0.99,
+        stats: Optional[ColumnStatistics] = None,
+        inplace: bool = False
     ) -> pd.DataFrame:
         """
         Cap outliers using percentile-based clipping.
@@ -214,34 +258,46 @@ class DataPreprocessor:
             columns: List of columns to cap (if None, all numeric columns)
             lower_percentile: Lower percentile for capping
             upper_percentile: Upper percentile for capping
+            stats: Precomputed statistics holding both percentiles (computed here if None)
+            inplace: Modify df instead of a copy
 
         Returns:
             DataFrame with capped outliers
         """
-        df = df.copy()
-
         if columns is None:
             columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        columns = [c for c in columns if c in df.columns]
 
-        for col in columns:
-            if col in df.columns:
-                lower = df[col].quantile(lower_percentile)
-                upper = df[col].quantile(upper_percentile)
-                df[col] = df[col].clip(lower=lower, upper=upper)
+        if stats is None:
+            stats = compute_column_stats(df[columns], quantiles=[lower_percentile, upper_percentile])
 
-        return df
+        if not columns:
+            return df if inplace else df.copy()
+
+        bounds = stats.quantiles[columns]
+        if inplace:
+            for col in columns:
+                df[col] = df[col].clip(lower=bounds.at[lower_percentile, col], upper=bounds.at[upper_percentile, col])
+            return df
+
+        capped = df[columns].clip(
+            lower=bounds.loc[lower_percentile], upper=bounds.loc[upper_percentile], axis=1
+        )
+        return df.assign(**capped)
 
-    def optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+    def optimize_dtypes(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
         Optimize DataFrame memory usage by downcasting dtypes.
 
         Args:
             df: Input DataFrame
+            inplace: Modify df instead of a copy
 
         Returns:
             DataFrame with optimized dtypes
         """
-        df = df.copy()
+        if not inplace:
+            df = df.copy()
 
         initial_mem = df.memory_usage(deep=True).sum() / 1024**2
 
@@ -259,58 +315,573 @@ class DataPreprocessor:
         obj_cols = df.select_dtypes(include=['object']).columns
         for col in obj_cols:
             if df[col].nunique() / len(df) < 0.5:  # Less than 50% unique values
-                df[col] = df[col].astype('category')
+                df[col] = df[col].astype(pd.CategoricalDtype(self._categories(col, df[col].unique())))
 
         final_mem = df.memory_usage(deep=True).sum() / 1024**2
         print(f"  Memory optimization: {initial_mem:.1f} MB -> {final_mem:.1f} MB ({(1-final_mem/initial_mem)*100:.1f}% reduction)")
 
         return df
 
+    # =========================================================================
+    # FIT / TRANSFORM
+    # =========================================================================
+
+    def fit(
+        self,
+        df: pd.DataFrame,
+        drop_high_missing: bool = True,
+        missing_threshold: float = 0.7,
+        cap_outliers: bool = False,
+        lower_percentile: float = 0.01,
+        upper_percentile: float = 0.99
+    ) -> "DataPreprocessor":
+        """
+        Compute every preprocessing statistic once and store it in self.state.
+
+        The state holds the dropped columns, outlier bounds, fill values
+        (numeric medians, categorical modes) and the target dtypes, so that
+        transform() never recomputes a statistic from the data it receives.
+
+        Args:
+            df: Application DataFrame used as reference (usually application_train)
+            drop_high_missing: Whether to drop columns with high missing values
+            missing_threshold: Threshold for dropping columns
+            cap_outliers: Whether to cap outliers
+            lower_percentile: Lower percentile for capping
+            upper_percentile: Upper percentile for capping
+
+        Returns:
+            self
+        """
+        fixed = self.fix_anomalies(df)
+        stats = self._fit_state(
+            fixed,
+            drop_high_missing=drop_high_missing,
+            missing_threshold=missing_threshold,
+            cap_outliers=cap_outliers,
+            lower_percentile=lower_percentile,
+            upper_percentile=upper_percentile
+        )
+
+        # Target dtypes are decided on the imputed reference data
+        self._apply_state(fixed, nunique=stats.nunique)
+        return self
+
+    def _fit_state(
+        self,
+        df: pd.DataFrame,
+        drop_high_missing: bool,
+        missing_threshold: float,
+        cap_outliers: bool,
+        lower_percentile: float,
+        upper_percentile: float
+    ) -> ColumnStatistics:
+        """
+        Fit the state (except dtypes) on a DataFrame whose anomalies are already fixed.
+
+        Returns the column statistics, needed afterwards to fit the dtypes
+        (see _apply_state).
+        """
+        # One scan for every statistic below (null counts, cardinality, medians,
+        # quantiles); per-column statistics do not depend on the dropped columns
+        quantiles = [lower_percentile, upper_percentile] if cap_outliers else []
+        stats = compute_column_stats(df, quantiles=quantiles)
+
+        categorical_cols = [
+            c for c in df.columns
+            if df[c].dtype == object or pd.api.types.is_string_dtype(df[c].dtype)
+        ]
+
+        def mode_of(col):
+            mode = df[col].mode()
+            return mode[0] if not mode.empty else None
+
+        self._build_state(
+            stats,
+            columns=df.columns.tolist(),
+            categorical_cols=categorical_cols,
+            mode_of=mode_of,
+            drop_high_missing=drop_high_missing,
+            missing_threshold=missing_threshold,
+            cap_outliers=cap_outliers,
+            lower_percentile=lower_percentile,
+            upper_percentile=upper_percentile
+        )
+        return stats
+
+    def _build_state(
+        self,
+        stats: ColumnStatistics,
+        columns: List[str],
+        categorical_cols: List[str],
+        mode_of: Callable[[str], Optional[object]],
+        drop_high_missing: bool,
+        missing_threshold: float,
+        cap_outliers: bool,
+        lower_percentile: float,
+        upper_percentile: float
+    ) -> dict:
+        """Build the state (except dtypes) from column statistics, exact or sketched."""
+        # Columns above the missing threshold
+        drop_columns = []
+        if drop_high_missing and stats.n_rows > 0:
+            missing_pct = stats.missing_ratio
+            drop_columns = missing_pct[missing_pct > missing_threshold].index.tolist()
+            if drop_columns:
+                print(f"  Dropping {len(drop_columns)} columns with >{missing_threshold*100:.0f}% missing values")
+
+        # Column lists only: the frame itself is not copied
+        dropped = set(drop_columns)
+        columns = [c for c in columns if c not in dropped]
+        numeric_cols = [c for c in stats.medians.index if c not in dropped]
+        categorical_cols = [c for c in categorical_cols if c not in dropped]
+
+        # Outlier bounds (ID, target and binary columns are never capped)
+        cap_bounds = {}
+        if cap_outliers:
+            binary_cols = set(stats.nunique[stats.nunique <= 2].index)
+            exclude_cols = {'SK_ID_CURR', 'TARGET'} | binary_cols
+            cap_cols = [c for c in numeric_cols if c not in exclude_cols]
+            if cap_cols:
+                bounds = stats.quantiles[cap_cols]
+                cap_bounds = {
+                    col: [float(bounds.at[lower_percentile, col]), float(bounds.at[upper_percentile, col])]
+                    for col in cap_cols
+                }
+
+        # Fill values: percentile clipping leaves the median unchanged,
+        # so medians are taken on the uncapped data
+        null_counts = stats.null_counts
+        fill_values = {}
+        numeric_missing = [c for c in numeric_cols if null_counts[c] > 0]
+        if numeric_missing:
+            medians = stats.medians[numeric_missing]
+            fill_values.update({
+                col: (None if pd.isna(value) else float(value)) for col, value in medians.items()
+            })
+        for col in categorical_cols:
+            if null_counts[col] > 0:
+                mode = mode_of(col)
+                fill_values[col] = mode if mode is not None else 'Unknown'
+
+        self.state = {
+            'columns': columns,
+            'drop_columns': drop_columns,
+            'anomaly_indicator': 'DAYS_EMPLOYED_ANOMALY' in columns,
+            'cap_bounds': cap_bounds,
+            'fill_values': fill_values,
+            'dtypes': {},
+            'categories': {},
+        }
+
+        return self.state
+
+    def _column_dtype(self, col: str, series: pd.Series, n_distinct: Optional[int]) -> pd.Series:
+        """
+        Downcast an imputed reference column as optimize_dtypes() would,
+        and record the chosen dtype in the state.
+        """
+        if series.dtype == 'int64':
+            series = pd.to_numeric(series, downcast='integer')
+        elif series.dtype == 'float64':
+            series = pd.to_numeric(series, downcast='float')
+        elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            # An all-missing column is filled with a single value
+            n_distinct = max(int(n_distinct), 1) if n_distinct is not None else series.nunique()
+            if len(series) == 0 or n_distinct / len(series) >= 0.5:
+                return series
+            categories = self._categories(col, series.unique())
+            self.state['categories'][col] = categories
+            self.state['dtypes'][col] = 'category'
+            return series.astype(pd.CategoricalDtype(categories))
+        else:
+            return series
+
+        self.state['dtypes'][col] = str(series.dtype)
+        return series
+
+    def _categories(self, col: str, observed: Iterable) -> List:
+        """
+        Ordered categories of a column: registry order when the column is
+        registered (new values appended), sorted observed values otherwise.
+        """
+        if self.category_registry is not None and col in self.category_registry:
+            return self.category_registry.categories(col, observed)
+        return sorted(v for v in observed if pd.notna(v))
+
+    def _cast_column(self, col: str, series: pd.Series) -> pd.Series:
+        """Cast a column to its fitted dtype."""
+        target = self.state['dtypes'][col]
+
+        if target == 'category':
+            return series.astype(pd.CategoricalDtype(self.state['categories'][col]))
+
+        # Integer downcasts are only applied when the new values still fit
+        if target.startswith(('int', 'uint')):
+            info = np.iinfo(target)
+            if series.isnull().any() or series.min() < info.min or series.max() > info.max:
+                return series
+
+        return series.astype(target)
+
+    def _apply_state(self, df: pd.DataFrame, nunique: Optional[pd.Series] = None) -> pd.DataFrame:
+        """
+        Apply the fitted state to a DataFrame owned by the caller, in place.
+
+        Each column is clipped, filled and cast in one go and replaced once,
+        so the frame is never copied as a whole. When fitting (`nunique`
+        given), the dtype of each column is chosen on its imputed values and
+        stored in the state.
+        """
+        state = self.state
+        fitted = set(state['columns'])
+        fitting = nunique is not None
+        if fitting:
+            state['dtypes'], state['categories'] = {}, {}
+
+        if state['anomaly_indicator'] and 'DAYS_EMPLOYED_ANOMALY' not in df.columns:
+            df['DAYS_EMPLOYED_ANOMALY'] = 0
+
+        # del (unlike drop) releases columns without rebuilding the other blocks
+        for col in [c for c in df.columns if c not in fitted]:
+            del df[col]
+
+        # Fitted column order; columns absent from the input (e.g. TARGET) are skipped
+        order = [c for c in state['columns'] if c in df.columns]
+        if list(df.columns) != order:
+            df = df[order]
+
+        bounds = state['cap_bounds']
+        fill_values = state['fill_values']
+
+        for col in order:
+            series = original = df[col]
+            if col in bounds:
+                series = series.clip(lower=bounds[col][0], upper=bounds[col][1])
+            if fill_values.get(col) is not None:
+                series = series.fillna(fill_values[col])
+            if fitting:
+                series = self._column_dtype(col, series, nunique.get(col))
+            elif col in state['dtypes']:
+                series = self._cast_column(col, series)
+            if series is not original:
+                df[col] = series
+
+        return df
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Apply the fitted state to new data in a single pass.
+
+        No statistic is recomputed: new applicants are cleaned with the
+        medians, modes, bounds and dtypes of the reference data. Categorical
+        values unseen during fit become missing.
+
+        Args:
+            df: Application DataFrame (train, test or new applicants)
+            inplace: Modify df instead of a copy (pandas engine only; the
+                polars engine always returns a new frame)
+
+        Returns:
+            Preprocessed DataFrame
+        """
+        if self.state is None:
+            raise RuntimeError("Preprocessor is not fitted: call fit() or load_state() first")
+
+        if self.engine == 'polars':
+            return polars_engine.apply_state(df, self.state)
+
+        # After fix_anomalies the frame is ours (a copy unless inplace)
+        return self._apply_state(self.fix_anomalies(df, inplace=inplace))
+
+    def fit_transform(self, df: pd.DataFrame, **fit_params) -> pd.DataFrame:
+        """
+        Fit the preprocessing state on df and transform it.
+
+        Args:
+            df: Application DataFrame
+            **fit_params: Arguments passed to fit()
+
+        Returns:
+            Preprocessed DataFrame
+        """
+        return self.fit(df, **fit_params).transform(df)
+
+    def save_state(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Save the fitted state as JSON (next to label_encoders.pkl by default).
+
+        Args:
+            path: Output file (defaults to models/preprocessing_state.json)
+
+        Returns:
+            Path to saved file
+        """
+        if self.state is None:
+            raise RuntimeError("Preprocessor is not fitted: nothing to save")
+
+        output_path = Path(path) if path else self.state_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        print(f"  Preprocessing state saved to {output_path}")
+        return output_path
+
+    def load_state(self, path: Optional[Union[str, Path]] = None) -> dict:
+        """
+        Load a state saved by save_state().
+
+        Args:
+            path: State file (defaults to models/preprocessing_state.json)
+
+        Returns:
+            Loaded state
+        """
+        state_path = Path(path) if path else self.state_path
+        if not state_path.exists():
+            raise FileNotFoundError(f"Preprocessing state not found: {state_path}")
+
+        with open(state_path, 'r') as f:
+            self.state = json.load(f)
+        return self.state
+
+    # =========================================================================
+    # STREAMING (OUT-OF-CORE)
+    # =========================================================================
+
+    def iter_chunks(self, table_name: str, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Read a raw table chunk by chunk.
+
+        Args:
+            table_name: Name of the table to load
+            chunk_size: Rows per chunk (config value if None)
+
+        Yields:
+            DataFrame chunks
+        """
+        file_path = self.raw_path / f"{table_name}.csv"
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Data file not found: {file_path}")
+
+        yield from pd.read_csv(file_path, chunksize=chunk_size or self.chunk_size)
+
+    def fit_chunked(
+        self,
+        table_name: str = "application_train",
+        chunk_size: Optional[int] = None,
+        chunks: Optional[Iterable[pd.DataFrame]] = None,
+        drop_high_missing: bool = True,
+        missing_threshold: float = 0.7,
+        cap_outliers: bool = False,
+        lower_percentile: float = 0.01,
+        upper_percentile: float = 0.99
+    ) -> "DataPreprocessor":
+        """
+        Fit the preprocessing state in one streaming pass.
+
+        Memory is bounded by the chunk size and the sketch sizes. Compared
+        with fit() on the full table (see src/data/sketches.py):
+        - Dropped columns, counts and dtypes match exactly
+        - Medians and capping percentiles are within ~1.5% in rank (k=200)
+        - Categorical modes and categories match while a column has at most
+          1000 distinct values (otherwise the column stays a string column)
+
+        Args:
+            table_name: Raw table to read (ignored when chunks are given)
+            chunk_size: Rows per chunk (config value if None)
+            chunks: Iterable of DataFrame chunks (e.g. read_table_chunks)
+            drop_high_missing: Whether to drop columns with high missing values
+            missing_threshold: Threshold for dropping columns
+            cap_outliers: Whether to cap outliers
+            lower_percentile: Lower percentile for capping
+            upper_percentile: Upper percentile for capping
+
+        Returns:
+            self
+        """
+        if chunks is None:
+            chunks = self.iter_chunks(table_name, chunk_size)
+
+        sketch = StreamingStatistics(k=self.sketch_k)
+        for chunk in chunks:
+            chunk = self.fix_anomalies(chunk, inplace=True)
+            # Same columns in every chunk, anomalies or not
+            if 'DAYS_EMPLOYED' in chunk.columns and 'DAYS_EMPLOYED_ANOMALY' not in chunk.columns:
+                chunk['DAYS_EMPLOYED_ANOMALY'] = 0
+            sketch.update(chunk)
+
+        print(f"  Sketched {sketch.n_rows:,} rows, {len(sketch.columns)} columns")
+
+        # The in-memory path only creates the indicator when an anomaly exists
+        columns = list(sketch.columns)
+        if 'DAYS_EMPLOYED_ANOMALY' in columns and sketch.maxima['DAYS_EMPLOYED_ANOMALY'] <= 0:
+            columns.remove('DAYS_EMPLOYED_ANOMALY')
+
+        quantiles = [lower_percentile, upper_percentile] if cap_outliers else []
+        stats = sketch.to_column_statistics(quantiles=quantiles)
+
+        self._build_state(
+            stats,
+            columns=columns,
+            categorical_cols=[c for c in columns if not sketch.numeric[c]],
+            mode_of=sketch.mode,
+            drop_high_missing=drop_high_missing,
+            missing_threshold=missing_threshold,
+            cap_outliers=cap_outliers,
+            lower_percentile=lower_percentile,
+            upper_percentile=upper_percentile
+        )
+        self._fit_dtypes_from_sketch(sketch, stats)
+
+        return self
+
+    def _fit_dtypes_from_sketch(self, sketch: StreamingStatistics, stats: ColumnStatistics) -> None:
+        """Choose the dtypes optimize_dtypes() would pick, from sketched ranges."""
+        state = self.state
+
+        def float32_safe(value: float) -> bool:
+            with np.errstate(over='ignore'):
+                return abs(float(np.float32(value)) - value) <= FLOAT32_TOLERANCE
+
+        for col in state['columns']:
+            if sketch.numeric[col]:
+                # Values after capping and imputation: data, bounds and fill value
+                low, high = sketch.minima[col], sketch.maxima[col]
+                extra_values = []
+                if col in state['cap_bounds']:
+                    bound_low, bound_high = state['cap_bounds'][col]
+                    low, high = min(max(low, bound_low), bound_high), max(min(high, bound_high), bound_low)
+                    extra_values += [bound_low, bound_high]
+                fill = state['fill_values'].get(col)
+                if fill is not None:
+                    low, high = min(low, fill), max(high, fill)
+                    extra_values.append(fill)
+
+                if sketch.is_float[col]:
+                    safe = sketch.float32_safe[col] and all(float32_safe(v) for v in extra_values)
+                    state['dtypes'][col] = 'float32' if safe else 'float64'
+                else:
+                    for candidate in ('int8', 'int16', 'int32', 'int64'):
+                        info = np.iinfo(candidate)
+                        if info.min <= low and high <= info.max:
+                            state['dtypes'][col] = candidate
+                            break
+            else:
+                n_distinct = max(int(stats.nunique[col]), 1)
+                frequent = sketch.frequent[col]
+                if n_distinct / sketch.n_rows < 0.5 and frequent.exact:
+                    categories = set(frequent.counts)
+                    if state['fill_values'].get(col) is not None:
+                        categories.add(state['fill_values'][col])
+                    state['dtypes'][col] = 'category'
+                    state['categories'][col] = self._categories(col, categories)
+
+    def transform_to_parquet(
+        self,
+        table_name: str = "application_train",
+        output_dir: Optional[Union[str, Path]] = None,
+        chunk_size: Optional[int] = None,
+        chunks: Optional[Iterable[pd.DataFrame]] = None
+    ) -> Path:
+        """
+        Transform a table chunk by chunk into a partitioned Parquet dataset.
+
+        Each chunk is written as one part file (part-00000.parquet, ...), so
+        memory is bounded by the chunk size.
+
+        Args:
+            table_name: Raw table to read (ignored when chunks are given)
+            output_dir: Dataset directory (data/processed/<table>_processed if None)
+            chunk_size: Rows per chunk (config value if None)
+            chunks: Iterable of DataFrame chunks
+
+        Returns:
+            Path to the dataset directory
+        """
+        if self.state is None:
+            raise RuntimeError("Preprocessor is not fitted: call fit_chunked() or load_state() first")
+
+        if chunks is None:
+            chunks = self.iter_chunks(table_name, chunk_size)
+
+        output_dir = Path(output_dir) if output_dir else self.processed_path / f"{table_name}_processed"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for old_part in output_dir.glob("part-*.parquet"):
+            old_part.unlink()
+
+        rows = 0
+        parts = 0
+        for chunk in chunks:
+            chunk = self.transform(chunk, inplace=True)
+            chunk.to_parquet(output_dir / f"part-{parts:05d}.parquet", index=False)
+            rows += len(chunk)
+            parts += 1
+
+        print(f"  Wrote {rows:,} rows in {parts} parts to {output_dir}")
+        return output_dir
+
     def preprocess_application(
         self,
         df: pd.DataFrame,
         drop_high_missing: bool = True,
         missing_threshold: float = 0.7,
-        cap_outliers: bool = False
+        cap_outliers: bool = False,
+        inplace: bool = False,
+        track_memory: bool = False
     ) -> pd.DataFrame:
         """
         Full preprocessing pipeline for application data.
 
+        Fits the preprocessing state on df, then applies it (see fit / transform).
+        The frame is copied at most once (never with inplace=True); every
+        later step mutates that working frame column by column.
+
         Args:
             df: Application DataFrame (train or test)
             drop_high_missing: Whether to drop columns with high missing values
             missing_threshold: Threshold for dropping columns
             cap_outliers: Whether to cap outliers
+            inplace: Take ownership of df and modify it instead of a copy
+            track_memory: Report start / peak / end RSS of every step
 
         Returns:
             Preprocessed DataFrame
         """
         print("Preprocessing application data...")
+        tracker = MemoryTracker(enabled=track_memory)
+
+        # Step 1: Fix anomalies (the only copy, unless inplace)
+        with tracker.step("fix_anomalies"):
+            df = self.fix_anomalies(df, inplace=inplace)
+
+        # Step 2: Fit statistics (dropped columns, bounds, fill values)
+        with tracker.step("fit_statistics"):
+            stats = self._fit_state(
+                df,
+                drop_high_missing=drop_high_missing,
+                missing_threshold=missing_threshold,
+                cap_outliers=cap_outliers,
+                lower_percentile=0.01,
+                upper_percentile=0.99
+            )
 
-        # Step 1: Fix anomalies
-        df = self.fix_anomalies(df)
-
-        # Step 2: Drop high missing columns (optional)
-        dropped_cols = []
-        if drop_high_missing:
-            df, dropped_cols = self.drop_high_missing_columns(df, threshold=missing_threshold)
-
-        # Step 3: Cap outliers (optional)
-        if cap_outliers:
-            # Don't cap ID columns or binary columns
-            exclude_cols = ['SK_ID_CURR', 'TARGET'] + [c for c in df.columns if df[c].nunique() <= 2]
-            numeric_cols = [c for c in df.select_dtypes(include=[np.number]).columns if c not in exclude_cols]
-            df = self.cap_outliers(df, columns=numeric_cols)
+        initial_mem = df.memory_usage(deep=True).sum() / 1024**2
 
-        # Step 4: Impute missing values
-        df = self.impute_missing_values(df)
+        # Step 3: Drop, cap, impute and downcast, column by column
+        with tracker.step("apply_state"):
+            df = self._apply_state(df, nunique=stats.nunique)
 
-        # Step 5: Optimize dtypes
-        df = self.optimize_dtypes(df)
+        final_mem = df.memory_usage(deep=True).sum() / 1024**2
+        print(f"  Memory optimization: {initial_mem:.1f} MB -> {final_mem:.1f} MB ({(1-final_mem/initial_mem)*100:.1f}% reduction)")
 
         # Store statistics
-        self.stats['dropped_columns'] = dropped_cols
+        self.stats['dropped_columns'] = self.state['drop_columns']
         self.stats['final_shape'] = df.shape
+        if track_memory:
+            self.stats['memory_steps'] = tracker.steps
+            tracker.report()
 
         print(f"  Final shape: {df.shape[0]:,} rows, {df.shape[1]} columns")
 
@@ -355,26 +926,74 @@ def preprocess_main_table(
     # Load data
     df = preprocessor.load_data("application_train")
 
-    # Preprocess
+    # Preprocess (the loaded frame is not reused: let the pipeline own it)
     df_processed = preprocessor.preprocess_application(
         df,
         drop_high_missing=True,
         missing_threshold=0.7,
-        cap_outliers=False  # We'll do this more carefully in feature engineering
+        cap_outliers=False,  # We'll do this more carefully in feature engineering
+        inplace=True,
+        track_memory=True
     )
 
     # Save
     preprocessor.save_processed_data(df_processed, "application_train_processed.csv")
+    preprocessor.save_state()
 
     return df_processed
 
 
+def preprocess_main_table_streaming(
+    config_path: str = "configs/config.yaml",
+    chunk_size: Optional[int] = None
+) -> Path:
+    """
+    Preprocess application_train without loading it in memory.
+
+    Two passes over the CSV: sketched statistics, then chunks transformed
+    to a partitioned Parquet dataset in data/processed.
+
+    Args:
+        config_path: Path to config file
+        chunk_size: Rows per chunk (config value if None)
+
+    Returns:
+        Path to the Parquet dataset directory
+    """
+    preprocessor = DataPreprocessor(config_path)
+
+    print("Pass 1/2: statistics...")
+    preprocessor.fit_chunked(
+        "application_train",
+        chunk_size=chunk_size,
+        drop_high_missing=True,
+        missing_threshold=0.7,
+        cap_outliers=False
+    )
+    preprocessor.save_state()
+
+    print("Pass 2/2: transform...")
+    return preprocessor.transform_to_parquet("application_train", chunk_size=chunk_size)
+
+
 if __name__ == "__main__":
     # Run preprocessing when script is executed directly
+    import argparse
     import os
     os.chdir(Path(__file__).parent.parent.parent)  # Change to project root
 
-    df = preprocess_main_table()
-    print("\nPreprocessing complete!")
-    print(f"Shape: {df.shape}")
-    print(f"Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+    parser = argparse.ArgumentParser(description="Preprocess application_train")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Out-of-core mode: chunked statistics and Parquet output")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows per chunk")
+    args = parser.parse_args()
+
+    if args.streaming:
+        output_dir = preprocess_main_table_streaming(chunk_size=args.chunk_size)
+        print("\nPreprocessing complete!")
+        print(f"Output: {output_dir}")
+    else:
+        df = preprocess_main_table()
+        print("\nPreprocessing complete!")
+        print(f"Shape: {df.shape}")
+        print(f"Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
@@ -0,0 +1,394 @@
+"""
+Prediction log retention for Credit Risk Scoring Project.
+
+credit_risk.predictions is partitioned by month on created_at
+(see scripts/init_db.sql). This module runs the periodic maintenance:
+- Pre-creates the partitions for the coming months, and moves rows the
+  DEFAULT partition caught while the job was not running into their own
+  monthly partition (reported, so gaps in the schedule are visible)
+- Detaches the partitions older than the retention window
+- Archives each detached partition to Parquet (year=/month= layout),
+  with a schema fixed by the table's column types (JSONB as JSON text),
+  so NULL-only chunks never decide a column's type
+- Drops the partition once the archive row count is verified
+
+Dropping a whole partition is a metadata operation, so retention never
+runs a large DELETE and never leaves bloat behind.
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+import math
+import re
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.utils.database import (
+    FLOAT_SQL_TYPES,
+    INTEGER_SQL_TYPES,
+    get_column_types,
+    get_engine,
+    get_stream_chunk_size,
+    read_table_chunks,
+)
+
+PARTITION_PATTERN = re.compile(r'^predictions_(\d{4})_(\d{2})$')
+
+# Used when config.yaml has no database.predictions section
+DEFAULT_RETENTION_CONFIG = {
+    'partition_months_ahead': 3,
+    'retention_months': 13,
+    'archive_path': 'data/archive/predictions',
+}
+
+
+def partition_month(partition_name: str) -> Optional[date]:
+    """
+    First day of the month stored in a monthly partition.
+
+    Args:
+        partition_name: Table name such as predictions_2026_10
+
+    Returns:
+        Month start date, or None for other tables (e.g. predictions_default)
+    """
+    match = PARTITION_PATTERN.match(partition_name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def retention_cutoff(today: date, retention_months: int) -> date:
+    """
+    First month kept by the retention policy.
+
+    Partitions for months strictly before the returned date are archived.
+
+    Args:
+        today: Reference date
+        retention_months: Number of months kept, current month included
+
+    Returns:
+        Month start date
+    """
+    months = today.year * 12 + (today.month - 1) - (retention_months - 1)
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def archive_schema(column_types: Dict[str, str]) -> pa.Schema:
+    """
+    Parquet schema of an archived partition, from its SQL column types.
+
+    Args:
+        column_types: Column -> information_schema data type (see get_column_types)
+
+    Returns:
+        Arrow schema (JSON columns as JSON text, unknown types as strings)
+    """
+    fields = []
+    for column, data_type in column_types.items():
+        if data_type in INTEGER_SQL_TYPES:
+            arrow_type = pa.int64()
+        elif data_type in FLOAT_SQL_TYPES:
+            arrow_type = pa.float64()
+        elif data_type == 'boolean':
+            arrow_type = pa.bool_()
+        elif data_type == 'timestamp with time zone':
+            arrow_type = pa.timestamp('us', tz='UTC')
+        elif data_type.startswith('timestamp'):
+            arrow_type = pa.timestamp('us')
+        elif data_type == 'date':
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column, arrow_type))
+    return pa.schema(fields)
+
+
+def _to_json_text(value):
+    """JSON text of a json/jsonb value (decoded by the driver), None kept."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return json.dumps(value, ensure_ascii=False)
+
+
+class PredictionRetention:
+    """
+    Maintains the monthly partitions of credit_risk.predictions.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml", engine: Optional[Engine] = None):
+        """
+        Initialize the retention job.
+
+        Args:
+            config_path: Path to configuration file
+            engine: Shared engine (get_engine() if None)
+        """
+        self.config = self._load_config(config_path)
+        self.engine = engine if engine is not None else get_engine(self.config)
+        self.schema = "credit_risk"
+        self.table_name = "predictions"
+
+        db_config = self.config.get('database', {})
+        self.settings = {**DEFAULT_RETENTION_CONFIG, **db_config.get('predictions', {})}
+        self.archive_path = Path(self.settings['archive_path'])
+        self.chunk_size = get_stream_chunk_size(self.config)
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    # =========================================================================
+    # PARTITIONS
+    # =========================================================================
+
+    def ensure_partitions(self, months_ahead: Optional[int] = None) -> List[str]:
+        """
+        Create the partitions for the current month and the next months.
+
+        Args:
+            months_ahead: Months created in advance (config value if None)
+
+        Returns:
+            Partition names (existing ones included)
+        """
+        if months_ahead is None:
+            months_ahead = int(self.settings['partition_months_ahead'])
+
+        query = text(f"SELECT {self.schema}.ensure_predictions_partitions(:months_ahead)")
+        with self.engine.begin() as conn:
+            return [row[0] for row in conn.execute(query, {'months_ahead': months_ahead})]
+
+    def default_partition_rows(self) -> int:
+        """Rows in predictions_default, i.e. outside every monthly partition (0 expected)."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(f'SELECT COUNT(*) FROM {self.schema}."{self.table_name}_default"')
+            ).scalar()
+
+    def list_partitions(self) -> Dict[str, bool]:
+        """
+        List the monthly prediction tables, attached or not.
+
+        A table detached by an interrupted run is still listed, so the next
+        run finishes archiving it.
+
+        Returns:
+            Dictionary mapping table name to True if attached to predictions
+        """
+        query = text("""
+            SELECT c.relname,
+                   EXISTS (
+                       SELECT 1 FROM pg_inherits i
+                       WHERE i.inhrelid = c.oid
+                         AND i.inhparent = to_regclass(:parent)
+                   ) AS attached
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = :schema
+              AND c.relkind = 'r'
+              AND c.relname LIKE 'predictions\\_%'
+            ORDER BY c.relname
+        """)
+        parent = f"{self.schema}.{self.table_name}"
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(query, {'schema': self.schema, 'parent': parent}).fetchall()
+
+        return {
+            name: attached for name, attached in rows
+            if partition_month(name) is not None
+        }
+
+    def detach_partition(self, partition_name: str) -> None:
+        """Detach a monthly partition from credit_risk.predictions."""
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                f'ALTER TABLE {self.schema}.{self.table_name} '
+                f'DETACH PARTITION {self.schema}."{partition_name}"'
+            ))
+
+    def drop_partition(self, partition_name: str) -> None:
+        """Drop a detached partition."""
+        with self.engine.begin() as conn:
+            conn.execute(text(f'DROP TABLE IF EXISTS {self.schema}."{partition_name}"'))
+
+    # =========================================================================
+    # ARCHIVING
+    # =========================================================================
+
+    def archive_file(self, partition_name: str) -> Path:
+        """Parquet file holding an archived partition."""
+        month = partition_month(partition_name)
+        return (
+            self.archive_path
+            / f"year={month.year}"
+            / f"month={month.month:02d}"
+            / f"{partition_name}.parquet"
+        )
+
+    def export_partition(self, partition_name: str) -> int:
+        """
+        Write a detached partition to Parquet, streaming it chunk by chunk.
+
+        The file is written under a temporary name and renamed only once its
+        row count matches the table. Columns keep the type of the table in
+        every chunk (see archive_schema); JSON values are stored as text.
+
+        Args:
+            partition_name: Detached partition to export
+
+        Returns:
+            Number of rows archived
+        """
+        output_file = self.archive_file(partition_name)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = output_file.with_suffix('.parquet.tmp')
+
+        column_types = get_column_types(self.engine, partition_name, self.schema)
+        schema = archive_schema(column_types)
+        json_columns = [c for c, data_type in column_types.items() if data_type in ('json', 'jsonb')]
+
+        writer = None
+        rows = 0
+        try:
+            for chunk in read_table_chunks(
+                self.engine, partition_name, schema=self.schema, chunk_size=self.chunk_size
+            ):
+                for column in json_columns:
+                    chunk[column] = chunk[column].map(_to_json_text)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_file, schema, compression='zstd')
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        with self.engine.connect() as conn:
+            expected = conn.execute(
+                text(f'SELECT COUNT(*) FROM {self.schema}."{partition_name}"')
+            ).scalar()
+
+        written = pq.ParquetFile(tmp_file).metadata.num_rows if writer is not None else 0
+        if written != expected:
+            tmp_file.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"Archive of {partition_name} has {written:,} rows, expected {expected:,}"
+            )
+
+        if writer is not None:
+            tmp_file.replace(output_file)
+        return rows
+
+    def archive_partition(self, partition_name: str) -> int:
+        """
+        Detach, export and drop one monthly partition.
+
+        Args:
+            partition_name: Partition to archive
+
+        Returns:
+            Number of rows archived
+        """
+        start_time = time.time()
+
+        if self.list_partitions().get(partition_name, False):
+            self.detach_partition(partition_name)
+
+        rows = self.export_partition(partition_name)
+        self.drop_partition(partition_name)
+
+        print(f"  {partition_name}: {rows:,} rows archived in {time.time() - start_time:.1f}s")
+        return rows
+
+    def apply_retention(
+        self,
+        retention_months: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> Dict[str, int]:
+        """
+        Archive every partition older than the retention window.
+
+        Args:
+            retention_months: Months kept in the database (config value if None)
+            today: Reference date (defaults to today)
+
+        Returns:
+            Dictionary with archived partition names and row counts
+        """
+        if retention_months is None:
+            retention_months = int(self.settings['retention_months'])
+        cutoff = retention_cutoff(today or date.today(), retention_months)
+
+        expired = [
+            name for name in self.list_partitions()
+            if partition_month(name) < cutoff
+        ]
+        if not expired:
+            print(f"  No partition older than {cutoff:%Y-%m}")
+            return {}
+
+        return {name: self.archive_partition(name) for name in expired}
+
+
+def run_prediction_retention(retention_months: Optional[int] = None, dry_run: bool = False):
+    """Main function to maintain the prediction log partitions."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Prediction Log Retention")
+    print("=" * 60)
+
+    retention = PredictionRetention()
+
+    print("\nCreating upcoming partitions...")
+    partitions = retention.ensure_partitions()
+    print(f"  {len(partitions)} partitions ready ({partitions[0]} .. {partitions[-1]})")
+    stranded = retention.default_partition_rows()
+    if stranded:
+        print(f"  WARNING: {stranded:,} rows still in {retention.table_name}_default "
+              f"(created_at outside every partition)")
+
+    print("\nApplying retention...")
+    if dry_run:
+        months = retention_months or int(retention.settings['retention_months'])
+        cutoff = retention_cutoff(date.today(), months)
+        expired = [n for n in retention.list_partitions() if partition_month(n) < cutoff]
+        print(f"  Would archive: {expired or 'nothing'}")
+        return {}
+
+    results = retention.apply_retention(retention_months)
+
+    print("\nRetention complete!")
+    return results
+
+
+if __name__ == "__main__":
+    import os
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Maintain credit_risk.predictions partitions")
+    parser.add_argument("--retention-months", type=int, default=None,
+                        help="Months kept in the database (config value by default)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List the partitions that would be archived")
+    args = parser.parse_args()
+
+    run_prediction_retention(retention_months=args.retention_months, dry_run=args.dry_run)
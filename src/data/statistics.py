@@ -0,0 +1,143 @@
+"""
+Column statistics for Credit Risk Scoring Project.
+
+This module computes, in one scan, the statistics every preprocessing
+step needs:
+- Null counts and cardinality
+- Medians and requested quantiles (pandas 'linear' interpolation)
+
+Numeric columns are processed as 2-D float64 blocks: each block is
+sorted once along the rows and every statistic is read from the sorted
+block, instead of one pandas pass per column and per statistic.
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Columns sorted together: bounds the float64 working copy to
+# n_rows x DEFAULT_BLOCK_SIZE values
+DEFAULT_BLOCK_SIZE = 32
+
+
+@dataclass
+class ColumnStatistics:
+    """
+    Statistics of a DataFrame, shaped like the equivalent pandas calls.
+
+    Attributes:
+        n_rows: Number of rows scanned
+        null_counts: df.isnull().sum()
+        nunique: df.nunique() (missing values excluded)
+        medians: df[numeric].median()
+        quantiles: df[numeric].quantile(q), one row per requested quantile
+    """
+    n_rows: int
+    null_counts: pd.Series
+    nunique: pd.Series
+    medians: pd.Series
+    quantiles: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def missing_ratio(self) -> pd.Series:
+        """Share of missing values per column."""
+        if self.n_rows == 0:
+            return self.null_counts.astype(float)
+        return self.null_counts / self.n_rows
+
+
+def _sorted_block_stats(values: np.ndarray, quantiles: Sequence[float]):
+    """
+    Statistics of a 2-D float block, computed from one in-place sort.
+
+    NaN sort last, so the first `count` rows of each column are its values.
+    """
+    n_rows, n_cols = values.shape
+    null_counts = np.isnan(values).sum(axis=0)
+    counts = n_rows - null_counts
+
+    values.sort(axis=0)
+
+    # Distinct values: 1 + number of changes between consecutive valid rows
+    if n_rows > 1:
+        changes = values[1:] != values[:-1]
+        valid_pairs = np.arange(1, n_rows)[:, None] < counts[None, :]
+        nunique = (changes & valid_pairs).sum(axis=0) + (counts > 0)
+    else:
+        nunique = (counts > 0).astype(np.int64)
+
+    def quantile(q: float) -> np.ndarray:
+        position = (counts - 1).clip(min=0) * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, (counts - 1).clip(min=0))
+        columns = np.arange(n_cols)
+        low_values = values[lower, columns]
+        high_values = values[upper, columns]
+        result = low_values + (position - lower) * (high_values - low_values)
+        # Equal neighbours: avoid inf - inf
+        result = np.where(low_values == high_values, low_values, result)
+        return np.where(counts > 0, result, np.nan)
+
+    medians = quantile(0.5)
+    quantile_values = [quantile(q) for q in quantiles]
+
+    return null_counts, nunique, medians, quantile_values
+
+
+def compute_column_stats(
+    df: pd.DataFrame,
+    quantiles: Iterable[float] = (),
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> ColumnStatistics:
+    """
+    Compute null counts, cardinality, medians and quantiles in one scan.
+
+    Args:
+        df: Input DataFrame
+        quantiles: Quantiles to compute for numeric columns (e.g. [0.01, 0.99])
+        block_size: Numeric columns converted and sorted at once
+
+    Returns:
+        ColumnStatistics (medians and quantiles cover numeric columns only)
+    """
+    quantiles = list(quantiles)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    numeric_set = set(numeric_cols)
+    other_cols = [c for c in df.columns if c not in numeric_set]
+
+    null_counts = {}
+    nunique = {}
+    medians = {}
+    quantile_rows: List[dict] = [{} for _ in quantiles]
+
+    for start in range(0, len(numeric_cols), block_size):
+        block_cols = numeric_cols[start:start + block_size]
+        values = df[block_cols].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        block_nulls, block_nunique, block_medians, block_quantiles = _sorted_block_stats(values, quantiles)
+        del values
+
+        for i, col in enumerate(block_cols):
+            null_counts[col] = int(block_nulls[i])
+            nunique[col] = int(block_nunique[i])
+            medians[col] = block_medians[i]
+            for row, q_values in zip(quantile_rows, block_quantiles):
+                row[col] = q_values[i]
+
+    # Non-numeric columns (strings, categories): counted by pandas
+    if other_cols:
+        others = df[other_cols]
+        null_counts.update(others.isnull().sum().to_dict())
+        nunique.update(others.nunique().to_dict())
+
+    return ColumnStatistics(
+        n_rows=len(df),
+        null_counts=pd.Series(null_counts, dtype='int64').reindex(df.columns),
+        nunique=pd.Series(nunique, dtype='int64').reindex(df.columns),
+        medians=pd.Series(medians, index=numeric_cols, dtype='float64'),
+        quantiles=pd.DataFrame(quantile_rows, index=quantiles, columns=numeric_cols, dtype='float64'),
+    )
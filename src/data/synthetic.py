@@ -0,0 +1,738 @@
+"""
+Synthetic data generator for Credit Risk Scoring Project.
+
+This module writes the eight Home Credit tables of configs/config.yaml
+without the Kaggle download, so ingestion, feature engineering and
+training can be run and benchmarked offline:
+- Same file names, column names and column order as the competition
+  CSVs, with similar category frequencies and null rates (building
+  columns, EXT_SOURCE_1/3, OCCUPATION_TYPE...)
+- Key relationships: application_train / application_test clients
+  (disjoint SK_ID_CURR), bureau (SK_ID_BUREAU) and bureau_balance,
+  previous_application (SK_ID_PREV) and its POS_CASH_balance,
+  installments_payments and credit_card_balance rows
+- Known anomalies: DAYS_EMPLOYED = 365243 for pensioners and the
+  365243 placeholders of the previous_application DAYS_* columns
+- A latent risk per client drives TARGET (~8% defaults), the external
+  scores, overdue bureau credits, refusals and late payments, so the
+  model has signal in every table
+- Scale factor relative to the full dataset (1.0 = 307,511 + 48,744
+  clients, ~58M rows in total); clients are generated in fixed-size
+  chunks, each from its own seeded generator (vectorized numpy), and
+  streamed to CSV, so the output depends only on seed and chunk size
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import yaml
+
+# Used when config.yaml has no data.synthetic section
+DEFAULT_SYNTHETIC_CONFIG = {
+    'scale': 0.1,
+    'seed': 42,
+    'chunk_clients': 10000,
+}
+
+# Clients of the full dataset (scale 1.0)
+FULL_TRAIN_CLIENTS = 307511
+FULL_TEST_CLIENTS = 48744
+
+FIRST_CLIENT_ID = 100001
+FIRST_BUREAU_ID = 5000000
+FIRST_PREV_ID = 1000000
+
+DAYS_ANOMALY = 365243
+
+# Logistic intercept of the latent risk: ~8% defaults, as in application_train
+TARGET_INTERCEPT = -2.95
+
+# =============================================================================
+# CATEGORIES (value -> frequency in the competition data, approximately)
+# =============================================================================
+
+INCOME_TYPES = {
+    'Working': 0.516, 'Commercial associate': 0.233, 'Pensioner': 0.180, 'State servant': 0.0706,
+    'Unemployed': 0.0001, 'Student': 0.0001, 'Businessman': 0.00003, 'Maternity leave': 0.00002,
+}
+EDUCATION_TYPES = {
+    'Secondary / secondary special': 0.710, 'Higher education': 0.243, 'Incomplete higher': 0.033,
+    'Lower secondary': 0.012, 'Academic degree': 0.0005,
+}
+FAMILY_STATUSES = {
+    'Married': 0.639, 'Single / not married': 0.148, 'Civil marriage': 0.097, 'Separated': 0.064,
+    'Widow': 0.052, 'Unknown': 0.00001,
+}
+HOUSING_TYPES = {
+    'House / apartment': 0.887, 'With parents': 0.048, 'Municipal apartment': 0.036,
+    'Rented apartment': 0.016, 'Office apartment': 0.009, 'Co-op apartment': 0.004,
+}
+TYPE_SUITES = {
+    'Unaccompanied': 0.81, 'Family': 0.131, 'Spouse, partner': 0.037, 'Children': 0.011,
+    'Other_B': 0.006, 'Other_A': 0.003, 'Group of people': 0.001,
+}
+OCCUPATION_TYPES = {
+    'Laborers': 0.26, 'Sales staff': 0.152, 'Core staff': 0.131, 'Managers': 0.101, 'Drivers': 0.088,
+    'High skill tech staff': 0.054, 'Accountants': 0.046, 'Medicine staff': 0.040, 'Security staff': 0.032,
+    'Cooking staff': 0.028, 'Cleaning staff': 0.022, 'Private service staff': 0.013,
+    'Low-skill Laborers': 0.010, 'Waiters/barmen staff': 0.006, 'Secretaries': 0.006,
+    'Realty agents': 0.004, 'HR staff': 0.003, 'IT staff': 0.003,
+}
+ORGANIZATION_TYPES = {
+    'Business Entity Type 3': 0.270, 'Self-employed': 0.152, 'Other': 0.066, 'Medicine': 0.045,
+    'Business Entity Type 2': 0.042, 'Government': 0.042, 'School': 0.035, 'Trade: type 7': 0.031,
+    'Kindergarten': 0.027, 'Construction': 0.027, 'Business Entity Type 1': 0.024,
+    'Transport: type 4': 0.021, 'Trade: type 3': 0.014, 'Industry: type 9': 0.013,
+    'Industry: type 3': 0.013, 'Security': 0.013, 'Housing': 0.012, 'Industry: type 11': 0.011,
+    'Military': 0.011, 'Bank': 0.010, 'Agriculture': 0.010, 'Police': 0.009, 'Transport: type 2': 0.009,
+    'Postal': 0.009, 'Security Ministries': 0.008, 'Trade: type 2': 0.008, 'Restaurant': 0.007,
+    'Services': 0.006, 'University': 0.005, 'Industry: type 7': 0.005, 'Transport: type 3': 0.005,
+    'Industry: type 1': 0.004, 'Hotel': 0.004, 'Electricity': 0.004, 'Industry: type 4': 0.003,
+    'Trade: type 6': 0.003, 'Industry: type 5': 0.002, 'Insurance': 0.002, 'Telecom': 0.002,
+    'Emergency': 0.002, 'Industry: type 2': 0.002, 'Advertising': 0.002, 'Realtor': 0.002,
+    'Culture': 0.001, 'Industry: type 12': 0.001, 'Trade: type 1': 0.001, 'Mobile': 0.001,
+    'Legal Services': 0.001, 'Cleaning': 0.001, 'Transport: type 1': 0.001, 'Industry: type 6': 0.0004,
+    'Industry: type 10': 0.0004, 'Religion': 0.0003, 'Industry: type 13': 0.0002,
+    'Trade: type 4': 0.0002, 'Trade: type 5': 0.0002, 'Industry: type 8': 0.0001,
+}
+WEEKDAYS = {
+    'TUESDAY': 0.175, 'WEDNESDAY': 0.169, 'MONDAY': 0.165, 'THURSDAY': 0.165, 'FRIDAY': 0.164,
+    'SATURDAY': 0.110, 'SUNDAY': 0.053,
+}
+FONDKAPREMONT = {
+    'reg oper account': 0.24, 'reg oper spec account': 0.039, 'org spec account': 0.018,
+    'not specified': 0.018,
+}
+HOUSE_TYPES = {'block of flats': 0.49, 'specific housing': 0.005, 'terraced house': 0.004}
+WALLS_MATERIALS = {
+    'Panel': 0.214, 'Stone, brick': 0.211, 'Block': 0.030, 'Wooden': 0.017, 'Mixed': 0.007,
+    'Monolithic': 0.006, 'Others': 0.005,
+}
+
+# Building columns (_AVG / _MODE / _MEDI) and their null rate
+BUILDING_COLUMNS = {
+    'APARTMENTS': 0.51, 'BASEMENTAREA': 0.585, 'YEARS_BEGINEXPLUATATION': 0.49, 'YEARS_BUILD': 0.665,
+    'COMMONAREA': 0.70, 'ELEVATORS': 0.53, 'ENTRANCES': 0.50, 'FLOORSMAX': 0.50, 'FLOORSMIN': 0.68,
+    'LANDAREA': 0.59, 'LIVINGAPARTMENTS': 0.68, 'LIVINGAREA': 0.50, 'NONLIVINGAPARTMENTS': 0.69,
+    'NONLIVINGAREA': 0.55,
+}
+BUILDING_SHARE = 0.51  # clients with any building information
+
+# FLAG_DOCUMENT_2 ... FLAG_DOCUMENT_21: share of clients providing each
+DOCUMENT_RATES = {
+    2: 0.00004, 3: 0.71, 4: 0.0001, 5: 0.015, 6: 0.088, 7: 0.0002, 8: 0.081, 9: 0.0039, 10: 0.00002,
+    11: 0.0039, 12: 0.00001, 13: 0.0035, 14: 0.0029, 15: 0.0012, 16: 0.0099, 17: 0.0003, 18: 0.0081,
+    19: 0.0006, 20: 0.0005, 21: 0.0003,
+}
+
+CREDIT_ACTIVE = {'Closed': 0.629, 'Active': 0.367, 'Sold': 0.004, 'Bad debt': 0.00001}
+CREDIT_CURRENCIES = {'currency 1': 0.9992, 'currency 2': 0.0007, 'currency 3': 0.0001, 'currency 4': 0.00001}
+CREDIT_TYPES = {
+    'Consumer credit': 0.729, 'Credit card': 0.234, 'Car loan': 0.016, 'Mortgage': 0.011,
+    'Microloan': 0.007, 'Loan for business development': 0.0012, 'Another type of loan': 0.0006,
+    'Unknown type of loan': 0.0003, 'Loan for working capital replenishment': 0.0003,
+}
+BUREAU_STATUSES = {'C': 0.50, '0': 0.274, 'X': 0.214, '1': 0.0089, '5': 0.0017, '2': 0.0009,
+                   '3': 0.0003, '4': 0.0002}
+
+PREV_CONTRACT_TYPES = {'Cash loans': 0.447, 'Consumer loans': 0.436, 'Revolving loans': 0.116, 'XNA': 0.0002}
+PREV_STATUSES = {'Approved': 0.621, 'Canceled': 0.189, 'Refused': 0.174, 'Unused offer': 0.016}
+CASH_LOAN_PURPOSES = {
+    'XAP': 0.552, 'XNA': 0.407, 'Repairs': 0.014, 'Other': 0.009, 'Urgent needs': 0.005,
+    'Buying a used car': 0.0017, 'Building a house or an annex': 0.0016, 'Everyday expenses': 0.0014,
+    'Medicine': 0.0013, 'Payments on other loans': 0.0011, 'Education': 0.0009, 'Journey': 0.0007,
+    'Purchase of electronic equipment': 0.0006, 'Buying a new car': 0.0006, 'Wedding / gift / holiday': 0.0006,
+    'Buying a home': 0.0005, 'Car repairs': 0.0005, 'Furniture': 0.0004, 'Buying a holiday home / land': 0.0003,
+    'Business development': 0.0003, 'Gasification / water supply': 0.0002, 'Buying a garage': 0.0001,
+    'Hobby': 0.00003, 'Money for a third person': 0.00001, 'Refusal to name the goal': 0.00001,
+}
+PAYMENT_TYPES = {
+    'Cash through the bank': 0.619, 'XNA': 0.376, 'Non-cash from your account': 0.0049,
+    'Cashless from the account of the employer': 0.0006,
+}
+REJECT_REASONS = {  # of refused applications
+    'HC': 0.60, 'LIMIT': 0.19, 'SCO': 0.13, 'SCOFR': 0.044, 'XNA': 0.018, 'VERIF': 0.012, 'SYSTEM': 0.0025,
+}
+CLIENT_TYPES = {'Repeater': 0.737, 'New': 0.180, 'Refreshed': 0.081, 'XNA': 0.001}
+GOODS_CATEGORIES = {
+    'XNA': 0.569, 'Mobile': 0.134, 'Consumer Electronics': 0.073, 'Computers': 0.063, 'Audio/Video': 0.060,
+    'Furniture': 0.032, 'Photo / Cinema Equipment': 0.015, 'Construction Materials': 0.015,
+    'Clothing and Accessories': 0.014, 'Auto Accessories': 0.0044, 'Jewelry': 0.0038, 'Homewares': 0.0030,
+    'Medical Supplies': 0.0023, 'Vehicles': 0.0008, 'Sport and Leisure': 0.0018, 'Gardening': 0.0016,
+    'Other': 0.0016, 'Office Appliances': 0.0014, 'Tourism': 0.0010, 'Medicine': 0.0010,
+    'Direct Sales': 0.0003, 'Fitness': 0.0001, 'Additional Service': 0.0001, 'Education': 0.0001,
+    'Weapon': 0.00005, 'Insurance': 0.00004, 'Animals': 0.000001,
+}
+PORTFOLIOS = {'POS': 0.414, 'Cash': 0.276, 'XNA': 0.222, 'Cards': 0.087, 'Cars': 0.0003}
+PRODUCT_TYPES = {'XNA': 0.637, 'x-sell': 0.274, 'walk-in': 0.089}
+CHANNEL_TYPES = {
+    'Credit and cash offices': 0.431, 'Country-wide': 0.297, 'Stone': 0.127, 'Regional / Local': 0.065,
+    'Contact center': 0.043, 'AP+ (Cash loan)': 0.034, 'Channel of corporate sales': 0.0037,
+    'Car dealer': 0.0003,
+}
+SELLER_INDUSTRIES = {
+    'XNA': 0.512, 'Consumer electronics': 0.238, 'Connectivity': 0.165, 'Furniture': 0.035,
+    'Construction': 0.018, 'Clothing': 0.014, 'Industry': 0.012, 'Auto technology': 0.003,
+    'Jewelry': 0.0016, 'MLM partners': 0.0007, 'Tourism': 0.0003,
+}
+YIELD_GROUPS = {'XNA': 0.31, 'middle': 0.231, 'high': 0.211, 'low_normal': 0.192, 'low_action': 0.056}
+PRODUCT_COMBINATIONS = {
+    'Cash': 0.171, 'POS household with interest': 0.158, 'POS mobile with interest': 0.134,
+    'Cash X-Sell: middle': 0.086, 'Cash X-Sell: low': 0.078, 'Card Street': 0.068,
+    'POS industry with interest': 0.059, 'POS household without interest': 0.050, 'Card X-Sell': 0.048,
+    'Cash Street: high': 0.036, 'Cash X-Sell: high': 0.036, 'Cash Street: middle': 0.021,
+    'Cash Street: low': 0.020, 'POS mobile without interest': 0.014, 'POS other with interest': 0.014,
+    'POS industry without interest': 0.0076, 'POS others without interest': 0.0015,
+}
+POS_STATUSES = {'Active': 0.914, 'Signed': 0.009, 'Returned to the store': 0.0005, 'Demand': 0.0007,
+                'Approved': 0.0005}
+CARD_STATUSES = {'Active': 0.963, 'Completed': 0.033, 'Signed': 0.0029, 'Demand': 0.0004,
+                 'Sent proposal': 0.0001, 'Refused': 0.00001, 'Approved': 0.00001}
+CARD_LIMITS = np.array([0, 22500, 45000, 67500, 90000, 135000, 180000, 225000, 270000, 450000])
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _codes(rng: np.random.Generator, n: int, options: Dict[str, float]) -> np.ndarray:
+    """Category index of n draws (frequencies normalized)."""
+    p = np.fromiter(options.values(), dtype=np.float64)
+    return rng.choice(len(p), size=n, p=p / p.sum())
+
+
+def _strings(codes: np.ndarray, categories, mask: Optional[np.ndarray] = None) -> pa.Array:
+    """String column from category indexes (null where mask)."""
+    indices = pa.array(codes.astype(np.int32), mask=mask)
+    return pa.DictionaryArray.from_arrays(indices, pa.array(list(categories))).dictionary_decode()
+
+
+def _categorical(rng: np.random.Generator, n: int, options: Dict[str, float], null_rate: float = 0.0) -> pa.Array:
+    """String column drawn from options, with null_rate nulls."""
+    mask = rng.random(n) < null_rate if null_rate else None
+    return _strings(_codes(rng, n, options), options.keys(), mask)
+
+
+def _numeric(values: np.ndarray, mask: Optional[np.ndarray] = None) -> pa.Array:
+    """Numeric column (null where mask)."""
+    return pa.array(values, mask=mask) if mask is not None and mask.any() else pa.array(values)
+
+
+def _flag(rng: np.random.Generator, n: int, rate: float) -> np.ndarray:
+    return (rng.random(n) < rate).astype(np.int64)
+
+
+def _expand(rng: np.random.Generator, n_parents: int, share: float, mean: float,
+            cap: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Child rows of n_parents: none with probability 1 - share, else 1 + Poisson(mean - 1).
+
+    Returns:
+        (parent index of each child row, position of the row within its parent)
+    """
+    counts = np.where(rng.random(n_parents) < share, 1 + rng.poisson(mean - 1, n_parents), 0)
+    if cap is not None:
+        counts = np.minimum(counts, cap)
+    parent = np.repeat(np.arange(n_parents), counts)
+    starts = np.cumsum(counts) - counts
+    position = np.arange(len(parent)) - np.repeat(starts, counts)
+    return parent, position
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+def _round_to(values: np.ndarray, step: float) -> np.ndarray:
+    return np.round(values / step) * step
+
+
+# =============================================================================
+# TABLES
+# =============================================================================
+
+def application_table(rng: np.random.Generator, ids: np.ndarray, risk: np.ndarray,
+                      with_target: bool) -> pa.Table:
+    """application_train (with_target) or application_test rows of a set of clients."""
+    n = len(ids)
+    columns = {'SK_ID_CURR': pa.array(ids)}
+    if with_target:
+        columns['TARGET'] = pa.array((rng.random(n) < _sigmoid(TARGET_INTERCEPT + 1.1 * risk)).astype(np.int64))
+
+    revolving = rng.random(n) < 0.095
+    gender = _codes(rng, n, {'F': 0.658, 'M': 0.342, 'XNA': 0.00001})
+    own_car = rng.random(n) < 0.34
+    children = rng.choice(5, size=n, p=[0.70, 0.199, 0.087, 0.0125, 0.0015])
+
+    income = np.clip(_round_to(rng.lognormal(11.9, 0.5, n), 2250), 25650, 1.17e8)
+    credit = np.clip(_round_to(rng.lognormal(13.0, 0.6, n), 4500), 45000, 4050000)
+    credit = np.where(revolving, np.clip(_round_to(credit / 2, 22500), 45000, None), credit)
+    annuity = np.round(credit * rng.uniform(0.03, 0.09, n) * 2) / 2
+    goods = np.where(revolving, np.nan, _round_to(credit * rng.uniform(0.8, 1.0, n), 4500))
+
+    income_type = _codes(rng, n, INCOME_TYPES)
+    pensioner = np.isin(income_type, [list(INCOME_TYPES).index('Pensioner'), list(INCOME_TYPES).index('Unemployed')])
+    days_birth = -rng.integers(7489, 25229, n)
+    days_employed = -np.minimum(rng.exponential(2400, n).astype(np.int64), -days_birth - 6570)
+    days_employed = np.where(pensioner, DAYS_ANOMALY, days_employed)
+
+    family = _codes(rng, n, FAMILY_STATUSES)
+    couple = np.isin(family, [0, 2])  # Married, Civil marriage
+
+    columns.update({
+        'NAME_CONTRACT_TYPE': _strings(revolving.astype(int), ['Cash loans', 'Revolving loans']),
+        'CODE_GENDER': _strings(gender, ['F', 'M', 'XNA']),
+        'FLAG_OWN_CAR': _strings((~own_car).astype(int), ['Y', 'N']),
+        'FLAG_OWN_REALTY': _strings((rng.random(n) < 0.31).astype(int), ['Y', 'N']),
+        'CNT_CHILDREN': pa.array(children),
+        'AMT_INCOME_TOTAL': pa.array(income),
+        'AMT_CREDIT': pa.array(credit),
+        'AMT_ANNUITY': _numeric(annuity, rng.random(n) < 0.00004),
+        'AMT_GOODS_PRICE': _numeric(goods, np.isnan(goods)),
+        'NAME_TYPE_SUITE': _categorical(rng, n, TYPE_SUITES, 0.0042),
+        'NAME_INCOME_TYPE': _strings(income_type, INCOME_TYPES.keys()),
+        'NAME_EDUCATION_TYPE': _categorical(rng, n, EDUCATION_TYPES),
+        'NAME_FAMILY_STATUS': _strings(family, FAMILY_STATUSES.keys()),
+        'NAME_HOUSING_TYPE': _categorical(rng, n, HOUSING_TYPES),
+        'REGION_POPULATION_RELATIVE': pa.array(np.round(np.clip(rng.gamma(2.0, 0.01, n), 0.00029, 0.0725), 6)),
+        'DAYS_BIRTH': pa.array(days_birth),
+        'DAYS_EMPLOYED': pa.array(days_employed),
+        'DAYS_REGISTRATION': pa.array(-np.round(rng.uniform(0, 24672, n))),
+        'DAYS_ID_PUBLISH': pa.array(-rng.integers(0, 7197, n)),
+        'OWN_CAR_AGE': _numeric(np.clip(np.round(rng.gamma(2.0, 6.0, n)), 0, 91), ~own_car),
+        'FLAG_MOBIL': pa.array(np.ones(n, dtype=np.int64)),
+        'FLAG_EMP_PHONE': pa.array((~pensioner).astype(np.int64)),
+        'FLAG_WORK_PHONE': pa.array(_flag(rng, n, 0.2)),
+        'FLAG_CONT_MOBILE': pa.array(_flag(rng, n, 0.998)),
+        'FLAG_PHONE': pa.array(_flag(rng, n, 0.28)),
+        'FLAG_EMAIL': pa.array(_flag(rng, n, 0.057)),
+        'OCCUPATION_TYPE': _strings(_codes(rng, n, OCCUPATION_TYPES), OCCUPATION_TYPES.keys(),
+                                    pensioner | (rng.random(n) < 0.16)),
+        'CNT_FAM_MEMBERS': _numeric((children + 1 + couple).astype(np.float64), rng.random(n) < 0.00001),
+    })
+
+    rating = rng.choice([1, 2, 3], size=n, p=[0.105, 0.738, 0.157])
+    organization = _codes(rng, n, ORGANIZATION_TYPES)
+    columns.update({
+        'REGION_RATING_CLIENT': pa.array(rating),
+        'REGION_RATING_CLIENT_W_CITY': pa.array(np.where(rng.random(n) < 0.05, rng.choice([1, 2, 3], n), rating)),
+        'WEEKDAY_APPR_PROCESS_START': _categorical(rng, n, WEEKDAYS),
+        'HOUR_APPR_PROCESS_START': pa.array(np.clip(np.round(rng.normal(12, 3.3, n)), 0, 23).astype(np.int64)),
+        'REG_REGION_NOT_LIVE_REGION': pa.array(_flag(rng, n, 0.015)),
+        'REG_REGION_NOT_WORK_REGION': pa.array(_flag(rng, n, 0.05)),
+        'LIVE_REGION_NOT_WORK_REGION': pa.array(_flag(rng, n, 0.04)),
+        'REG_CITY_NOT_LIVE_CITY': pa.array(_flag(rng, n, 0.078)),
+        'REG_CITY_NOT_WORK_CITY': pa.array(_flag(rng, n, 0.23)),
+        'LIVE_CITY_NOT_WORK_CITY': pa.array(_flag(rng, n, 0.18)),
+        'ORGANIZATION_TYPE': _strings(np.where(pensioner, len(ORGANIZATION_TYPES), organization),
+                                      [*ORGANIZATION_TYPES, 'XNA']),
+    })
+
+    # External scores: lower for riskier clients
+    for name, null_rate, noise in (('EXT_SOURCE_1', 0.564, 0.9), ('EXT_SOURCE_2', 0.0021, 0.7),
+                                   ('EXT_SOURCE_3', 0.198, 0.8)):
+        score = _sigmoid(0.4 - 0.8 * risk + rng.normal(0, noise, n))
+        columns[name] = _numeric(np.round(score, 6), rng.random(n) < null_rate)
+
+    # Building information: one set per client, _MODE / _MEDI close to _AVG
+    has_building = rng.random(n) < BUILDING_SHARE
+    building = {}
+    for name, null_rate in BUILDING_COLUMNS.items():
+        if name == 'YEARS_BEGINEXPLUATATION':
+            values = np.clip(rng.normal(0.977, 0.02, n), 0, 1)
+        elif name == 'YEARS_BUILD':
+            values = np.clip(rng.normal(0.75, 0.11, n), 0, 1)
+        else:
+            values = rng.beta(1.2, 8.0, n)
+        missing = ~has_building | (rng.random(n) < (null_rate - (1 - BUILDING_SHARE)) / BUILDING_SHARE)
+        building[name] = (values, missing)
+    for suffix, spread in (('AVG', 0.0), ('MODE', 0.02), ('MEDI', 0.005)):
+        for name, (values, missing) in building.items():
+            shifted = np.clip(values + rng.normal(0, spread, n), 0, 1) if spread else values
+            columns[f"{name}_{suffix}"] = _numeric(np.round(shifted, 4), missing)
+
+    social_missing = rng.random(n) < 0.0033
+    obs_30 = rng.poisson(1.4, n).astype(np.float64)
+    def_30 = rng.binomial(obs_30.astype(np.int64), 0.1).astype(np.float64)
+    columns.update({
+        'FONDKAPREMONT_MODE': _categorical(rng, n, FONDKAPREMONT, 0.684),
+        'HOUSETYPE_MODE': _categorical(rng, n, HOUSE_TYPES, 0.502),
+        'TOTALAREA_MODE': _numeric(np.round(rng.beta(1.2, 8.0, n), 4), ~has_building | (rng.random(n) < 0.02)),
+        'WALLSMATERIAL_MODE': _categorical(rng, n, WALLS_MATERIALS, 0.509),
+        'EMERGENCYSTATE_MODE': _strings((rng.random(n) < 0.015).astype(int), ['No', 'Yes'], ~has_building),
+        'OBS_30_CNT_SOCIAL_CIRCLE': _numeric(obs_30, social_missing),
+        'DEF_30_CNT_SOCIAL_CIRCLE': _numeric(def_30, social_missing),
+        'OBS_60_CNT_SOCIAL_CIRCLE': _numeric(obs_30, social_missing),
+        'DEF_60_CNT_SOCIAL_CIRCLE': _numeric(np.minimum(def_30, rng.binomial(1, 0.7, n) * def_30), social_missing),
+        'DAYS_LAST_PHONE_CHANGE': pa.array(-np.round(np.clip(rng.exponential(960, n), 0, 4292))),
+    })
+    for number, rate in DOCUMENT_RATES.items():
+        columns[f"FLAG_DOCUMENT_{number}"] = pa.array(_flag(rng, n, rate))
+
+    bureau_missing = rng.random(n) < 0.135
+    for name, mean in (('HOUR', 0.0064), ('DAY', 0.007), ('WEEK', 0.034), ('MON', 0.267),
+                       ('QRT', 0.265), ('YEAR', 1.9)):
+        columns[f"AMT_REQ_CREDIT_BUREAU_{name}"] = _numeric(rng.poisson(mean, n).astype(np.float64), bureau_missing)
+
+    return pa.table(columns)
+
+
+def bureau_tables(rng: np.random.Generator, client_ids: np.ndarray, risk: np.ndarray,
+                  first_id: int) -> Tuple[pa.Table, pa.Table]:
+    """bureau credits of a set of clients and their bureau_balance months."""
+    client, _ = _expand(rng, len(client_ids), share=0.86, mean=5.6)
+    n = len(client)
+    bureau_ids = first_id + np.arange(n)
+    client_risk = risk[client]
+
+    active = _codes(rng, n, CREDIT_ACTIVE)
+    is_active = active == 1
+    credit_type = _codes(rng, n, CREDIT_TYPES)
+    days_credit = -rng.integers(1, 2923, n)
+    duration = rng.exponential(700, n).astype(np.int64)
+    enddate = days_credit + duration
+    enddate_fact = np.where(is_active, np.nan, np.minimum(days_credit + rng.exponential(500, n).astype(np.int64), 0))
+    amount = np.round(rng.lognormal(11.6, 1.2, n), 2)
+    overdue = rng.random(n) < 0.0025 * np.exp(client_risk)
+    debt = np.where(is_active, np.round(amount * rng.uniform(0, 1, n), 2), 0.0)
+
+    bureau = pa.table({
+        'SK_ID_CURR': pa.array(client_ids[client]),
+        'SK_ID_BUREAU': pa.array(bureau_ids),
+        'CREDIT_ACTIVE': _strings(active, CREDIT_ACTIVE.keys()),
+        'CREDIT_CURRENCY': _categorical(rng, n, CREDIT_CURRENCIES),
+        'DAYS_CREDIT': pa.array(days_credit),
+        'CREDIT_DAY_OVERDUE': pa.array(np.where(overdue, rng.exponential(100, n).astype(np.int64) + 1, 0)),
+        'DAYS_CREDIT_ENDDATE': _numeric(enddate.astype(np.float64), rng.random(n) < 0.06),
+        'DAYS_ENDDATE_FACT': _numeric(enddate_fact, np.isnan(enddate_fact) | (rng.random(n) < 0.005)),
+        'AMT_CREDIT_MAX_OVERDUE': _numeric(np.where(rng.random(n) < 0.15, np.round(rng.lognormal(8, 1.5, n), 2), 0.0),
+                                           rng.random(n) < 0.65),
+        'CNT_CREDIT_PROLONG': pa.array(np.where(rng.random(n) < 0.005, rng.integers(1, 3, n), 0)),
+        'AMT_CREDIT_SUM': _numeric(amount, rng.random(n) < 0.00001),
+        'AMT_CREDIT_SUM_DEBT': _numeric(debt, rng.random(n) < 0.15),
+        'AMT_CREDIT_SUM_LIMIT': _numeric(np.where(credit_type == 1, np.round(amount * rng.uniform(0, 0.5, n), 2), 0.0),
+                                         rng.random(n) < 0.34),
+        'AMT_CREDIT_SUM_OVERDUE': pa.array(np.where(overdue, np.round(amount * rng.uniform(0, 0.2, n), 2), 0.0)),
+        'CREDIT_TYPE': _strings(credit_type, CREDIT_TYPES.keys()),
+        'DAYS_CREDIT_UPDATE': pa.array(np.minimum(days_credit + rng.integers(0, 2922, n), 0)),
+        'AMT_ANNUITY': _numeric(np.round(rng.lognormal(9.5, 1.3, n), 2), rng.random(n) < 0.71),
+    })
+
+    # Monthly statuses of about half of the credits, most recent month first
+    credit, month = _expand(rng, n, share=0.47, mean=33, cap=-days_credit // 30 + 1)
+    late = rng.random(len(credit)) < 0.3 * overdue[credit]
+    statuses = np.where(late, rng.integers(3, 8, len(credit)), _codes(rng, len(credit), BUREAU_STATUSES))
+    balance = pa.table({
+        'SK_ID_BUREAU': pa.array(bureau_ids[credit]),
+        'MONTHS_BALANCE': pa.array(-month),
+        'STATUS': _strings(statuses, BUREAU_STATUSES.keys()),
+    })
+    return bureau, balance
+
+
+def previous_tables(rng: np.random.Generator, client_ids: np.ndarray, risk: np.ndarray,
+                    first_id: int) -> Dict[str, pa.Table]:
+    """previous_application rows of a set of clients and their monthly histories."""
+    client, _ = _expand(rng, len(client_ids), share=0.95, mean=4.9)
+    n = len(client)
+    prev_ids = first_id + np.arange(n)
+    client_risk = risk[client]
+
+    contract = _codes(rng, n, PREV_CONTRACT_TYPES)
+    # Refusals grow with the client's risk
+    status_p = np.fromiter(PREV_STATUSES.values(), dtype=np.float64)
+    refused = rng.random(n) < status_p[2] * np.exp(0.4 * client_risk - 0.08)
+    status = np.where(refused, 2, rng.choice([0, 1, 3], size=n, p=status_p[[0, 1, 3]] / status_p[[0, 1, 3]].sum()))
+    approved = status == 0
+    canceled = status == 1
+
+    application = np.where(canceled & (rng.random(n) < 0.8), 0.0, np.round(rng.lognormal(11.4, 1.1, n), 1))
+    credit = np.round(application * rng.uniform(0.9, 1.2, n), 1)
+    cnt_payment = rng.choice([6, 10, 12, 18, 24, 30, 36, 48, 60], size=n,
+                             p=[0.12, 0.16, 0.3, 0.08, 0.16, 0.04, 0.08, 0.03, 0.03]).astype(np.float64)
+    annuity = np.round(credit / cnt_payment * rng.uniform(1.05, 1.4, n), 3)
+    terms_missing = canceled | (application == 0) | (rng.random(n) < 0.02)
+    down_missing = rng.random(n) < 0.536
+    rate_down = np.round(rng.beta(0.6, 5.0, n), 6)
+    rate_missing = rng.random(n) < 0.9964
+    days_decision = -rng.integers(1, 2923, n)
+
+    reject = np.where(refused, _codes(rng, n, REJECT_REASONS) + 2, np.where(status == 3, 1, 0))
+
+    # Dates of approved loans, with the 365243 placeholders of the competition data
+    first_due = days_decision + rng.integers(0, 60, n)
+    last_due_1st = first_due + 30 * cnt_payment
+    terminated = rng.random(n) < 0.45
+    last_due = np.where(terminated, np.minimum(last_due_1st, -1), DAYS_ANOMALY)
+    termination = np.where(terminated & (rng.random(n) < 0.97), np.minimum(last_due + rng.integers(0, 10, n), -1),
+                           DAYS_ANOMALY)
+
+    def placeholder(values: np.ndarray, rate: float) -> np.ndarray:
+        return np.where(rng.random(n) < rate, DAYS_ANOMALY, values).astype(np.float64)
+
+    previous = pa.table({
+        'SK_ID_PREV': pa.array(prev_ids),
+        'SK_ID_CURR': pa.array(client_ids[client]),
+        'NAME_CONTRACT_TYPE': _strings(contract, PREV_CONTRACT_TYPES.keys()),
+        'AMT_ANNUITY': _numeric(annuity, terms_missing),
+        'AMT_APPLICATION': pa.array(application),
+        'AMT_CREDIT': _numeric(credit, rng.random(n) < 0.000001),
+        'AMT_DOWN_PAYMENT': _numeric(np.round(application * rate_down, 1), down_missing),
+        'AMT_GOODS_PRICE': _numeric(application, terms_missing),
+        'WEEKDAY_APPR_PROCESS_START': _categorical(rng, n, WEEKDAYS),
+        'HOUR_APPR_PROCESS_START': pa.array(np.clip(np.round(rng.normal(12.5, 3.3, n)), 0, 23).astype(np.int64)),
+        'FLAG_LAST_APPL_PER_CONTRACT': _strings((rng.random(n) < 0.005).astype(int), ['Y', 'N']),
+        'NFLAG_LAST_APPL_IN_DAY': pa.array(_flag(rng, n, 0.996)),
+        'RATE_DOWN_PAYMENT': _numeric(rate_down, down_missing),
+        'RATE_INTEREST_PRIMARY': _numeric(np.round(rng.uniform(0.03, 1.0, n), 6), rate_missing),
+        'RATE_INTEREST_PRIVILEGED': _numeric(np.round(rng.uniform(0.37, 1.0, n), 6), rate_missing),
+        'NAME_CASH_LOAN_PURPOSE': _categorical(rng, n, CASH_LOAN_PURPOSES),
+        'NAME_CONTRACT_STATUS': _strings(status, PREV_STATUSES.keys()),
+        'DAYS_DECISION': pa.array(days_decision),
+        'NAME_PAYMENT_TYPE': _categorical(rng, n, PAYMENT_TYPES),
+        'CODE_REJECT_REASON': _strings(reject, ['XAP', 'CLIENT', *REJECT_REASONS]),
+        'NAME_TYPE_SUITE': _categorical(rng, n, TYPE_SUITES, 0.491),
+        'NAME_CLIENT_TYPE': _categorical(rng, n, CLIENT_TYPES),
+        'NAME_GOODS_CATEGORY': _categorical(rng, n, GOODS_CATEGORIES),
+        'NAME_PORTFOLIO': _categorical(rng, n, PORTFOLIOS),
+        'NAME_PRODUCT_TYPE': _categorical(rng, n, PRODUCT_TYPES),
+        'CHANNEL_TYPE': _categorical(rng, n, CHANNEL_TYPES),
+        'SELLERPLACE_AREA': pa.array(np.where(rng.random(n) < 0.46, -1,
+                                              np.minimum(rng.lognormal(3.5, 1.5, n).astype(np.int64), 4000000))),
+        'NAME_SELLER_INDUSTRY': _categorical(rng, n, SELLER_INDUSTRIES),
+        'CNT_PAYMENT': _numeric(cnt_payment, terms_missing),
+        'NAME_YIELD_GROUP': _categorical(rng, n, YIELD_GROUPS),
+        'PRODUCT_COMBINATION': _categorical(rng, n, PRODUCT_COMBINATIONS, 0.0002),
+        'DAYS_FIRST_DRAWING': _numeric(placeholder(days_decision + rng.integers(0, 30, n), 0.96), ~approved),
+        'DAYS_FIRST_DUE': _numeric(placeholder(first_due, 0.025), ~approved),
+        'DAYS_LAST_DUE_1ST_VERSION': _numeric(placeholder(last_due_1st, 0.06), ~approved),
+        'DAYS_LAST_DUE': _numeric(last_due.astype(np.float64), ~approved),
+        'DAYS_TERMINATION': _numeric(termination.astype(np.float64), ~approved),
+        'NFLAG_INSURED_ON_APPROVAL': _numeric(_flag(rng, n, 0.33).astype(np.float64), ~approved),
+    })
+
+    # Monthly histories start at the decision and stop before the application month
+    months_available = -days_decision // 30
+    late_rate = 0.05 * np.exp(0.8 * client_risk)
+    tables = {'previous_application': previous}
+
+    loan, month = _expand(rng, n, share=0.56, mean=10.7, cap=months_available)
+    m = len(loan)
+    cnt_instalment = cnt_payment[loan]
+    future = np.maximum(cnt_instalment - month, 0)
+    dpd = np.where(rng.random(m) < late_rate[loan] * 0.5, rng.exponential(15, m).astype(np.int64) + 1, 0)
+    pos_status = np.where(future == 0, len(POS_STATUSES), _codes(rng, m, POS_STATUSES))
+    tables['POS_CASH_balance'] = pa.table({
+        'SK_ID_PREV': pa.array(prev_ids[loan]),
+        'SK_ID_CURR': pa.array(client_ids[client][loan]),
+        'MONTHS_BALANCE': pa.array(-months_available[loan] + month),
+        'CNT_INSTALMENT': _numeric(cnt_instalment, rng.random(m) < 0.0026),
+        'CNT_INSTALMENT_FUTURE': _numeric(future, rng.random(m) < 0.0026),
+        'NAME_CONTRACT_STATUS': _strings(pos_status, [*POS_STATUSES, 'Completed']),
+        'SK_DPD': pa.array(dpd),
+        'SK_DPD_DEF': pa.array(np.where(rng.random(m) < 0.5, dpd, 0)),
+    })
+
+    loan, number = _expand(rng, n, share=0.60, mean=13.6, cap=months_available)
+    m = len(loan)
+    days_instalment = (days_decision[loan] + 30 * (number + 1)).astype(np.float64)
+    late = rng.random(m) < late_rate[loan]
+    delay = np.where(late, rng.exponential(15, m) + 1, -rng.exponential(10, m))
+    instalment = np.where(np.isnan(annuity[loan]) | (annuity[loan] == 0),
+                          np.round(rng.lognormal(9.0, 1.0, m), 3), annuity[loan])
+    partial = rng.random(m) < 0.1 + 0.1 * late
+    payment_missing = rng.random(m) < 0.0002
+    tables['installments_payments'] = pa.table({
+        'SK_ID_PREV': pa.array(prev_ids[loan]),
+        'SK_ID_CURR': pa.array(client_ids[client][loan]),
+        'NUM_INSTALMENT_VERSION': pa.array(rng.choice([0.0, 1.0, 2.0], size=m, p=[0.25, 0.7, 0.05])),
+        'NUM_INSTALMENT_NUMBER': pa.array(number + 1),
+        'DAYS_INSTALMENT': pa.array(days_instalment),
+        'DAYS_ENTRY_PAYMENT': _numeric(np.round(days_instalment + delay), payment_missing),
+        'AMT_INSTALMENT': pa.array(instalment),
+        'AMT_PAYMENT': _numeric(np.round(np.where(partial, instalment * rng.uniform(0, 1, m), instalment), 3),
+                                payment_missing),
+    })
+
+    # Card histories of approved revolving loans
+    cards = (contract == 2) & approved
+    loan, month = _expand(rng, n, share=1.0, mean=37, cap=np.where(cards, months_available, 0))
+    m = len(loan)
+    limit = CARD_LIMITS[rng.integers(0, len(CARD_LIMITS), n)][loan].astype(np.float64)
+    utilization = np.clip(rng.beta(0.8, 1.5, m) * np.exp(0.3 * client_risk[loan]), 0, 1.2)
+    balance_amount = np.round(limit * utilization, 3)
+    drawing = rng.random(m) < 0.2
+    drawings = np.where(drawing, np.round(rng.lognormal(9.0, 1.2, m), 3), 0.0)
+    atm_share = rng.uniform(0, 1, m) * drawing
+    drawings_missing = rng.random(m) < 0.19
+    payment = np.round(np.where(balance_amount > 0, balance_amount * rng.uniform(0.03, 0.3, m), 0.0), 3)
+    dpd = np.where(rng.random(m) < late_rate[loan] * 0.3, rng.exponential(10, m).astype(np.int64) + 1, 0)
+    tables['credit_card_balance'] = pa.table({
+        'SK_ID_PREV': pa.array(prev_ids[loan]),
+        'SK_ID_CURR': pa.array(client_ids[client][loan]),
+        'MONTHS_BALANCE': pa.array(-months_available[loan] + month),
+        'AMT_BALANCE': pa.array(balance_amount),
+        'AMT_CREDIT_LIMIT_ACTUAL': pa.array(limit.astype(np.int64)),
+        'AMT_DRAWINGS_ATM_CURRENT': _numeric(np.round(drawings * atm_share, 3), drawings_missing),
+        'AMT_DRAWINGS_CURRENT': pa.array(drawings),
+        'AMT_DRAWINGS_OTHER_CURRENT': _numeric(np.zeros(m), drawings_missing),
+        'AMT_DRAWINGS_POS_CURRENT': _numeric(np.round(drawings * (1 - atm_share), 3), drawings_missing),
+        'AMT_INST_MIN_REGULARITY': _numeric(np.round(balance_amount * 0.05, 3), rng.random(m) < 0.08),
+        'AMT_PAYMENT_CURRENT': _numeric(payment, drawings_missing | (rng.random(m) < 0.01)),
+        'AMT_PAYMENT_TOTAL_CURRENT': pa.array(payment),
+        'AMT_RECEIVABLE_PRINCIPAL': pa.array(np.round(balance_amount * 0.95, 3)),
+        'AMT_RECIVABLE': pa.array(balance_amount),
+        'AMT_TOTAL_RECEIVABLE': pa.array(balance_amount),
+        'CNT_DRAWINGS_ATM_CURRENT': _numeric(drawing * (atm_share > 0.5).astype(np.float64), drawings_missing),
+        'CNT_DRAWINGS_CURRENT': pa.array(drawing * rng.integers(1, 6, m)),
+        'CNT_DRAWINGS_OTHER_CURRENT': _numeric(np.zeros(m), drawings_missing),
+        'CNT_DRAWINGS_POS_CURRENT': _numeric(drawing * (atm_share <= 0.5).astype(np.float64), drawings_missing),
+        'CNT_INSTALMENT_MATURE_CUM': _numeric(month.astype(np.float64), rng.random(m) < 0.08),
+        'NAME_CONTRACT_STATUS': _categorical(rng, m, CARD_STATUSES),
+        'SK_DPD': pa.array(dpd),
+        'SK_DPD_DEF': pa.array(np.where(rng.random(m) < 0.3, dpd, 0)),
+    })
+    return tables
+
+
+# =============================================================================
+# GENERATOR
+# =============================================================================
+
+class SyntheticDataGenerator:
+    """
+    Writes Home Credit-shaped CSVs for offline runs and benchmarks.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml"):
+        """
+        Initialize the generator.
+
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config = self._load_config(config_path)
+        data_config = self.config.get('data', {})
+        self.settings = {**DEFAULT_SYNTHETIC_CONFIG, **data_config.get('synthetic', {})}
+        self.raw_path = Path(self.config.get('paths', {}).get('data', {}).get('raw', 'data/raw'))
+        # Table name -> CSV file name, as in the Kaggle download
+        self.filenames = {table['name']: table['filename'] for table in data_config.get('tables', [])}
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    def generate(
+        self,
+        output_dir: Optional[Union[str, Path]] = None,
+        scale: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Write the eight tables.
+
+        Args:
+            output_dir: Output directory (paths.data.raw if None)
+            scale: Clients relative to the full dataset (1.0 = 356,255)
+            seed: Random seed
+
+        Returns:
+            Rows written per table
+        """
+        scale = float(scale if scale is not None else self.settings['scale'])
+        seed = int(seed if seed is not None else self.settings['seed'])
+        if scale <= 0:
+            raise ValueError(f"scale must be positive, got {scale}")
+        output_dir = Path(output_dir or self.raw_path)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        n_clients = max(2, round((FULL_TRAIN_CLIENTS + FULL_TEST_CLIENTS) * scale))
+        chunk_clients = int(self.settings['chunk_clients'])
+        test_share = FULL_TEST_CLIENTS / (FULL_TRAIN_CLIENTS + FULL_TEST_CLIENTS)
+        print(f"Generating {n_clients:,} clients (scale {scale}, seed {seed}) into {output_dir}...")
+
+        writers: Dict[str, pa_csv.CSVWriter] = {}
+        rows = {name: 0 for name in self.filenames}
+        next_bureau_id, next_prev_id = FIRST_BUREAU_ID, FIRST_PREV_ID
+        start_time = time.time()
+
+        def write(name: str, table: pa.Table) -> None:
+            if name not in writers:
+                path = output_dir / self.filenames.get(name, f"{name}.csv")
+                writers[name] = pa_csv.CSVWriter(path, table.schema)
+            writers[name].write_table(table)
+            rows[name] = rows.get(name, 0) + table.num_rows
+
+        try:
+            for chunk_index, first in enumerate(range(0, n_clients, chunk_clients)):
+                # One generator per chunk: the output only depends on seed and chunk size
+                rng = np.random.default_rng([seed, chunk_index])
+                ids = FIRST_CLIENT_ID + np.arange(first, min(first + chunk_clients, n_clients))
+                risk = rng.normal(0, 1, len(ids))
+                is_test = rng.random(len(ids)) < test_share
+
+                write('application_train', application_table(rng, ids[~is_test], risk[~is_test], True))
+                write('application_test', application_table(rng, ids[is_test], risk[is_test], False))
+
+                bureau, balance = bureau_tables(rng, ids, risk, next_bureau_id)
+                next_bureau_id += bureau.num_rows
+                write('bureau', bureau)
+                write('bureau_balance', balance)
+
+                previous = previous_tables(rng, ids, risk, next_prev_id)
+                next_prev_id += previous['previous_application'].num_rows
+                for name, table in previous.items():
+                    write(name, table)
+                print(f"  {ids[-1] - FIRST_CLIENT_ID + 1:,}/{n_clients:,} clients", end='\r')
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        elapsed = time.time() - start_time
+        total_rows = sum(rows.values())
+        size_mb = sum((output_dir / self.filenames.get(name, f"{name}.csv")).stat().st_size
+                      for name in writers) / 1024 ** 2
+        print(f"\n  {total_rows:,} rows, {size_mb:,.1f} MB in {elapsed:.1f}s "
+              f"({total_rows / max(elapsed, 1e-9):,.0f} rows/s)")
+        for name, count in rows.items():
+            print(f"  {name}: {count:,} rows")
+        return rows
+
+
+def run_synthetic_data(output_dir: Optional[str] = None, scale: Optional[float] = None,
+                       seed: Optional[int] = None) -> Dict[str, int]:
+    """Main function to generate the synthetic raw tables."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Synthetic Data")
+    print("=" * 60)
+
+    rows = SyntheticDataGenerator().generate(output_dir=output_dir, scale=scale, seed=seed)
+
+    print("\nSynthetic data complete!")
+    return rows
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Generate Home Credit-shaped CSVs (offline runs, benchmarks)")
+    parser.add_argument("--scale", type=float, default=None,
+                        help="Clients relative to the full dataset, e.g. 0.01 to 10 (config value by default)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (config value by default)")
+    parser.add_argument("--output-dir", default=None, help="Output directory (paths.data.raw by default)")
+    args = parser.parse_args()
+
+    run_synthetic_data(output_dir=args.output_dir, scale=args.scale, seed=args.seed)
@@ -0,0 +1,463 @@
+"""
+Aggregate summary tables for Credit Risk Scoring Project.
+
+This module keeps the per-client aggregates used by feature engineering
+(bureau, previous applications and, once ingested, installments, POS cash
+and credit card balances) as summary tables in PostgreSQL:
+- Full rebuild in a single transaction (readers keep the previous snapshot)
+- Incremental refresh of the clients touched since the last watermark
+- Watermarks stored in credit_risk.aggregate_watermarks
+- Stale summaries are never read: ingestion invalidates the summaries of
+  a table it reloads, and a summary behind its source (rows above the
+  watermark) falls back to the live GROUP BY until the next refresh
+
+Feature builds read the ready aggregates instead of rescanning the
+source tables with a full GROUP BY on every run.
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import yaml
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.utils.database import get_engine
+
+# =============================================================================
+# AGGREGATE DEFINITIONS
+# =============================================================================
+# source_table:     table aggregated per sk_id_curr
+# watermark_column: monotonically increasing key used for incremental refresh
+#                   (None = full rebuild only)
+# select:           aggregate expressions, grouped by sk_id_curr
+
+AGGREGATES: Dict[str, dict] = {
+    'bureau': {
+        'source_table': 'bureau',
+        'summary_table': 'agg_bureau',
+        'watermark_column': 'sk_id_bureau',
+        'select': """
+            sk_id_curr,
+            COUNT(*) as bureau_credit_count,
+            SUM(CASE WHEN credit_active = 'Active' THEN 1 ELSE 0 END) as bureau_active_count,
+            SUM(CASE WHEN credit_active = 'Closed' THEN 1 ELSE 0 END) as bureau_closed_count,
+            SUM(amt_credit_sum) as bureau_amt_credit_sum_total,
+            AVG(amt_credit_sum) as bureau_amt_credit_sum_mean,
+            MAX(amt_credit_sum) as bureau_amt_credit_sum_max,
+            SUM(amt_credit_sum_debt) as bureau_debt_sum,
+            AVG(amt_credit_sum_debt) as bureau_debt_mean,
+            SUM(amt_credit_sum_overdue) as bureau_overdue_sum,
+            MAX(amt_credit_sum_overdue) as bureau_overdue_max,
+            SUM(CASE WHEN amt_credit_sum_overdue > 0 THEN 1 ELSE 0 END) as bureau_overdue_count,
+            SUM(cnt_credit_prolong) as bureau_prolong_count,
+            AVG(days_credit) as bureau_days_credit_mean,
+            MIN(days_credit) as bureau_days_credit_min,
+            AVG(days_credit_enddate) as bureau_days_enddate_mean,
+            COUNT(DISTINCT credit_type) as bureau_credit_type_count
+        """,
+    },
+    'previous_application': {
+        'source_table': 'previous_application',
+        'summary_table': 'agg_previous_application',
+        'watermark_column': 'sk_id_prev',
+        'select': """
+            sk_id_curr,
+            COUNT(*) as prev_app_count,
+            SUM(CASE WHEN name_contract_status = 'Approved' THEN 1 ELSE 0 END) as prev_approved_count,
+            SUM(CASE WHEN name_contract_status = 'Refused' THEN 1 ELSE 0 END) as prev_refused_count,
+            SUM(CASE WHEN name_contract_status = 'Canceled' THEN 1 ELSE 0 END) as prev_canceled_count,
+            AVG(amt_application) as prev_amt_application_mean,
+            MAX(amt_application) as prev_amt_application_max,
+            AVG(amt_credit) as prev_amt_credit_mean,
+            SUM(amt_credit) as prev_amt_credit_sum,
+            AVG(amt_credit - amt_application) as prev_credit_app_diff_mean,
+            AVG(amt_annuity) as prev_amt_annuity_mean,
+            MAX(amt_annuity) as prev_amt_annuity_max,
+            AVG(amt_down_payment) as prev_down_payment_mean,
+            AVG(days_decision) as prev_days_decision_mean,
+            MIN(days_decision) as prev_days_decision_min,
+            COUNT(DISTINCT name_contract_type) as prev_contract_type_count,
+            COUNT(DISTINCT name_goods_category) as prev_goods_category_count
+        """,
+    },
+    # The three history tables below are read from CSV until they are ingested
+    # (load_csv_to_postgres with these table names)
+    'installments': {
+        'source_table': 'installments_payments',
+        'summary_table': 'agg_installments',
+        'watermark_column': None,
+        'select': """
+            sk_id_curr,
+            COUNT(sk_id_prev) as instal_count,
+            AVG(days_entry_payment - days_instalment) as instal_delay_mean,
+            MAX(days_entry_payment - days_instalment) as instal_delay_max,
+            SUM(days_entry_payment - days_instalment) as instal_delay_sum,
+            AVG(amt_payment - amt_instalment) as instal_payment_diff_mean,
+            SUM(amt_payment - amt_instalment) as instal_payment_diff_sum,
+            SUM(CASE WHEN days_entry_payment - days_instalment > 0 THEN 1 ELSE 0 END) as instal_late_count,
+            AVG(CASE WHEN days_entry_payment - days_instalment > 0 THEN 1 ELSE 0 END) as instal_late_ratio,
+            SUM(amt_payment) as instal_amt_payment_sum,
+            AVG(amt_payment) as instal_amt_payment_mean,
+            SUM(amt_instalment) as instal_amt_instalment_sum,
+            AVG(amt_instalment) as instal_amt_instalment_mean
+        """,
+    },
+    'pos_cash': {
+        'source_table': 'pos_cash_balance',
+        'summary_table': 'agg_pos_cash',
+        'watermark_column': None,
+        'select': """
+            sk_id_curr,
+            COUNT(DISTINCT sk_id_prev) as pos_contract_count,
+            MIN(months_balance) as pos_months_min,
+            MAX(months_balance) as pos_months_max,
+            COUNT(months_balance) as pos_record_count,
+            AVG(cnt_instalment) as pos_instalment_mean,
+            MAX(cnt_instalment) as pos_instalment_max,
+            AVG(cnt_instalment_future) as pos_future_instalment_mean,
+            MIN(cnt_instalment_future) as pos_future_instalment_min,
+            SUM(sk_dpd) as pos_dpd_sum,
+            AVG(sk_dpd) as pos_dpd_mean,
+            MAX(sk_dpd) as pos_dpd_max,
+            SUM(sk_dpd_def) as pos_dpd_def_sum,
+            AVG(sk_dpd_def) as pos_dpd_def_mean,
+            MAX(sk_dpd_def) as pos_dpd_def_max,
+            SUM(CASE WHEN sk_dpd > 0 THEN 1 ELSE 0 END) as pos_dpd_count,
+            SUM(CASE WHEN sk_dpd_def > 0 THEN 1 ELSE 0 END) as pos_dpd_def_count
+        """,
+    },
+    'credit_card': {
+        'source_table': 'credit_card_balance',
+        'summary_table': 'agg_credit_card',
+        'watermark_column': None,
+        'select': """
+            sk_id_curr,
+            COUNT(DISTINCT sk_id_prev) as cc_card_count,
+            MIN(months_balance) as cc_months_min,
+            MAX(months_balance) as cc_months_max,
+            COUNT(months_balance) as cc_record_count,
+            AVG(amt_balance) as cc_balance_mean,
+            MAX(amt_balance) as cc_balance_max,
+            SUM(amt_balance) as cc_balance_sum,
+            AVG(amt_credit_limit_actual) as cc_limit_mean,
+            MAX(amt_credit_limit_actual) as cc_limit_max,
+            AVG(amt_drawings_current) as cc_drawings_mean,
+            SUM(amt_drawings_current) as cc_drawings_sum,
+            AVG(amt_payment_total_current) as cc_payment_mean,
+            SUM(amt_payment_total_current) as cc_payment_sum,
+            AVG(amt_balance / (amt_credit_limit_actual + 1)) as cc_utilization_mean,
+            MAX(amt_balance / (amt_credit_limit_actual + 1)) as cc_utilization_max,
+            SUM(CASE WHEN amt_balance > amt_credit_limit_actual THEN 1 ELSE 0 END) as cc_over_limit_count,
+            SUM(sk_dpd) as cc_dpd_sum,
+            AVG(sk_dpd) as cc_dpd_mean,
+            MAX(sk_dpd) as cc_dpd_max,
+            SUM(CASE WHEN sk_dpd > 0 THEN 1 ELSE 0 END) as cc_dpd_count
+        """,
+    },
+}
+
+
+class AggregateStore:
+    """
+    Maintains per-client aggregate summary tables in PostgreSQL.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml", engine: Optional[Engine] = None):
+        """
+        Initialize the aggregate store.
+
+        Args:
+            config_path: Path to configuration file
+            engine: SQLAlchemy engine (shared engine if None)
+        """
+        self.config = self._load_config(config_path)
+        agg_config = self.config.get('features', {}).get('aggregates', {})
+        self.schema = agg_config.get('schema', 'credit_risk')
+        self.use_summary_tables = agg_config.get('use_summary_tables', True)
+        self.engine = engine if engine is not None else get_engine(self.config)
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        with open(config_path, 'r') as f:
+            return yaml.safe_load(f)
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def aggregate_query(self, name: str, client_filter: Optional[str] = None) -> str:
+        """
+        Build the GROUP BY query for an aggregate.
+
+        Args:
+            name: Aggregate name (key of AGGREGATES)
+            client_filter: Optional subquery restricting sk_id_curr
+
+        Returns:
+            SQL query string
+        """
+        definition = AGGREGATES[name]
+        query = f"SELECT {definition['select']} FROM {self.schema}.{definition['source_table']}"
+        if client_filter:
+            query += f" WHERE sk_id_curr IN ({client_filter})"
+        return query + " GROUP BY sk_id_curr"
+
+    def table_exists(self, table_name: str) -> bool:
+        """Check whether a table exists in the aggregate schema."""
+        query = text("SELECT to_regclass(:name) IS NOT NULL")
+        with self.engine.connect() as conn:
+            return bool(conn.execute(query, {'name': f"{self.schema}.{table_name}"}).scalar())
+
+    def source_watermark(self, name: str) -> Optional[int]:
+        """Current maximum of the watermark column in the source table (None if empty)."""
+        definition = AGGREGATES[name]
+        query = text(f"SELECT MAX({definition['watermark_column']}) FROM {self.schema}.{definition['source_table']}")
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+
+    def has_summary(self, name: str) -> bool:
+        """
+        Whether the summary table of an aggregate is refreshed and current.
+
+        A summary invalidated by ingestion, or with source rows above its
+        watermark, is not used.
+        """
+        if not self.use_summary_tables:
+            return False
+        watermark = self.get_watermark(name)
+        if watermark is None:
+            return False
+
+        if AGGREGATES[name]['watermark_column'] and watermark >= 0:
+            current = self.source_watermark(name)
+            if current is not None and current > watermark:
+                print(f"  {name}: summary behind its source (watermark {watermark:,} < {current:,}), "
+                      f"using a live query until the next refresh")
+                return False
+        return True
+
+    def read(self, name: str) -> pd.DataFrame:
+        """
+        Read an aggregate, from its summary table when available.
+
+        Falls back to a live GROUP BY over the source table.
+
+        Args:
+            name: Aggregate name (key of AGGREGATES)
+
+        Returns:
+            DataFrame with one row per sk_id_curr
+        """
+        if self.has_summary(name):
+            summary_table = AGGREGATES[name]['summary_table']
+            return pd.read_sql(f"SELECT * FROM {self.schema}.{summary_table}", self.engine)
+
+        return pd.read_sql(self.aggregate_query(name), self.engine)
+
+    # =========================================================================
+    # WATERMARKS
+    # =========================================================================
+
+    def _ensure_watermark_table(self, conn) -> None:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {self.schema}.aggregate_watermarks (
+                aggregate_name VARCHAR(50) PRIMARY KEY,
+                watermark BIGINT,
+                refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+    def get_watermark(self, name: str) -> Optional[int]:
+        """
+        Get the last refreshed watermark of an aggregate.
+
+        Returns:
+            Watermark value, -1 for aggregates refreshed without watermark,
+            None if the summary table has never been refreshed
+        """
+        if not self.table_exists('aggregate_watermarks'):
+            return None
+
+        query = text(f"""
+            SELECT COALESCE(watermark, -1)
+            FROM {self.schema}.aggregate_watermarks
+            WHERE aggregate_name = :name
+        """)
+        with self.engine.connect() as conn:
+            return conn.execute(query, {'name': name}).scalar()
+
+    def _set_watermark(self, conn, name: str, watermark: Optional[int]) -> None:
+        conn.execute(text(f"""
+            INSERT INTO {self.schema}.aggregate_watermarks (aggregate_name, watermark, refreshed_at)
+            VALUES (:name, :watermark, CURRENT_TIMESTAMP)
+            ON CONFLICT (aggregate_name)
+            DO UPDATE SET watermark = EXCLUDED.watermark, refreshed_at = EXCLUDED.refreshed_at
+        """), {'name': name, 'watermark': watermark})
+
+    def invalidate(self, source_table: str) -> List[str]:
+        """
+        Forget the summaries built from a source table.
+
+        Called by ingestion before it replaces or appends to the table:
+        reads fall back to the live GROUP BY (or CSV) and the next refresh
+        is a full rebuild.
+
+        Args:
+            source_table: Table being reloaded
+
+        Returns:
+            Names of the invalidated aggregates
+        """
+        names = [name for name, definition in AGGREGATES.items() if definition['source_table'] == source_table]
+        if not names or not self.table_exists('aggregate_watermarks'):
+            return []
+
+        with self.engine.begin() as conn:
+            for name in names:
+                conn.execute(text(
+                    f"DELETE FROM {self.schema}.aggregate_watermarks WHERE aggregate_name = :name"
+                ), {'name': name})
+        print(f"  Invalidated summaries of {source_table}: {', '.join(names)}")
+        return names
+
+    # =========================================================================
+    # REFRESH
+    # =========================================================================
+
+    def _ensure_summary_table(self, conn, name: str) -> None:
+        """Create the summary table (empty) and its supporting indexes."""
+        definition = AGGREGATES[name]
+        source = definition['source_table']
+        summary = definition['summary_table']
+
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {self.schema}.{summary} AS "
+            f"{self.aggregate_query(name)} WITH NO DATA"
+        ))
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{summary}_sk_id_curr "
+            f"ON {self.schema}.{summary}(sk_id_curr)"
+        ))
+        # Ingestion recreates source tables, so their indexes may be missing
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS idx_{source}_sk_id_curr "
+            f"ON {self.schema}.{source}(sk_id_curr)"
+        ))
+        if definition['watermark_column']:
+            column = definition['watermark_column']
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_{source}_{column} "
+                f"ON {self.schema}.{source}({column})"
+            ))
+
+    def refresh(self, name: str, full: bool = False) -> int:
+        """
+        Refresh the summary table of an aggregate.
+
+        Incremental refresh recomputes only the clients having source rows
+        above the stored watermark; aggregates without a watermark column are
+        always rebuilt. Each refresh runs in one transaction, so concurrent
+        feature builds keep reading the previous snapshot until it commits.
+
+        Args:
+            name: Aggregate name (key of AGGREGATES)
+            full: Force a full rebuild
+
+        Returns:
+            Number of summary rows written
+        """
+        definition = AGGREGATES[name]
+        source = f"{self.schema}.{definition['source_table']}"
+        summary = f"{self.schema}.{definition['summary_table']}"
+        column = definition['watermark_column']
+
+        if not self.table_exists(definition['source_table']):
+            print(f"  {name}: source table {source} not found, skipped")
+            return 0
+
+        start_time = time.time()
+        watermark = self.get_watermark(name)
+        incremental = not full and column is not None and watermark is not None and watermark >= 0
+
+        with self.engine.begin() as conn:
+            self._ensure_watermark_table(conn)
+            self._ensure_summary_table(conn, name)
+
+            new_watermark = None
+            if column:
+                new_watermark = conn.execute(text(f"SELECT MAX({column}) FROM {source}")).scalar()
+
+            if incremental:
+                if new_watermark is None or new_watermark <= watermark:
+                    print(f"  {name}: up to date (watermark {watermark:,})")
+                    return 0
+
+                conn.execute(text(f"""
+                    CREATE TEMP TABLE _affected_clients ON COMMIT DROP AS
+                    SELECT DISTINCT sk_id_curr FROM {source}
+                    WHERE {column} > :low AND {column} <= :high
+                """), {'low': watermark, 'high': new_watermark})
+                conn.execute(text(f"""
+                    DELETE FROM {summary} s
+                    USING _affected_clients a
+                    WHERE s.sk_id_curr = a.sk_id_curr
+                """))
+                client_filter = "SELECT sk_id_curr FROM _affected_clients"
+                query = self.aggregate_query(name, client_filter=client_filter)
+            else:
+                conn.execute(text(f"DELETE FROM {summary}"))
+                query = self.aggregate_query(name)
+
+            rows = conn.execute(text(f"INSERT INTO {summary} {query}")).rowcount
+            self._set_watermark(conn, name, new_watermark)
+
+        mode = "incremental" if incremental else "full"
+        print(f"  {name}: {rows:,} clients refreshed ({mode}) in {time.time() - start_time:.1f}s")
+        return rows
+
+    def refresh_all(self, full: bool = False, names: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Refresh every summary table whose source table exists.
+
+        Args:
+            full: Force full rebuilds
+            names: Aggregates to refresh (all if None)
+
+        Returns:
+            Dictionary with aggregate names and rows written
+        """
+        results = {}
+        for name in names or list(AGGREGATES):
+            results[name] = self.refresh(name, full=full)
+        return results
+
+
+def run_aggregate_refresh(full: bool = False):
+    """Main function to refresh the aggregate summary tables."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Aggregate Refresh")
+    print("=" * 60)
+
+    store = AggregateStore()
+    results = store.refresh_all(full=full)
+
+    print("\nRefresh complete!")
+    return results
+
+
+if __name__ == "__main__":
+    import os
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Refresh aggregate summary tables")
+    parser.add_argument("--full", action="store_true", help="Rebuild instead of incremental refresh")
+    args = parser.parse_args()
+
+    run_aggregate_refresh(full=args.full)
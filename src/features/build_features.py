@@ -6,25 +6,116 @@ This module handles:
 - Aggregation of previous_application data (from PostgreSQL)
 - Aggregation of large CSV files (installments, POS_CASH, credit_card)
 - Creation of new features (ratios, indicators)
-- Final dataset assembly
+- Final dataset assembly, in memory or streamed to Parquet (bounded
+  memory: merged chunks are written as they arrive, then filled batch
+  by batch)
+- Post-merge missing-value fill (one vectorized median scan), with the
+  fill values persisted to models/feature_fill_values.json for serving
 
 Author: Daniela Samo
 Date: January 2026
 """
 
+import json
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
-from sqlalchemy import create_engine, text
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple, Union
+from sqlalchemy import text
 import yaml
-import os
-from dotenv import load_dotenv
 import warnings
 import gc
 
+from src.data.sketches import DEFAULT_KLL_K, StreamingStatistics
+from src.data.statistics import compute_column_stats
+from src.features import polars_engine
+from src.features.aggregates import AggregateStore
+from src.utils.database import get_engine, get_stream_chunk_size, read_table_chunks
+
 warnings.filterwarnings('ignore')
-load_dotenv()
+
+FILL_VALUES_FILENAME = "feature_fill_values.json"
+
+# Aggregates whose absence means "no history": filled with 0, not the median
+ZERO_FILL_MARKERS = ('count', 'sum')
+
+
+def compute_fill_values(
+    df: pd.DataFrame,
+    exclude: Iterable[str] = ('sk_id_curr', 'target')
+) -> Dict[str, float]:
+    """
+    Compute the fill value of every numeric feature in one scan.
+
+    Count and sum aggregates are filled with 0 (client without history),
+    other numeric columns with their median.
+
+    Args:
+        df: Merged feature dataset
+        exclude: Columns never filled (identifiers, target)
+
+    Returns:
+        Column -> fill value
+    """
+    exclude = set(exclude)
+    numeric_cols = [c for c in df.select_dtypes(include=[np.number]).columns if c not in exclude]
+    zero_cols = [c for c in numeric_cols if any(x in c for x in ZERO_FILL_MARKERS)]
+    median_cols = [c for c in numeric_cols if c not in set(zero_cols)]
+
+    medians = compute_column_stats(df[median_cols]).medians if median_cols else pd.Series(dtype='float64')
+
+    fill_values = {col: 0.0 for col in zero_cols}
+    fill_values.update({col: float(value) for col, value in medians.items() if pd.notna(value)})
+    return fill_values
+
+
+def compute_fill_values_streaming(
+    sketch: StreamingStatistics,
+    exclude: Iterable[str] = ('sk_id_curr', 'target')
+) -> Dict[str, float]:
+    """
+    Compute the fill values from statistics accumulated chunk by chunk.
+
+    Same rules as compute_fill_values; medians come from the KLL sketches
+    (exact while a column has fewer than ~k values, ~1.5% rank error with
+    the default k=200 above).
+
+    Args:
+        sketch: Statistics of the merged feature chunks
+        exclude: Columns never filled (identifiers, target)
+
+    Returns:
+        Column -> fill value
+    """
+    exclude = set(exclude)
+    numeric_cols = [c for c in sketch.numeric_columns if c not in exclude]
+    zero_cols = [c for c in numeric_cols if any(x in c for x in ZERO_FILL_MARKERS)]
+    medians = sketch.to_column_statistics().medians
+
+    fill_values = {col: 0.0 for col in zero_cols}
+    fill_values.update({
+        col: float(medians[col]) for col in numeric_cols
+        if col not in fill_values and pd.notna(medians.get(col))
+    })
+    return fill_values
+
+
+def fill_missing_features(df: pd.DataFrame, fill_values: Dict[str, float]) -> pd.DataFrame:
+    """
+    Fill missing feature values in place with a single dict fillna.
+
+    Args:
+        df: Feature dataset (modified in place)
+        fill_values: Column -> fill value (see compute_fill_values)
+
+    Returns:
+        The filled DataFrame
+    """
+    present = {col: value for col, value in fill_values.items() if col in df.columns}
+    df.fillna(present, inplace=True)
+    return df
 
 
 class FeatureEngineer:
@@ -37,29 +128,53 @@ class FeatureEngineer:
         self.raw_path = Path(self.config['paths']['data']['raw'])
         self.features_path = Path(self.config['paths']['data']['features'])
         self.engine = self._create_engine()
+        self.aggregates = AggregateStore(config_path, engine=self.engine)
         self.features_path.mkdir(parents=True, exist_ok=True)
         self.feature_groups = {}
 
+        # Execution engine of the columnar steps ('pandas' or 'polars')
+        self.compute_engine = polars_engine.check_engine(self.config['features'].get('engine', 'pandas'))
+
+        # Fill values of the last built dataset (see build_feature_dataset)
+        self.fill_values: Dict[str, float] = {}
+        self.fill_values_path = Path(self.config['paths']['models']) / FILL_VALUES_FILENAME
+
     def _load_config(self, config_path: str) -> dict:
         with open(config_path, 'r') as f:
             return yaml.safe_load(f)
 
     def _create_engine(self):
-        host = os.getenv('POSTGRES_HOST', 'localhost')
-        port = os.getenv('POSTGRES_PORT', '5432')
-        database = os.getenv('POSTGRES_DB', 'credit_risk')
-        user = os.getenv('POSTGRES_USER', 'credit_user')
-        password = os.getenv('POSTGRES_PASSWORD', '')
-        connection_string = f"postgresql://{user}:{password}@{host}:{port}/{database}"
-        return create_engine(connection_string)
+        return get_engine(self.config)
 
     # =========================================================================
     # APPLICATION FEATURES
     # =========================================================================
 
-    def create_application_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def create_application_features(self, df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
         """Create new features from application_train table."""
-        print("Creating application features...")
+        if verbose:
+            print(f"Creating application features ({self.compute_engine} engine)...")
+
+        if self.compute_engine == 'polars':
+            df = polars_engine.create_application_features(df)
+        else:
+            df = self._create_application_features_pandas(df)
+
+        self.feature_groups['application'] = [
+            'credit_income_ratio', 'annuity_income_ratio', 'credit_annuity_ratio',
+            'goods_credit_ratio', 'income_per_person', 'age_years', 'employed_years',
+            'employed_to_age_ratio', 'registration_to_age', 'id_publish_to_age',
+            'documents_provided_count', 'contact_info_count',
+            'ext_source_mean', 'ext_source_std', 'ext_source_min', 'ext_source_max'
+        ]
+
+        if verbose:
+            print(f"  Created {len(self.feature_groups['application'])} application features")
+        return df
+
+    @staticmethod
+    def _create_application_features_pandas(df: pd.DataFrame) -> pd.DataFrame:
+        """Application features computed with eager pandas operations."""
         df = df.copy()
 
         # Financial Ratios
@@ -95,17 +210,38 @@ class FeatureEngineer:
         df['ext_source_min'] = df[existing_ext].min(axis=1)
         df['ext_source_max'] = df[existing_ext].max(axis=1)
 
-        self.feature_groups['application'] = [
-            'credit_income_ratio', 'annuity_income_ratio', 'credit_annuity_ratio',
-            'goods_credit_ratio', 'income_per_person', 'age_years', 'employed_years',
-            'employed_to_age_ratio', 'registration_to_age', 'id_publish_to_age',
-            'documents_provided_count', 'contact_info_count',
-            'ext_source_mean', 'ext_source_std', 'ext_source_min', 'ext_source_max'
-        ]
-
-        print(f"  Created {len(self.feature_groups['application'])} application features")
         return df
 
+    def iter_application_chunks(
+        self,
+        columns: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream application_train from PostgreSQL with application features added.
+
+        Rows are read through a server-side cursor, so at most `chunk_size`
+        raw rows are held in memory at a time.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            chunk_size: Rows per chunk (database.stream_chunk_size if None)
+
+        Yields:
+            Typed DataFrame chunks with application features
+        """
+        if chunk_size is None:
+            chunk_size = get_stream_chunk_size(self.config)
+
+        chunks = read_table_chunks(
+            self.engine,
+            "application_train",
+            columns=columns,
+            chunk_size=chunk_size
+        )
+        for chunk in chunks:
+            yield self.create_application_features(chunk, verbose=False)
+
     # =========================================================================
     # BUREAU FEATURES
     # =========================================================================
@@ -114,30 +250,8 @@ class FeatureEngineer:
         """Create aggregated features from bureau table."""
         print("Creating bureau features from PostgreSQL...")
 
-        query = """
-        SELECT
-            sk_id_curr,
-            COUNT(*) as bureau_credit_count,
-            SUM(CASE WHEN credit_active = 'Active' THEN 1 ELSE 0 END) as bureau_active_count,
-            SUM(CASE WHEN credit_active = 'Closed' THEN 1 ELSE 0 END) as bureau_closed_count,
-            SUM(amt_credit_sum) as bureau_amt_credit_sum_total,
-            AVG(amt_credit_sum) as bureau_amt_credit_sum_mean,
-            MAX(amt_credit_sum) as bureau_amt_credit_sum_max,
-            SUM(amt_credit_sum_debt) as bureau_debt_sum,
-            AVG(amt_credit_sum_debt) as bureau_debt_mean,
-            SUM(amt_credit_sum_overdue) as bureau_overdue_sum,
-            MAX(amt_credit_sum_overdue) as bureau_overdue_max,
-            SUM(CASE WHEN amt_credit_sum_overdue > 0 THEN 1 ELSE 0 END) as bureau_overdue_count,
-            SUM(cnt_credit_prolong) as bureau_prolong_count,
-            AVG(days_credit) as bureau_days_credit_mean,
-            MIN(days_credit) as bureau_days_credit_min,
-            AVG(days_credit_enddate) as bureau_days_enddate_mean,
-            COUNT(DISTINCT credit_type) as bureau_credit_type_count
-        FROM credit_risk.bureau
-        GROUP BY sk_id_curr
-        """
-
-        bureau_agg = pd.read_sql(query, self.engine)
+        # Summary table if refreshed (src/features/aggregates.py), else live GROUP BY
+        bureau_agg = self.aggregates.read('bureau')
 
         # Derived features
         bureau_agg['bureau_active_ratio'] = (
@@ -164,30 +278,8 @@ class FeatureEngineer:
         """Create aggregated features from previous_application table."""
         print("Creating previous application features from PostgreSQL...")
 
-        query = """
-        SELECT
-            sk_id_curr,
-            COUNT(*) as prev_app_count,
-            SUM(CASE WHEN name_contract_status = 'Approved' THEN 1 ELSE 0 END) as prev_approved_count,
-            SUM(CASE WHEN name_contract_status = 'Refused' THEN 1 ELSE 0 END) as prev_refused_count,
-            SUM(CASE WHEN name_contract_status = 'Canceled' THEN 1 ELSE 0 END) as prev_canceled_count,
-            AVG(amt_application) as prev_amt_application_mean,
-            MAX(amt_application) as prev_amt_application_max,
-            AVG(amt_credit) as prev_amt_credit_mean,
-            SUM(amt_credit) as prev_amt_credit_sum,
-            AVG(amt_credit - amt_application) as prev_credit_app_diff_mean,
-            AVG(amt_annuity) as prev_amt_annuity_mean,
-            MAX(amt_annuity) as prev_amt_annuity_max,
-            AVG(amt_down_payment) as prev_down_payment_mean,
-            AVG(days_decision) as prev_days_decision_mean,
-            MIN(days_decision) as prev_days_decision_min,
-            COUNT(DISTINCT name_contract_type) as prev_contract_type_count,
-            COUNT(DISTINCT name_goods_category) as prev_goods_category_count
-        FROM credit_risk.previous_application
-        GROUP BY sk_id_curr
-        """
-
-        prev_agg = pd.read_sql(query, self.engine)
+        # Summary table if refreshed (src/features/aggregates.py), else live GROUP BY
+        prev_agg = self.aggregates.read('previous_application')
 
         # Derived features
         prev_agg['prev_approval_rate'] = (
@@ -210,8 +302,8 @@ class FeatureEngineer:
     # INSTALLMENTS FEATURES (from CSV)
     # =========================================================================
 
-    def create_installments_features(self, chunk_size: int = 100000) -> pd.DataFrame:
-        """Create aggregated features from installments_payments.csv."""
+    def _aggregate_installments_csv(self, chunk_size: int) -> pd.DataFrame:
+        """Aggregate installments_payments.csv per client, reading it in chunks."""
         print("Creating installments features from CSV (chunked)...")
 
         file_path = self.raw_path / "installments_payments.csv"
@@ -260,6 +352,16 @@ class FeatureEngineer:
         instal_agg.index.name = 'sk_id_curr'
         instal_agg = instal_agg.reset_index()
 
+        return instal_agg
+
+    def create_installments_features(self, chunk_size: int = 100000) -> pd.DataFrame:
+        """Create aggregated features from installments_payments.csv (or its summary table once ingested)."""
+        if self.aggregates.has_summary('installments'):
+            print("Creating installments features from PostgreSQL summary table...")
+            instal_agg = self.aggregates.read('installments')
+        else:
+            instal_agg = self._aggregate_installments_csv(chunk_size)
+
         instal_agg['instal_late_ratio'] = (
             instal_agg['instal_late_count'] / (instal_agg['instal_count'] + 1)
         )
@@ -278,8 +380,8 @@ class FeatureEngineer:
     # POS CASH BALANCE FEATURES (from CSV)
     # =========================================================================
 
-    def create_pos_cash_features(self, chunk_size: int = 100000) -> pd.DataFrame:
-        """Create aggregated features from POS_CASH_balance.csv."""
+    def _aggregate_pos_cash_csv(self, chunk_size: int) -> pd.DataFrame:
+        """Aggregate POS_CASH_balance.csv per client, reading it in chunks."""
         print("Creating POS cash features from CSV (chunked)...")
 
         file_path = self.raw_path / "POS_CASH_balance.csv"
@@ -330,6 +432,16 @@ class FeatureEngineer:
         pos_agg.index.name = 'sk_id_curr'
         pos_agg = pos_agg.reset_index()
 
+        return pos_agg
+
+    def create_pos_cash_features(self, chunk_size: int = 100000) -> pd.DataFrame:
+        """Create aggregated features from POS_CASH_balance.csv (or its summary table once ingested)."""
+        if self.aggregates.has_summary('pos_cash'):
+            print("Creating POS cash features from PostgreSQL summary table...")
+            pos_agg = self.aggregates.read('pos_cash')
+        else:
+            pos_agg = self._aggregate_pos_cash_csv(chunk_size)
+
         pos_agg['pos_dpd_ratio'] = (
             pos_agg['pos_dpd_count'] / (pos_agg['pos_record_count'] + 1)
         )
@@ -345,8 +457,8 @@ class FeatureEngineer:
     # CREDIT CARD BALANCE FEATURES (from CSV)
     # =========================================================================
 
-    def create_credit_card_features(self, chunk_size: int = 100000) -> pd.DataFrame:
-        """Create aggregated features from credit_card_balance.csv."""
+    def _aggregate_credit_card_csv(self, chunk_size: int) -> pd.DataFrame:
+        """Aggregate credit_card_balance.csv per client, reading it in chunks."""
         print("Creating credit card features from CSV (chunked)...")
 
         file_path = self.raw_path / "credit_card_balance.csv"
@@ -403,6 +515,16 @@ class FeatureEngineer:
         cc_agg.index.name = 'sk_id_curr'
         cc_agg = cc_agg.reset_index()
 
+        return cc_agg
+
+    def create_credit_card_features(self, chunk_size: int = 100000) -> pd.DataFrame:
+        """Create aggregated features from credit_card_balance.csv (or its summary table once ingested)."""
+        if self.aggregates.has_summary('credit_card'):
+            print("Creating credit card features from PostgreSQL summary table...")
+            cc_agg = self.aggregates.read('credit_card')
+        else:
+            cc_agg = self._aggregate_credit_card_csv(chunk_size)
+
         cc_agg['cc_payment_to_balance_ratio'] = (
             cc_agg['cc_payment_sum'] / (cc_agg['cc_balance_sum'] + 1)
         )
@@ -418,90 +540,208 @@ class FeatureEngineer:
     # MAIN ASSEMBLY
     # =========================================================================
 
+    def _create_aggregates(
+        self,
+        include_installments: bool,
+        include_pos_cash: bool,
+        include_credit_card: bool
+    ) -> List[pd.DataFrame]:
+        """Per-client aggregate tables (small: one row per client)."""
+        aggregates = [
+            self.create_bureau_features(),
+            self.create_previous_application_features(),
+        ]
+        if include_installments:
+            aggregates.append(self.create_installments_features())
+        if include_pos_cash:
+            aggregates.append(self.create_pos_cash_features())
+        if include_credit_card:
+            aggregates.append(self.create_credit_card_features())
+        return aggregates
+
+    def iter_feature_chunks(
+        self,
+        aggregates: List[pd.DataFrame],
+        chunk_size: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Stream application_train and merge the aggregates chunk by chunk (not filled)."""
+        print("\nStreaming application_train from PostgreSQL...")
+        total_rows = 0
+        for chunk in self.iter_application_chunks(chunk_size=chunk_size):
+            for agg_df in aggregates:
+                chunk = chunk.merge(agg_df, on='sk_id_curr', how='left')
+            total_rows += len(chunk)
+            print(f"  Processed {total_rows:,} rows...", end='\r')
+            yield chunk
+        print(f"\n  Loaded {total_rows:,} rows")
+        print(f"  Created {len(self.feature_groups.get('application', []))} application features")
+
+    def _print_summary(self, n_rows: int, n_columns: int) -> None:
+        print("\n" + "="*60)
+        print("FEATURE DATASET SUMMARY")
+        print("="*60)
+        print(f"Total rows: {n_rows:,}")
+        print(f"Total columns: {n_columns}")
+        print(f"\nFeatures by group:")
+        for group, features in self.feature_groups.items():
+            print(f"  {group}: {len(features)} features")
+
     def build_feature_dataset(
         self,
         include_installments: bool = True,
         include_pos_cash: bool = True,
         include_credit_card: bool = True
     ) -> pd.DataFrame:
-        """Build the complete feature dataset."""
+        """
+        Build the complete feature dataset in memory.
+
+        Holds the whole dataset (plus a concat copy): use
+        write_feature_dataset for the full table.
+        """
         print("="*60)
         print("BUILDING FEATURE DATASET")
         print("="*60)
 
-        # Load base application data
-        print("\nLoading application_train from PostgreSQL...")
-        app_df = pd.read_sql(
-            "SELECT * FROM credit_risk.application_train",
-            self.engine
-        )
-        print(f"  Loaded {len(app_df):,} rows")
-
-        # Create application features
-        app_df = self.create_application_features(app_df)
-
-        # Create and merge bureau features
-        bureau_df = self.create_bureau_features()
-        app_df = app_df.merge(bureau_df, on='sk_id_curr', how='left')
-        del bureau_df
+        aggregates = self._create_aggregates(include_installments, include_pos_cash, include_credit_card)
+        app_df = pd.concat(list(self.iter_feature_chunks(aggregates)), ignore_index=True)
+        del aggregates
         gc.collect()
 
-        # Create and merge previous application features
-        prev_df = self.create_previous_application_features()
-        app_df = app_df.merge(prev_df, on='sk_id_curr', how='left')
-        del prev_df
-        gc.collect()
-
-        # Create and merge installments features
-        if include_installments:
-            instal_df = self.create_installments_features()
-            app_df = app_df.merge(instal_df, on='sk_id_curr', how='left')
-            del instal_df
-            gc.collect()
-
-        # Create and merge POS cash features
-        if include_pos_cash:
-            pos_df = self.create_pos_cash_features()
-            app_df = app_df.merge(pos_df, on='sk_id_curr', how='left')
-            del pos_df
-            gc.collect()
+        # Fill NaN for clients without history (0 for counts/sums, medians otherwise)
+        self.fill_values = compute_fill_values(app_df)
+        fill_missing_features(app_df, self.fill_values)
 
-        # Create and merge credit card features
-        if include_credit_card:
-            cc_df = self.create_credit_card_features()
-            app_df = app_df.merge(cc_df, on='sk_id_curr', how='left')
-            del cc_df
-            gc.collect()
-
-        # Fill NaN for clients without history
-        numeric_cols = app_df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            if col not in ['sk_id_curr', 'target']:
-                if any(x in col for x in ['count', 'sum']):
-                    app_df[col] = app_df[col].fillna(0)
-                else:
-                    app_df[col] = app_df[col].fillna(app_df[col].median())
+        self._print_summary(len(app_df), len(app_df.columns))
+        return app_df
 
-        # Summary
-        print("\n" + "="*60)
-        print("FEATURE DATASET SUMMARY")
+    def write_feature_dataset(
+        self,
+        filename: str = "features_v1.parquet",
+        csv_filename: Optional[str] = None,
+        include_installments: bool = True,
+        include_pos_cash: bool = True,
+        include_credit_card: bool = True,
+        chunk_size: Optional[int] = None
+    ) -> Path:
+        """
+        Build the complete feature dataset straight to Parquet.
+
+        Memory is bounded by the chunk size, the per-client aggregates and
+        the sketch sizes, not by the number of applications:
+        1. Merged chunks are appended to <stem>.unfilled.parquet while their
+           statistics are sketched (fill values, see compute_fill_values_streaming)
+        2. That file is re-read batch by batch, filled and written to
+           `filename` (and `csv_filename` if given), then removed
+
+        Integer columns with missing values are written as float64, as the
+        in-memory concat does.
+
+        Args:
+            filename: Parquet artifact in the features directory
+            csv_filename: Optional CSV copy in the features directory
+            include_installments: Merge installments features
+            include_pos_cash: Merge POS cash features
+            include_credit_card: Merge credit card features
+            chunk_size: Rows per chunk (database.stream_chunk_size if None)
+
+        Returns:
+            Path of the Parquet artifact
+        """
+        print("="*60)
+        print("BUILDING FEATURE DATASET (streaming)")
         print("="*60)
-        print(f"Total rows: {len(app_df):,}")
-        print(f"Total columns: {len(app_df.columns)}")
-        print(f"\nFeatures by group:")
-        for group, features in self.feature_groups.items():
-            print(f"  {group}: {len(features)} features")
 
-        return app_df
+        if chunk_size is None:
+            chunk_size = get_stream_chunk_size(self.config)
+        output_path = self.features_path / filename
+        unfilled_path = output_path.with_name(f"{output_path.stem}.unfilled.parquet")
+
+        aggregates = self._create_aggregates(include_installments, include_pos_cash, include_credit_card)
+        sketch = StreamingStatistics(k=self.config['data'].get('sketch_k', DEFAULT_KLL_K))
+
+        writer = None
+        try:
+            for chunk in self.iter_feature_chunks(aggregates, chunk_size):
+                sketch.update(chunk)
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    # A text column that is NULL throughout the first chunk has no type yet
+                    schema = pa.schema([
+                        field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                        for field in table.schema.remove_metadata()
+                    ])
+                    writer = pq.ParquetWriter(unfilled_path, schema)
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+        del aggregates
+        gc.collect()
+        if writer is None:
+            raise ValueError("application_train is empty: no features written")
+
+        self.fill_values = compute_fill_values_streaming(sketch)
+
+        unfilled = pq.ParquetFile(unfilled_path)
+        schema = pa.schema([
+            field.with_type(pa.float64())
+            if pa.types.is_integer(field.type) and field.name in self.fill_values
+            and sketch.non_null[field.name] < sketch.n_rows else field
+            for field in unfilled.schema_arrow
+        ])
+        csv_path = self.features_path / csv_filename if csv_filename else None
+        try:
+            with pq.ParquetWriter(output_path, schema, compression='zstd') as writer:
+                for i, batch in enumerate(unfilled.iter_batches(batch_size=chunk_size)):
+                    chunk = fill_missing_features(batch.to_pandas(), self.fill_values)
+                    writer.write_table(pa.Table.from_pandas(chunk, preserve_index=False).cast(schema))
+                    if csv_path is not None:
+                        chunk.to_csv(csv_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        finally:
+            unfilled_path.unlink()
+
+        self._print_summary(sketch.n_rows, len(schema))
+        print(f"\nFeatures saved to: {output_path}")
+        print(f"File size: {output_path.stat().st_size / 1024**2:.1f} MB")
+        if csv_path is not None:
+            print(f"Features saved to: {csv_path}")
+        self.save_fill_values()
+        return output_path
 
     def save_features(self, df: pd.DataFrame, filename: str = "features_v1.csv") -> Path:
-        """Save the feature dataset to disk."""
+        """Save the feature dataset to disk (Parquet if filename ends with .parquet)."""
         output_path = self.features_path / filename
-        df.to_csv(output_path, index=False)
+        if output_path.suffix == '.parquet':
+            df.to_parquet(output_path, index=False, compression='zstd')
+        else:
+            df.to_csv(output_path, index=False)
         print(f"\nFeatures saved to: {output_path}")
         print(f"File size: {output_path.stat().st_size / 1024**2:.1f} MB")
+
+        if self.fill_values:
+            self.save_fill_values()
         return output_path
 
+    def save_fill_values(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Save the fill values of the feature dataset as JSON.
+
+        The API uses them as defaults for the features a request does not
+        provide, so training and serving fill missing values identically.
+
+        Args:
+            path: Output file (models/feature_fill_values.json by default)
+
+        Returns:
+            Path of the saved file
+        """
+        path = Path(path) if path is not None else self.fill_values_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.fill_values, f, indent=2)
+        print(f"Fill values saved to: {path}")
+        return path
+
 
 def run_feature_engineering():
     """Main function to run feature engineering pipeline."""
@@ -511,19 +751,20 @@ def run_feature_engineering():
 
     fe = FeatureEngineer()
 
-    features_df = fe.build_feature_dataset(
+    # Parquet read by src.models.train / src.models.score, CSV kept as fallback
+    features_path = fe.write_feature_dataset(
+        "features_v1.parquet",
+        csv_filename="features_v1.csv",
         include_installments=True,
         include_pos_cash=True,
         include_credit_card=True
     )
 
-    fe.save_features(features_df, "features_v1.csv")
-
     print("\nFeature engineering complete!")
-    return features_df
+    return features_path
 
 
 if __name__ == "__main__":
     import os
     os.chdir(Path(__file__).parent.parent.parent)
-    df = run_feature_engineering()
+    run_feature_engineering()
@@ -0,0 +1,209 @@
+"""
+Categorical encoding for Credit Risk Scoring Project.
+
+This module holds the category dictionary shared by preprocessing,
+training and serving:
+- Built once from the label encoders of the training notebook
+  (models/label_encoders.pkl) and persisted as models/category_codes.json
+- A category's code is its position in the registry, so codes are
+  identical at train and serve time
+- Encoding is a vectorized lookup (pd.Categorical codes); missing
+  values map to the 'MISSING' category when it was seen in training,
+  unknown values become NaN (handled as missing by XGBoost)
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+MISSING_TOKEN = "MISSING"
+REGISTRY_FILENAME = "category_codes.json"
+ENCODERS_FILENAME = "label_encoders.pkl"
+
+
+class CategoryRegistry:
+    """
+    Persistent category -> code dictionary, one entry per categorical column.
+
+    Column names are matched case-insensitively, so the raw tables
+    (NAME_INCOME_TYPE) and the model features (name_income_type) share
+    the same entry.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]], missing_token: str = MISSING_TOKEN):
+        """
+        Initialize the registry.
+
+        Args:
+            categories: Ordered categories per column (code = position)
+            missing_token: Category used for missing values, when present
+        """
+        self.missing_token = missing_token
+        self._categories = {col.lower(): list(values) for col, values in categories.items()}
+
+    @classmethod
+    def from_label_encoders(cls, encoders: Dict[str, object]) -> "CategoryRegistry":
+        """
+        Build the registry from fitted sklearn LabelEncoders.
+
+        Args:
+            encoders: Column -> LabelEncoder (classes_ are sorted, code = index)
+
+        Returns:
+            CategoryRegistry with the same codes as the encoders
+        """
+        return cls({col: [str(c) for c in encoder.classes_] for col, encoder in encoders.items()})
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CategoryRegistry":
+        """Load a registry saved with save()."""
+        with open(path, 'r') as f:
+            payload = json.load(f)
+        return cls(payload['columns'], missing_token=payload.get('missing_token', MISSING_TOKEN))
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Save the registry as JSON.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Path of the saved file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'missing_token': self.missing_token, 'columns': self._categories}, f, indent=2)
+        return path
+
+    def __contains__(self, column: str) -> bool:
+        return column.lower() in self._categories
+
+    @property
+    def columns(self) -> List[str]:
+        """Registered columns (lowercase)."""
+        return list(self._categories)
+
+    def categories(self, column: str, observed: Iterable = ()) -> List[str]:
+        """
+        Categories of a column, in code order.
+
+        Args:
+            column: Column name (any case)
+            observed: Values seen in the data; those missing from the registry
+                are appended (sorted) so existing codes never move
+
+        Returns:
+            Ordered list of categories
+        """
+        known = self._categories[column.lower()]
+        known_set = set(known)
+        extra = sorted({v for v in observed if pd.notna(v) and v not in known_set})
+        return known + extra
+
+    def encode(self, column: str, values) -> np.ndarray:
+        """
+        Encode values of one column to their float codes.
+
+        Args:
+            column: Column name (any case)
+            values: Array-like of raw values
+
+        Returns:
+            float64 codes; NaN for unknown values (and for missing values
+            when the column has no 'MISSING' category)
+        """
+        categories = self._categories[column.lower()]
+        values = pd.Series(values, copy=False)
+        if self.missing_token in categories and values.isna().any():
+            values = values.astype(object).fillna(self.missing_token)
+
+        codes = pd.Categorical(values, categories=categories).codes.astype(np.float64)
+        codes[codes < 0] = np.nan
+        return codes
+
+    def encode_frame(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Replace every registered column of a DataFrame by its codes.
+
+        Args:
+            df: Input DataFrame
+            inplace: Modify df instead of a copy
+
+        Returns:
+            DataFrame with numeric codes for the registered columns
+        """
+        if not inplace:
+            df = df.copy()
+        for col in [c for c in df.columns if c in self]:
+            df[col] = self.encode(col, df[col])
+        return df
+
+
+def load_category_registry(models_dir: Union[str, Path] = "models") -> Optional[CategoryRegistry]:
+    """
+    Load the category registry of a models directory.
+
+    category_codes.json is used when present; otherwise the registry is
+    rebuilt from label_encoders.pkl.
+
+    Args:
+        models_dir: Directory holding the model artifacts
+
+    Returns:
+        CategoryRegistry, or None when neither artifact exists
+    """
+    models_dir = Path(models_dir)
+    registry_path = models_dir / REGISTRY_FILENAME
+    if registry_path.exists():
+        return CategoryRegistry.load(registry_path)
+
+    encoders_path = models_dir / ENCODERS_FILENAME
+    if encoders_path.exists():
+        import joblib
+        return CategoryRegistry.from_label_encoders(joblib.load(encoders_path))
+
+    return None
+
+
+def build_category_registry(models_dir: Union[str, Path] = "models") -> Path:
+    """
+    Convert label_encoders.pkl into category_codes.json.
+
+    Args:
+        models_dir: Directory holding the model artifacts
+
+    Returns:
+        Path of the saved registry
+    """
+    import joblib
+
+    models_dir = Path(models_dir)
+    encoders = joblib.load(models_dir / ENCODERS_FILENAME)
+    registry = CategoryRegistry.from_label_encoders(encoders)
+    path = registry.save(models_dir / REGISTRY_FILENAME)
+    print(f"Category registry saved: {path} ({len(registry.columns)} columns)")
+    return path
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import os
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Build models/category_codes.json from label_encoders.pkl")
+    parser.add_argument("--models-dir", default="models", help="Directory of the model artifacts")
+    args = parser.parse_args()
+
+    build_category_registry(args.models_dir)
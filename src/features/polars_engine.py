@@ -0,0 +1,237 @@
+"""
+Polars execution engine for Credit Risk Scoring Project.
+
+This module runs the columnar steps of the pipeline as lazy Polars
+query plans over Arrow data, instead of eager pandas operations:
+- Application features (ratios, ages, document/contact counts,
+  ext_source statistics) of FeatureEngineer.create_application_features
+- The replay of a fitted preprocessing state (DataPreprocessor.transform):
+  anomaly fix, outlier capping, imputation and dtype casts
+
+Each step is one plan: Polars optimizes it, runs the expressions on all
+cores and materializes only the result, without intermediate pandas
+copies. Inputs and outputs stay pandas DataFrames, so callers are
+unchanged. Select the engine with `features.engine` in config.yaml.
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError:  # Optional dependency: the pandas engine is the default
+    pl = None
+
+ENGINES = ('pandas', 'polars')
+
+DAYS_EMPLOYED_ANOMALY = 365243
+
+CONTACT_COLUMNS = [
+    'flag_mobil', 'flag_emp_phone', 'flag_work_phone',
+    'flag_cont_mobile', 'flag_phone', 'flag_email'
+]
+EXT_SOURCE_COLUMNS = ['ext_source_1', 'ext_source_2', 'ext_source_3']
+
+
+def check_engine(engine: str) -> str:
+    """
+    Validate an engine name and check that it can run here.
+
+    Args:
+        engine: 'pandas' or 'polars'
+
+    Returns:
+        The engine name
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (expected one of {ENGINES})")
+    if engine == 'polars' and pl is None:
+        raise ImportError("features.engine = 'polars' requires polars (pip install polars)")
+    return engine
+
+
+# =============================================================================
+# APPLICATION FEATURES
+# =============================================================================
+
+def application_feature_exprs(columns: List[str]) -> List["pl.Expr"]:
+    """
+    Polars expressions of the application features.
+
+    Same formulas as FeatureEngineer.create_application_features; row-wise
+    aggregates skip missing values as pandas does.
+
+    Args:
+        columns: Columns of the input frame (lowercase)
+
+    Returns:
+        List of named expressions
+    """
+    col = pl.col
+    age_years = -col('days_birth') / 365
+    employed_years = (-col('days_employed') / 365).clip(0, 50)
+
+    exprs = [
+        # Financial Ratios
+        (col('amt_credit') / (col('amt_income_total') + 1)).alias('credit_income_ratio'),
+        (col('amt_annuity') / (col('amt_income_total') + 1)).alias('annuity_income_ratio'),
+        (col('amt_credit') / (col('amt_annuity') + 1)).alias('credit_annuity_ratio'),
+        (col('amt_goods_price') / (col('amt_credit') + 1)).alias('goods_credit_ratio'),
+        (col('amt_income_total') / (col('cnt_fam_members') + 1)).alias('income_per_person'),
+
+        # Age Features
+        age_years.alias('age_years'),
+        employed_years.alias('employed_years'),
+        (employed_years / (age_years + 1)).alias('employed_to_age_ratio'),
+        ((-col('days_registration') / 365) / (age_years + 1)).alias('registration_to_age'),
+        ((-col('days_id_publish') / 365) / (age_years + 1)).alias('id_publish_to_age'),
+    ]
+
+    # Document and contact counts (missing flags count as 0)
+    doc_cols = [c for c in columns if c.startswith('flag_document_')]
+    contact_cols = [c for c in CONTACT_COLUMNS if c in columns]
+    exprs.append(_row_sum(doc_cols).alias('documents_provided_count'))
+    exprs.append(_row_sum(contact_cols).alias('contact_info_count'))
+
+    # External Sources
+    ext_cols = [c for c in EXT_SOURCE_COLUMNS if c in columns]
+    if ext_cols:
+        values = [col(c).cast(pl.Float64) for c in ext_cols]
+        count = pl.sum_horizontal([v.is_not_null().cast(pl.Int32) for v in values])
+        mean = pl.mean_horizontal(values)
+        squares = pl.sum_horizontal([(v - mean) ** 2 for v in values])
+        exprs += [
+            mean.alias('ext_source_mean'),
+            pl.when(count > 1).then(squares / (count - 1)).sqrt().alias('ext_source_std'),
+            pl.min_horizontal(values).alias('ext_source_min'),
+            pl.max_horizontal(values).alias('ext_source_max'),
+        ]
+
+    return exprs
+
+
+def _row_sum(columns: List[str]) -> "pl.Expr":
+    """Row-wise sum as float64 (0.0 when there is no column), like DataFrame.sum(axis=1)."""
+    if not columns:
+        return pl.lit(0.0, dtype=pl.Float64)
+    return pl.sum_horizontal([pl.col(c).cast(pl.Float64) for c in columns])
+
+
+def create_application_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the application features to a DataFrame with one Polars plan.
+
+    Only the input columns the expressions read are converted to Arrow;
+    the new columns are appended to the pandas frame.
+
+    Args:
+        df: application_train rows (lowercase columns)
+
+    Returns:
+        New DataFrame with the application features appended
+    """
+    check_engine('polars')
+    columns = df.columns.tolist()
+    exprs = application_feature_exprs(columns)
+
+    needed = sorted(set().union(*(expr.meta.root_names() for expr in exprs)))
+    features = pl.from_pandas(df[needed]).lazy().select(exprs).collect().to_pandas()
+
+    # pandas' sum(axis=1) of integer (or boolean) flags is int64
+    doc_cols = [c for c in columns if c.startswith('flag_document_')]
+    contact_cols = [c for c in CONTACT_COLUMNS if c in columns]
+    for name, source_cols in [('documents_provided_count', doc_cols), ('contact_info_count', contact_cols)]:
+        if source_cols and all(
+            pd.api.types.is_integer_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c]) for c in source_cols
+        ):
+            features[name] = features[name].astype(np.int64)
+
+    features.index = df.index
+    return pd.concat([df, features], axis=1)
+
+
+# =============================================================================
+# PREPROCESSING STATE
+# =============================================================================
+
+def apply_state(df: pd.DataFrame, state: Dict) -> pd.DataFrame:
+    """
+    Replay a fitted DataPreprocessor state with one Polars plan.
+
+    Equivalent to DataPreprocessor.transform on the pandas engine: the
+    DAYS_EMPLOYED anomaly is fixed, unfitted columns are dropped, and
+    every fitted column is capped, filled and cast in one pass.
+
+    Args:
+        df: Raw application rows (uppercase columns)
+        state: DataPreprocessor.state
+
+    Returns:
+        New preprocessed DataFrame; the input is left untouched
+    """
+    check_engine('polars')
+    order = [c for c in state['columns'] if c in df.columns or c == 'DAYS_EMPLOYED_ANOMALY']
+    if not state['anomaly_indicator']:
+        order = [c for c in order if c != 'DAYS_EMPLOYED_ANOMALY']
+    bounds = state['cap_bounds']
+    fill_values = state['fill_values']
+    dtypes = state['dtypes']
+
+    source_cols = [c for c in order if c in df.columns]
+    frame = pl.from_pandas(df[source_cols]).lazy()
+
+    # Anomaly fix (DataPreprocessor.fix_anomalies)
+    if 'DAYS_EMPLOYED' in source_cols:
+        is_anomaly = pl.col('DAYS_EMPLOYED') == DAYS_EMPLOYED_ANOMALY
+        anomaly_exprs = [
+            pl.when(is_anomaly).then(None).otherwise(pl.col('DAYS_EMPLOYED')).alias('DAYS_EMPLOYED')
+        ]
+        if state['anomaly_indicator']:
+            anomaly_exprs.append(is_anomaly.fill_null(False).cast(pl.Int64).alias('DAYS_EMPLOYED_ANOMALY'))
+        frame = frame.with_columns(anomaly_exprs)
+    elif state['anomaly_indicator']:
+        frame = frame.with_columns(pl.lit(0, dtype=pl.Int64).alias('DAYS_EMPLOYED_ANOMALY'))
+
+    # Capping, imputation and category restriction, one expression per column
+    exprs = []
+    for col in order:
+        expr = pl.col(col)
+        if col in bounds:
+            # Float bounds on an integer column give floats, as in pandas
+            expr = expr.cast(pl.Float64).clip(bounds[col][0], bounds[col][1])
+        if fill_values.get(col) is not None:
+            expr = expr.fill_null(fill_values[col])
+        if dtypes.get(col) == 'category':
+            categories = state['categories'][col]
+            expr = pl.when(expr.is_in(categories)).then(expr).cast(pl.Enum(categories))
+        elif dtypes.get(col, '').startswith('float'):
+            expr = expr.cast(getattr(pl, dtypes[col].capitalize()))
+        exprs.append(expr.alias(col))
+
+    result = frame.select(exprs).collect()
+
+    # Integer downcasts only when the values still fit (as _cast_column)
+    int_casts = []
+    for col in order:
+        target = dtypes.get(col, '')
+        if target.startswith(('int', 'uint')):
+            info = np.iinfo(target)
+            series = result[col]
+            if series.null_count() == 0 and (
+                len(series) == 0 or info.min <= series.min() and series.max() <= info.max
+            ):
+                int_casts.append(pl.col(col).cast(getattr(pl, target.capitalize())))
+    if int_casts:
+        result = result.with_columns(int_casts)
+
+    output = result.to_pandas()
+    for col in output.columns:
+        if isinstance(output[col].dtype, pd.CategoricalDtype):
+            output[col] = output[col].cat.as_unordered()
+    output.index = df.index
+    return output
@@ -0,0 +1,289 @@
+"""
+Model artifacts for Credit Risk Scoring Project.
+
+This module writes and loads the production model in XGBoost's native
+format, instead of a pickled XGBClassifier:
+- <model>.ubj: the booster saved as UBJSON (no pickle, readable by any
+  XGBoost version that supports the format)
+- <model>.categories.json: the category registry of this model
+- <model>.calibration.json: probability lookup table and decision
+  rules (src.models.calibration), when the model was calibrated
+- <model>.manifest.json: version, feature order, decision and risk
+  thresholds, file names and SHA-256 checksums
+- Loaders read each file once, verify its checksum and build the
+  booster from memory; several versions (one manifest each) can be
+  loaded side by side from the same directory
+- The pickle is only used as a fallback when no manifest exists
+  (artifacts trained before this format)
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import xgboost as xgb
+
+from src.features.encoding import CategoryRegistry, load_category_registry
+from src.models.calibration import DECISION_THRESHOLD, RISK_THRESHOLDS, ScoreCalibration
+
+MANIFEST_FORMAT = 1
+MODEL_SUFFIX = ".ubj"
+CATEGORIES_SUFFIX = ".categories.json"
+CALIBRATION_SUFFIX = ".calibration.json"
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+class ChecksumError(ValueError):
+    """An artifact does not match the checksum of its manifest."""
+
+
+def sha256_bytes(data: bytes) -> str:
+    """SHA-256 hex digest of data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def manifest_path(models_dir: Union[str, Path], model_filename: str) -> Path:
+    """
+    Manifest of a model, from its pickle or native file name.
+
+    Args:
+        models_dir: Directory holding the model artifacts
+        model_filename: e.g. xgboost_credit_risk_v1.pkl
+
+    Returns:
+        e.g. models/xgboost_credit_risk_v1.manifest.json
+    """
+    return Path(models_dir) / f"{Path(model_filename).stem}{MANIFEST_SUFFIX}"
+
+
+def save_model_artifacts(
+    booster: xgb.Booster,
+    models_dir: Union[str, Path],
+    model_filename: str,
+    feature_names: List[str],
+    registry: Optional[CategoryRegistry],
+    model_version: str,
+    metrics: Optional[Dict] = None,
+    calibration: Optional[ScoreCalibration] = None
+) -> Path:
+    """
+    Write the native model, its categories, calibration and the manifest.
+
+    Args:
+        booster: Trained booster
+        models_dir: Output directory
+        model_filename: Model file name (its stem names the artifacts)
+        feature_names: Model features, in order
+        registry: Category registry (None if no categorical feature)
+        model_version: Version served with the predictions
+        metrics: Test metrics recorded in the manifest (auc_roc...)
+        calibration: Probability calibration (None: historical thresholds)
+
+    Returns:
+        Path of the manifest
+    """
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    stem = Path(model_filename).stem
+
+    files = {'model': (f"{stem}{MODEL_SUFFIX}", bytes(booster.save_raw('ubj')))}
+    if registry is not None:
+        payload = {'missing_token': registry.missing_token,
+                   'columns': {col: registry.categories(col) for col in registry.columns}}
+        files['categories'] = (f"{stem}{CATEGORIES_SUFFIX}", json.dumps(payload).encode('utf-8'))
+    thresholds = {'decision': DECISION_THRESHOLD, 'risk_levels': RISK_THRESHOLDS}
+    if calibration is not None:
+        files['calibration'] = (f"{stem}{CALIBRATION_SUFFIX}", json.dumps(calibration.to_dict()).encode('utf-8'))
+        thresholds = {'decision': calibration.decision_threshold, 'risk_levels': calibration.risk_thresholds,
+                      'calibrated': True}
+
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'model_version': model_version,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'xgboost_version': xgb.__version__,
+        'num_boosted_rounds': int(booster.num_boosted_rounds()),
+        'feature_names': list(feature_names),
+        'thresholds': thresholds,
+        'metrics': {k: v for k, v in (metrics or {}).items() if isinstance(v, (int, float))},
+        'files': {},
+    }
+    for name, (filename, data) in files.items():
+        (models_dir / filename).write_bytes(data)
+        manifest['files'][name] = {'path': filename, 'sha256': sha256_bytes(data), 'bytes': len(data)}
+
+    # Manifest last (atomic rename): readers never see it before its files
+    path = manifest_path(models_dir, model_filename)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ModelArtifacts:
+    """
+    One model version loaded from its manifest.
+
+    Attributes:
+        manifest: Parsed manifest
+        classifier: XGBClassifier (predict_proba, SHAP)
+        booster: Its xgb.Booster (shared, not a copy)
+        feature_names: Model features, in order
+        registry: CategoryRegistry or None
+        calibration: ScoreCalibration or None (historical thresholds)
+        model_version: Version from the manifest
+    """
+
+    def __init__(self, manifest: Dict, classifier: xgb.XGBClassifier, registry: Optional[CategoryRegistry],
+                 calibration: Optional[ScoreCalibration] = None):
+        self.manifest = manifest
+        self.classifier = classifier
+        self.booster = classifier.get_booster()
+        self.registry = registry
+        self.calibration = calibration
+        self.feature_names = manifest['feature_names']
+        self.model_version = manifest['model_version']
+
+
+def _read_verified(models_dir: Path, entry: Dict, verify: bool) -> bytes:
+    """Read an artifact and check it against its manifest entry."""
+    data = (models_dir / entry['path']).read_bytes()
+    if verify and sha256_bytes(data) != entry['sha256']:
+        raise ChecksumError(f"Checksum mismatch for {models_dir / entry['path']}")
+    return data
+
+
+def load_model_artifacts(path: Union[str, Path], verify: bool = True) -> ModelArtifacts:
+    """
+    Load a model version from its manifest.
+
+    Args:
+        path: Manifest file
+        verify: Check the SHA-256 of every file
+
+    Returns:
+        ModelArtifacts
+
+    Raises:
+        FileNotFoundError: Manifest or artifact missing
+        ChecksumError: An artifact was modified or truncated
+        ValueError: Unsupported manifest format
+    """
+    path = Path(path)
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError(f"Unsupported manifest format {manifest.get('format')} in {path}")
+
+    models_dir = path.parent
+    # Parsed once, from the verified bytes (the file is not read again)
+    classifier = xgb.XGBClassifier()
+    classifier.load_model(bytearray(_read_verified(models_dir, manifest['files']['model'], verify)))
+
+    registry = None
+    if 'categories' in manifest['files']:
+        payload = json.loads(_read_verified(models_dir, manifest['files']['categories'], verify))
+        registry = CategoryRegistry(payload['columns'], missing_token=payload['missing_token'])
+
+    calibration = None
+    if 'calibration' in manifest['files']:
+        calibration = ScoreCalibration.from_dict(
+            json.loads(_read_verified(models_dir, manifest['files']['calibration'], verify))
+        )
+
+    return ModelArtifacts(manifest, classifier, registry, calibration)
+
+
+def load_production_artifacts(
+    models_dir: Union[str, Path] = "models",
+    model_filename: str = "xgboost_credit_risk_v1.pkl",
+    model_version: str = "v1.0.0"
+) -> ModelArtifacts:
+    """
+    Model of a models directory: native artifacts, else the pickle.
+
+    Args:
+        models_dir: Directory holding the model artifacts
+        model_filename: Pickle name, also naming the native artifacts
+        model_version: Version reported for a pickled model
+
+    Returns:
+        ModelArtifacts
+    """
+    models_dir = Path(models_dir)
+    path = manifest_path(models_dir, model_filename)
+    if path.exists():
+        return load_model_artifacts(path)
+
+    # Artifacts trained before the native format
+    import joblib
+
+    pickle_path = models_dir / model_filename
+    if not pickle_path.exists():
+        raise FileNotFoundError(f"No model in {models_dir} ({path.name} or {model_filename})")
+    with open(models_dir / "feature_names.json", 'r') as f:
+        feature_names = json.load(f)
+    return ModelArtifacts(
+        {'model_version': model_version, 'feature_names': feature_names},
+        joblib.load(pickle_path),
+        load_category_registry(models_dir),
+    )
+
+
+def convert_pickle(
+    models_dir: Union[str, Path] = "models",
+    model_filename: str = "xgboost_credit_risk_v1.pkl",
+    model_version: str = "v1.0.0"
+) -> Path:
+    """
+    Write the native artifacts of a pickled model.
+
+    Args:
+        models_dir: Directory holding the model artifacts
+        model_filename: Pickled XGBClassifier
+        model_version: Version written to the manifest
+
+    Returns:
+        Path of the manifest
+    """
+    import joblib
+
+    models_dir = Path(models_dir)
+    classifier = joblib.load(models_dir / model_filename)
+    with open(models_dir / "feature_names.json", 'r') as f:
+        feature_names = json.load(f)
+    metrics = {}
+    if (models_dir / "metrics.json").exists():
+        with open(models_dir / "metrics.json", 'r') as f:
+            metrics = json.load(f)
+
+    path = save_model_artifacts(
+        classifier.get_booster(), models_dir, model_filename, feature_names,
+        load_category_registry(models_dir), model_version, metrics
+    )
+    print(f"Native model artifacts written: {path}")
+    return path
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Convert a pickled model to native artifacts + manifest")
+    parser.add_argument("--models-dir", default="models", help="Directory holding the model artifacts")
+    parser.add_argument("--model", default="xgboost_credit_risk_v1.pkl", help="Pickled XGBClassifier")
+    parser.add_argument("--version", default="v1.0.0", help="Version written to the manifest")
+    args = parser.parse_args()
+
+    convert_pickle(args.models_dir, args.model, args.version)
@@ -0,0 +1,223 @@
+"""
+Probability calibration for Credit Risk Scoring Project.
+
+The model is trained with scale_pos_weight (~11), so its probabilities
+overstate the default rate. This module maps them to calibrated default
+probabilities and derives the decisions from those:
+- Calibration is fitted on the validation split (isotonic regression or
+  Platt scaling) and stored as a monotone piecewise-linear lookup table
+  (<model>.calibration.json, listed in the model manifest)
+- Serving applies the table with np.interp, one vectorized call for a
+  single client or a batch
+- Risk levels are bands of the calibrated probability, the credit score
+  is a points-to-double-the-odds scale of its log-odds (300-850) and
+  the 0/1 prediction keeps the training operating point
+- Without a table (models trained before calibration) the historical
+  rules apply: bands 0.3 / 0.6 of the raw probability, linear score
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+# Historical rules, on the raw probability (models without calibration)
+DECISION_THRESHOLD = 0.5
+RISK_THRESHOLDS = {'Faible': 0.3, 'Moyen': 0.6}  # upper bounds, 'Élevé' above
+
+CALIBRATION_METHODS = ('isotonic', 'platt')
+
+# Used when config.yaml has no model.calibration section
+DEFAULT_CALIBRATION_CONFIG = {
+    'enabled': True,
+    'method': 'isotonic',
+    'max_knots': 200,
+    'risk_thresholds': {'Faible': 0.05, 'Moyen': 0.12},  # calibrated default probability
+    'score_scaling': {'base_score': 600, 'base_odds': 12, 'pdo': 40},
+}
+
+SCORE_RANGE = (300, 850)
+
+
+def risk_levels(proba: np.ndarray, thresholds: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Risk level of each probability ('Faible' / 'Moyen' below their upper bound, 'Élevé' above)."""
+    thresholds = thresholds or RISK_THRESHOLDS
+    proba = np.asarray(proba)
+    return np.select([proba < thresholds['Faible'], proba < thresholds['Moyen']], ["Faible", "Moyen"], "Élevé")
+
+
+def credit_scores(proba: np.ndarray) -> np.ndarray:
+    """Credit score of each raw probability, from 850 (safe) down to 300 (historical rule)."""
+    return np.clip((850 - np.asarray(proba) * 550).astype(np.int64), *SCORE_RANGE)
+
+
+def scaled_scores(proba: np.ndarray, base_score: float, base_odds: float, pdo: float) -> np.ndarray:
+    """
+    Credit score of each calibrated probability.
+
+    base_score at good:bad odds of base_odds, pdo more points each time the
+    odds double, clipped to 300-850.
+    """
+    proba = np.clip(np.asarray(proba, dtype=np.float64), 1e-6, 1 - 1e-6)
+    points = base_score + pdo / np.log(2) * np.log((1 - proba) / proba / base_odds)
+    return np.clip(np.round(points), *SCORE_RANGE).astype(np.int64)
+
+
+def expected_calibration_error(y_true: np.ndarray, proba: np.ndarray, n_bins: int = 10) -> float:
+    """Mean |observed - predicted| default rate over probability deciles, weighted by size."""
+    proba = np.asarray(proba, dtype=np.float64)
+    edges = np.quantile(proba, np.linspace(0, 1, n_bins + 1)[1:-1])
+    bins = np.searchsorted(edges, proba, side='right')
+    error = 0.0
+    for b in np.unique(bins):
+        mask = bins == b
+        error += mask.sum() * abs(y_true[mask].mean() - proba[mask].mean())
+    return float(error / len(proba))
+
+
+class ScoreCalibration:
+    """
+    Monotone lookup table from raw to calibrated probability, and the
+    decision rules on the calibrated probability.
+
+    Attributes:
+        method: 'isotonic' or 'platt'
+        raw: Raw probability knots (increasing)
+        calibrated: Calibrated probability at each knot (non-decreasing)
+        decision_threshold: Calibrated probability of the 0/1 prediction
+        risk_thresholds: Upper bounds of 'Faible' and 'Moyen'
+        score_scaling: base_score, base_odds and pdo of the credit score
+    """
+
+    def __init__(self, method: str, raw: np.ndarray, calibrated: np.ndarray,
+                 decision_threshold: Optional[float] = None,
+                 risk_thresholds: Optional[Dict[str, float]] = None,
+                 score_scaling: Optional[Dict[str, float]] = None):
+        self.method = method
+        self.raw = np.asarray(raw, dtype=np.float64)
+        # Monotone by construction; enforced against rounding in stored tables
+        self.calibrated = np.maximum.accumulate(np.clip(np.asarray(calibrated, dtype=np.float64), 0, 1))
+        self.decision_threshold = float(
+            decision_threshold if decision_threshold is not None else self.transform(DECISION_THRESHOLD)
+        )
+        self.risk_thresholds = dict(risk_thresholds or DEFAULT_CALIBRATION_CONFIG['risk_thresholds'])
+        self.score_scaling = dict(score_scaling or DEFAULT_CALIBRATION_CONFIG['score_scaling'])
+
+    def transform(self, proba: Union[float, np.ndarray]) -> np.ndarray:
+        """Calibrated probability of raw probabilities."""
+        return np.interp(proba, self.raw, self.calibrated)
+
+    def to_dict(self) -> Dict:
+        return {
+            'method': self.method,
+            'raw': self.raw.tolist(),
+            'calibrated': self.calibrated.tolist(),
+            'decision_threshold': self.decision_threshold,
+            'risk_thresholds': self.risk_thresholds,
+            'score_scaling': self.score_scaling,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict) -> 'ScoreCalibration':
+        return cls(payload['method'], payload['raw'], payload['calibrated'], payload['decision_threshold'],
+                   payload['risk_thresholds'], payload['score_scaling'])
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ScoreCalibration':
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def fit_calibration(y_true: np.ndarray, proba: np.ndarray, settings: Optional[Dict] = None) -> ScoreCalibration:
+    """
+    Fit the calibration of raw probabilities.
+
+    Args:
+        y_true: Labels of a split not used for the trees (validation)
+        proba: Raw model probabilities of that split
+        settings: model.calibration settings (method, max_knots, bands)
+
+    Returns:
+        ScoreCalibration
+    """
+    settings = {**DEFAULT_CALIBRATION_CONFIG, **(settings or {})}
+    method = settings['method']
+    if method not in CALIBRATION_METHODS:
+        raise ValueError(f"Unknown calibration method {method!r} (expected one of {CALIBRATION_METHODS})")
+
+    proba = np.asarray(proba, dtype=np.float64)
+    y_true = np.asarray(y_true, dtype=np.float64)
+    max_knots = int(settings['max_knots'])
+
+    if method == 'isotonic':
+        from sklearn.isotonic import IsotonicRegression
+
+        model = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(proba, y_true)
+        raw, calibrated = model.X_thresholds_, model.y_thresholds_
+        if len(raw) > max_knots:
+            # Resampled on quantiles of the scores: np.interp of a monotone table stays monotone
+            grid = np.unique(np.quantile(proba, np.linspace(0, 1, max_knots)))
+            raw, calibrated = grid, np.interp(grid, raw, calibrated)
+    else:
+        from sklearn.linear_model import LogisticRegression
+
+        def logit(p: np.ndarray) -> np.ndarray:
+            p = np.clip(p, 1e-6, 1 - 1e-6)
+            return np.log(p / (1 - p))
+
+        model = LogisticRegression(C=1e6).fit(logit(proba).reshape(-1, 1), y_true)
+        grid = np.unique(np.concatenate([[0.0, 1.0], np.quantile(proba, np.linspace(0, 1, max_knots - 2))]))
+        raw, calibrated = grid, model.predict_proba(logit(grid).reshape(-1, 1))[:, 1]
+
+    return ScoreCalibration(method, raw, calibrated, risk_thresholds=settings['risk_thresholds'],
+                            score_scaling=settings['score_scaling'])
+
+
+def calibration_report(calibration: ScoreCalibration, y_true: np.ndarray, proba: np.ndarray) -> Dict[str, float]:
+    """Brier score and expected calibration error, raw vs calibrated (test split)."""
+    calibrated = calibration.transform(proba)
+    return {
+        'method': calibration.method,
+        'n_knots': int(len(calibration.raw)),
+        'default_rate': float(np.mean(y_true)),
+        'mean_raw': float(np.mean(proba)),
+        'mean_calibrated': float(np.mean(calibrated)),
+        'brier_raw': float(np.mean((proba - y_true) ** 2)),
+        'brier_calibrated': float(np.mean((calibrated - y_true) ** 2)),
+        'ece_raw': expected_calibration_error(y_true, proba),
+        'ece_calibrated': expected_calibration_error(y_true, calibrated),
+        'decision_threshold': calibration.decision_threshold,
+    }
+
+
+def decisions(proba: np.ndarray, calibration: Optional[ScoreCalibration] = None) -> Dict[str, np.ndarray]:
+    """
+    Served outputs of raw model probabilities.
+
+    Args:
+        proba: Raw probabilities (one per client)
+        calibration: Lookup table of the model (None: historical rules)
+
+    Returns:
+        Dictionary of arrays: probability, prediction, risk_level, score
+    """
+    proba = np.asarray(proba, dtype=np.float64)
+    if calibration is None:
+        return {
+            'probability': proba,
+            'prediction': (proba >= DECISION_THRESHOLD).astype(np.int8),
+            'risk_level': risk_levels(proba),
+            'score': credit_scores(proba),
+        }
+
+    calibrated = calibration.transform(proba)
+    return {
+        'probability': calibrated,
+        'prediction': (calibrated >= calibration.decision_threshold).astype(np.int8),
+        'risk_level': risk_levels(calibrated, calibration.risk_thresholds),
+        'score': scaled_scores(calibrated, **calibration.score_scaling),
+    }
@@ -0,0 +1,411 @@
+"""
+Model compression for Credit Risk Scoring Project.
+
+This module shrinks the production ensemble after training, within a
+maximum AUC loss on the validation split (same split as
+src.models.train), confirmed on the test split:
+- prune: trees are removed greedily, least useful first, as long as the
+  validation AUC stays within max_auc_drop; the mean contribution of the
+  removed trees is folded into base_score so probabilities stay centred
+- distill: smaller, shallower students are trained on the production
+  model's probabilities (soft labels); the shortest one within
+  max_auc_drop is kept
+- The candidate with the shortest prediction path (sum of tree depths,
+  stable where measured latency is noisy) is written as an alternative
+  artifact (<model>_compressed.ubj + manifest) and
+  compared with the production model in metrics.json (AUC and latency)
+
+The API serves it with API_MODEL_MANIFEST=xgboost_credit_risk_v1_compressed.manifest.json.
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import yaml
+
+from src.models.artifacts import load_production_artifacts, save_model_artifacts
+from src.models.calibration import fit_calibration
+from src.models.evaluate import roc_auc
+from src.models.train import ModelTrainer
+
+COMPRESSION_METHODS = ('prune', 'distill')
+
+# Used when config.yaml has no model.compression section
+DEFAULT_COMPRESSION_CONFIG = {
+    'max_auc_drop': 0.002,
+    'methods': ['prune', 'distill'],
+    'distill_max_depth': [2, 3],
+    'distill_rounds': 300,
+    'distill_learning_rate': 0.1,
+    'distill_step': 10,
+    'latency_repeats': 200,
+    'latency_batch_rows': 1000,
+    'output_suffix': '_compressed',
+}
+
+
+# =============================================================================
+# TREE SELECTION
+# =============================================================================
+
+def tree_contributions(booster: xgb.Booster, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Margin added by each tree to each row.
+
+    Args:
+        booster: Binary booster (one tree per round)
+        X: Feature matrix
+
+    Returns:
+        (contributions of shape (rows, trees), base margin per row)
+    """
+    leaves = booster.predict(xgb.DMatrix(X, feature_names=booster.feature_names), pred_leaf=True)
+    leaves = leaves.reshape(len(X), -1).astype(np.int64)
+
+    model = json.loads(booster.save_raw('json'))
+    trees = model['learner']['gradient_booster']['model']['trees']
+    contributions = np.empty(leaves.shape, dtype=np.float64)
+    for t, tree in enumerate(trees):
+        # Leaf values are stored in split_conditions
+        contributions[:, t] = np.asarray(tree['split_conditions'], dtype=np.float64)[leaves[:, t]]
+
+    margin = booster.inplace_predict(X, predict_type='margin', validate_features=False)
+    return contributions, margin - contributions.sum(axis=1)
+
+
+def greedy_prune(contributions: np.ndarray, base_margin: np.ndarray, y: np.ndarray,
+                 max_auc_drop: float) -> np.ndarray:
+    """
+    Trees to keep, removing the least useful ones first.
+
+    Trees are ranked by the validation AUC lost when each is removed
+    alone, then removed one by one in that order while the AUC of the
+    remaining ensemble stays within max_auc_drop of the full one.
+
+    Args:
+        contributions: Margin of each tree per row
+        base_margin: Base margin per row
+        y: Labels
+        max_auc_drop: Maximum AUC loss
+
+    Returns:
+        Boolean mask of the kept trees (at least one)
+    """
+    margin = base_margin + contributions.sum(axis=1)
+    target = roc_auc(y, margin) - max_auc_drop
+    n_trees = contributions.shape[1]
+
+    drops = np.array([-roc_auc(y, margin - contributions[:, t]) for t in range(n_trees)])
+    keep = np.ones(n_trees, dtype=bool)
+    for t in np.argsort(drops, kind='stable'):
+        if keep.sum() == 1:
+            break
+        candidate = margin - contributions[:, t]
+        if roc_auc(y, candidate) >= target:
+            margin = candidate
+            keep[t] = False
+    return keep
+
+
+def select_trees(booster: xgb.Booster, keep: np.ndarray, margin_shift: float = 0.0) -> xgb.Booster:
+    """
+    Booster made of a subset of the trees of a binary logistic booster.
+
+    Args:
+        booster: Source booster (one tree per round)
+        keep: Boolean mask of the kept trees
+        margin_shift: Added to the base margin (logit of base_score)
+
+    Returns:
+        New booster
+    """
+    model = json.loads(booster.save_raw('json'))
+    learner = model['learner']
+    gbtree = learner['gradient_booster']['model']
+
+    kept = np.flatnonzero(keep)
+    trees = [gbtree['trees'][i] for i in kept]
+    for new_id, tree in enumerate(trees):
+        tree['id'] = new_id
+    gbtree['trees'] = trees
+    gbtree['tree_info'] = [gbtree['tree_info'][i] for i in kept]
+    gbtree['iteration_indptr'] = list(range(len(trees) + 1))
+    gbtree['gbtree_model_param']['num_trees'] = str(len(trees))
+
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+    base_margin = np.log(base_score / (1 - base_score)) + margin_shift
+    learner['learner_model_param']['base_score'] = f"[{1 / (1 + np.exp(-base_margin)):.9E}]"
+
+    compressed = xgb.Booster()
+    compressed.load_model(bytearray(json.dumps(model).encode('utf-8')))
+    return compressed
+
+
+def prediction_latency(booster: xgb.Booster, X: np.ndarray, repeats: int, batch_rows: int) -> Dict[str, float]:
+    """
+    Median prediction latency, one row and per row of a batch.
+
+    Returns:
+        Dictionary with single_row_ms and batch_us_per_row
+    """
+    row = np.ascontiguousarray(X[:1])
+    batch = np.ascontiguousarray(X[:batch_rows])
+
+    def median_seconds(data: np.ndarray, n: int) -> float:
+        timings = np.empty(n)
+        for i in range(n):
+            start = time.perf_counter()
+            booster.inplace_predict(data, validate_features=False)
+            timings[i] = time.perf_counter() - start
+        return float(np.median(timings))
+
+    return {
+        'single_row_ms': round(median_seconds(row, repeats) * 1e3, 4),
+        'batch_us_per_row': round(median_seconds(batch, max(repeats // 10, 5)) / len(batch) * 1e6, 4),
+    }
+
+
+def tree_depth(tree: Dict) -> int:
+    """Depth of a tree of the JSON model."""
+    left, right = tree['left_children'], tree['right_children']
+    depth, level = 0, [0]
+    while level:
+        level = [child for node in level for child in (left[node], right[node]) if child != -1]
+        depth += bool(level)
+    return depth
+
+
+def describe(booster: xgb.Booster) -> Dict[str, int]:
+    """
+    Size of a booster.
+
+    Returns:
+        n_trees, max_depth, n_leaves and path_length (sum of the tree
+        depths: nodes visited per row at most, the prediction cost)
+    """
+    trees = json.loads(booster.save_raw('json'))['learner']['gradient_booster']['model']['trees']
+    depths = [tree_depth(tree) for tree in trees]
+    return {
+        'n_trees': len(trees),
+        'max_depth': max(depths, default=0),
+        'n_leaves': int(sum(tree['left_children'].count(-1) for tree in trees)),
+        'path_length': int(sum(depths)),
+    }
+
+
+# =============================================================================
+# COMPRESSOR
+# =============================================================================
+
+class ModelCompressor:
+    """
+    Builds a smaller alternative to the production model.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml"):
+        """
+        Initialize the compressor.
+
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config = self._load_config(config_path)
+        self.settings = {**DEFAULT_COMPRESSION_CONFIG, **self.config.get('model', {}).get('compression', {})}
+        self.trainer = ModelTrainer(config_path)
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    def prune(self, booster: xgb.Booster, X_val: np.ndarray, y_val: np.ndarray) -> xgb.Booster:
+        """Greedy tree removal within max_auc_drop on the validation split."""
+        contributions, base_margin = tree_contributions(booster, X_val)
+        keep = greedy_prune(contributions, base_margin, y_val, float(self.settings['max_auc_drop']))
+        shift = float(contributions[:, ~keep].sum(axis=1).mean()) if (~keep).any() else 0.0
+        print(f"  prune: {keep.sum()}/{len(keep)} trees kept")
+        return select_trees(booster, keep, shift)
+
+    def distill(self, booster: xgb.Booster, splits: Dict, target_auc: float) -> List[xgb.Booster]:
+        """
+        Students trained on the production probabilities.
+
+        Returns:
+            For each student depth, its shortest prefix within the AUC
+            bound (depths where none reaches it are skipped)
+        """
+        s = self.settings
+        X_train, _ = splits['train']
+        X_val, y_val = splits['valid']
+        max_bin = int(self.trainer.settings['max_bin'])
+        soft_labels = booster.inplace_predict(X_train, validate_features=False)
+        dtrain = xgb.QuantileDMatrix(X_train, label=soft_labels, max_bin=max_bin, nthread=self.trainer.nthread,
+                                     feature_names=booster.feature_names)
+
+        students = []
+        for depth in s['distill_max_depth']:
+            params = {
+                'objective': 'binary:logistic',
+                'max_depth': int(depth),
+                'learning_rate': float(s['distill_learning_rate']),
+                'tree_method': 'hist',
+                'max_bin': max_bin,
+                'nthread': self.trainer.nthread,
+                'seed': self.trainer.random_state,
+            }
+            student = xgb.train(params, dtrain, num_boost_round=int(s['distill_rounds']))
+            for rounds in range(int(s['distill_step']), int(s['distill_rounds']) + 1, int(s['distill_step'])):
+                if roc_auc(y_val, student[:rounds].inplace_predict(X_val, validate_features=False)) >= target_auc:
+                    students.append(student[:rounds])
+                    print(f"  distill: depth {depth}, {rounds} trees")
+                    break
+            else:
+                print(f"  distill: depth {depth} never within the AUC bound")
+        return students
+
+    def run(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        features_path: Optional[Union[str, Path]] = None,
+        methods: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Compress the production model and write the alternative artifact.
+
+        Args:
+            df: Feature DataFrame used for training (loaded if None)
+            features_path: Feature artifact (config value if None)
+            methods: 'prune' and / or 'distill' (config value if None)
+
+        Returns:
+            Compression section written to metrics.json
+        """
+        s = self.settings
+        methods = list(methods or s['methods'])
+        unknown = set(methods) - set(COMPRESSION_METHODS)
+        if unknown:
+            raise ValueError(f"Unknown compression method(s) {sorted(unknown)} (expected {COMPRESSION_METHODS})")
+        trainer = self.trainer
+        ts = trainer.settings
+
+        artifacts = load_production_artifacts(trainer.models_dir, ts['model_filename'], ts['model_version'])
+        if df is None:
+            df = trainer.load_features(features_path)
+        X, y = trainer.prepare(df)
+        del df
+        splits = trainer.split(X.reindex(columns=artifacts.feature_names), y)
+        splits = {name: (part.to_numpy(dtype=np.float32), labels) for name, (part, labels) in splits.items()}
+        del X, y
+        X_val, y_val = splits['valid']
+        X_test, y_test = splits['test']
+        max_drop = float(s['max_auc_drop'])
+        repeats, batch_rows = int(s['latency_repeats']), int(s['latency_batch_rows'])
+
+        def summary(booster: xgb.Booster, method: str) -> Dict:
+            return {
+                'method': method,
+                **describe(booster),
+                'valid_auc': roc_auc(y_val, booster.inplace_predict(X_val, validate_features=False)),
+                'test_auc': roc_auc(y_test, booster.inplace_predict(X_test, validate_features=False)),
+                **prediction_latency(booster, X_test, repeats, batch_rows),
+            }
+
+        production = artifacts.booster
+        baseline = summary(production, 'none')
+        print(f"\nProduction model: {baseline['n_trees']} trees, valid AUC {baseline['valid_auc']:.4f}, "
+              f"{baseline['single_row_ms']:.3f} ms/row")
+
+        print(f"\nCompressing (max AUC drop {max_drop})...")
+        candidates = []
+        if 'prune' in methods:
+            candidates.append((self.prune(production, X_val, y_val), 'prune'))
+        if 'distill' in methods:
+            target = baseline['valid_auc'] - max_drop
+            candidates += [(student, 'distill') for student in self.distill(production, splits, target)]
+
+        best, best_summary = production, baseline
+        for booster, method in candidates:
+            candidate = summary(booster, method)
+            print(f"  {method}: {candidate['n_trees']} trees (depth {candidate['max_depth']}), "
+                  f"valid AUC {candidate['valid_auc']:.4f}, {candidate['batch_us_per_row']:.2f} µs/row")
+            # The test split confirms the bound (trees were selected on validation)
+            within_bound = candidate['valid_auc'] >= baseline['valid_auc'] - max_drop \
+                and candidate['test_auc'] >= baseline['test_auc'] - max_drop
+            if not within_bound:
+                print(f"    rejected: test AUC {candidate['test_auc']:.4f} "
+                      f"(production {baseline['test_auc']:.4f})")
+            elif candidate['path_length'] < best_summary['path_length']:
+                best, best_summary = booster, candidate
+
+        # Same decision rules as production: recalibrated for the smaller model
+        calibration = None
+        if artifacts.calibration is not None:
+            calibration = fit_calibration(y_val, best.inplace_predict(X_val, validate_features=False),
+                                          {**trainer.calibration_settings, 'method': artifacts.calibration.method})
+
+        stem = Path(ts['model_filename']).stem
+        manifest = save_model_artifacts(
+            best, trainer.models_dir, f"{stem}{s['output_suffix']}.ubj", artifacts.feature_names,
+            artifacts.registry, f"{artifacts.model_version}{s['output_suffix']}",
+            {'auc_roc': best_summary['test_auc']}, calibration
+        )
+        compression = {
+            'max_auc_drop': max_drop,
+            'production': baseline,
+            'compressed': best_summary,
+            'manifest': manifest.name,
+        }
+
+        metrics_path = trainer.models_dir / "metrics.json"
+        metrics = {}
+        if metrics_path.exists():
+            with open(metrics_path, 'r') as f:
+                metrics = json.load(f)
+        metrics['compression'] = compression
+        with open(metrics_path, 'w') as f:
+            json.dump(metrics, f, indent=2, default=str)
+
+        print(f"\nKept: {best_summary['method']} - {best_summary['n_trees']} trees, "
+              f"test AUC {baseline['test_auc']:.4f} -> {best_summary['test_auc']:.4f}, "
+              f"{baseline['batch_us_per_row']:.2f} -> {best_summary['batch_us_per_row']:.2f} µs/row")
+        print(f"Compressed model: {manifest}")
+        return compression
+
+
+def run_compression(features_path: Optional[str] = None, methods: Optional[List[str]] = None) -> Dict:
+    """Main function to compress the production model."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Model Compression")
+    print("=" * 60)
+
+    compression = ModelCompressor().run(features_path=features_path, methods=methods)
+
+    print("\nCompression complete! Serve it with "
+          f"API_MODEL_MANIFEST={compression['manifest']}")
+    return compression
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Compress the production model within an AUC budget")
+    parser.add_argument("--features", default=None,
+                        help="Feature artifact used for training (config value by default)")
+    parser.add_argument("--methods", nargs="+", choices=COMPRESSION_METHODS, default=None,
+                        help="Compression methods to try (config value by default)")
+    args = parser.parse_args()
+
+    run_compression(features_path=args.features, methods=args.methods)
@@ -0,0 +1,350 @@
+"""
+Model evaluation for Credit Risk Scoring Project.
+
+This module cross-validates the training configuration (make evaluate):
+- Stratified K-fold on the feature artifact, with the parameters used
+  by src.models.train (config, then models/best_params.json)
+- Folds run in parallel worker processes; the encoded feature matrix is
+  written once as a .npy file and memory-mapped by every worker, which
+  quantizes its training rows chunk by chunk (no per-fold copy)
+- AUC, Gini, precision, recall and F1 computed with vectorized numpy
+  (rank-based AUC, one bincount for the confusion counts)
+- Results written with the metrics.json schema to models/cv_metrics.json
+  (mean over folds), plus per-fold metrics and timing, and the
+  confusion matrix, ROC and precision-recall plots of the out-of-fold
+  predictions
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import yaml
+from sklearn.model_selection import StratifiedKFold
+
+from src.models.external_memory import FeatureBatchIter
+from src.models.train import ModelTrainer, booster_params, plot_evaluation, resolve_nthread
+
+METRIC_NAMES = ('auc_roc', 'gini', 'precision', 'recall', 'f1_score')
+
+# Used when config.yaml has no model.evaluation section
+DEFAULT_EVALUATION_CONFIG = {
+    'n_folds': 5,
+    'n_jobs': -1,
+    'threshold': 0.5,
+    'chunk_rows': 100000,
+    'output_filename': 'cv_metrics.json',
+    'plot_prefix': 'cv_',
+}
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+def roc_auc(y_true: np.ndarray, scores: np.ndarray) -> float:
+    """
+    ROC AUC from the ranks of the scores (Mann-Whitney U, ties averaged).
+
+    Args:
+        y_true: Binary labels
+        scores: Predicted scores
+
+    Returns:
+        AUC (NaN when only one class is present)
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    scores = np.asarray(scores)
+    n_pos = int(y_true.sum())
+    n_neg = len(y_true) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return float('nan')
+
+    order = np.argsort(scores, kind='mergesort')
+    sorted_scores = scores[order]
+    first = np.r_[True, sorted_scores[1:] != sorted_scores[:-1]]
+    starts = np.flatnonzero(first)
+    ends = np.r_[starts[1:], len(scores)]
+    tie_ranks = (starts + ends + 1) / 2.0  # average 1-based rank of each tie group
+    ranks = tie_ranks[np.cumsum(first) - 1]
+
+    positive_rank_sum = ranks[y_true[order]].sum()
+    return float((positive_rank_sum - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg))
+
+
+def binary_metrics(y_true: np.ndarray, proba: np.ndarray, threshold: float = 0.5) -> Dict[str, float]:
+    """
+    Metrics of metrics.json, vectorized.
+
+    Same definitions as src.models.train.classification_metrics
+    (zero_division=0).
+
+    Args:
+        y_true: Binary labels
+        proba: Predicted default probabilities
+        threshold: Decision threshold
+
+    Returns:
+        Dictionary with auc_roc, gini, precision, recall and f1_score
+    """
+    y_true = np.asarray(y_true).astype(np.int64)
+    y_pred = (np.asarray(proba) >= threshold).astype(np.int64)
+    tn, fp, fn, tp = np.bincount(2 * y_true + y_pred, minlength=4)[:4]
+
+    auc = roc_auc(y_true, proba)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+    return {
+        'auc_roc': float(auc),
+        'gini': float(2 * auc - 1),
+        'precision': float(precision),
+        'recall': float(recall),
+        'f1_score': float(f1),
+    }
+
+
+# =============================================================================
+# FOLD WORKER
+# =============================================================================
+
+def _run_fold(
+    cache_dir: str,
+    fold: int,
+    params: Dict,
+    nthread: int,
+    max_bin: int,
+    threshold: float,
+    chunk_rows: int
+) -> Dict:
+    """
+    Train on every fold but one and score the held-out fold.
+
+    Returns:
+        Fold metrics and timing, with the held-out row indices and
+        probabilities
+    """
+    start_time = time.time()
+    cache_dir = Path(cache_dir)
+    with open(cache_dir / "meta.json") as f:
+        feature_names = json.load(f)['feature_names']
+    X = np.load(cache_dir / "X.npy", mmap_mode='r')
+    y = np.load(cache_dir / "y.npy", mmap_mode='r')
+    folds = np.load(cache_dir / "folds.npy", mmap_mode='r')
+
+    def train_batches():
+        for start in range(0, len(y), chunk_rows):
+            keep = folds[start:start + chunk_rows] != fold
+            yield X[start:start + chunk_rows][keep], y[start:start + chunk_rows][keep]
+
+    dtrain = xgb.QuantileDMatrix(FeatureBatchIter(train_batches, feature_names),
+                                 max_bin=max_bin, nthread=nthread)
+    quantize_seconds = time.time() - start_time
+
+    native, num_boost_round = booster_params(params)
+    native.update({'tree_method': 'hist', 'max_bin': max_bin, 'nthread': nthread})
+    train_start = time.time()
+    booster = xgb.train(native, dtrain, num_boost_round=num_boost_round)
+    train_seconds = time.time() - train_start
+
+    predict_start = time.time()
+    index = np.flatnonzero(np.asarray(folds) == fold)
+    proba = booster.inplace_predict(X[index], validate_features=False)
+    predict_seconds = time.time() - predict_start
+
+    return {
+        'fold': fold,
+        **binary_metrics(y[index], proba, threshold),
+        'n_train': int(dtrain.num_row()),
+        'n_test': int(len(index)),
+        'quantize_seconds': round(quantize_seconds, 3),
+        'train_seconds': round(train_seconds, 3),
+        'predict_seconds': round(predict_seconds, 3),
+        'seconds': round(time.time() - start_time, 3),
+        'index': index,
+        'proba': proba,
+    }
+
+
+# =============================================================================
+# EVALUATOR
+# =============================================================================
+
+class ModelEvaluator:
+    """
+    Cross-validates the model with parallel fold processes.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml"):
+        """
+        Initialize the evaluator.
+
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config = self._load_config(config_path)
+        self.settings = {**DEFAULT_EVALUATION_CONFIG, **self.config.get('model', {}).get('evaluation', {})}
+        self.trainer = ModelTrainer(config_path)
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    def cache_matrix(self, df: Optional[pd.DataFrame], n_folds: int, cache_dir: Path) -> np.ndarray:
+        """
+        Encode the features once and assign stratified folds.
+
+        Writes X.npy (float32), y.npy, folds.npy and meta.json.
+
+        Args:
+            df: Feature DataFrame (loaded from the config path if None)
+            n_folds: Number of folds
+            cache_dir: Directory receiving the arrays
+
+        Returns:
+            Labels
+        """
+        if df is None:
+            df = self.trainer.load_features()
+        X, y = self.trainer.prepare(df)
+        del df
+
+        folds = np.empty(len(y), dtype=np.int8)
+        splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=self.trainer.random_state)
+        for fold, (_, test_index) in enumerate(splitter.split(np.zeros(len(y)), y)):
+            folds[test_index] = fold
+
+        np.save(cache_dir / "X.npy", np.ascontiguousarray(X.to_numpy(dtype=np.float32)))
+        np.save(cache_dir / "y.npy", y)
+        np.save(cache_dir / "folds.npy", folds)
+        with open(cache_dir / "meta.json", 'w') as f:
+            json.dump({'feature_names': self.trainer.feature_names}, f)
+        return y
+
+    def run(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        n_folds: Optional[int] = None,
+        n_jobs: Optional[int] = None,
+        save_plots: bool = True
+    ) -> Dict:
+        """
+        Run the cross-validation and write the results.
+
+        Each fold trains n_estimators rounds (no early stopping, which
+        would select the rounds on the held-out fold).
+
+        Args:
+            df: Feature DataFrame (loaded from the config path if None)
+            n_folds: Number of folds
+            n_jobs: Worker processes (-1 for all cores, at most n_folds)
+            save_plots: Write the out-of-fold plots
+
+        Returns:
+            Metrics written to the output file
+        """
+        s = self.settings
+        n_folds = int(n_folds if n_folds is not None else s['n_folds'])
+        n_jobs = min(resolve_nthread(n_jobs if n_jobs is not None else s['n_jobs']), n_folds)
+        nthread = max(1, self.trainer.nthread // n_jobs)
+        threshold = float(s['threshold'])
+        max_bin = int(self.trainer.settings['max_bin'])
+
+        start_time = time.time()
+        with tempfile.TemporaryDirectory(prefix="evaluation-") as cache_dir:
+            y = self.cache_matrix(df, n_folds, Path(cache_dir))
+            params = self.trainer.load_params(y)
+            print(f"\n{n_folds}-fold cross-validation with {n_jobs} worker(s) x {nthread} thread(s)...")
+
+            fold_args = [
+                (cache_dir, fold, params, nthread, max_bin, threshold, int(s['chunk_rows']))
+                for fold in range(n_folds)
+            ]
+            if n_jobs == 1:
+                results = [_run_fold(*args) for args in fold_args]
+            else:
+                # spawn: workers start without the parent's threads and memory
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context) as executor:
+                    results = list(executor.map(_run_fold, *zip(*fold_args)))
+
+        oof = np.empty(len(y), dtype=np.float32)
+        for result in results:
+            oof[result.pop('index')] = result.pop('proba')
+            print(f"  Fold {result['fold']}: AUC {result['auc_roc']:.4f} "
+                  f"({result['n_test']:,} rows, {result['seconds']:.1f}s)")
+
+        fold_metrics = pd.DataFrame(results)
+        metrics = {name: float(fold_metrics[name].mean()) for name in METRIC_NAMES}
+        metrics.update({
+            'best_params': params,
+            'n_folds': n_folds,
+            'n_jobs': n_jobs,
+            'metrics_std': {name: float(fold_metrics[name].std(ddof=0)) for name in METRIC_NAMES},
+            'out_of_fold': binary_metrics(y, oof, threshold),
+            'folds': results,
+            'evaluation_time_seconds': round(time.time() - start_time, 2),
+        })
+        for name in METRIC_NAMES:
+            print(f"  {name}: {metrics[name]:.4f} ± {metrics['metrics_std'][name]:.4f}")
+
+        models_dir = self.trainer.models_dir
+        models_dir.mkdir(parents=True, exist_ok=True)
+        output_path = models_dir / s['output_filename']
+        with open(output_path, 'w') as f:
+            json.dump(metrics, f, indent=2, default=str)
+        print(f"\nMetrics saved to: {output_path}")
+
+        if save_plots:
+            plot_evaluation(y, oof, models_dir, prefix=s['plot_prefix'])
+            print(f"Plots saved to {models_dir} ({s['plot_prefix']}*.png)")
+        return metrics
+
+
+def run_evaluation(
+    n_folds: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    save_plots: bool = True
+) -> Dict:
+    """Main function to cross-validate the model."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Model Evaluation")
+    print("=" * 60)
+
+    metrics = ModelEvaluator().run(n_folds=n_folds, n_jobs=n_jobs, save_plots=save_plots)
+
+    print(f"\nCV AUC: {metrics['auc_roc']:.4f} ± {metrics['metrics_std']['auc_roc']:.4f} "
+          f"in {metrics['evaluation_time_seconds']:.1f}s")
+    print("\nEvaluation complete!")
+    return metrics
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Cross-validate the credit risk model")
+    parser.add_argument("--n-folds", type=int, default=None,
+                        help="Number of stratified folds (config value by default)")
+    parser.add_argument("--n-jobs", type=int, default=None,
+                        help="Worker processes (-1 for all cores)")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Skip the out-of-fold plots")
+    args = parser.parse_args()
+
+    run_evaluation(n_folds=args.n_folds, n_jobs=args.n_jobs, save_plots=not args.no_plots)
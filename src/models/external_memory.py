@@ -0,0 +1,185 @@
+"""
+External-memory training data for Credit Risk Scoring Project.
+
+This module streams the Parquet feature partitions to XGBoost for
+feature sets larger than RAM (ModelTrainer.run_external):
+- Partitions are read batch by batch through memory maps; only one
+  encoded batch is held in memory at a time
+- Rows are assigned to train / validation / test from a hash of
+  sk_id_curr, so every pass over the data sees the same split without
+  keeping an index in memory
+- FeatureBatchIter feeds an XGBoost DataIter: ExtMemQuantileDMatrix
+  quantizes the batches and pages them to a cache directory
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xgboost as xgb
+
+from src.features.encoding import CategoryRegistry
+
+SPLITS = ('train', 'valid', 'test')
+
+# Fibonacci hashing constant (2^64 / golden ratio)
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def split_of(ids: np.ndarray, test_size: float, validation_size: float) -> np.ndarray:
+    """
+    Split of each row, from a hash of its id (stable across passes and runs).
+
+    Args:
+        ids: sk_id_curr values
+        test_size: Share of rows in the test split
+        validation_size: Share of rows in the validation split
+
+    Returns:
+        Array of 'train', 'valid' or 'test'
+    """
+    hashed = np.asarray(ids).astype(np.uint64) * _HASH_MULTIPLIER
+    uniform = (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+    train_share = 1.0 - test_size - validation_size
+    return np.where(uniform < train_share, 'train',
+                    np.where(uniform < train_share + validation_size, 'valid', 'test'))
+
+
+def scan_partitions(
+    files: List[Path],
+    id_column: str,
+    target_column: str,
+    batch_size: int
+) -> Tuple[List[str], Dict[str, Tuple[Set[str], bool]], pd.DataFrame]:
+    """
+    One light pass over the partitions: schema, categories and labels.
+
+    Only the id, target and string columns are read.
+
+    Args:
+        files: Parquet feature partitions
+        id_column: Id column
+        target_column: Target column
+        batch_size: Rows per read batch
+
+    Returns:
+        (feature names, {categorical column: (observed values, has missing)},
+         DataFrame of ids and labels)
+    """
+    schema = pq.ParquetFile(files[0]).schema_arrow
+    feature_names = [name for name in schema.names if name not in (id_column, target_column)]
+    categorical = [
+        field.name for field in schema
+        if field.name in feature_names and (
+            pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+            or pa.types.is_dictionary(field.type)
+        )
+    ]
+
+    observed = {col: (set(), False) for col in categorical}
+    labels = []
+    for file in files:
+        parquet_file = pq.ParquetFile(file, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=batch_size,
+                                               columns=[id_column, target_column] + categorical):
+            frame = batch.to_pandas()
+            labels.append(frame[[id_column, target_column]])
+            for col in categorical:
+                values, has_missing = observed[col]
+                values.update(frame[col].dropna().astype(str).unique())
+                observed[col] = (values, has_missing or bool(frame[col].isna().any()))
+
+    return feature_names, observed, pd.concat(labels, ignore_index=True)
+
+
+def iter_encoded_batches(
+    files: List[Path],
+    registry: CategoryRegistry,
+    feature_names: List[str],
+    split: str,
+    batch_size: int,
+    test_size: float,
+    validation_size: float,
+    id_column: str = 'sk_id_curr',
+    target_column: str = 'target'
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Encoded (X, y) batches of one split.
+
+    Args:
+        files: Parquet feature partitions
+        registry: Category registry
+        feature_names: Model features, in order
+        split: 'train', 'valid' or 'test'
+        batch_size: Rows per read batch
+        test_size: Share of rows in the test split
+        validation_size: Share of rows in the validation split
+        id_column: Id column
+        target_column: Target column
+
+    Yields:
+        (float32 feature matrix, float32 labels)
+    """
+    columns = [id_column, target_column] + feature_names
+    for file in files:
+        parquet_file = pq.ParquetFile(file, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            frame = batch.to_pandas()
+            mask = split_of(frame[id_column].to_numpy(), test_size, validation_size) == split
+            if not mask.any():
+                continue
+            frame = registry.encode_frame(frame.loc[mask, feature_names], inplace=True)
+            yield (
+                frame.to_numpy(dtype=np.float32, na_value=np.nan),
+                batch.column(target_column).to_numpy(zero_copy_only=False)[mask].astype(np.float32),
+            )
+
+
+class FeatureBatchIter(xgb.DataIter):
+    """
+    XGBoost data iterator over one split of the feature partitions.
+
+    With a cache prefix, ExtMemQuantileDMatrix writes the quantized pages
+    under it; without one, QuantileDMatrix loads the batches in memory.
+    """
+
+    def __init__(
+        self,
+        batches: "callable",
+        feature_names: List[str],
+        cache_prefix: Optional[str] = None,
+        min_cache_page_bytes: Optional[int] = None
+    ):
+        """
+        Initialize the iterator.
+
+        Args:
+            batches: Function returning a new (X, y) batch generator per pass
+            feature_names: Model features, in order
+            cache_prefix: Path prefix of the external-memory cache pages
+            min_cache_page_bytes: Minimum size of a cache page
+        """
+        self._batches = batches
+        self._iterator = None
+        self.feature_names = feature_names
+        super().__init__(cache_prefix=cache_prefix, release_data=True,
+                         min_cache_page_bytes=min_cache_page_bytes)
+
+    def next(self, input_data) -> bool:
+        if self._iterator is None:
+            self._iterator = self._batches()
+        batch = next(self._iterator, None)
+        if batch is None:
+            return False
+        X, y = batch
+        input_data(data=X, label=y, feature_names=self.feature_names)
+        return True
+
+    def reset(self) -> None:
+        self._iterator = None
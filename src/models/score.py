@@ -0,0 +1,456 @@
+"""
+Batch scoring for Credit Risk Scoring Project.
+
+This module scores the feature store offline (nightly portfolio
+monitoring) and writes the decisions to credit_risk.predictions:
+- Reads feature partitions (one Parquet file or a directory of part
+  files) through memory maps, chunk by chunk
+- Scores the chunks with the production model in worker processes,
+  one model copy per worker
+- Optionally adds the top-k SHAP reasons of each score (JSON)
+- Bulk-writes each chunk with COPY (or to Parquet with --output-dir)
+- Reports throughput and checkpoints every written chunk, so an
+  interrupted run resumes where it stopped
+
+Decisions follow the API rules: calibrated probability, risk level and
+300-850 score from the model's calibration (src/models/calibration.py).
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xgboost as xgb
+import yaml
+
+from src.data.predictions import PREDICTION_COLUMNS, copy_predictions
+from src.models.artifacts import load_production_artifacts
+from src.models.calibration import decisions
+
+SCORE_COLUMNS = PREDICTION_COLUMNS + ['reasons']
+
+# Used when config.yaml has no scoring section
+DEFAULT_SCORING_CONFIG = {
+    'features_path': 'data/features/features_v1.parquet',
+    'model_filename': 'xgboost_credit_risk_v1.pkl',
+    'model_version': None,
+    'n_jobs': -1,
+    'chunk_size': 50000,
+    'top_k_reasons': 0,
+    'checkpoint_path': 'data/features/score_checkpoint.json',
+}
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+class ModelScorer:
+    """
+    Scores feature frames with the production model.
+
+    Categorical columns are encoded with the shared category registry and
+    features are aligned on feature_names.json, as in the API.
+    """
+
+    def __init__(
+        self,
+        models_dir: Union[str, Path] = "models",
+        model_filename: str = DEFAULT_SCORING_CONFIG['model_filename'],
+        top_k_reasons: int = 0,
+        nthread: Optional[int] = None
+    ):
+        """
+        Load the model artifacts.
+
+        Args:
+            models_dir: Directory holding the model artifacts
+            model_filename: Model file name (native artifacts + manifest,
+                else the pickled XGBClassifier)
+            top_k_reasons: Number of SHAP reasons per client (0 to skip)
+            nthread: XGBoost threads (1 in worker processes)
+        """
+        artifacts = load_production_artifacts(models_dir, model_filename)
+        self.booster = artifacts.booster
+        if nthread is not None:
+            self.booster.set_param({'nthread': nthread})
+
+        self.feature_names: List[str] = artifacts.feature_names
+        self.registry = artifacts.registry
+        self.calibration = artifacts.calibration
+        self.top_k_reasons = top_k_reasons
+
+    def feature_matrix(self, features: pd.DataFrame) -> np.ndarray:
+        """
+        Model input of a feature frame (float32, feature_names order).
+
+        Missing features are NaN (handled natively by XGBoost).
+        """
+        features = features.reindex(columns=self.feature_names)
+        if self.registry is not None:
+            for col in [c for c in self.feature_names if c in self.registry]:
+                if not pd.api.types.is_numeric_dtype(features[col]):
+                    features[col] = self.registry.encode(col, features[col])
+        return features.to_numpy(dtype=np.float32, na_value=np.nan)
+
+    def reasons(self, matrix: np.ndarray) -> List[str]:
+        """
+        Top-k SHAP reasons of each row, as JSON strings.
+
+        Reasons are the features that increase the default risk the most
+        (largest positive contributions to the margin).
+        """
+        contribs = self.booster.predict(
+            xgb.DMatrix(matrix, feature_names=self.feature_names), pred_contribs=True
+        )[:, :-1]  # last column is the bias
+        k = min(self.top_k_reasons, contribs.shape[1])
+        top = np.argsort(-contribs, axis=1)[:, :k]
+
+        names = np.asarray(self.feature_names)
+        return [
+            json.dumps([
+                {'feature': names[j], 'contribution': round(float(row[j]), 4)}
+                for j in order if row[j] > 0
+            ])
+            for row, order in zip(contribs, top)
+        ]
+
+    def score(self, features: pd.DataFrame, model_version: str) -> pd.DataFrame:
+        """
+        Score a feature frame.
+
+        Args:
+            features: Feature rows (sk_id_curr and model features)
+            model_version: Version recorded with each decision
+
+        Returns:
+            DataFrame with SCORE_COLUMNS
+        """
+        matrix = self.feature_matrix(features)
+        proba = self.booster.inplace_predict(matrix, validate_features=False)
+        decided = decisions(proba, self.calibration)
+
+        results = pd.DataFrame({
+            'sk_id_curr': features['sk_id_curr'].to_numpy(),
+            'probability': np.round(decided['probability'], 6),
+            'score': decided['score'],
+            'decision': decided['risk_level'],
+            'model_version': model_version,
+            'created_at': datetime.now(),
+            'reasons': self.reasons(matrix) if self.top_k_reasons > 0 else None,
+        })
+        return results[SCORE_COLUMNS]
+
+
+# One scorer per worker process, loaded once by the pool initializer
+_worker_scorer: Optional[ModelScorer] = None
+
+
+def _init_worker(models_dir: str, model_filename: str, top_k_reasons: int) -> None:
+    global _worker_scorer
+    _worker_scorer = ModelScorer(models_dir, model_filename, top_k_reasons, nthread=1)
+
+
+def _score_in_worker(features: pd.DataFrame, model_version: str) -> pd.DataFrame:
+    return _worker_scorer.score(features, model_version)
+
+
+# =============================================================================
+# BATCH SCORING
+# =============================================================================
+
+def feature_files(path: Union[str, Path]) -> List[Path]:
+    """
+    Parquet files of a feature partition set.
+
+    Args:
+        path: A Parquet file, or a directory of part files
+
+    Returns:
+        Sorted list of Parquet files
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = sorted(path.rglob("*.parquet"))
+    elif path.exists():
+        files = [path]
+    else:
+        files = []
+    if not files:
+        raise FileNotFoundError(f"No Parquet feature partition found at {path}")
+    return files
+
+
+def iter_feature_chunks(
+    files: List[Path],
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+    root: Optional[Path] = None
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Read feature partitions chunk by chunk through memory maps.
+
+    Args:
+        files: Parquet files
+        chunk_size: Rows per chunk
+        columns: Columns read (all if None)
+        root: Directory the chunk keys are relative to (file names if None)
+
+    Yields:
+        (chunk key, chunk) where the key ("file:index") identifies the
+        chunk in the checkpoint
+    """
+    for file in files:
+        name = file.relative_to(root).as_posix() if root is not None else file.name
+        parquet_file = pq.ParquetFile(file, memory_map=True)
+        available = set(parquet_file.schema_arrow.names)
+        read_columns = [c for c in columns if c in available] if columns is not None else None
+        for i, batch in enumerate(parquet_file.iter_batches(batch_size=chunk_size, columns=read_columns)):
+            yield f"{name}:{i}", batch.to_pandas()
+
+
+class BatchScorer:
+    """
+    Scores feature partitions in parallel and writes the decisions.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml"):
+        """
+        Initialize the batch scorer.
+
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config = self._load_config(config_path)
+        self.settings = {**DEFAULT_SCORING_CONFIG, **self.config.get('scoring', {})}
+        self.models_dir = Path(self.config.get('paths', {}).get('models', 'models'))
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    # =========================================================================
+    # CHECKPOINT
+    # =========================================================================
+
+    def _load_checkpoint(self, checkpoint_path: Path, run_key: Dict) -> set:
+        """Chunks already written by a previous run of the same job."""
+        if not checkpoint_path.exists():
+            return set()
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('run') != run_key:
+            raise ValueError(
+                f"Checkpoint {checkpoint_path} belongs to another run ({checkpoint.get('run')}); "
+                "delete it or pass --restart"
+            )
+        return set(checkpoint.get('done', []))
+
+    def _save_checkpoint(self, checkpoint_path: Path, run_key: Dict, done: set) -> None:
+        """Write the checkpoint atomically (temporary file + rename)."""
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = checkpoint_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'run': run_key, 'done': sorted(done)}, f)
+        tmp_path.replace(checkpoint_path)
+
+    # =========================================================================
+    # OUTPUT
+    # =========================================================================
+
+    def _write(self, key: str, results: pd.DataFrame, output_dir: Optional[Path], engine) -> int:
+        """Write one scored chunk to Parquet or credit_risk.predictions."""
+        if output_dir is not None:
+            file, index = key.rsplit(':', 1)
+            part = output_dir / f"{file.replace('/', '_')}-{int(index):06d}.parquet"
+            pq.write_table(pa.Table.from_pandas(results, preserve_index=False), part, compression='zstd')
+            return len(results)
+
+        columns = SCORE_COLUMNS if results['reasons'].notna().any() else PREDICTION_COLUMNS
+        return copy_predictions(engine, results.to_dict('records'), columns=columns)
+
+    # =========================================================================
+    # RUN
+    # =========================================================================
+
+    def run(
+        self,
+        features_path: Optional[Union[str, Path]] = None,
+        output_dir: Optional[Union[str, Path]] = None,
+        n_jobs: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        top_k_reasons: Optional[int] = None,
+        model_version: Optional[str] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        restart: bool = False,
+        engine=None
+    ) -> Dict:
+        """
+        Score every feature chunk not yet written.
+
+        Chunks are scored in parallel and written in input order; each
+        written chunk is then recorded in the checkpoint. A chunk
+        interrupted between the write and the checkpoint is written again
+        on resume.
+
+        Args:
+            features_path: Parquet file or directory (config value if None)
+            output_dir: Write Parquet parts here instead of the database
+            n_jobs: Worker processes (-1 for all cores, 1 to score inline)
+            chunk_size: Rows per chunk
+            top_k_reasons: SHAP reasons per client (0 to skip)
+            model_version: Version recorded with each decision (version of
+                the model artifacts if None, e.g. v1.0.0_compressed)
+            checkpoint_path: Checkpoint file
+            restart: Ignore and replace an existing checkpoint
+            engine: Database engine (get_engine() if None and no output_dir)
+
+        Returns:
+            Dictionary with rows, chunks, skipped chunks, seconds and rows/s
+        """
+        s = self.settings
+        features_path = Path(features_path or s['features_path'])
+        files = feature_files(features_path)
+        root = features_path if features_path.is_dir() else None
+        n_jobs = int(n_jobs if n_jobs is not None else s['n_jobs'])
+        if n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        chunk_size = int(chunk_size or s['chunk_size'])
+        top_k_reasons = int(top_k_reasons if top_k_reasons is not None else s['top_k_reasons'])
+        model_version = model_version or s['model_version']
+        if model_version is None:
+            # Same version as the API serving these artifacts
+            model_version = load_production_artifacts(self.models_dir, s['model_filename']).model_version
+        checkpoint_path = Path(checkpoint_path or s['checkpoint_path'])
+
+        if output_dir is not None:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+        elif engine is None:
+            from src.utils.database import get_engine
+            engine = get_engine(self.config)
+
+        # Chunk keys only make sense for the same input and chunking
+        run_key = {
+            'features_path': [str(f) for f in files],
+            'chunk_size': chunk_size,
+            'model_version': model_version,
+        }
+        done = set() if restart else self._load_checkpoint(checkpoint_path, run_key)
+
+        scorer_args = (str(self.models_dir), s['model_filename'], top_k_reasons)
+        with open(self.models_dir / "feature_names.json") as f:
+            columns = ['sk_id_curr'] + json.load(f)
+
+        print(f"Scoring {len(files)} feature file(s) with {n_jobs} worker(s), "
+              f"{chunk_size:,} rows per chunk ({len(done)} chunks already written)")
+
+        start_time = time.time()
+        rows = chunks = skipped = 0
+
+        def write(key: str, results: pd.DataFrame) -> None:
+            nonlocal rows, chunks
+            rows += self._write(key, results, output_dir, engine)
+            chunks += 1
+            done.add(key)
+            self._save_checkpoint(checkpoint_path, run_key, done)
+            elapsed = time.time() - start_time
+            print(f"  {key}: {rows:,} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+        def pending_chunks() -> Iterator[Tuple[str, pd.DataFrame]]:
+            nonlocal skipped
+            for key, chunk in iter_feature_chunks(files, chunk_size, columns, root):
+                if key in done:
+                    skipped += 1
+                else:
+                    yield key, chunk
+
+        if n_jobs == 1:
+            scorer = ModelScorer(*scorer_args)
+            for key, chunk in pending_chunks():
+                write(key, scorer.score(chunk, model_version))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=n_jobs, initializer=_init_worker, initargs=scorer_args
+            ) as executor:
+                # At most 2 chunks per worker in flight: bounded memory, busy workers
+                in_flight: deque = deque()
+                for key, chunk in pending_chunks():
+                    in_flight.append((key, executor.submit(_score_in_worker, chunk, model_version)))
+                    if len(in_flight) >= 2 * n_jobs:
+                        key, future = in_flight.popleft()
+                        write(key, future.result())
+                while in_flight:
+                    key, future = in_flight.popleft()
+                    write(key, future.result())
+
+        elapsed = time.time() - start_time
+        return {
+            'rows': rows,
+            'chunks': chunks,
+            'skipped_chunks': skipped,
+            'seconds': round(elapsed, 2),
+            'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+def run_batch_scoring(**kwargs) -> Dict:
+    """Main function to score the feature store."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Batch Scoring")
+    print("=" * 60)
+
+    stats = BatchScorer().run(**kwargs)
+
+    print(f"\n{stats['rows']:,} rows scored in {stats['seconds']:.1f}s "
+          f"({stats['rows_per_second']:,.0f} rows/s, {stats['skipped_chunks']} chunks resumed)")
+    print("\nBatch scoring complete!")
+    return stats
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Score the feature store into credit_risk.predictions")
+    parser.add_argument("--features", default=None,
+                        help="Parquet file or directory of feature partitions (config value by default)")
+    parser.add_argument("--output-dir", default=None,
+                        help="Write Parquet parts here instead of the database")
+    parser.add_argument("--n-jobs", type=int, default=None,
+                        help="Worker processes (-1 for all cores)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Rows per chunk")
+    parser.add_argument("--top-k-reasons", type=int, default=None,
+                        help="SHAP reasons per client (0 to skip)")
+    parser.add_argument("--model-version", default=None,
+                        help="Version recorded with each decision (model artifacts version by default)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the checkpoint and score everything again")
+    args = parser.parse_args()
+
+    run_batch_scoring(
+        features_path=args.features,
+        output_dir=args.output_dir,
+        n_jobs=args.n_jobs,
+        chunk_size=args.chunk_size,
+        top_k_reasons=args.top_k_reasons,
+        model_version=args.model_version,
+        restart=args.restart,
+    )
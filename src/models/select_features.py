@@ -0,0 +1,471 @@
+"""
+Feature selection for Credit Risk Scoring Project.
+
+This module shrinks the model's feature vector in three passes, on the
+train / validation split of src.models.train:
+- Importance: features whose share of the total gain and of the mean
+  |SHAP| are both below min_importance are dropped
+- Correlation: of two features correlated above
+  features.correlation_threshold, the less important one is dropped
+- Recursive elimination: the least important features are removed in
+  steps; each round evaluates several subset sizes in parallel worker
+  processes (memory-mapped split, as in src.models.tune), keeps the
+  smallest one within max_auc_drop of the full model on the validation
+  and test splits, and re-ranks its features before the next round
+- The model is retrained on the selected features into output_dir
+  (models/selected) and the report compares AUC, serving latency
+  (prediction + SHAP for one client) and the feature groups, hence the
+  table aggregations, that no longer need to be built
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import yaml
+
+from src.features.encoding import REGISTRY_FILENAME
+from src.models.artifacts import load_production_artifacts
+from src.models.evaluate import roc_auc
+from src.models.train import BEST_PARAMS_FILENAME, ID_COLUMN, TARGET_COLUMN, ModelTrainer, booster_params, resolve_nthread
+
+SELECTED_FEATURES_FILENAME = "selected_features.json"
+
+# Used when config.yaml has no model.feature_selection section
+DEFAULT_SELECTION_CONFIG = {
+    'min_importance': 0.001,
+    'max_auc_drop': 0.002,
+    'elimination_step': 0.2,
+    'min_features': 10,
+    'n_jobs': -1,
+    'correlation_sample_rows': 50000,
+    'shap_sample_rows': 2000,
+    'latency_repeats': 200,
+    'output_dir': 'models/selected',
+}
+
+# Feature group (FeatureEngineer.feature_groups) of each aggregate prefix
+FEATURE_GROUP_PREFIXES = {
+    'bureau_': 'bureau',
+    'prev_': 'previous_application',
+    'instal_': 'installments',
+    'pos_': 'pos_cash',
+    'cc_': 'credit_card',
+}
+
+
+def feature_group(name: str) -> str:
+    """Feature group of a feature ('application' unless it is an aggregate)."""
+    for prefix, group in FEATURE_GROUP_PREFIXES.items():
+        if name.startswith(prefix):
+            return group
+    return 'application'
+
+
+def importance_shares(booster: xgb.Booster, X_sample: np.ndarray, feature_names: List[str]) -> pd.DataFrame:
+    """
+    Share of the total gain and of the mean |SHAP| of each feature.
+
+    Args:
+        booster: Trained booster
+        X_sample: Rows used for SHAP
+        feature_names: Features of the booster, in order
+
+    Returns:
+        DataFrame indexed by feature with 'gain' and 'shap' shares
+    """
+    gain = pd.Series(booster.get_score(importance_type='total_gain'), dtype=float)
+    gain = gain.reindex(feature_names, fill_value=0.0)
+
+    contribs = booster.predict(xgb.DMatrix(X_sample, feature_names=feature_names), pred_contribs=True)
+    shap = pd.Series(np.abs(contribs[:, :-1]).mean(axis=0), index=feature_names)
+
+    return pd.DataFrame({
+        'gain': gain / max(gain.sum(), 1e-12),
+        'shap': shap / max(shap.sum(), 1e-12),
+    })
+
+
+def correlation_prune(X: pd.DataFrame, ranking: List[str], threshold: float) -> List[str]:
+    """
+    Features kept by correlation pruning.
+
+    Features are visited by decreasing importance; one is dropped when
+    its absolute correlation with an already kept feature exceeds the
+    threshold.
+
+    Args:
+        X: Feature sample
+        ranking: Features, most important first
+        threshold: Maximum absolute correlation
+
+    Returns:
+        Kept features, in ranking order
+    """
+    corr = X[ranking].corr().abs().to_numpy()
+    kept = []
+    for i in range(len(ranking)):
+        if not any(corr[i, j] > threshold for j in kept):
+            kept.append(i)
+    return [ranking[i] for i in kept]
+
+
+# =============================================================================
+# SUBSET WORKER
+# =============================================================================
+
+def _evaluate_subset(
+    cache_dir: str,
+    columns: List[str],
+    params: Dict,
+    nthread: int,
+    early_stopping_rounds: int,
+    shap_sample_rows: int
+) -> Dict:
+    """
+    Train on a feature subset and score it on the validation and test splits.
+
+    Returns:
+        Subset, valid / test AUC, boosting rounds, seconds and the
+        importance shares of its features
+    """
+    start_time = time.time()
+    cache_dir = Path(cache_dir)
+    with open(cache_dir / "meta.json") as f:
+        meta = json.load(f)
+    index = [meta['feature_names'].index(col) for col in columns]
+    arrays = {
+        name: np.load(cache_dir / f"{name}.npy", mmap_mode='r')
+        for name in ('X_train', 'y_train', 'X_valid', 'y_valid', 'X_test', 'y_test')
+    }
+    X_train, X_valid, X_test = (np.ascontiguousarray(arrays[name][:, index])
+                                for name in ('X_train', 'X_valid', 'X_test'))
+
+    matrix_args = {'max_bin': meta['max_bin'], 'feature_names': columns, 'nthread': nthread}
+    dtrain = xgb.QuantileDMatrix(X_train, label=arrays['y_train'], **matrix_args)
+    dvalid = xgb.QuantileDMatrix(X_valid, label=arrays['y_valid'], ref=dtrain, **matrix_args)
+
+    native, num_boost_round = booster_params(params)
+    native.update({'tree_method': 'hist', 'max_bin': meta['max_bin'], 'nthread': nthread})
+    booster = xgb.train(native, dtrain, num_boost_round=num_boost_round, evals=[(dvalid, 'valid')],
+                        early_stopping_rounds=early_stopping_rounds, verbose_eval=False)
+    booster = booster[: booster.best_iteration + 1]
+
+    shares = importance_shares(booster, X_valid[:shap_sample_rows], columns)
+    return {
+        'n_features': len(columns),
+        'features': columns,
+        'valid_auc': roc_auc(arrays['y_valid'], booster.inplace_predict(X_valid)),
+        'test_auc': roc_auc(arrays['y_test'], booster.inplace_predict(X_test)),
+        'num_boost_round': int(booster.num_boosted_rounds()),
+        'seconds': round(time.time() - start_time, 2),
+        'importance': shares.to_dict(orient='index'),
+    }
+
+
+# =============================================================================
+# SELECTOR
+# =============================================================================
+
+class FeatureSelector:
+    """
+    Selects a reduced feature set and retrains the model on it.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml"):
+        """
+        Initialize the selector.
+
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config_path = config_path
+        self.config = self._load_config(config_path)
+        self.settings = {**DEFAULT_SELECTION_CONFIG, **self.config.get('model', {}).get('feature_selection', {})}
+        self.correlation_threshold = float(self.config.get('features', {}).get('correlation_threshold', 0.95))
+        self.trainer = ModelTrainer(config_path)
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    def cache_split(self, df: pd.DataFrame, cache_dir: Path) -> Tuple[Dict, pd.DataFrame]:
+        """
+        Encode and split the features once, as .npy files for the workers.
+
+        Returns:
+            (training parameters, sample of the encoded training rows)
+        """
+        X, y = self.trainer.prepare(df)
+        splits = self.trainer.split(X, y)
+        del X, y
+
+        for name, (X_part, y_part) in splits.items():
+            np.save(cache_dir / f"X_{name}.npy", np.ascontiguousarray(X_part.to_numpy(dtype=np.float32)))
+            np.save(cache_dir / f"y_{name}.npy", y_part)
+        with open(cache_dir / "meta.json", 'w') as f:
+            json.dump({'feature_names': self.trainer.feature_names,
+                       'max_bin': int(self.trainer.settings['max_bin'])}, f)
+
+        X_train = splits['train'][0]
+        sample = X_train.sample(n=min(int(self.settings['correlation_sample_rows']), len(X_train)),
+                                random_state=self.trainer.random_state)
+        return self.trainer.load_params(splits['train'][1]), sample
+
+    def eliminate(self, cache_dir: Path, ranking: List[str], full: Dict, worker_args: Dict,
+                  n_jobs: int) -> Tuple[Dict, List[Dict]]:
+        """
+        Recursive elimination, subset sizes of a round evaluated in parallel.
+
+        Every subset kept, the filtered ranking included, is within
+        max_auc_drop of the full model on the validation and test splits;
+        when the ranking itself is not, elimination starts from the full
+        feature set.
+
+        Args:
+            cache_dir: Cached split
+            ranking: Features, most important first
+            full: Evaluation of the full model (AUC bounds)
+            worker_args: Parameters of _evaluate_subset
+            n_jobs: Worker processes (subset sizes per round)
+
+        Returns:
+            (evaluation of the selected subset, evaluations of every round)
+        """
+        step = float(self.settings['elimination_step'])
+        min_features = int(self.settings['min_features'])
+        max_drop = float(self.settings['max_auc_drop'])
+
+        def within_bounds(result: Dict) -> bool:
+            # Bounded on the test split too: rounds select on the validation split
+            return (result['valid_auc'] >= full['valid_auc'] - max_drop
+                    and result['test_auc'] >= full['test_auc'] - max_drop)
+
+        current = _evaluate_subset(str(cache_dir), ranking, **worker_args)
+        rounds = [current]
+        print(f"    {current['n_features']:>4} features: valid AUC {current['valid_auc']:.4f} "
+              f"({current['seconds']:.1f}s)")
+        if not within_bounds(current):
+            print(f"    Filtered features lose more than {max_drop} AUC: starting from the full feature set")
+            current = full
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context) as executor:
+            while len(current['features']) > min_features:
+                importance = pd.DataFrame.from_dict(current['importance'], orient='index')
+                ranked = importance.sort_values(['shap', 'gain'], ascending=False).index.tolist()
+                sizes = sorted({max(int(len(ranked) * (1 - step) ** i), min_features) for i in range(1, n_jobs + 1)}
+                               - {len(ranked)})
+                if not sizes:
+                    break
+
+                futures = [executor.submit(_evaluate_subset, str(cache_dir), ranked[:size], **worker_args)
+                           for size in sizes]
+                results = [future.result() for future in futures]
+                rounds.extend(results)
+                for result in results:
+                    print(f"    {result['n_features']:>4} features: valid AUC {result['valid_auc']:.4f} "
+                          f"({result['seconds']:.1f}s)")
+
+                passing = [r for r in results if within_bounds(r)]
+                if not passing:
+                    break
+                current = min(passing, key=lambda r: r['n_features'])
+        return current, rounds
+
+    def latency(self, artifacts, X: pd.DataFrame) -> Dict[str, float]:
+        """Median serving latency of one client: probability and SHAP values (ms)."""
+        row = X[artifacts.feature_names].iloc[:1]
+        dmatrix = xgb.DMatrix(row)
+        repeats = int(self.settings['latency_repeats'])
+
+        def median_ms(func) -> float:
+            timings = np.empty(repeats)
+            for i in range(repeats):
+                start = time.perf_counter()
+                func()
+                timings[i] = time.perf_counter() - start
+            return round(float(np.median(timings)) * 1e3, 4)
+
+        return {
+            'predict_ms': median_ms(lambda: artifacts.classifier.predict_proba(row)),
+            'shap_ms': median_ms(lambda: artifacts.booster.predict(dmatrix, pred_contribs=True)),
+        }
+
+    def run(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        features_path: Optional[Union[str, Path]] = None,
+        n_jobs: Optional[int] = None,
+        retrain: bool = True
+    ) -> Dict:
+        """
+        Select the features, retrain and write the report.
+
+        Args:
+            df: Feature DataFrame (loaded from features_path if None)
+            features_path: Feature artifact (config value if None)
+            n_jobs: Worker processes (-1 for all cores)
+            retrain: Retrain the model on the selected features
+
+        Returns:
+            Report written to selected_features.json
+        """
+        s = self.settings
+        n_jobs = resolve_nthread(n_jobs if n_jobs is not None else s['n_jobs'])
+        nthread = max(1, self.trainer.nthread // n_jobs)
+        output_dir = Path(s['output_dir'])
+        max_drop = float(s['max_auc_drop'])
+        if df is None:
+            df = self.trainer.load_features(features_path)
+
+        start_time = time.time()
+        with tempfile.TemporaryDirectory(prefix="selection-") as cache_dir:
+            params, sample = self.cache_split(df, Path(cache_dir))
+            feature_names = list(self.trainer.feature_names)
+            worker_args = {
+                'params': params,
+                'nthread': nthread,
+                'early_stopping_rounds': int(self.trainer.settings['early_stopping_rounds']),
+                'shap_sample_rows': int(s['shap_sample_rows']),
+            }
+
+            print(f"\nFull model ({len(feature_names)} features)...")
+            full = _evaluate_subset(cache_dir, feature_names, **worker_args)
+            print(f"  Valid AUC {full['valid_auc']:.4f}, test AUC {full['test_auc']:.4f}")
+
+            importance = pd.DataFrame.from_dict(full['importance'], orient='index')
+            important = importance[(importance['gain'] >= s['min_importance'])
+                                   | (importance['shap'] >= s['min_importance'])]
+            ranking = important.sort_values(['shap', 'gain'], ascending=False).index.tolist()
+            print(f"  Importance >= {s['min_importance']}: {len(ranking)} features")
+
+            ranking = correlation_prune(sample, ranking, self.correlation_threshold)
+            print(f"  Correlation <= {self.correlation_threshold}: {len(ranking)} features")
+
+            print(f"\nRecursive elimination ({n_jobs} worker(s) x {nthread} thread(s))...")
+            selected, rounds = self.eliminate(Path(cache_dir), ranking, full, worker_args, n_jobs)
+        selection_time = time.time() - start_time
+
+        features = selected['features']
+        kept_groups = {feature_group(f) for f in features}
+        report = {
+            'features': features,
+            'n_features': {'full': len(feature_names), 'importance': len(important),
+                           'correlation': len(ranking), 'selected': len(features)},
+            'max_auc_drop': max_drop,
+            'correlation_threshold': self.correlation_threshold,
+            'valid_auc': {'full': full['valid_auc'], 'selected': selected['valid_auc']},
+            'test_auc': {'full': full['test_auc'], 'selected': selected['test_auc']},
+            'feature_groups': {
+                group: {'full': sum(feature_group(f) == group for f in feature_names),
+                        'selected': sum(feature_group(f) == group for f in features)}
+                for group in ['application', *FEATURE_GROUP_PREFIXES.values()]
+            },
+            # Aggregations FeatureEngineer no longer needs to build
+            'skippable_feature_groups': sorted(set(FEATURE_GROUP_PREFIXES.values()) - kept_groups),
+            'rounds': [{k: v for k, v in r.items() if k not in ('features', 'importance')} for r in rounds],
+            'selection_time_seconds': round(selection_time, 2),
+        }
+        print(f"\nSelected {len(features)}/{len(feature_names)} features: valid AUC "
+              f"{full['valid_auc']:.4f} -> {selected['valid_auc']:.4f}, test AUC "
+              f"{full['test_auc']:.4f} -> {selected['test_auc']:.4f}")
+        if report['skippable_feature_groups']:
+            print(f"  Feature groups no longer needed: {', '.join(report['skippable_feature_groups'])}")
+
+        if retrain:
+            report['retrained'] = self.retrain(df, features, output_dir)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / SELECTED_FEATURES_FILENAME
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport saved to: {path}")
+        return report
+
+    def retrain(self, df: pd.DataFrame, features: List[str], output_dir: Path) -> Dict:
+        """
+        Train the model on the selected features into output_dir.
+
+        The tuned parameters and category codes of the production model
+        are reused. Serving latency is compared with the production model.
+
+        Returns:
+            Test AUC and serving latency, production and selected
+        """
+        models_dir = self.trainer.models_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for filename in (BEST_PARAMS_FILENAME, REGISTRY_FILENAME):
+            if (models_dir / filename).exists():
+                shutil.copy(models_dir / filename, output_dir / filename)
+
+        print(f"\nRetraining on {len(features)} features into {output_dir}...")
+        trainer = ModelTrainer(self.config_path)
+        trainer.models_dir = output_dir
+        metrics = trainer.run(df[[ID_COLUMN, TARGET_COLUMN] + features], save_plots=False)
+
+        ts = trainer.settings
+        X = self.trainer.registry.encode_frame(df.drop(columns=[ID_COLUMN, TARGET_COLUMN]).head(100))
+        X = X.astype(np.float32)
+        selected = load_production_artifacts(output_dir, ts['model_filename'], ts['model_version'])
+        retrained = {
+            'test_auc': metrics['auc_roc'],
+            'num_boost_round': metrics['num_boost_round'],
+            'selected_latency': self.latency(selected, X),
+        }
+        try:
+            production = load_production_artifacts(models_dir, ts['model_filename'], ts['model_version'])
+        except FileNotFoundError:
+            print(f"  No production model in {models_dir}, latency not compared")
+            return retrained
+
+        retrained['production_latency'] = self.latency(production, X.reindex(columns=production.feature_names))
+        print(f"  Serving latency (ms): predict {retrained['production_latency']['predict_ms']:.3f} -> "
+              f"{retrained['selected_latency']['predict_ms']:.3f}, SHAP "
+              f"{retrained['production_latency']['shap_ms']:.3f} -> {retrained['selected_latency']['shap_ms']:.3f}")
+        return retrained
+
+
+def run_feature_selection(features_path: Optional[str] = None, n_jobs: Optional[int] = None,
+                          retrain: bool = True) -> Dict:
+    """Main function to select the model features."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Feature Selection")
+    print("=" * 60)
+
+    report = FeatureSelector().run(features_path=features_path, n_jobs=n_jobs, retrain=retrain)
+
+    print("\nFeature selection complete!")
+    return report
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Select a reduced feature set and retrain the model")
+    parser.add_argument("--features", default=None,
+                        help="Feature artifact, Parquet or CSV (config value by default)")
+    parser.add_argument("--n-jobs", type=int, default=None,
+                        help="Worker processes (-1 for all cores)")
+    parser.add_argument("--no-retrain", action="store_true",
+                        help="Only write the selected feature list")
+    args = parser.parse_args()
+
+    run_feature_selection(features_path=args.features, n_jobs=args.n_jobs, retrain=not args.no_retrain)
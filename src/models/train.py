@@ -0,0 +1,933 @@
+"""
+Model training for Credit Risk Scoring Project.
+
+This module trains the production XGBoost model from the feature
+artifact (replaces the training part of notebooks/03_modeling.ipynb):
+- Categorical features encoded with the shared category registry
+- Stratified train / validation / test split (70/15/15)
+- One QuantileDMatrix built up front (histogram bins computed once),
+  trained with tree_method='hist' on `nthread` cores and early stopping
+- Artifacts written the way the API expects: native UBJSON booster with
+  its manifest (src/models/artifacts.py), feature_names.json,
+  category_codes.json, metrics.json and plots (plus the legacy pickled
+  XGBClassifier)
+- Training time and peak memory recorded in metrics.json
+- Probabilities calibrated on the validation split (lookup table in
+  the manifest, src/models/calibration.py), reported on the test set
+- External-memory mode (--external-memory) for feature sets larger than
+  RAM: the Parquet partitions are streamed through a data iterator and
+  the quantized pages are cached on disk (src/models/external_memory.py)
+- Incremental mode (--incremental): the production booster keeps
+  boosting on newly labelled data, or only its leaf values are refreshed;
+  a guard keeps the production model when the update falls clearly
+  below a model trained from scratch on the same data
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import yaml
+from sklearn.metrics import (
+    average_precision_score, confusion_matrix, f1_score, precision_recall_curve,
+    precision_score, recall_score, roc_auc_score, roc_curve
+)
+from sklearn.model_selection import train_test_split
+
+from src.features.encoding import MISSING_TOKEN, REGISTRY_FILENAME, CategoryRegistry, load_category_registry
+from src.models.artifacts import load_production_artifacts, save_model_artifacts
+from src.models.calibration import DEFAULT_CALIBRATION_CONFIG, ScoreCalibration, calibration_report, fit_calibration
+from src.models.external_memory import (
+    SPLITS, FeatureBatchIter, iter_encoded_batches, scan_partitions, split_of
+)
+from src.models.score import feature_files
+from src.utils.memory import MB, MemoryTracker
+
+ID_COLUMN = 'sk_id_curr'
+TARGET_COLUMN = 'target'
+
+BEST_PARAMS_FILENAME = "best_params.json"
+
+# Used when config.yaml has no model.training section
+DEFAULT_TRAINING_CONFIG = {
+    'features_path': 'data/features/features_v1.parquet',
+    'model_filename': 'xgboost_credit_risk_v1.pkl',
+    'model_version': 'v1.0.0',
+    'legacy_pickle': True,
+    'tree_method': 'hist',
+    'max_bin': 256,
+    'nthread': -1,
+    'early_stopping_rounds': 50,
+    'shap_sample_size': 1000,
+    'external_memory': False,
+    'external_cache_dir': 'data/features/xgb_cache',
+    'external_batch_rows': 100000,
+    'min_cache_page_mb': 64,
+    'incremental_rounds': 100,
+    'incremental_guard': True,
+    'incremental_auc_tolerance': 0.005,
+}
+
+# 'continue': new trees on top of the production booster
+# 'refresh': same trees, leaf values recomputed on the new data
+INCREMENTAL_MODES = ('continue', 'refresh')
+
+# scikit-learn parameter names -> native XGBoost names
+_NATIVE_PARAM_NAMES = {'random_state': 'seed', 'n_jobs': 'nthread'}
+_SKLEARN_ONLY_PARAMS = ('n_estimators', 'use_label_encoder', 'early_stopping_rounds')
+
+
+def booster_params(params: Dict) -> Tuple[Dict, int]:
+    """
+    Split scikit-learn style parameters into native parameters and rounds.
+
+    Args:
+        params: XGBClassifier-style parameters (n_estimators, random_state...)
+
+    Returns:
+        (native parameters for xgb.train, number of boosting rounds)
+    """
+    native = {
+        _NATIVE_PARAM_NAMES.get(name, name): value
+        for name, value in params.items()
+        if name not in _SKLEARN_ONLY_PARAMS
+    }
+    return native, int(params.get('n_estimators', 100))
+
+
+def resolve_nthread(nthread: int) -> int:
+    """Number of threads, -1 (or 0) meaning every core."""
+    return int(nthread) if nthread and nthread > 0 else (os.cpu_count() or 1)
+
+
+def classification_metrics(y_true: np.ndarray, proba: np.ndarray, threshold: float = 0.5) -> Dict[str, float]:
+    """
+    Metrics of metrics.json (same definitions as the modeling notebook).
+
+    Args:
+        y_true: Binary labels
+        proba: Predicted default probabilities
+        threshold: Decision threshold
+
+    Returns:
+        Dictionary with auc_roc, gini, precision, recall and f1_score
+    """
+    y_pred = (proba >= threshold).astype(int)
+    auc = roc_auc_score(y_true, proba)
+    return {
+        'auc_roc': float(auc),
+        'gini': float(2 * auc - 1),
+        'precision': float(precision_score(y_true, y_pred, zero_division=0)),
+        'recall': float(recall_score(y_true, y_pred, zero_division=0)),
+        'f1_score': float(f1_score(y_true, y_pred, zero_division=0)),
+    }
+
+
+def plot_evaluation(y_true: np.ndarray, proba: np.ndarray, output_dir: Path, prefix: str = '') -> None:
+    """
+    Confusion matrix, ROC and precision-recall plots (as in the notebook).
+
+    Args:
+        y_true: Binary labels
+        proba: Predicted default probabilities
+        output_dir: Directory receiving the PNG files
+        prefix: File name prefix
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    auc = roc_auc_score(y_true, proba)
+    labels = ['Pas de défaut', 'Défaut']
+
+    cm = confusion_matrix(y_true, (proba >= 0.5).astype(int))
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.imshow(cm, cmap='Blues')
+    for (i, j), count in np.ndenumerate(cm):
+        ax.text(j, i, f"{count:d}", ha='center', va='center',
+                color='white' if count > cm.max() / 2 else 'black')
+    ax.set_xticks([0, 1], labels)
+    ax.set_yticks([0, 1], labels)
+    ax.set_xlabel('Prédit', fontsize=12)
+    ax.set_ylabel('Réel', fontsize=12)
+    ax.set_title('Matrice de Confusion - Test Set', fontsize=14)
+    fig.savefig(output_dir / f'{prefix}confusion_matrix.png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+    fpr, tpr, _ = roc_curve(y_true, proba)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(fpr, tpr, 'b-', linewidth=2, label=f'Modèle (AUC = {auc:.4f})')
+    ax.plot([0, 1], [0, 1], 'r--', linewidth=1, label='Random (AUC = 0.5)')
+    ax.set_xlabel('Taux de Faux Positifs (FPR)', fontsize=12)
+    ax.set_ylabel('Taux de Vrais Positifs (TPR)', fontsize=12)
+    ax.set_title('Courbe ROC - Credit Risk Scoring', fontsize=14)
+    ax.legend(loc='lower right', fontsize=11)
+    ax.grid(True, alpha=0.3)
+    fig.savefig(output_dir / f'{prefix}roc_curve.png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+    precision_curve, recall_curve, _ = precision_recall_curve(y_true, proba)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(recall_curve, precision_curve, 'g-', linewidth=2,
+            label=f'Modèle (AP = {average_precision_score(y_true, proba):.4f})')
+    ax.axhline(y=y_true.mean(), color='r', linestyle='--', label=f'Baseline ({y_true.mean():.4f})')
+    ax.set_xlabel('Recall', fontsize=12)
+    ax.set_ylabel('Precision', fontsize=12)
+    ax.set_title('Courbe Precision-Recall', fontsize=14)
+    ax.legend(loc='upper right', fontsize=11)
+    ax.grid(True, alpha=0.3)
+    fig.savefig(output_dir / f'{prefix}precision_recall_curve.png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+class ModelTrainer:
+    """
+    Trains and saves the credit risk model.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml"):
+        """
+        Initialize the trainer.
+
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config = self._load_config(config_path)
+        self.model_config = self.config.get('model', {})
+        self.settings = {**DEFAULT_TRAINING_CONFIG, **self.model_config.get('training', {})}
+
+        self.models_dir = Path(self.config.get('paths', {}).get('models', 'models'))
+        self.random_state = int(self.model_config.get('random_state', 42))
+        self.test_size = float(self.model_config.get('test_size', 0.15))
+        self.validation_size = float(self.model_config.get('validation_size', 0.15))
+        self.nthread = resolve_nthread(self.settings['nthread'])
+        self.calibration_settings = {**DEFAULT_CALIBRATION_CONFIG, **self.model_config.get('calibration', {})}
+
+        self.registry: Optional[CategoryRegistry] = None
+        self.calibration: Optional[ScoreCalibration] = None
+        self.feature_names = []
+        self.tracker = MemoryTracker()
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    # =========================================================================
+    # DATA
+    # =========================================================================
+
+    def load_features(self, path: Optional[Union[str, Path]] = None) -> pd.DataFrame:
+        """
+        Load the feature artifact.
+
+        Args:
+            path: Parquet or CSV file (config value if None; the CSV written
+                next to it by the feature pipeline is used when the Parquet
+                file does not exist)
+
+        Returns:
+            Feature DataFrame with sk_id_curr and target
+        """
+        path = Path(path or self.settings['features_path'])
+        if not path.exists() and path.suffix == '.parquet' and path.with_suffix('.csv').exists():
+            path = path.with_suffix('.csv')
+
+        print(f"Loading features from {path}...")
+        df = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+        print(f"  Shape: {df.shape[0]:,} rows, {df.shape[1]} columns")
+        return df
+
+    def fit_registry(self, df: pd.DataFrame) -> CategoryRegistry:
+        """
+        Category registry covering every categorical feature of df.
+
+        Existing codes (models/category_codes.json) never move: new
+        categories are appended. Columns unknown to the registry get sorted
+        categories, plus 'MISSING' when they have missing values (same
+        codes as the LabelEncoders of the notebook).
+
+        Args:
+            df: Feature DataFrame
+
+        Returns:
+            CategoryRegistry
+        """
+        observed = {
+            col: (set(df[col].dropna().astype(str).unique()), bool(df[col].isna().any()))
+            for col in df.columns
+            if col not in (ID_COLUMN, TARGET_COLUMN) and not pd.api.types.is_numeric_dtype(df[col])
+        }
+        return self.registry_from_observed(observed)
+
+    def registry_from_observed(self, observed: Dict[str, Tuple[set, bool]]) -> CategoryRegistry:
+        """
+        Category registry from the values observed per categorical column.
+
+        Args:
+            observed: Column -> (observed values, has missing values)
+
+        Returns:
+            CategoryRegistry (same rules as fit_registry)
+        """
+        existing = load_category_registry(self.models_dir)
+        categories = {}
+        for col, (values, has_missing) in observed.items():
+            if existing is not None and col in existing:
+                categories[col] = existing.categories(col, values)
+            else:
+                categories[col] = sorted(set(values) | ({MISSING_TOKEN} if has_missing else set()))
+        return CategoryRegistry(categories)
+
+    def prepare(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Encode categorical features and separate the target.
+
+        Args:
+            df: Feature DataFrame
+
+        Returns:
+            (float32 feature matrix as a DataFrame, labels)
+        """
+        self.registry = self.fit_registry(df)
+        y = df[TARGET_COLUMN].to_numpy(dtype=np.int8)
+
+        X = df.drop(columns=[c for c in (ID_COLUMN, TARGET_COLUMN) if c in df.columns])
+        X = self.registry.encode_frame(X, inplace=True).astype(np.float32)
+        self.feature_names = X.columns.tolist()
+
+        print(f"  Features: {len(self.feature_names)} ({len(self.registry.columns)} categorical)")
+        print(f"  Default rate: {y.mean() * 100:.2f}%")
+        return X, y
+
+    def split(self, X: pd.DataFrame, y: np.ndarray) -> Dict[str, Tuple[pd.DataFrame, np.ndarray]]:
+        """
+        Stratified train / validation / test split (70/15/15 by default).
+
+        Args:
+            X: Feature matrix
+            y: Labels
+
+        Returns:
+            Dictionary with 'train', 'valid' and 'test' (X, y) pairs
+        """
+        holdout = self.test_size + self.validation_size
+        X_train, X_temp, y_train, y_temp = train_test_split(
+            X, y, test_size=holdout, random_state=self.random_state, stratify=y
+        )
+        X_val, X_test, y_val, y_test = train_test_split(
+            X_temp, y_temp, test_size=self.test_size / holdout,
+            random_state=self.random_state, stratify=y_temp
+        )
+        print(f"  Split: train {len(y_train):,} / valid {len(y_val):,} / test {len(y_test):,}")
+        return {'train': (X_train, y_train), 'valid': (X_val, y_val), 'test': (X_test, y_test)}
+
+    def build_matrices(self, splits: Dict) -> Tuple[xgb.QuantileDMatrix, xgb.QuantileDMatrix]:
+        """
+        Quantize the training and validation sets once.
+
+        The validation matrix reuses the bin boundaries of the training
+        matrix (ref=), so both are sketched from the training data only.
+
+        Returns:
+            (dtrain, dvalid)
+        """
+        max_bin = int(self.settings['max_bin'])
+        X_train, y_train = splits['train']
+        X_val, y_val = splits['valid']
+        dtrain = xgb.QuantileDMatrix(X_train, label=y_train, max_bin=max_bin, nthread=self.nthread)
+        dvalid = xgb.QuantileDMatrix(X_val, label=y_val, ref=dtrain, max_bin=max_bin, nthread=self.nthread)
+        return dtrain, dvalid
+
+    # =========================================================================
+    # TRAINING
+    # =========================================================================
+
+    def load_params(self, y_train: np.ndarray) -> Dict:
+        """
+        Training parameters.
+
+        Config defaults (model.xgboost), overridden by the tuned parameters
+        of models/best_params.json when present. scale_pos_weight is the
+        negative / positive ratio of the training set.
+
+        Args:
+            y_train: Training labels
+
+        Returns:
+            XGBClassifier-style parameters
+        """
+        params = dict(self.model_config.get('xgboost', {}))
+        best_params_path = self.models_dir / BEST_PARAMS_FILENAME
+        if best_params_path.exists():
+            with open(best_params_path, 'r') as f:
+                params.update(json.load(f))
+            print(f"  Tuned parameters: {best_params_path}")
+
+        params.update({
+            'scale_pos_weight': float((y_train == 0).sum() / max((y_train == 1).sum(), 1)),
+            'random_state': self.random_state,
+            'eval_metric': 'auc',
+            'objective': 'binary:logistic',
+        })
+        return params
+
+    def train(
+        self,
+        dtrain: xgb.QuantileDMatrix,
+        dvalid: xgb.QuantileDMatrix,
+        params: Dict
+    ) -> xgb.Booster:
+        """
+        Train with the histogram method and early stopping on validation AUC.
+
+        Args:
+            dtrain: Training matrix
+            dvalid: Validation matrix (same bins)
+            params: XGBClassifier-style parameters
+
+        Returns:
+            Booster truncated to its best iteration
+        """
+        native, num_boost_round = booster_params(params)
+        native.update({
+            'tree_method': self.settings['tree_method'],
+            'max_bin': int(self.settings['max_bin']),
+            'nthread': self.nthread,
+        })
+
+        booster = xgb.train(
+            native,
+            dtrain,
+            num_boost_round=num_boost_round,
+            evals=[(dvalid, 'valid')],
+            early_stopping_rounds=int(self.settings['early_stopping_rounds']),
+            verbose_eval=False,
+        )
+        best_iteration = booster.best_iteration
+        print(f"  Best iteration: {best_iteration + 1}/{num_boost_round} (valid AUC {booster.best_score:.4f})")
+        return booster[: best_iteration + 1]
+
+    @staticmethod
+    def to_classifier(booster: xgb.Booster) -> xgb.XGBClassifier:
+        """XGBClassifier wrapping a trained booster (artifact loaded by the API)."""
+        model = xgb.XGBClassifier()
+        model.load_model(booster.save_raw('ubj'))
+        return model
+
+    def calibrate(self, y_valid: np.ndarray, proba_valid: np.ndarray, y_test: np.ndarray,
+                  proba_test: np.ndarray) -> Optional[Dict]:
+        """
+        Fit the probability calibration on the validation split.
+
+        Args:
+            y_valid: Validation labels
+            proba_valid: Raw validation probabilities
+            y_test: Test labels
+            proba_test: Raw test probabilities
+
+        Returns:
+            Calibration report on the test set (None if disabled)
+        """
+        self.calibration = None
+        if not self.calibration_settings['enabled']:
+            return None
+
+        self.calibration = fit_calibration(y_valid, proba_valid, self.calibration_settings)
+        report = calibration_report(self.calibration, y_test, proba_test)
+        print(f"\nCalibration ({report['method']}, {report['n_knots']} knots): mean probability "
+              f"{report['mean_raw']:.4f} -> {report['mean_calibrated']:.4f} "
+              f"(default rate {report['default_rate']:.4f}), Brier {report['brier_raw']:.4f} -> "
+              f"{report['brier_calibrated']:.4f}")
+        return report
+
+    # =========================================================================
+    # ARTIFACTS
+    # =========================================================================
+
+    def save_artifacts(self, model: xgb.XGBClassifier, metrics: Dict) -> Dict[str, Path]:
+        """
+        Save the model, feature names, category registry and metrics.
+
+        The native model, its calibration and the manifest are written
+        first; the pickle only when legacy_pickle is set.
+
+        Returns:
+            Dictionary of artifact paths
+        """
+        self.models_dir.mkdir(parents=True, exist_ok=True)
+        paths = {
+            'manifest': save_model_artifacts(
+                model.get_booster(), self.models_dir, self.settings['model_filename'],
+                self.feature_names, self.registry, self.settings['model_version'], metrics,
+                self.calibration
+            ),
+            'feature_names': self.models_dir / "feature_names.json",
+            'category_codes': self.models_dir / REGISTRY_FILENAME,
+            'metrics': self.models_dir / "metrics.json",
+        }
+        if self.settings['legacy_pickle']:
+            paths['model'] = self.models_dir / self.settings['model_filename']
+            joblib.dump(model, paths['model'])
+        with open(paths['feature_names'], 'w') as f:
+            json.dump(self.feature_names, f)
+        self.registry.save(paths['category_codes'])
+        with open(paths['metrics'], 'w') as f:
+            json.dump(metrics, f, indent=2, default=str)
+
+        for name, path in paths.items():
+            print(f"  {name}: {path}")
+        return paths
+
+    def save_plots(self, model: xgb.XGBClassifier, X_test: pd.DataFrame, y_test: np.ndarray,
+                   proba: np.ndarray) -> None:
+        """Confusion matrix, ROC, precision-recall and SHAP plots (as in the notebook)."""
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import shap
+
+        plot_evaluation(y_test, proba, self.models_dir)
+
+        sample = X_test.sample(n=min(int(self.settings['shap_sample_size']), len(X_test)),
+                               random_state=self.random_state)
+        shap_values = shap.TreeExplainer(model).shap_values(sample)
+        for plot_type, filename, title in [
+            ('bar', 'shap_importance.png', 'Top 20 Features - Importance SHAP'),
+            ('dot', 'shap_summary.png', 'Impact des Features sur la Prédiction'),
+        ]:
+            plt.figure(figsize=(14, 12))
+            shap.summary_plot(shap_values, sample, plot_type=plot_type, show=False, max_display=20)
+            plt.title(title, fontsize=14)
+            plt.tight_layout()
+            plt.savefig(self.models_dir / filename, dpi=150, bbox_inches='tight')
+            plt.close('all')
+
+        print(f"  Plots saved to {self.models_dir}")
+
+    # =========================================================================
+    # PIPELINE
+    # =========================================================================
+
+    def run(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        features_path: Optional[Union[str, Path]] = None,
+        save_plots: bool = True
+    ) -> Dict:
+        """
+        Train, evaluate on the test set and save the artifacts.
+
+        Args:
+            df: Feature DataFrame (loaded from features_path if None)
+            features_path: Feature artifact (config value if None)
+            save_plots: Also write the evaluation and SHAP plots
+
+        Returns:
+            Metrics written to metrics.json
+        """
+        with self.tracker.step("load"):
+            if df is None:
+                df = self.load_features(features_path)
+        with self.tracker.step("prepare"):
+            X, y = self.prepare(df)
+            del df
+            splits = self.split(X, y)
+            del X, y
+
+        print(f"\nTraining XGBoost ({self.settings['tree_method']}, {self.nthread} threads)...")
+        train_start = time.time()
+        with self.tracker.step("quantize"):
+            dtrain, dvalid = self.build_matrices(splits)
+        params = self.load_params(splits['train'][1])
+        with self.tracker.step("train"):
+            booster = self.train(dtrain, dvalid, params)
+        training_time = time.time() - train_start
+
+        print("\nEvaluating on the test set...")
+        with self.tracker.step("evaluate"):
+            model = self.to_classifier(booster)
+            X_test, y_test = splits['test']
+            proba = booster.inplace_predict(X_test)
+            metrics = classification_metrics(y_test, proba)
+        for name, value in metrics.items():
+            print(f"  {name}: {value:.4f}")
+        X_val, y_val = splits['valid']
+        calibration = self.calibrate(y_val, booster.inplace_predict(X_val), y_test, proba)
+
+        metrics.update({
+            'best_params': params,
+            'num_boost_round': int(booster.num_boosted_rounds()),
+            'n_features': len(self.feature_names),
+            'n_train': int(len(splits['train'][1])),
+            'n_valid': int(len(splits['valid'][1])),
+            'n_test': int(len(y_test)),
+            'tree_method': self.settings['tree_method'],
+            'nthread': self.nthread,
+            'training_time_seconds': round(training_time, 2),
+            'peak_memory_mb': round(self.tracker.peak_mb, 1),
+            'calibration': calibration,
+        })
+
+        print("\nSaving artifacts...")
+        self.save_artifacts(model, metrics)
+        if save_plots:
+            self.save_plots(model, X_test, y_test, proba)
+
+        print("\nMemory by step:")
+        self.tracker.report()
+        return metrics
+
+    def run_external(
+        self,
+        features_path: Optional[Union[str, Path]] = None,
+        in_memory: bool = False
+    ) -> Dict:
+        """
+        Train from the Parquet partitions without loading them in memory.
+
+        The partitions are read in batches of external_batch_rows rows.
+        ExtMemQuantileDMatrix quantizes each split and writes its pages to
+        a temporary directory under external_cache_dir, removed once the
+        model is trained. Rows are split by a hash of sk_id_curr (not
+        stratified). No plots are written (they need the test set in
+        memory).
+
+        Args:
+            features_path: Parquet file or directory of partitions
+                (config value if None)
+            in_memory: Load the same batches in a QuantileDMatrix instead
+                (reference for benchmarks)
+
+        Returns:
+            Metrics written to metrics.json
+        """
+        files = feature_files(features_path or self.settings['features_path'])
+        batch_rows = int(self.settings['external_batch_rows'])
+        max_bin = int(self.settings['max_bin'])
+        mode = 'in-memory' if in_memory else 'external memory'
+
+        print(f"Scanning {len(files)} feature partition(s)...")
+        with self.tracker.step("scan"):
+            self.feature_names, observed, labels = scan_partitions(files, ID_COLUMN, TARGET_COLUMN, batch_rows)
+            self.registry = self.registry_from_observed(observed)
+            split = split_of(labels[ID_COLUMN].to_numpy(), self.test_size, self.validation_size)
+            y = labels[TARGET_COLUMN].to_numpy(dtype=np.int8)
+            counts = {name: int((split == name).sum()) for name in SPLITS}
+            y_train = y[split == 'train']
+            del labels, split, y
+        print(f"  Features: {len(self.feature_names)} ({len(self.registry.columns)} categorical)")
+        print(f"  Split: train {counts['train']:,} / valid {counts['valid']:,} / test {counts['test']:,}")
+
+        def batches(name: str):
+            return lambda: iter_encoded_batches(
+                files, self.registry, self.feature_names, name, batch_rows,
+                self.test_size, self.validation_size, ID_COLUMN, TARGET_COLUMN
+            )
+
+        cache_root = Path(self.settings['external_cache_dir'])
+        cache_root.mkdir(parents=True, exist_ok=True)
+        min_page_bytes = int(self.settings['min_cache_page_mb'] * MB)
+
+        print(f"\nTraining XGBoost ({mode}, {self.nthread} threads)...")
+        train_start = time.time()
+        with tempfile.TemporaryDirectory(dir=cache_root, prefix="train-") as cache_dir:
+            with self.tracker.step("quantize"):
+                if in_memory:
+                    dtrain = xgb.QuantileDMatrix(FeatureBatchIter(batches('train'), self.feature_names),
+                                                 max_bin=max_bin, nthread=self.nthread)
+                    dvalid = xgb.QuantileDMatrix(FeatureBatchIter(batches('valid'), self.feature_names),
+                                                 ref=dtrain, max_bin=max_bin, nthread=self.nthread)
+                else:
+                    dtrain = xgb.ExtMemQuantileDMatrix(
+                        FeatureBatchIter(batches('train'), self.feature_names,
+                                         os.path.join(cache_dir, 'train'), min_page_bytes),
+                        max_bin=max_bin, nthread=self.nthread
+                    )
+                    dvalid = xgb.ExtMemQuantileDMatrix(
+                        FeatureBatchIter(batches('valid'), self.feature_names,
+                                         os.path.join(cache_dir, 'valid'), min_page_bytes),
+                        ref=dtrain, max_bin=max_bin, nthread=self.nthread
+                    )
+            cache_mb = sum(f.stat().st_size for f in Path(cache_dir).rglob('*') if f.is_file()) / MB
+            if not in_memory:
+                print(f"  Page cache: {cache_mb:.1f} MB in {cache_root}")
+
+            params = self.load_params(y_train)
+            with self.tracker.step("train"):
+                booster = self.train(dtrain, dvalid, params)
+            del dtrain, dvalid
+        training_time = time.time() - train_start
+
+        print("\nEvaluating on the test set...")
+
+        def predict(name: str) -> Tuple[np.ndarray, np.ndarray]:
+            y_parts, proba_parts = [], []
+            for X_batch, y_batch in batches(name)():
+                proba_parts.append(booster.inplace_predict(X_batch, validate_features=False))
+                y_parts.append(y_batch.astype(np.int8))
+            return np.concatenate(y_parts), np.concatenate(proba_parts)
+
+        with self.tracker.step("evaluate"):
+            y_test, proba = predict('test')
+            metrics = classification_metrics(y_test, proba)
+        for name, value in metrics.items():
+            print(f"  {name}: {value:.4f}")
+        calibration = self.calibrate(*predict('valid'), y_test, proba)
+
+        metrics.update({
+            'best_params': params,
+            'num_boost_round': int(booster.num_boosted_rounds()),
+            'n_features': len(self.feature_names),
+            'n_train': counts['train'],
+            'n_valid': counts['valid'],
+            'n_test': counts['test'],
+            'tree_method': self.settings['tree_method'],
+            'nthread': self.nthread,
+            'external_memory': not in_memory,
+            'external_cache_mb': round(cache_mb, 1) if not in_memory else 0.0,
+            'training_time_seconds': round(training_time, 2),
+            'peak_memory_mb': round(self.tracker.peak_mb, 1),
+            'calibration': calibration,
+        })
+
+        print("\nSaving artifacts...")
+        self.save_artifacts(self.to_classifier(booster), metrics)
+
+        print("\nMemory by step:")
+        self.tracker.report()
+        return metrics
+
+    def load_production_model(self) -> Tuple[xgb.Booster, list]:
+        """
+        Production booster and its feature names (models/ artifacts).
+
+        Returns:
+            (booster, feature names in model order)
+        """
+        artifacts = load_production_artifacts(self.models_dir, self.settings['model_filename'],
+                                              self.settings['model_version'])
+        print(f"  Production model: {artifacts.model_version} "
+              f"({artifacts.booster.num_boosted_rounds()} rounds)")
+        return artifacts.booster, artifacts.feature_names
+
+    def run_incremental(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        features_path: Optional[Union[str, Path]] = None,
+        mode: str = 'continue',
+        guard: Optional[bool] = None,
+        save_plots: bool = False
+    ) -> Dict:
+        """
+        Update the production model with newly labelled data.
+
+        'continue' adds up to incremental_rounds trees to the production
+        booster (early stopping on validation AUC); 'refresh' keeps its
+        trees and recomputes their leaf values. With the guard, a reference
+        model is also trained from scratch on the same split and parameters.
+        It only sees the new data, so it never replaces production: when its
+        validation AUC beats the incremental one by more than
+        incremental_auc_tolerance, the update is rejected, the production
+        artifacts are left unchanged and a full training on the complete
+        history is needed.
+
+        Args:
+            df: New labelled features (loaded from features_path if None)
+            features_path: Feature artifact (config value if None)
+            mode: 'continue' or 'refresh'
+            guard: Compare with a model trained from scratch (config value if None)
+            save_plots: Also write the evaluation and SHAP plots
+
+        Returns:
+            Metrics written to metrics.json (incremental['model'] is
+            'production' when the guard rejected the update and nothing
+            was written)
+        """
+        if mode not in INCREMENTAL_MODES:
+            raise ValueError(f"Unknown incremental mode '{mode}' (expected one of {INCREMENTAL_MODES})")
+        guard = bool(self.settings['incremental_guard'] if guard is None else guard)
+
+        with self.tracker.step("load"):
+            if df is None:
+                df = self.load_features(features_path)
+            base, feature_names = self.load_production_model()
+        with self.tracker.step("prepare"):
+            X, y = self.prepare(df)
+            del df
+            # Production feature order; features absent from the new data are missing
+            X = X.reindex(columns=feature_names)
+            self.feature_names = feature_names
+            splits = self.split(X, y)
+            del X, y
+
+        X_val, y_val = splits['valid']
+        params = self.load_params(splits['train'][1])
+        native, _ = booster_params(params)
+        native.update({
+            'tree_method': self.settings['tree_method'],
+            'max_bin': int(self.settings['max_bin']),
+            'nthread': self.nthread,
+        })
+        base_auc = roc_auc_score(y_val, base.inplace_predict(X_val))
+
+        print(f"\nUpdating the production model ({mode}, {self.nthread} threads)...")
+        update_start = time.time()
+        dtrain = dvalid = None
+        with self.tracker.step("update"):
+            if mode == 'continue':
+                dtrain, dvalid = self.build_matrices(splits)
+                booster = xgb.train(
+                    native,
+                    dtrain,
+                    num_boost_round=int(self.settings['incremental_rounds']),
+                    evals=[(dvalid, 'valid')],
+                    early_stopping_rounds=int(self.settings['early_stopping_rounds']),
+                    xgb_model=base,
+                    verbose_eval=False,
+                )
+                booster = booster[: booster.best_iteration + 1]
+            else:
+                # The refresh updater needs the raw values (no QuantileDMatrix)
+                X_train, y_train = splits['train']
+                refresh = {**native, 'process_type': 'update', 'updater': 'refresh', 'refresh_leaf': True}
+                booster = xgb.train(refresh, xgb.DMatrix(X_train, label=y_train, nthread=self.nthread),
+                                    num_boost_round=base.num_boosted_rounds(), xgb_model=base)
+        update_time = time.time() - update_start
+        incremental_auc = roc_auc_score(y_val, booster.inplace_predict(X_val))
+        print(f"  Valid AUC: production {base_auc:.4f} -> {mode} {incremental_auc:.4f} "
+              f"({booster.num_boosted_rounds()} rounds, {update_time:.1f}s)")
+
+        incremental = {
+            'mode': mode,
+            'base_rounds': int(base.num_boosted_rounds()),
+            'base_valid_auc': float(base_auc),
+            'incremental_valid_auc': float(incremental_auc),
+            'update_time_seconds': round(update_time, 2),
+            'model': 'incremental',
+        }
+        if guard:
+            print("\nGuard: reference model trained from scratch on the same split...")
+            retrain_start = time.time()
+            with self.tracker.step("full_retrain"):
+                if dtrain is None:
+                    dtrain, dvalid = self.build_matrices(splits)
+                full = self.train(dtrain, dvalid, params)
+            full_auc = roc_auc_score(y_val, full.inplace_predict(X_val))
+            tolerance = float(self.settings['incremental_auc_tolerance'])
+            incremental.update({
+                'full_retrain_valid_auc': float(full_auc),
+                'full_retrain_time_seconds': round(time.time() - retrain_start, 2),
+                'auc_tolerance': tolerance,
+            })
+            if incremental_auc < full_auc - tolerance:
+                print(f"  Guard failed: incremental model below the reference ({incremental_auc:.4f} < "
+                      f"{full_auc:.4f} - {tolerance}), keeping the production model. "
+                      "Retrain on the complete history (without --incremental).")
+                booster = base
+                incremental['model'] = 'production'
+            else:
+                print(f"  Guard passed (reference {full_auc:.4f})")
+            del full
+        del dtrain, dvalid
+
+        print("\nEvaluating on the test set...")
+        with self.tracker.step("evaluate"):
+            model = self.to_classifier(booster)
+            X_test, y_test = splits['test']
+            proba = booster.inplace_predict(X_test)
+            metrics = classification_metrics(y_test, proba)
+        for name, value in metrics.items():
+            print(f"  {name}: {value:.4f}")
+        calibration = self.calibrate(y_val, booster.inplace_predict(X_val), y_test, proba)
+
+        metrics.update({
+            'best_params': params,
+            'num_boost_round': int(booster.num_boosted_rounds()),
+            'n_features': len(self.feature_names),
+            'n_train': int(len(splits['train'][1])),
+            'n_valid': int(len(y_val)),
+            'n_test': int(len(y_test)),
+            'tree_method': self.settings['tree_method'],
+            'nthread': self.nthread,
+            'incremental': incremental,
+            'training_time_seconds': round(update_time, 2),
+            'peak_memory_mb': round(self.tracker.peak_mb, 1),
+            'calibration': calibration,
+        })
+
+        if incremental['model'] == 'production':
+            print("\nProduction artifacts unchanged (guard failed)")
+        else:
+            print("\nSaving artifacts...")
+            self.save_artifacts(model, metrics)
+            if save_plots:
+                self.save_plots(model, X_test, y_test, proba)
+
+        print("\nMemory by step:")
+        self.tracker.report()
+        return metrics
+
+
+def run_training(
+    features_path: Optional[str] = None,
+    save_plots: bool = True,
+    external_memory: Optional[bool] = None,
+    incremental: Optional[str] = None,
+    guard: Optional[bool] = None
+) -> Dict:
+    """Main function to train the model."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Model Training")
+    print("=" * 60)
+
+    trainer = ModelTrainer()
+    if external_memory is None:
+        external_memory = bool(trainer.settings['external_memory'])
+    if incremental:
+        metrics = trainer.run_incremental(features_path=features_path, mode=incremental,
+                                          guard=guard, save_plots=save_plots)
+    elif external_memory:
+        metrics = trainer.run_external(features_path=features_path)
+    else:
+        metrics = trainer.run(features_path=features_path, save_plots=save_plots)
+
+    print(f"\nTest AUC: {metrics['auc_roc']:.4f} - trained in {metrics['training_time_seconds']:.1f}s, "
+          f"peak memory {metrics['peak_memory_mb']:.0f} MB")
+    print("\nTraining complete!")
+    return metrics
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Train the credit risk XGBoost model")
+    parser.add_argument("--features", default=None,
+                        help="Feature artifact, Parquet or CSV (config value by default)")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Skip the evaluation and SHAP plots")
+    parser.add_argument("--external-memory", action="store_true", default=None,
+                        help="Stream the Parquet partitions and cache the quantized pages on disk")
+    parser.add_argument("--incremental", choices=INCREMENTAL_MODES, default=None,
+                        help="Update the production model with the new data instead of retraining")
+    parser.add_argument("--no-guard", action="store_true",
+                        help="Incremental mode: skip the comparison with a model trained from scratch")
+    args = parser.parse_args()
+
+    run_training(features_path=args.features, save_plots=not args.no_plots,
+                 external_memory=args.external_memory, incremental=args.incremental,
+                 guard=False if args.no_guard else None)
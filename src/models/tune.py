@@ -0,0 +1,357 @@
+"""
+Hyperparameter tuning for Credit Risk Scoring Project.
+
+This module runs the Optuna search of the modeling notebook from the
+repository, on the same study (models/optuna_study.db, credit_risk_xgb):
+- The study is stored in SQLite, so an interrupted search resumes and
+  new trials add to the previous ones
+- Several worker processes run trials concurrently on the same storage,
+  each with its share of the cores
+- The encoded train / validation split is prepared once and shared with
+  the workers as memory-mapped arrays; each worker quantizes it once
+  (QuantileDMatrix) and reuses it for all its trials
+- Unpromising trials are pruned (median or Hyperband) from XGBoost's
+  per-iteration evaluation, instead of running all n_estimators
+- The best parameters are written to models/best_params.json, which
+  src.models.train uses
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import optuna
+import xgboost as xgb
+import yaml
+
+from src.models.train import BEST_PARAMS_FILENAME, ModelTrainer, booster_params, resolve_nthread
+
+# Used when config.yaml has no model.tuning section
+DEFAULT_TUNING_CONFIG = {
+    'storage': 'sqlite:///models/optuna_study.db',
+    'study_name': 'credit_risk_xgb',
+    'n_trials': 50,
+    'n_jobs': -1,
+    'pruner': 'median',  # 'median', 'hyperband' or 'none'
+    'early_stopping_rounds': 50,
+}
+
+PRUNERS = ('median', 'hyperband', 'none')
+
+
+def suggest_params(trial: optuna.Trial) -> Dict:
+    """
+    Search space (same distributions as the notebook study, so it resumes).
+
+    Args:
+        trial: Optuna trial
+
+    Returns:
+        XGBClassifier-style parameters
+    """
+    return {
+        'n_estimators': trial.suggest_int('n_estimators', 100, 500),
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+        'min_child_weight': trial.suggest_int('min_child_weight', 1, 10),
+        'subsample': trial.suggest_float('subsample', 0.6, 1.0),
+        'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
+        'gamma': trial.suggest_float('gamma', 0, 5),
+        'reg_alpha': trial.suggest_float('reg_alpha', 0, 10),
+        'reg_lambda': trial.suggest_float('reg_lambda', 0, 10),
+    }
+
+
+def create_pruner(name: str) -> optuna.pruners.BasePruner:
+    """
+    Pruner deciding from the validation AUC of each boosting round.
+
+    Args:
+        name: 'median', 'hyperband' or 'none'
+
+    Returns:
+        Optuna pruner
+    """
+    if name == 'median':
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=20)
+    if name == 'hyperband':
+        return optuna.pruners.HyperbandPruner(min_resource=20, max_resource=500, reduction_factor=3)
+    if name == 'none':
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"Unknown pruner '{name}' (expected one of {PRUNERS})")
+
+
+def open_storage(url: str) -> optuna.storages.RDBStorage:
+    """RDB storage; SQLite waits for locks held by the other workers."""
+    engine_kwargs = {'connect_args': {'timeout': 60}} if url.startswith('sqlite') else {}
+    return optuna.storages.RDBStorage(url, engine_kwargs=engine_kwargs)
+
+
+class PruningCallback(xgb.callback.TrainingCallback):
+    """
+    Reports the validation metric of every boosting round to the trial
+    and stops the training when the pruner says so.
+    """
+
+    def __init__(self, trial: optuna.Trial, observation_key: str = 'valid-auc'):
+        self.trial = trial
+        self.dataset, self.metric = observation_key.split('-', 1)
+
+    def after_iteration(self, model, epoch: int, evals_log) -> bool:
+        score = evals_log[self.dataset][self.metric][-1]
+        self.trial.report(float(score), step=epoch)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"Trial pruned at iteration {epoch}")
+        return False
+
+
+# =============================================================================
+# WORKERS
+# =============================================================================
+
+def _run_worker(
+    cache_dir: str,
+    storage_url: str,
+    study_name: str,
+    pruner: str,
+    max_trials: int,
+    nthread: int,
+    base_params: Dict,
+    early_stopping_rounds: int,
+    seed: int
+) -> int:
+    """
+    Run trials in one process until the study has max_trials finished trials.
+
+    Returns:
+        Number of trials finished in the study while this worker ran
+    """
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    cache_dir = Path(cache_dir)
+    with open(cache_dir / "meta.json") as f:
+        meta = json.load(f)
+
+    # Memory-mapped split, quantized once for every trial of this worker
+    arrays = {
+        name: np.load(cache_dir / f"{name}.npy", mmap_mode='r')
+        for name in ('X_train', 'y_train', 'X_valid', 'y_valid')
+    }
+    matrix_args = {'max_bin': meta['max_bin'], 'feature_names': meta['feature_names'], 'nthread': nthread}
+    dtrain = xgb.QuantileDMatrix(arrays['X_train'], label=arrays['y_train'], **matrix_args)
+    dvalid = xgb.QuantileDMatrix(arrays['X_valid'], label=arrays['y_valid'], ref=dtrain, **matrix_args)
+
+    def objective(trial: optuna.Trial) -> float:
+        native, num_boost_round = booster_params({**base_params, **suggest_params(trial)})
+        native.update({'tree_method': 'hist', 'max_bin': meta['max_bin'], 'nthread': nthread})
+
+        evals_result = {}
+        booster = xgb.train(
+            native, dtrain, num_boost_round=num_boost_round,
+            evals=[(dvalid, 'valid')], evals_result=evals_result,
+            early_stopping_rounds=early_stopping_rounds,
+            callbacks=[PruningCallback(trial)], verbose_eval=False,
+        )
+        trial.set_user_attr('best_iteration', int(booster.best_iteration) + 1)
+        return float(max(evals_result['valid']['auc']))
+
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=open_storage(storage_url),
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=create_pruner(pruner),
+    )
+    finished = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+    before = len(study.get_trials(deepcopy=False, states=finished))
+    study.optimize(
+        objective,
+        n_trials=max(max_trials - before, 0),
+        callbacks=[optuna.study.MaxTrialsCallback(max_trials, states=finished)],
+    )
+    return len(study.get_trials(deepcopy=False, states=finished)) - before
+
+
+# =============================================================================
+# TUNER
+# =============================================================================
+
+class HyperparameterTuner:
+    """
+    Runs the Optuna study with parallel worker processes.
+    """
+
+    def __init__(self, config_path: str = "configs/config.yaml"):
+        """
+        Initialize the tuner.
+
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config_path = config_path
+        self.config = self._load_config(config_path)
+        self.settings = {**DEFAULT_TUNING_CONFIG, **self.config.get('model', {}).get('tuning', {})}
+        self.trainer = ModelTrainer(config_path)
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file."""
+        config_file = Path(config_path)
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                return yaml.safe_load(f)
+        return {}
+
+    def cache_split(self, df, cache_dir: Path) -> Dict:
+        """
+        Encode and split the features once, as .npy files for the workers.
+
+        Args:
+            df: Feature DataFrame (loaded from the config path if None)
+            cache_dir: Directory receiving the arrays
+
+        Returns:
+            Parameters shared by all trials (scale_pos_weight, seed...)
+        """
+        if df is None:
+            df = self.trainer.load_features()
+        X, y = self.trainer.prepare(df)
+        splits = self.trainer.split(X, y)
+        del X, y
+
+        for name in ('train', 'valid'):
+            X_part, y_part = splits[name]
+            np.save(cache_dir / f"X_{name}.npy", np.ascontiguousarray(X_part.to_numpy(dtype=np.float32)))
+            np.save(cache_dir / f"y_{name}.npy", y_part)
+        with open(cache_dir / "meta.json", 'w') as f:
+            json.dump({
+                'feature_names': self.trainer.feature_names,
+                'max_bin': int(self.trainer.settings['max_bin']),
+            }, f)
+
+        # Same fixed parameters as the notebook (scale_pos_weight from train)
+        params = self.trainer.load_params(splits['train'][1])
+        return {k: params[k] for k in ('scale_pos_weight', 'random_state', 'eval_metric', 'objective')}
+
+    def run(
+        self,
+        df=None,
+        n_trials: Optional[int] = None,
+        n_jobs: Optional[int] = None,
+        pruner: Optional[str] = None,
+        storage: Optional[str] = None,
+        study_name: Optional[str] = None,
+        save_best_params: bool = True
+    ) -> optuna.Study:
+        """
+        Run n_trials more trials of the study.
+
+        Args:
+            df: Feature DataFrame (loaded from the config path if None)
+            n_trials: Trials added to the study
+            n_jobs: Worker processes (-1 for all cores)
+            pruner: 'median', 'hyperband' or 'none'
+            storage: Optuna storage URL
+            study_name: Study name
+            save_best_params: Write models/best_params.json
+
+        Returns:
+            The Optuna study
+        """
+        s = self.settings
+        n_trials = int(n_trials if n_trials is not None else s['n_trials'])
+        n_jobs = resolve_nthread(n_jobs if n_jobs is not None else s['n_jobs'])
+        pruner = pruner or s['pruner']
+        storage = storage or s['storage']
+        study_name = study_name or s['study_name']
+        create_pruner(pruner)  # validate before any work
+
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        study = optuna.create_study(
+            study_name=study_name, storage=open_storage(storage),
+            direction='maximize', load_if_exists=True,
+        )
+        finished = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+        max_trials = len(study.get_trials(deepcopy=False, states=finished)) + n_trials
+        nthread = max(1, (os.cpu_count() or 1) // n_jobs)
+
+        print(f"Study '{study_name}': {len(study.trials)} trials so far, running {n_trials} more "
+              f"with {n_jobs} worker(s) x {nthread} thread(s), pruner={pruner}")
+
+        start_time = time.time()
+        with tempfile.TemporaryDirectory(prefix="tuning-") as cache_dir:
+            base_params = self.cache_split(df, Path(cache_dir))
+            seed = int(self.trainer.random_state) + len(study.trials)
+            worker_args = [
+                (cache_dir, storage, study_name, pruner, max_trials, nthread, base_params,
+                 int(s['early_stopping_rounds']), seed + i)
+                for i in range(n_jobs)
+            ]
+            if n_jobs == 1:
+                _run_worker(*worker_args[0])
+            else:
+                # spawn: workers start without the parent's threads and memory
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context) as executor:
+                    for future in [executor.submit(_run_worker, *args) for args in worker_args]:
+                        future.result()
+
+        study = optuna.load_study(study_name=study_name, storage=open_storage(storage))
+        states = [t.state for t in study.trials]
+        pruned = states.count(optuna.trial.TrialState.PRUNED)
+        print(f"\n{len(study.trials)} trials ({pruned} pruned) in {time.time() - start_time:.1f}s")
+        print(f"Best AUC: {study.best_value:.4f} (trial {study.best_trial.number})")
+
+        if save_best_params:
+            self.save_best_params(study)
+        return study
+
+    def save_best_params(self, study: optuna.Study) -> Path:
+        """Write the best trial's parameters to models/best_params.json."""
+        path = self.trainer.models_dir / BEST_PARAMS_FILENAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(study.best_params, f, indent=2)
+        print(f"Best parameters saved to: {path}")
+        return path
+
+
+def run_tuning(
+    n_trials: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    pruner: Optional[str] = None
+) -> optuna.Study:
+    """Main function to tune the model hyperparameters."""
+    print("=" * 60)
+    print("Credit Risk Scoring - Hyperparameter Tuning")
+    print("=" * 60)
+
+    study = HyperparameterTuner().run(n_trials=n_trials, n_jobs=n_jobs, pruner=pruner)
+
+    print("\nBest parameters:")
+    for key, value in study.best_params.items():
+        print(f"  {key}: {value}")
+    print("\nTuning complete! Retrain with: python -m src.models.train")
+    return study
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).parent.parent.parent)
+
+    parser = argparse.ArgumentParser(description="Tune the XGBoost hyperparameters with Optuna")
+    parser.add_argument("--n-trials", type=int, default=None,
+                        help="Trials added to the study (config value by default)")
+    parser.add_argument("--n-jobs", type=int, default=None,
+                        help="Worker processes (-1 for all cores)")
+    parser.add_argument("--pruner", choices=PRUNERS, default=None,
+                        help="Pruner of unpromising trials")
+    args = parser.parse_args()
+
+    run_tuning(n_trials=args.n_trials, n_jobs=args.n_jobs, pruner=args.pruner)
@@ -0,0 +1,296 @@
+"""
+Database utilities for Credit Risk Scoring Project.
+
+This module provides the single SQLAlchemy engine factory shared by
+data ingestion, feature engineering and the API:
+- Connection pooling (size, overflow, pre-ping, recycle)
+- Server-side statement timeout
+- Server-side cursors for large reads
+- Prometheus metrics on pool checkout wait
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import yaml
+from dotenv import load_dotenv
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / "configs" / "config.yaml"
+
+# Used when config.yaml has no database.pool section
+DEFAULT_POOL_CONFIG = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_timeout': 30,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+}
+DEFAULT_STATEMENT_TIMEOUT_MS = 600000
+DEFAULT_STREAM_CHUNK_SIZE = 50000
+
+# information_schema data types read back as float64 / nullable integers
+FLOAT_SQL_TYPES = {'double precision', 'real', 'numeric'}
+INTEGER_SQL_TYPES = {'smallint', 'integer', 'bigint'}
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+POOL_CHECKOUT_WAIT = Histogram(
+    'credit_risk_db_pool_checkout_wait_seconds',
+    'Time spent waiting for a pooled database connection',
+    ['database'],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0]
+)
+
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    'credit_risk_db_pool_checkout_timeouts_total',
+    'Number of pool checkouts that timed out',
+    ['database']
+)
+
+POOL_CONNECTIONS_IN_USE = Gauge(
+    'credit_risk_db_pool_connections_in_use',
+    'Number of connections currently checked out of the pool',
+    ['database']
+)
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        label = self._orig_logging_name or 'default'
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(database=label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(database=label).observe(time.perf_counter() - start_time)
+
+
+# =============================================================================
+# ENGINE FACTORY
+# =============================================================================
+
+# One engine per (database URL, process): pools must never be shared across a fork
+_engines: Dict[Tuple[str, int], Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def load_database_config(config_path: Optional[str] = None) -> dict:
+    """
+    Load the `database` section of the configuration file.
+
+    Args:
+        config_path: Path to configuration file (defaults to configs/config.yaml)
+
+    Returns:
+        Database configuration dictionary (empty if the file is missing)
+    """
+    path = Path(config_path) if config_path else DEFAULT_CONFIG_PATH
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        return (yaml.safe_load(f) or {}).get('database', {})
+
+
+def get_database_url() -> str:
+    """Build the PostgreSQL connection string from environment variables."""
+    host = os.getenv('POSTGRES_HOST', 'localhost')
+    port = os.getenv('POSTGRES_PORT', '5432')
+    database = os.getenv('POSTGRES_DB', 'credit_risk')
+    user = os.getenv('POSTGRES_USER', 'credit_user')
+    password = os.getenv('POSTGRES_PASSWORD', '')
+
+    return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+
+
+def get_engine(config: Optional[dict] = None, url: Optional[str] = None) -> Engine:
+    """
+    Return the shared, pooled engine for the configured database.
+
+    The engine is created once per process and database URL, so every
+    component (ingestion, feature engineering, API) draws from the same pool.
+
+    Args:
+        config: Full project configuration (loaded from config.yaml if None)
+        url: Database URL (built from POSTGRES_* environment variables if None)
+
+    Returns:
+        SQLAlchemy engine
+    """
+    if url is None:
+        url = get_database_url()
+
+    key = (url, os.getpid())
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            db_config = config.get('database', {}) if config is not None else load_database_config()
+            engine = _build_engine(url, db_config)
+            _engines[key] = engine
+
+    return engine
+
+
+def _build_engine(url: str, db_config: dict) -> Engine:
+    """Create a pooled engine from the `database` configuration section."""
+    pool_config = {**DEFAULT_POOL_CONFIG, **db_config.get('pool', {})}
+    statement_timeout = db_config.get('statement_timeout_ms', DEFAULT_STATEMENT_TIMEOUT_MS)
+    pool_name = db_config.get('name', os.getenv('POSTGRES_DB', 'credit_risk'))
+
+    connect_args = {}
+    if url.startswith('postgresql') and statement_timeout:
+        connect_args['options'] = f"-c statement_timeout={int(statement_timeout)}"
+
+    engine = create_engine(
+        url,
+        poolclass=_TimedQueuePool,
+        pool_size=pool_config['pool_size'],
+        max_overflow=pool_config['max_overflow'],
+        pool_timeout=pool_config['pool_timeout'],
+        pool_recycle=pool_config['pool_recycle'],
+        pool_pre_ping=pool_config['pool_pre_ping'],
+        pool_logging_name=pool_name,
+        connect_args=connect_args
+    )
+
+    # engine.pool is looked up at scrape time, so this survives engine.dispose()
+    POOL_CONNECTIONS_IN_USE.labels(database=pool_name).set_function(
+        lambda: engine.pool.checkedout()
+    )
+
+    return engine
+
+
+def get_stream_chunk_size(config: Optional[dict] = None) -> int:
+    """Number of rows fetched per round trip by server-side cursors."""
+    db_config = config.get('database', {}) if config is not None else load_database_config()
+    return int(db_config.get('stream_chunk_size', DEFAULT_STREAM_CHUNK_SIZE))
+
+
+@contextmanager
+def streaming_connection(engine: Engine, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[Connection]:
+    """
+    Open a connection whose queries use a server-side (named) cursor.
+
+    Rows are fetched from PostgreSQL in batches of `chunk_size` instead of
+    materializing the full result set on the client.
+
+    Args:
+        engine: Engine returned by get_engine()
+        chunk_size: Rows buffered per fetch
+
+    Yields:
+        Connection with stream_results enabled
+    """
+    with engine.connect() as conn:
+        yield conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+
+
+def get_column_types(engine: Engine, table_name: str, schema: str = "credit_risk") -> Dict[str, str]:
+    """
+    Get the SQL data type of every column of a table, in table order.
+
+    Args:
+        engine: Engine returned by get_engine()
+        table_name: Name of the table
+        schema: Database schema
+
+    Returns:
+        Dictionary mapping column name to information_schema data type
+    """
+    query = text("""
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = :schema AND table_name = :table_name
+        ORDER BY ordinal_position
+    """)
+
+    with engine.connect() as conn:
+        rows = conn.execute(query, {'schema': schema, 'table_name': table_name}).fetchall()
+
+    return {column: data_type for column, data_type in rows}
+
+
+def read_table_chunks(
+    engine: Engine,
+    table_name: str,
+    schema: str = "credit_risk",
+    columns: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    where: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a table through a server-side cursor as typed DataFrame chunks.
+
+    Only the requested columns are transferred, and at most `chunk_size` rows
+    are held on the client at once. Column dtypes come from the table schema,
+    so every chunk has the same types even when a column is entirely NULL
+    within that chunk.
+
+    Args:
+        engine: Engine returned by get_engine()
+        table_name: Name of the table
+        schema: Database schema
+        columns: Columns to read (projection). All columns if None
+        chunk_size: Rows per chunk
+        where: Optional SQL filter (without the WHERE keyword)
+
+    Yields:
+        DataFrame chunks of at most `chunk_size` rows
+    """
+    column_types = get_column_types(engine, table_name, schema)
+    if not column_types:
+        raise ValueError(f"Table not found: {schema}.{table_name}")
+
+    if columns is None:
+        columns = list(column_types)
+    unknown = [c for c in columns if c not in column_types]
+    if unknown:
+        raise ValueError(f"Unknown columns for {schema}.{table_name}: {unknown}")
+
+    float_cols = {c: 'float64' for c in columns if column_types[c] in FLOAT_SQL_TYPES}
+    int_cols = [c for c in columns if column_types[c] in INTEGER_SQL_TYPES]
+
+    select_list = ", ".join(f'"{c}"' for c in columns)
+    query = f'SELECT {select_list} FROM {schema}."{table_name}"'
+    if where:
+        query += f" WHERE {where}"
+
+    with streaming_connection(engine, chunk_size) as conn:
+        for chunk in pd.read_sql(text(query), conn, chunksize=chunk_size, dtype=float_cols):
+            # An all-NULL integer column comes back as object: keep it numeric
+            for col in int_cols:
+                if chunk[col].dtype == object:
+                    chunk[col] = chunk[col].astype('float64')
+            yield chunk
+
+
+def dispose_engines() -> None:
+    """Close all pooled connections owned by this process."""
+    with _engines_lock:
+        pid = os.getpid()
+        for (url, owner_pid), engine in list(_engines.items()):
+            if owner_pid == pid:
+                engine.dispose()
+                del _engines[(url, owner_pid)]
@@ -0,0 +1,127 @@
+"""
+Memory tracking utilities for Credit Risk Scoring Project.
+
+This module measures the resident memory (RSS) of pipeline steps:
+- A background thread samples RSS while a step runs
+- Start, peak and end RSS are recorded per step
+- Linux reads /proc/self/statm; other platforms fall back to
+  resource.getrusage (process-wide peak only)
+
+Author: Daniela Samo
+Date: October 2026
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_STATM_PATH = "/proc/self/statm"
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+MB = 1024 ** 2
+
+
+def current_rss() -> Optional[int]:
+    """
+    Resident set size of the current process, in bytes.
+
+    Returns:
+        RSS in bytes, or None when it cannot be measured
+    """
+    try:
+        with open(_STATM_PATH, 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+
+    if resource is not None:
+        # Peak RSS so far (KB on Linux, bytes on macOS)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if os.uname().sysname == 'Darwin' else max_rss * 1024
+    return None
+
+
+class MemoryTracker:
+    """
+    Records the RSS of named steps.
+
+    Usage:
+        tracker = MemoryTracker()
+        with tracker.step("impute"):
+            ...
+        tracker.report()
+    """
+
+    def __init__(self, interval: float = 0.01, enabled: bool = True):
+        """
+        Initialize the tracker.
+
+        Args:
+            interval: Seconds between RSS samples while a step runs
+            enabled: If False, step() only runs the block (no sampling)
+        """
+        self.interval = interval
+        self.enabled = enabled
+        self.steps: List[Dict] = []
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Measure the block as one step.
+
+        Args:
+            name: Step name used in the report
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start_rss = current_rss() or 0
+        peak = [start_rss]
+        stop_event = threading.Event()
+
+        def sample():
+            while not stop_event.wait(self.interval):
+                rss = current_rss()
+                if rss is not None and rss > peak[0]:
+                    peak[0] = rss
+
+        sampler = threading.Thread(target=sample, name=f"memory-{name}", daemon=True)
+        start_time = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop_event.set()
+            sampler.join()
+            end_rss = current_rss() or 0
+            self.steps.append({
+                'step': name,
+                'seconds': time.perf_counter() - start_time,
+                'start_mb': start_rss / MB,
+                'peak_mb': max(peak[0], end_rss) / MB,
+                'end_mb': end_rss / MB,
+            })
+
+    @property
+    def peak_mb(self) -> float:
+        """Highest RSS observed across all steps, in MB."""
+        return max((s['peak_mb'] for s in self.steps), default=0.0)
+
+    def report(self) -> None:
+        """Print start, peak and end RSS of every step."""
+        if not self.steps:
+            return
+        print(f"  {'Step':<24} {'Time (s)':>9} {'Start MB':>9} {'Peak MB':>9} {'End MB':>9}")
+        for s in self.steps:
+            print(
+                f"  {s['step']:<24} {s['seconds']:>9.2f} {s['start_mb']:>9.1f} "
+                f"{s['peak_mb']:>9.1f} {s['end_mb']:>9.1f}"
+            )
@@ -13,8 +13,15 @@ import joblib
 import numpy as np
 import pandas as pd
 import shap
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.features.encoding import load_category_registry
+from src.models.artifacts import load_model_artifacts
+from src.models.calibration import decisions
+
 # =============================================================================
 # CONFIGURATION - MODE STANDALONE
 # =============================================================================
@@ -23,7 +30,8 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent
 MODELS_DIR = BASE_DIR / "models"
 
-MODEL_PATH = MODELS_DIR / "xgboost_credit_risk_v1.pkl"
+MODEL_PATH = MODELS_DIR / "xgboost_credit_risk_v1.pkl"  # Ancien format (pickle), si pas de manifeste
+MANIFEST_PATH = MODELS_DIR / "xgboost_credit_risk_v1.manifest.json"  # Modèle natif (UBJSON) + checksums
 FEATURES_PATH = MODELS_DIR / "feature_names.json"
 METRICS_PATH = MODELS_DIR / "metrics.json"
 
@@ -33,15 +41,21 @@ METRICS_PATH = MODELS_DIR / "metrics.json"
 
 @st.cache_resource
 def load_model():
-    """Charge le modèle XGBoost et crée l'explainer SHAP."""
-    model = joblib.load(MODEL_PATH)
-    with open(FEATURES_PATH, 'r') as f:
-        feature_names = json.load(f)
+    """Charge le modèle XGBoost (format natif vérifié, sinon pickle) et crée l'explainer SHAP."""
+    if MANIFEST_PATH.exists():
+        artifacts = load_model_artifacts(MANIFEST_PATH)
+        model, feature_names = artifacts.classifier, artifacts.feature_names
+        category_registry, calibration = artifacts.registry, artifacts.calibration
+    else:
+        model = joblib.load(MODEL_PATH)
+        with open(FEATURES_PATH, 'r') as f:
+            feature_names = json.load(f)
+        category_registry, calibration = load_category_registry(MODELS_DIR), None
     shap_explainer = shap.TreeExplainer(model)
-    return model, feature_names, shap_explainer
+    return model, feature_names, shap_explainer, category_registry, calibration
 
 # Charger au démarrage
-MODEL, FEATURE_NAMES_LIST, SHAP_EXPLAINER = load_model()
+MODEL, FEATURE_NAMES_LIST, SHAP_EXPLAINER, CATEGORY_REGISTRY, CALIBRATION = load_model()
 
 # Taux de conversion vers EUR (base)
 EXCHANGE_RATES = {
@@ -771,23 +785,21 @@ def format_currency(amount, curr):
     else:
         return f"{CURRENCY_SYMBOLS[curr]}{amount:,.0f}"
 
-def get_risk_color(probability):
+def get_risk_color(risk_level):
     """Retourne la couleur et le label selon le niveau de risque."""
-    # Seuils ajustés au comportement réel du modèle XGBoost
-    # Le modèle donne rarement < 30% même pour de bons profils
-    if probability < 0.40:
+    # Niveau calculé comme dans l'API (probabilité calibrée si le modèle l'est)
+    if risk_level == "Faible":
         return "#10b981", T["low_risk"]
-    elif probability < 0.55:
+    elif risk_level == "Moyen":
         return "#f59e0b", T["medium_risk"]
     else:
         return "#ef4444", T["high_risk"]
 
-def get_decision(probability):
+def get_decision(risk_level):
     """Retourne la décision métier."""
-    # Seuils métier réalistes
-    if probability < 0.40:
+    if risk_level == "Faible":
         return f"✅ {T['credit_recommended']}", T["reliable_client"]
-    elif probability < 0.55:
+    elif risk_level == "Moyen":
         return f"⚠️ {T['further_study']}", T["needs_analysis"]
     else:
         return f"❌ {T['credit_not_recommended']}", T["high_risk_client"]
@@ -817,9 +829,10 @@ def call_api(data):
                 if model_field in FEATURE_NAMES_LIST:
                     df.loc[0, model_field] = float(data[api_field])
 
-        # Encoder code_gender
-        if 'code_gender' in data and 'code_gender' in FEATURE_NAMES_LIST:
-            df.loc[0, 'code_gender'] = 1.0 if data['code_gender'] == 'M' else 0.0
+        # Encoder les variables catégorielles (mêmes codes qu'à l'entraînement)
+        if CATEGORY_REGISTRY is not None:
+            for col in [c for c in FEATURE_NAMES_LIST if c in CATEGORY_REGISTRY]:
+                df[col] = CATEGORY_REGISTRY.encode(col, [data.get(col)])
 
         # Features dérivées ext_source
         ext_sources = [data.get('ext_source_1') or 0, data.get('ext_source_2') or 0, data.get('ext_source_3') or 0]
@@ -833,25 +846,14 @@ def call_api(data):
             if 'ext_source_min' in FEATURE_NAMES_LIST:
                 df.loc[0, 'ext_source_min'] = float(min(valid_sources))
 
-        # Prédiction
-        proba = MODEL.predict_proba(df)[0][1]
-
-        # Niveau de risque et score
-        if proba < 0.3:
-            risk_level = "Faible"
-        elif proba < 0.6:
-            risk_level = "Moyen"
-        else:
-            risk_level = "Élevé"
-
-        score = int(850 - (proba * 550))
-        score = max(300, min(850, score))
+        # Prédiction, niveau de risque et score (mêmes règles que l'API)
+        decided = decisions(MODEL.predict_proba(df)[:, 1], CALIBRATION)
 
         return {
-            "probability": round(proba, 4),
-            "prediction": int(proba >= 0.5),
-            "risk_level": risk_level,
-            "score": score
+            "probability": round(float(decided["probability"][0]), 4),
+            "prediction": int(decided["prediction"][0]),
+            "risk_level": str(decided["risk_level"][0]),
+            "score": int(decided["score"][0])
         }, None
 
     except Exception as e:
@@ -881,8 +883,10 @@ def call_explain_api(data):
                 if model_field in FEATURE_NAMES_LIST:
                     df.loc[0, model_field] = float(data[api_field])
 
-        if 'code_gender' in data and 'code_gender' in FEATURE_NAMES_LIST:
-            df.loc[0, 'code_gender'] = 1.0 if data['code_gender'] == 'M' else 0.0
+        # Encoder les variables catégorielles (mêmes codes qu'à l'entraînement)
+        if CATEGORY_REGISTRY is not None:
+            for col in [c for c in FEATURE_NAMES_LIST if c in CATEGORY_REGISTRY]:
+                df[col] = CATEGORY_REGISTRY.encode(col, [data.get(col)])
 
         ext_sources = [data.get('ext_source_1') or 0, data.get('ext_source_2') or 0, data.get('ext_source_3') or 0]
         valid_sources = [float(s) for s in ext_sources if s and s > 0]
@@ -895,15 +899,10 @@ def call_explain_api(data):
             if 'ext_source_min' in FEATURE_NAMES_LIST:
                 df.loc[0, 'ext_source_min'] = float(min(valid_sources))
 
-        # Prédiction
-        proba = MODEL.predict_proba(df)[0][1]
-
-        if proba < 0.3:
-            risk_level = "Faible"
-        elif proba < 0.6:
-            risk_level = "Moyen"
-        else:
-            risk_level = "Élevé"
+        # Prédiction (mêmes règles que l'API)
+        decided = decisions(MODEL.predict_proba(df)[:, 1], CALIBRATION)
+        proba = float(decided["probability"][0])
+        risk_level = str(decided["risk_level"][0])
 
         # SHAP values
         shap_values = SHAP_EXPLAINER.shap_values(df)
@@ -927,9 +926,9 @@ def call_explain_api(data):
 
         # Filtrage dynamique selon le profil
         MIN_IMPACT_THRESHOLD = 0.025
-        if proba < 0.40:
+        if risk_level == "Faible":
             max_protective, max_risk = 6, 3
-        elif proba < 0.55:
+        elif risk_level == "Moyen":
             max_protective, max_risk = 4, 4
         else:
             max_protective, max_risk = 3, 6
@@ -1255,8 +1254,8 @@ if st.button(f"🔍 {T['analyze_risk']}", type="primary", use_container_width=Tr
     else:
         probability = result["probability"]
         score = result["score"]
-        color, risk_label = get_risk_color(probability)
-        decision, decision_text = get_decision(probability)
+        color, risk_label = get_risk_color(result["risk_level"])
+        decision, decision_text = get_decision(result["risk_level"])
 
         st.markdown("---")
 
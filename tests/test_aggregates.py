@@ -0,0 +1,201 @@
+# =============================================================================
+# TESTS AGRÉGATS - Credit Risk Scoring
+# =============================================================================
+# Tables de synthèse par client et leur invalidation (src/features/aggregates.py)
+# Exécution : pytest tests/test_aggregates.py -v
+# =============================================================================
+
+import pytest
+import pandas as pd
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.ingestion import HISTORY_TABLES, DataIngestion
+from src.data.synthetic import SyntheticDataGenerator
+from src.features import aggregates
+from src.features.aggregates import AggregateStore
+from tests.test_features import make_sqlite_engine
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+class FakeResult:
+    def __init__(self, value=None, rowcount=0):
+        self.value = value
+        self.rowcount = rowcount
+
+    def scalar(self):
+        return self.value
+
+
+class FakeDatabase:
+    """
+    Moteur simulé : répond aux requêtes PostgreSQL de l'AggregateStore
+    (to_regclass, filigranes, MAX de la source) et enregistre le SQL exécuté.
+    """
+
+    def __init__(self):
+        self.tables = {"bureau", "previous_application"}
+        self.watermarks = {}
+        self.source_max = {"bureau": 150, "previous_application": 80}
+        self.statements = []
+
+    @contextmanager
+    def connect(self):
+        yield self
+
+    begin = connect
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        params = params or {}
+        self.statements.append(sql)
+
+        if "to_regclass" in sql:
+            return FakeResult(params["name"].split(".")[1] in self.tables)
+        if sql.startswith("CREATE TABLE IF NOT EXISTS credit_risk.aggregate_watermarks"):
+            self.tables.add("aggregate_watermarks")
+        elif sql.startswith("SELECT COALESCE(watermark, -1)"):
+            if params["name"] not in self.watermarks:
+                return FakeResult(None)
+            value = self.watermarks[params["name"]]
+            return FakeResult(-1 if value is None else value)
+        elif sql.startswith("SELECT MAX("):
+            return FakeResult(self.source_max[sql.split(".")[-1]])
+        elif sql.startswith("INSERT INTO credit_risk.aggregate_watermarks"):
+            self.watermarks[params["name"]] = params["watermark"]
+        elif sql.startswith("DELETE FROM credit_risk.aggregate_watermarks"):
+            self.watermarks.pop(params["name"], None)
+        elif sql.startswith("INSERT INTO credit_risk.agg_"):
+            return FakeResult(rowcount=42)
+        return FakeResult()
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def store(database):
+    return AggregateStore(CONFIG_PATH, engine=database)
+
+
+@pytest.fixture
+def read_queries(monkeypatch):
+    """Requêtes passées à pd.read_sql (lecture de la synthèse ou GROUP BY en direct)."""
+    queries = []
+
+    def read_sql(query, con):
+        queries.append(" ".join(str(query).split()))
+        return pd.DataFrame({"sk_id_curr": [1]})
+
+    monkeypatch.setattr(aggregates.pd, "read_sql", read_sql)
+    return queries
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestRefresh:
+    """Reconstruction complète puis rafraîchissement incrémental par filigrane."""
+
+    def test_full_then_incremental(self, store, database):
+        assert store.refresh("bureau") == 42
+        assert database.watermarks["bureau"] == 150
+        assert any(s == "DELETE FROM credit_risk.agg_bureau" for s in database.statements)
+
+        database.statements.clear()
+        assert store.refresh("bureau") == 0  # aucune ligne au-dessus du filigrane
+        assert not any(s.startswith("INSERT INTO credit_risk.agg_bureau") for s in database.statements)
+
+        database.source_max["bureau"] = 200
+        assert store.refresh("bureau") == 42
+        assert any("_affected_clients" in s for s in database.statements)
+        assert database.watermarks["bureau"] == 200
+
+    def test_missing_source_skipped(self, store, database):
+        assert store.refresh("installments") == 0
+        assert "installments" not in database.watermarks
+
+
+class TestStaleness:
+    """Une synthèse invalidée ou en retard sur sa source n'est jamais lue."""
+
+    def test_summary_read_when_current(self, store, database, read_queries):
+        assert not store.has_summary("bureau")
+        store.refresh("bureau")
+
+        assert store.has_summary("bureau")
+        store.read("bureau")
+        assert read_queries[-1] == "SELECT * FROM credit_risk.agg_bureau"
+
+    def test_behind_source_uses_live_query(self, store, database, read_queries):
+        store.refresh("bureau")
+        database.source_max["bureau"] = 151
+
+        assert not store.has_summary("bureau")
+        store.read("bureau")
+        assert "GROUP BY sk_id_curr" in read_queries[-1]
+
+    def test_invalidate_forces_full_rebuild(self, store, database):
+        store.refresh("bureau")
+        store.refresh("previous_application")
+
+        assert store.invalidate("bureau") == ["bureau"]
+        assert not store.has_summary("bureau")
+        assert store.has_summary("previous_application")
+
+        database.statements.clear()
+        store.refresh("bureau")
+        assert not any("_affected_clients" in s for s in database.statements)
+        assert store.has_summary("bureau")
+
+    def test_invalidate_before_any_refresh(self, store):
+        assert store.invalidate("bureau") == []
+        assert store.invalidate("application_train") == []
+
+
+class TestIngestion:
+    """L'ingestion invalide les synthèses et charge aussi les tables d'historique."""
+
+    @pytest.fixture
+    def ingestion(self, tmp_path, monkeypatch):
+        engine = make_sqlite_engine()
+        monkeypatch.setattr(DataIngestion, "_create_engine", lambda self: engine)
+        ingestion = DataIngestion(CONFIG_PATH)
+        ingestion.raw_path = tmp_path
+        SyntheticDataGenerator(CONFIG_PATH).generate(tmp_path, scale=0.0002, seed=1)
+
+        invalidated = []
+        monkeypatch.setattr(ingestion.aggregates, "invalidate", invalidated.append)
+        ingestion.invalidated = invalidated
+        return ingestion
+
+    def test_reload_invalidates(self, ingestion):
+        ingestion.load_csv_to_postgres("bureau", "bureau.csv")
+        ingestion.load_csv_to_postgres("bureau", "bureau.csv", if_exists="append")
+
+        assert ingestion.invalidated == ["bureau", "bureau"]
+
+    def test_history_tables(self, ingestion):
+        results = ingestion.load_history_tables()
+
+        assert list(results) == HISTORY_TABLES
+        assert ingestion.invalidated == HISTORY_TABLES
+        with ingestion.engine.connect() as conn:
+            for table, rows in results.items():
+                assert rows > 0
+                assert conn.execute(text(f"SELECT COUNT(*) FROM credit_risk.{table}")).scalar() == rows
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -7,13 +7,20 @@
 
 import pytest
 from fastapi.testclient import TestClient
+import io
+import json
 import sys
 from pathlib import Path
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
 # Ajouter le répertoire parent au path pour importer l'API
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api.main import app, load_model
+from api.main import app, load_model, score_batch
+from api.streaming import ArrowStreamBatcher, NdjsonBatcher
 
 # =============================================================================
 # FIXTURES
@@ -185,6 +192,23 @@ class TestPredictEndpoint:
         response_f = client.post("/predict", json=valid_client_data)
         assert response_f.status_code == 200
 
+    def test_predict_categorical_encoding(self, client, valid_client_data):
+        """Les variables catégorielles fournies modifient la prédiction."""
+        response_base = client.post("/predict", json=valid_client_data)
+
+        valid_client_data["name_income_type"] = "Unemployed"
+        valid_client_data["occupation_type"] = "Low-skill Laborers"
+        response_cat = client.post("/predict", json=valid_client_data)
+
+        assert response_cat.status_code == 200
+        assert response_cat.json()["probability"] != response_base.json()["probability"]
+
+    def test_predict_unknown_category(self, client, valid_client_data):
+        """Une catégorie inconnue est traitée comme valeur manquante."""
+        valid_client_data["name_income_type"] = "Astronaut"
+        response = client.post("/predict", json=valid_client_data)
+        assert response.status_code == 200
+
 
 # =============================================================================
 # TESTS VALIDATION DES INPUTS
@@ -335,6 +359,265 @@ class TestExplainEndpoint:
             assert factor["impact"] == "reduces_risk"
 
 
+# =============================================================================
+# TESTS ENDPOINT /predict/stream
+# =============================================================================
+
+def to_ndjson(records):
+    """Encode une liste de clients en NDJSON."""
+    return "".join(json.dumps(r) + "\n" for r in records).encode()
+
+
+def to_arrow_stream(records):
+    """Encode une liste de clients en flux Arrow IPC (plusieurs record batches)."""
+    table = pa.Table.from_pandas(pd.DataFrame(records), preserve_index=False)
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=2):
+            writer.write_batch(batch)
+    return sink.getvalue()
+
+
+@pytest.fixture
+def clients(valid_client_data, risky_client_data):
+    """Lot de clients identifiés (sk_id_curr 1 à 5)."""
+    return [
+        {**valid_client_data, "sk_id_curr": 1},
+        {**risky_client_data, "sk_id_curr": 2},
+        {**valid_client_data, "sk_id_curr": 3, "name_income_type": "Pensioner"},
+        {**risky_client_data, "sk_id_curr": 4, "ext_source_2": None},
+        {**valid_client_data, "sk_id_curr": 5, "amt_credit": 250000},
+    ]
+
+
+class FakeWriter:
+    """Journal des décisions en mémoire (remplace PredictionWriter)."""
+
+    def __init__(self):
+        self.records = []
+
+    def submit(self, record):
+        self.records.append(record)
+        return True
+
+
+@pytest.fixture
+def audit_log(monkeypatch):
+    writer = FakeWriter()
+    monkeypatch.setattr("api.main.prediction_writer", writer)
+    return writer
+
+
+class TestPredictStream:
+    """Tests du scoring en flux (NDJSON / Arrow IPC)."""
+
+    def test_ndjson_matches_predict(self, client, clients):
+        """Chaque ligne du flux donne le même résultat que /predict."""
+        response = client.post(
+            "/predict/stream", content=to_ndjson(clients),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+
+        assert [r["sk_id_curr"] for r in results] == [1, 2, 3, 4, 5]
+        for record, result in zip(clients, results):
+            expected = client.post("/predict", json=record).json()
+            assert result["probability"] == pytest.approx(expected["probability"], abs=1e-6)
+            for key in ["prediction", "risk_level", "score"]:
+                assert result[key] == expected[key]
+            assert result["error"] is None
+
+    def test_ndjson_invalid_rows(self, client, valid_client_data):
+        """Lignes invalides signalées sans interrompre le flux."""
+        body = to_ndjson([valid_client_data]) + b"not json\n" + to_ndjson([{"amt_credit": 1000}])
+        response = client.post("/predict/stream", content=body)
+        results = [json.loads(line) for line in response.text.splitlines()]
+
+        assert len(results) == 3
+        assert results[0]["error"] is None and results[0]["probability"] is not None
+        assert results[1]["error"] and results[1]["probability"] is None
+        assert results[2]["error"] and results[2]["score"] is None
+
+    def test_decisions_logged(self, client, clients, valid_client_data, audit_log):
+        """Chaque ligne scorée est journalisée comme une décision de /predict ; pas les lignes invalides."""
+        body = to_ndjson(clients) + to_ndjson([{"amt_credit": 1000}])
+        results = [json.loads(line) for line in client.post("/predict/stream", content=body).text.splitlines()]
+
+        assert [r["sk_id_curr"] for r in audit_log.records] == [1, 2, 3, 4, 5]
+        for record, result in zip(audit_log.records, results):
+            assert record["score"] == result["score"]
+            assert record["decision"] == result["risk_level"]
+            assert record["probability"] == pytest.approx(result["probability"], abs=1e-6)
+
+    def test_invalid_ids(self, client, clients):
+        """Identifiant non entier ou hors int64 : ligne signalée, le flux continue."""
+        body = to_ndjson([{**clients[0], "sk_id_curr": 1.5}, {**clients[1], "sk_id_curr": 10**20}, clients[2]])
+        response = client.post("/predict/stream", content=body)
+        results = [json.loads(line) for line in response.text.splitlines()]
+
+        assert response.status_code == 200
+        assert len(results) == 3
+        for result in results[:2]:
+            assert "sk_id_curr" in result["error"] and result["sk_id_curr"] is None
+            assert result["score"] is None
+        assert results[2]["sk_id_curr"] == 3 and results[2]["error"] is None
+
+    def test_ndjson_ids_stay_integers(self, client, clients):
+        """Lot mêlant lignes avec et sans identifiant : entiers, comme /predict/batch."""
+        rows = [clients[0], {k: v for k, v in clients[1].items() if k != "sk_id_curr"}, clients[2]]
+        response = client.post("/predict/stream", content=to_ndjson(rows))
+
+        assert '"sk_id_curr":1,' in response.text
+        results = [json.loads(line) for line in response.text.splitlines()]
+        expected = client.post("/predict/batch", json=rows).json()["results"]
+        assert results == expected
+
+    def test_failed_batch_reported(self, client, clients, monkeypatch):
+        """Échec d'un lot après l'envoi des en-têtes : lignes en erreur, lots suivants scorés."""
+        def failing(batch):
+            if 3 in batch["sk_id_curr"].tolist():
+                raise RuntimeError("modèle indisponible")
+            return score_batch(batch)
+
+        monkeypatch.setattr("api.main.STREAM_BATCH_SIZE", 2)
+        monkeypatch.setattr("api.main.score_batch", failing)
+        response = client.post("/predict/stream", content=to_ndjson(clients))
+        results = [json.loads(line) for line in response.text.splitlines()]
+
+        assert [r["sk_id_curr"] for r in results] == [1, 2, 3, 4, 5]
+        assert all("modèle indisponible" in r["error"] and r["score"] is None for r in results[2:4])
+        assert all(r["error"] is None for r in results[:2] + results[4:])
+
+    def test_arrow_matches_ndjson(self, client, clients):
+        """Le flux Arrow IPC donne les mêmes scores que le flux NDJSON."""
+        ndjson = client.post("/predict/stream", content=to_ndjson(clients))
+        arrow = client.post(
+            "/predict/stream", content=to_arrow_stream(clients),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"}
+        )
+        assert arrow.headers["content-type"].startswith("application/vnd.apache.arrow.stream")
+
+        result = ipc.open_stream(arrow.content).read_pandas()
+        expected = [json.loads(line) for line in ndjson.text.splitlines()]
+
+        assert result["sk_id_curr"].tolist() == [r["sk_id_curr"] for r in expected]
+        assert result["probability"].tolist() == [r["probability"] for r in expected]
+        assert result["risk_level"].tolist() == [r["risk_level"] for r in expected]
+
+    @pytest.mark.parametrize("fmt", ["ndjson", "arrow"])
+    def test_batcher_chunk_boundaries(self, clients, fmt):
+        """Découpage arbitraire du corps : mêmes lignes, lots de taille fixe."""
+        payload, batcher = (
+            (to_ndjson(clients), NdjsonBatcher(batch_size=2)) if fmt == "ndjson"
+            else (to_arrow_stream(clients), ArrowStreamBatcher(batch_size=2))
+        )
+
+        batches = []
+        for i in range(0, len(payload), 7):
+            batches.extend(batcher.feed(payload[i:i + 7]))
+        batches.extend(batcher.finish())
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert pd.concat(batches)["sk_id_curr"].tolist() == [1, 2, 3, 4, 5]
+
+
+# =============================================================================
+# TESTS ENDPOINT /predict/batch ET SÉRIALISATION
+# =============================================================================
+
+ARROW_HEADERS = {"Accept": "application/vnd.apache.arrow.stream"}
+
+
+class TestPredictBatch:
+    """Tests du scoring par lot (réponse JSON ou Arrow IPC)."""
+
+    def test_json_matches_predict(self, client, clients):
+        """Chaque client du lot donne le même résultat que /predict."""
+        response = client.post("/predict/batch", json=clients)
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        assert [r["sk_id_curr"] for r in results] == [1, 2, 3, 4, 5]
+        for record, result in zip(clients, results):
+            expected = client.post("/predict", json=record).json()
+            assert result["probability"] == pytest.approx(expected["probability"], abs=1e-6)
+            for key in ["prediction", "risk_level", "score"]:
+                assert result[key] == expected[key]
+
+    def test_arrow_response_matches_json(self, client, clients):
+        """Réponse Arrow IPC (entrée JSON ou Arrow) identique à la réponse JSON."""
+        expected = client.post("/predict/batch", json=clients).json()["results"]
+
+        for kwargs in [
+            {"json": clients},
+            {"content": to_arrow_stream(clients),
+             "headers": {"Content-Type": "application/vnd.apache.arrow.stream"}},
+        ]:
+            response = client.post("/predict/batch", **{
+                **kwargs, "headers": {**kwargs.get("headers", {}), **ARROW_HEADERS}
+            })
+            assert response.headers["content-type"].startswith("application/vnd.apache.arrow.stream")
+            result = ipc.open_stream(response.content).read_pandas()
+
+            assert result["sk_id_curr"].tolist() == [r["sk_id_curr"] for r in expected]
+            assert result["probability"].tolist() == [r["probability"] for r in expected]
+            assert result["score"].tolist() == [r["score"] for r in expected]
+
+    def test_invalid_rows_and_body(self, client, valid_client_data):
+        """Ligne invalide signalée ; corps non conforme refusé (400)."""
+        results = client.post("/predict/batch", json=[valid_client_data, {"amt_credit": 1}]).json()["results"]
+        assert results[0]["error"] is None
+        assert results[1]["error"] and results[1]["probability"] is None
+
+        assert client.post("/predict/batch", json={"clients": []}).status_code == 400
+        assert client.post("/predict/batch", content=b"not json").status_code == 400
+
+    def test_decisions_logged(self, client, clients, valid_client_data, audit_log):
+        """Chaque client scoré est journalisé ; la ligne invalide ne l'est pas."""
+        results = client.post("/predict/batch", json=clients + [{"amt_credit": 1}]).json()["results"]
+
+        assert [r["sk_id_curr"] for r in audit_log.records] == [1, 2, 3, 4, 5]
+        assert [r["decision"] for r in audit_log.records] == [r["risk_level"] for r in results[:5]]
+        assert all(r["model_version"] for r in audit_log.records)
+
+    def test_invalid_ids(self, client, clients):
+        """Identifiant non entier ou hors int64 : erreur sur la ligne, pas de 500."""
+        response = client.post("/predict/batch", json=[
+            {**clients[0], "sk_id_curr": 1.5}, {**clients[1], "sk_id_curr": 10**20}, clients[2]
+        ])
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        assert [r["sk_id_curr"] for r in results] == [None, None, 3]
+        assert all("sk_id_curr" in r["error"] and r["probability"] is None for r in results[:2])
+        assert results[2]["error"] is None
+
+    def test_too_many_rows(self, client, clients, monkeypatch):
+        """Lot trop grand : 413."""
+        monkeypatch.setattr("api.main.BATCH_MAX_ROWS", 3)
+        assert client.post("/predict/batch", json=clients).status_code == 413
+
+
+class TestFastSerialization:
+    """orjson et chemin Pydantic standard donnent le même JSON."""
+
+    @pytest.mark.parametrize("endpoint", ["/predict", "/explain"])
+    def test_fast_matches_validated(self, client, valid_client_data, monkeypatch, endpoint):
+        fast = client.post(endpoint, json=valid_client_data).json()
+        monkeypatch.setattr("api.main.FAST_JSON", False)
+        validated = client.post(endpoint, json=valid_client_data).json()
+
+        assert fast == validated
+
+    def test_serialization_metric(self, client, valid_client_data):
+        """Temps de sérialisation exposé par endpoint."""
+        client.post("/predict", json=valid_client_data)
+        metrics = client.get("/metrics").text
+
+        assert 'credit_risk_serialization_seconds_count{encoder="orjson",endpoint="/predict"}' in metrics
+
+
 # =============================================================================
 # TESTS DE PERFORMANCE
 # =============================================================================
@@ -0,0 +1,83 @@
+# =============================================================================
+# TESTS ARTEFACTS DU MODÈLE - Credit Risk Scoring
+# =============================================================================
+# Modèle natif UBJSON + manifeste avec checksums (src/models/artifacts.py)
+# Exécution : pytest tests/test_artifacts.py -v
+# =============================================================================
+
+import pytest
+import json
+import shutil
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.artifacts import (
+    ChecksumError, convert_pickle, load_model_artifacts, load_production_artifacts, save_model_artifacts
+)
+
+MODELS_DIR = Path(__file__).parent.parent / "models"
+MODEL_FILENAME = "xgboost_credit_risk_v1.pkl"
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def pickled_models_dir(tmp_path):
+    """Copie des artefacts historiques (pickle seulement)."""
+    for name in [MODEL_FILENAME, "feature_names.json", "category_codes.json", "metrics.json"]:
+        shutil.copy(MODELS_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestNativeArtifacts:
+    """Conversion, vérification des checksums et chargement côte à côte."""
+
+    def test_same_predictions_as_pickle(self, pickled_models_dir):
+        legacy = load_production_artifacts(pickled_models_dir, MODEL_FILENAME)
+        manifest_path = convert_pickle(pickled_models_dir, MODEL_FILENAME, "v1.0.0")
+        native = load_production_artifacts(pickled_models_dir, MODEL_FILENAME)
+
+        manifest = json.loads(manifest_path.read_text())
+        assert manifest["feature_names"] == legacy.feature_names
+        assert manifest["thresholds"]["decision"] == 0.5
+        assert native.model_version == "v1.0.0"
+        assert native.registry.categories("code_gender") == legacy.registry.categories("code_gender")
+
+        X = np.random.default_rng(0).random((50, len(native.feature_names)), dtype=np.float32)
+        np.testing.assert_array_equal(native.booster.inplace_predict(X), legacy.booster.inplace_predict(X))
+        np.testing.assert_array_equal(native.classifier.predict_proba(X), legacy.classifier.predict_proba(X))
+
+    def test_checksum_mismatch(self, pickled_models_dir):
+        manifest_path = convert_pickle(pickled_models_dir, MODEL_FILENAME)
+        model_path = pickled_models_dir / "xgboost_credit_risk_v1.ubj"
+        model_path.write_bytes(model_path.read_bytes()[:-10])
+
+        with pytest.raises(ChecksumError):
+            load_model_artifacts(manifest_path)
+
+    def test_versions_side_by_side(self, tmp_path):
+        legacy = load_production_artifacts(MODELS_DIR, MODEL_FILENAME)
+        v1 = save_model_artifacts(legacy.booster, tmp_path, "model_v1.pkl", legacy.feature_names, None, "v1")
+        v2 = save_model_artifacts(legacy.booster[:10], tmp_path, "model_v2.pkl", legacy.feature_names, None, "v2")
+
+        first, second = load_model_artifacts(v1), load_model_artifacts(v2)
+        assert (first.model_version, second.model_version) == ("v1", "v2")
+        assert second.booster.num_boosted_rounds() == 10
+        assert first.booster.num_boosted_rounds() == legacy.booster.num_boosted_rounds()
+        assert first.registry is None
+
+    def test_missing_model(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_production_artifacts(tmp_path, MODEL_FILENAME)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,115 @@
+# =============================================================================
+# TESTS CALIBRATION DES PROBABILITÉS - Credit Risk Scoring
+# =============================================================================
+# Table de correspondance monotone et règles de décision (src/models/calibration.py)
+# Exécution : pytest tests/test_calibration.py -v
+# =============================================================================
+
+import pytest
+import numpy as np
+import xgboost as xgb
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.artifacts import load_model_artifacts, save_model_artifacts
+from src.models.calibration import (
+    ScoreCalibration, credit_scores, decisions, fit_calibration, risk_levels, scaled_scores
+)
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def weighted_scores():
+    """Probabilités d'un modèle entraîné avec scale_pos_weight=11 (surestimées)."""
+    rng = np.random.default_rng(0)
+    true_proba = 1 / (1 + np.exp(-rng.normal(-2.6, 1.0, 20000)))
+    y = (rng.random(20000) < true_proba).astype(int)
+    odds = 11 * true_proba / (1 - true_proba)
+    return y, odds / (1 + odds)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestFit:
+    """Calibration isotone / Platt : table monotone, taux de défaut retrouvé."""
+
+    @pytest.mark.parametrize("method", ["isotonic", "platt"])
+    def test_calibrated_mean(self, weighted_scores, method):
+        y, raw = weighted_scores
+        calibration = fit_calibration(y, raw, {"method": method, "max_knots": 50})
+        calibrated = calibration.transform(raw)
+
+        assert len(calibration.raw) <= 50
+        assert np.all(np.diff(calibration.calibrated) >= 0)
+        assert raw.mean() > 0.3
+        assert calibrated.mean() == pytest.approx(y.mean(), abs=0.01)
+        assert np.mean((calibrated - y) ** 2) < np.mean((raw - y) ** 2)
+
+    def test_round_trip(self, weighted_scores):
+        y, raw = weighted_scores
+        calibration = fit_calibration(y, raw, {"method": "platt"})
+        loaded = ScoreCalibration.from_dict(calibration.to_dict())
+
+        np.testing.assert_array_equal(loaded.transform(raw), calibration.transform(raw))
+        assert loaded.decision_threshold == calibration.decision_threshold
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            fit_calibration(np.array([0, 1]), np.array([0.2, 0.8]), {"method": "beta"})
+
+
+class TestDecisions:
+    """Règles servies par l'API et le scoring batch."""
+
+    def test_without_calibration(self):
+        proba = np.array([0.1, 0.45, 0.7])
+        decided = decisions(proba)
+
+        assert decided["risk_level"].tolist() == risk_levels(proba).tolist()
+        np.testing.assert_array_equal(decided["score"], credit_scores(proba))
+        assert decided["prediction"].tolist() == [0, 0, 1]
+
+    def test_with_calibration(self, weighted_scores):
+        y, raw = weighted_scores
+        calibration = fit_calibration(y, raw, {"method": "platt"})
+        decided = decisions(raw, calibration)
+
+        # Même point de fonctionnement que le seuil 0.5 de l'entraînement
+        np.testing.assert_array_equal(decided["prediction"], (raw >= 0.5).astype(np.int8))
+        assert set(decided["risk_level"]) == {"Faible", "Moyen", "Élevé"}
+        order = np.argsort(decided["probability"])
+        assert np.all(np.diff(decided["score"][order]) <= 0)
+
+    def test_scaled_scores(self):
+        # base_score à la cote de référence, +pdo points quand la cote double
+        scores = scaled_scores(np.array([1 / 13, 1 / 25, 0.999]), base_score=600, base_odds=12, pdo=40)
+        assert scores.tolist() == [600, 640, 300]
+
+
+class TestArtifacts:
+    """Table écrite avec le manifeste, checksum vérifié au chargement."""
+
+    def test_saved_with_manifest(self, weighted_scores, tmp_path):
+        y, raw = weighted_scores
+        X = raw.reshape(-1, 1).astype(np.float32)
+        booster = xgb.train({"objective": "binary:logistic", "max_depth": 2},
+                            xgb.DMatrix(X, label=y, feature_names=["raw"]), num_boost_round=5)
+        calibration = fit_calibration(y, raw)
+
+        path = save_model_artifacts(booster, tmp_path, "model.pkl", ["raw"], None, "v-test",
+                                    calibration=calibration)
+        artifacts = load_model_artifacts(path)
+
+        assert artifacts.manifest["files"]["calibration"]["path"] == "model.calibration.json"
+        assert artifacts.manifest["thresholds"]["decision"] == calibration.decision_threshold
+        np.testing.assert_array_equal(artifacts.calibration.transform(raw), calibration.transform(raw))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
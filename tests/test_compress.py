@@ -0,0 +1,89 @@
+# =============================================================================
+# TESTS COMPRESSION DU MODÈLE - Credit Risk Scoring
+# =============================================================================
+# Élagage et distillation sous contrainte d'AUC (src/models/compress.py)
+# Exécution : pytest tests/test_compress.py -v
+# =============================================================================
+
+import pytest
+import json
+import numpy as np
+import xgboost as xgb
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.artifacts import load_model_artifacts
+from src.models.compress import ModelCompressor, select_trees, tree_contributions
+from tests.test_train import make_feature_dataset
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def compressor(tmp_path):
+    """Compresseur d'un modèle de 100 arbres écrit dans un dossier temporaire."""
+    compressor = ModelCompressor(CONFIG_PATH)
+    compressor.settings.update({"max_auc_drop": 0.01, "distill_rounds": 60, "latency_repeats": 20})
+    trainer = compressor.trainer
+    trainer.models_dir = tmp_path
+
+    X, y = trainer.prepare(make_feature_dataset(4000))
+    X_train, y_train = trainer.split(X, y)["train"]
+    booster = xgb.train({"objective": "binary:logistic", "max_depth": 4, "learning_rate": 0.05},
+                        xgb.DMatrix(X_train, label=y_train), num_boost_round=100)
+    trainer.save_artifacts(trainer.to_classifier(booster), {"auc_roc": 0.75})
+    return compressor
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestTreeSelection:
+    """Sous-ensemble d'arbres : marges identiques à la somme des contributions."""
+
+    def test_subset_margins(self, compressor, tmp_path):
+        booster = load_model_artifacts(tmp_path / "xgboost_credit_risk_v1.manifest.json").booster
+        X = np.random.default_rng(0).random((200, len(booster.feature_names)), dtype=np.float32)
+        contributions, base_margin = tree_contributions(booster, X)
+
+        keep = np.arange(contributions.shape[1]) % 3 == 0
+        subset = select_trees(booster, keep, margin_shift=0.25)
+        margin = subset.inplace_predict(X, predict_type="margin", validate_features=False)
+
+        np.testing.assert_allclose(margin, base_margin + contributions[:, keep].sum(axis=1) + 0.25, atol=1e-4)
+        assert subset.num_boosted_rounds() == keep.sum()
+
+
+class TestCompression:
+    """Modèle alternatif plus petit, AUC bornée, comparatif dans metrics.json."""
+
+    def test_compressed_artifact(self, compressor, tmp_path):
+        compression = compressor.run(make_feature_dataset(4000))
+
+        production, compressed = compression["production"], compression["compressed"]
+        assert compressed["valid_auc"] >= production["valid_auc"] - 0.01
+        assert compressed["test_auc"] >= production["test_auc"] - 0.01
+        assert compressed["path_length"] < production["path_length"]
+        assert {"single_row_ms", "batch_us_per_row", "test_auc"} <= set(compressed)
+
+        metrics = json.loads((tmp_path / "metrics.json").read_text())
+        assert metrics["compression"]["manifest"] == "xgboost_credit_risk_v1_compressed.manifest.json"
+        assert metrics["auc_roc"] == 0.75  # métriques de l'entraînement conservées
+
+        artifacts = load_model_artifacts(tmp_path / compression["manifest"])
+        assert artifacts.booster.num_boosted_rounds() == compressed["n_trees"]
+        assert artifacts.model_version == "v1.0.0_compressed"
+
+    def test_unknown_method(self, compressor):
+        with pytest.raises(ValueError):
+            compressor.run(make_feature_dataset(500), methods=["quantize"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,80 @@
+# =============================================================================
+# TESTS ENCODAGE - Credit Risk Scoring
+# =============================================================================
+# Tests unitaires du dictionnaire des catégories (CategoryRegistry)
+# Exécution : pytest tests/test_encoding.py -v
+# =============================================================================
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.features.encoding import CategoryRegistry, load_category_registry
+
+MODELS_DIR = Path(__file__).parent.parent / "models"
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def registry():
+    """Registre construit comme dans le notebook (NaN -> 'MISSING')."""
+    gender = LabelEncoder().fit(["M", "F", "XNA"])
+    occupation = LabelEncoder().fit(["Drivers", "MISSING", "Core staff"])
+    return CategoryRegistry.from_label_encoders({"code_gender": gender, "occupation_type": occupation})
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestCategoryRegistry:
+    """Tests de l'encodage partagé entraînement / service."""
+
+    def test_codes_match_label_encoder(self, registry):
+        """Les codes sont ceux du LabelEncoder d'origine."""
+        values = ["M", "F", "M", "XNA"]
+        expected = LabelEncoder().fit(["M", "F", "XNA"]).transform(values)
+
+        np.testing.assert_array_equal(registry.encode("code_gender", values), expected)
+
+    def test_missing_and_unknown_values(self, registry):
+        """NaN -> 'MISSING' si la catégorie existe, sinon NaN ; valeur inconnue -> NaN."""
+        occupation = registry.encode("occupation_type", [None, "Drivers", "Astronaut"])
+        gender = registry.encode("CODE_GENDER", [None, "F"])
+
+        assert occupation[0] == 2 and occupation[1] == 1 and np.isnan(occupation[2])
+        assert np.isnan(gender[0]) and gender[1] == 0
+
+    def test_encode_frame_and_roundtrip(self, registry, tmp_path):
+        """Le registre sauvegardé en JSON encode un DataFrame à l'identique."""
+        df = pd.DataFrame({"CODE_GENDER": ["F", "M"], "AMT_CREDIT": [1.0, 2.0]})
+        restored = CategoryRegistry.load(registry.save(tmp_path / "category_codes.json"))
+
+        result = restored.encode_frame(df)
+
+        assert result["CODE_GENDER"].tolist() == [0.0, 1.0]
+        assert result["AMT_CREDIT"].tolist() == [1.0, 2.0]
+        assert df["CODE_GENDER"].tolist() == ["F", "M"]
+
+    def test_new_categories_keep_existing_codes(self, registry):
+        """Les valeurs absentes du registre sont ajoutées à la fin."""
+        categories = registry.categories("code_gender", ["M", "Z", np.nan])
+
+        assert categories == ["F", "M", "XNA", "Z"]
+
+    def test_project_registry_matches_encoders(self):
+        """category_codes.json reprend exactement label_encoders.pkl."""
+        joblib = pytest.importorskip("joblib")
+        encoders = joblib.load(MODELS_DIR / "label_encoders.pkl")
+        registry = load_category_registry(MODELS_DIR)
+
+        assert sorted(registry.columns) == sorted(encoders)
+        for col, encoder in encoders.items():
+            assert registry.categories(col) == list(encoder.classes_)
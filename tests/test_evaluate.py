@@ -0,0 +1,80 @@
+# =============================================================================
+# TESTS ÉVALUATION - Credit Risk Scoring
+# =============================================================================
+# Validation croisée parallèle et métriques vectorisées (src/models/evaluate.py)
+# Exécution : pytest tests/test_evaluate.py -v
+# =============================================================================
+
+import pytest
+import json
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.evaluate import METRIC_NAMES, ModelEvaluator, binary_metrics, roc_auc
+from src.models.train import classification_metrics
+from tests.test_train import make_feature_dataset
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def evaluator(tmp_path):
+    """Évaluateur écrivant ses résultats dans un dossier temporaire."""
+    evaluator = ModelEvaluator(CONFIG_PATH)
+    evaluator.trainer.models_dir = tmp_path
+    (tmp_path / "best_params.json").write_text(json.dumps({"n_estimators": 40, "max_depth": 3}))
+    return evaluator
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestMetrics:
+    """Métriques vectorisées identiques à scikit-learn."""
+
+    def test_same_values_as_sklearn(self):
+        rng = np.random.default_rng(0)
+        y = rng.integers(0, 2, 5000)
+        proba = np.round(rng.random(5000) * 0.5 + 0.3 * y, 2)  # ex aequo nombreux
+
+        vectorized = binary_metrics(y, proba)
+        reference = classification_metrics(y, proba)
+        for name in METRIC_NAMES:
+            assert vectorized[name] == pytest.approx(reference[name])
+
+    def test_edge_cases(self):
+        assert np.isnan(roc_auc(np.ones(10), np.random.rand(10)))
+        metrics = binary_metrics(np.array([0, 1, 0, 1]), np.array([0.1, 0.2, 0.3, 0.4]))
+        assert metrics["precision"] == 0.0 and metrics["f1_score"] == 0.0
+
+
+class TestCrossValidation:
+    """Folds dans des processus parallèles, schéma de metrics.json."""
+
+    def test_parallel_folds(self, evaluator, tmp_path):
+        df = make_feature_dataset(3000)
+        metrics = evaluator.run(df, n_folds=3, n_jobs=2, save_plots=True)
+
+        saved = json.loads((tmp_path / "cv_metrics.json").read_text())
+        assert set(METRIC_NAMES) | {"best_params"} <= set(saved)
+        assert saved["auc_roc"] == pytest.approx(metrics["auc_roc"])
+        assert metrics["auc_roc"] > 0.6
+        assert metrics["best_params"]["max_depth"] == 3
+
+        folds = saved["folds"]
+        assert [f["fold"] for f in folds] == [0, 1, 2]
+        assert sum(f["n_test"] for f in folds) == len(df)
+        assert all(f["n_train"] + f["n_test"] == len(df) for f in folds)
+        assert all(f["seconds"] >= f["train_seconds"] > 0 for f in folds)
+        assert (tmp_path / "cv_roc_curve.png").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
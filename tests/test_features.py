@@ -0,0 +1,242 @@
+# =============================================================================
+# TESTS FEATURES - Credit Risk Scoring
+# =============================================================================
+# Tests unitaires de l'assemblage des features (imputation post-fusion)
+# Exécution : pytest tests/test_features.py -v
+# =============================================================================
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.features.build_features import FeatureEngineer, compute_fill_values, fill_missing_features
+from src.utils import database
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# Types SQLite -> types information_schema de PostgreSQL
+SQLITE_TYPES = {"BIGINT": "bigint", "INTEGER": "bigint", "FLOAT": "double precision", "REAL": "double precision"}
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def merged_features():
+    """Jeu de features après fusion : clients sans historique = NaN."""
+    rng = np.random.default_rng(0)
+    n = 400
+    df = pd.DataFrame({
+        "sk_id_curr": np.arange(n),
+        "target": rng.integers(0, 2, n),
+        "amt_credit": rng.lognormal(13, 0.5, n),
+        "bureau_credit_count": rng.integers(0, 10, n).astype(float),
+        "bureau_debt_sum": rng.lognormal(10, 1, n),
+        "bureau_days_credit_mean": rng.normal(-900, 300, n),
+        "inst_late_ratio": rng.uniform(0, 1, n),
+        "name_income_type": rng.choice(["Working", "Pensioner"], n),
+    })
+    for col in ["bureau_credit_count", "bureau_debt_sum", "bureau_days_credit_mean", "inst_late_ratio"]:
+        df.loc[rng.choice(n, n // 4, replace=False), col] = np.nan
+    return df
+
+
+def make_application_rows(n, seed=3):
+    """Lignes application_train (colonnes en minuscules, comme en base)."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "sk_id_curr": np.arange(100000, 100000 + n),
+        "target": rng.integers(0, 2, n),
+        "amt_income_total": rng.lognormal(11.5, 0.6, n),
+        "amt_credit": rng.lognormal(13, 0.5, n),
+        "amt_annuity": rng.lognormal(10, 0.4, n),
+        "amt_goods_price": rng.lognormal(12.9, 0.5, n),
+        "cnt_fam_members": rng.integers(1, 6, n).astype(float),
+        "days_birth": rng.integers(-25000, -7000, n),
+        "days_employed": rng.integers(-20000, -100, n),
+        "days_registration": rng.uniform(-15000, 0, n),
+        "days_id_publish": rng.integers(-6000, 0, n),
+        "flag_document_3": rng.integers(0, 2, n),
+        "flag_mobil": rng.integers(0, 2, n),
+        "flag_phone": rng.integers(0, 2, n),
+        "ext_source_1": rng.uniform(0, 1, n),
+        "ext_source_2": rng.uniform(0, 1, n),
+        "ext_source_3": rng.uniform(0, 1, n),
+        "name_income_type": rng.choice(["Working", "Pensioner"], n),
+    })
+    df.loc[rng.random(n) < 0.5, "ext_source_1"] = np.nan
+    return df
+
+
+def make_sqlite_engine():
+    """Base SQLite en mémoire avec un schéma credit_risk (à la place de PostgreSQL)."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, _):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS credit_risk")
+
+    return engine
+
+
+@pytest.fixture
+def sqlite_engine(monkeypatch):
+    """Base SQLite, types de colonnes lus par PRAGMA."""
+    engine = make_sqlite_engine()
+
+    def column_types(engine, table_name, schema="credit_risk"):
+        with engine.connect() as conn:
+            rows = conn.execute(text(f'PRAGMA {schema}.table_info("{table_name}")')).fetchall()
+        return {row[1]: SQLITE_TYPES.get(row[2], "text") for row in rows}
+
+    # information_schema n'existe pas dans SQLite
+    monkeypatch.setattr(database, "get_column_types", column_types)
+    return engine
+
+
+@pytest.fixture
+def feature_engineer(sqlite_engine, monkeypatch, tmp_path):
+    """FeatureEngineer connecté à la base SQLite, sorties dans un dossier temporaire."""
+    monkeypatch.setattr(FeatureEngineer, "_create_engine", lambda self: sqlite_engine)
+    fe = FeatureEngineer(CONFIG_PATH)
+    fe.features_path = tmp_path
+    fe.fill_values_path = tmp_path / "feature_fill_values.json"
+    return fe
+
+
+def legacy_fill(df):
+    """Imputation historique, colonne par colonne."""
+    df = df.copy()
+    for col in df.select_dtypes(include=[np.number]).columns:
+        if col not in ['sk_id_curr', 'target']:
+            if any(x in col for x in ['count', 'sum']):
+                df[col] = df[col].fillna(0)
+            else:
+                df[col] = df[col].fillna(df[col].median())
+    return df
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestFillMissing:
+    """Tests de l'imputation vectorisée après fusion."""
+
+    def test_matches_legacy_fill(self, merged_features):
+        """Même résultat que la boucle fillna colonne par colonne."""
+        expected = legacy_fill(merged_features)
+        df = merged_features.copy()
+        result = fill_missing_features(df, compute_fill_values(df))
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result is df
+
+    def test_fill_values(self, merged_features):
+        """0 pour les comptes et sommes, médiane sinon ; identifiants exclus."""
+        fill_values = compute_fill_values(merged_features)
+
+        assert fill_values["bureau_credit_count"] == 0.0
+        assert fill_values["bureau_debt_sum"] == 0.0
+        assert fill_values["inst_late_ratio"] == pytest.approx(merged_features["inst_late_ratio"].median())
+        assert "sk_id_curr" not in fill_values and "target" not in fill_values
+        assert "name_income_type" not in fill_values
+
+    def test_fill_values_reused_on_new_data(self, merged_features):
+        """Les valeurs persistées s'appliquent telles quelles à de nouvelles lignes."""
+        fill_values = compute_fill_values(merged_features)
+        new = pd.DataFrame({"inst_late_ratio": [np.nan, 0.2], "bureau_credit_count": [np.nan, 3.0]})
+
+        fill_missing_features(new, fill_values)
+
+        assert new["inst_late_ratio"].tolist() == [fill_values["inst_late_ratio"], 0.2]
+        assert new["bureau_credit_count"].tolist() == [0.0, 3.0]
+
+
+class TestFeatureEngineer:
+    """Lecture en flux de application_train par le moteur SQLAlchemy."""
+
+    def test_streams_through_database_engine(self, feature_engineer, sqlite_engine):
+        rows = make_application_rows(250)
+        rows.to_sql("application_train", sqlite_engine, schema="credit_risk", index=False)
+
+        assert feature_engineer.engine is sqlite_engine
+        assert feature_engineer.compute_engine == "pandas"
+        chunks = list(feature_engineer.iter_application_chunks(chunk_size=100))
+
+        assert [len(c) for c in chunks] == [100, 100, 50]
+        result = pd.concat(chunks, ignore_index=True)
+        assert result["sk_id_curr"].tolist() == rows["sk_id_curr"].tolist()
+        assert "credit_income_ratio" in result.columns
+        assert result["ext_source_1"].dtype == "float64"
+
+
+class TestReadTableChunks:
+    """Curseur serveur : projection, filtre et types stables d'un lot à l'autre."""
+
+    def test_projection_filter_and_types(self, sqlite_engine):
+        rows = make_application_rows(120)
+        rows["own_car_age"] = pd.array([pd.NA] * 100 + list(range(20)), dtype="Int64")
+        rows.to_sql("application_train", sqlite_engine, schema="credit_risk", index=False)
+
+        chunks = list(database.read_table_chunks(
+            sqlite_engine, "application_train", columns=["sk_id_curr", "own_car_age"],
+            chunk_size=50, where="target = 1",
+        ))
+
+        result = pd.concat(chunks, ignore_index=True)
+        assert list(result.columns) == ["sk_id_curr", "own_car_age"]
+        assert result["sk_id_curr"].tolist() == rows.loc[rows.target == 1, "sk_id_curr"].tolist()
+        # Lots entièrement NULL : colonne entière lue en float64, pas en object
+        assert all(c["own_car_age"].dtype != object for c in chunks)
+
+    def test_unknown_table_or_column(self, sqlite_engine):
+        make_application_rows(10).to_sql("application_train", sqlite_engine, schema="credit_risk", index=False)
+
+        with pytest.raises(ValueError):
+            next(database.read_table_chunks(sqlite_engine, "bureau"))
+        with pytest.raises(ValueError):
+            next(database.read_table_chunks(sqlite_engine, "application_train", columns=["missing"]))
+
+
+class TestStreamingFeatureDataset:
+    """Jeu de features écrit en flux : identique à la version en mémoire."""
+
+    @pytest.fixture
+    def loaded_engineer(self, feature_engineer, sqlite_engine, monkeypatch):
+        rows = make_application_rows(250)
+        # Entier nullable : NULL seulement dans le dernier lot (int64 puis float64)
+        rows["own_car_age"] = pd.array(np.arange(250) % 20, dtype="Int64")
+        rows.loc[[230, 240], "own_car_age"] = pd.NA
+        rows.to_sql("application_train", sqlite_engine, schema="credit_risk", index=False)
+
+        bureau = pd.DataFrame({
+            "sk_id_curr": rows["sk_id_curr"].iloc[::3],
+            "bureau_credit_count": np.arange(84, dtype=float),
+            "bureau_days_credit_mean": np.linspace(-2000, -10, 84),
+        })
+        monkeypatch.setattr(feature_engineer, "_create_aggregates", lambda *flags: [bureau])
+        feature_engineer.config["data"]["sketch_k"] = 1000  # médianes exactes sur 250 lignes
+        return feature_engineer
+
+    def test_matches_in_memory(self, loaded_engineer):
+        expected = loaded_engineer.build_feature_dataset()
+        expected_fill = dict(loaded_engineer.fill_values)
+
+        path = loaded_engineer.write_feature_dataset("features.parquet", csv_filename="features.csv",
+                                                     chunk_size=100)
+        result = pd.read_parquet(path)
+
+        assert loaded_engineer.fill_values == pytest.approx(expected_fill)
+        pd.testing.assert_frame_equal(result, expected)
+        assert result["own_car_age"].dtype == "float64"
+        assert result["bureau_credit_count"].isna().sum() == 0
+        assert len(pd.read_csv(loaded_engineer.features_path / "features.csv")) == 250
+        assert not (loaded_engineer.features_path / "features.unfilled.parquet").exists()
+        assert loaded_engineer.fill_values_path.exists()
@@ -0,0 +1,125 @@
+# =============================================================================
+# TESTS MOTEUR POLARS - Credit Risk Scoring
+# =============================================================================
+# Équivalence entre les moteurs pandas et polars
+# Exécution : pytest tests/test_polars_engine.py -v
+# =============================================================================
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("polars")
+
+from src.data.preprocessing import DataPreprocessor
+from src.features import polars_engine
+from src.features.build_features import FeatureEngineer
+from tests.test_preprocessing import make_applications
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def application_rows():
+    """Lignes application_train (colonnes en minuscules, comme en base)."""
+    rng = np.random.default_rng(3)
+    n = 1000
+    df = pd.DataFrame({
+        "sk_id_curr": np.arange(n),
+        "amt_income_total": rng.lognormal(11.5, 0.6, n),
+        "amt_credit": rng.lognormal(13, 0.5, n),
+        "amt_annuity": rng.lognormal(10, 0.4, n),
+        "amt_goods_price": rng.lognormal(12.9, 0.5, n),
+        "cnt_fam_members": rng.integers(1, 6, n).astype(float),
+        "days_birth": rng.integers(-25000, -7000, n),
+        "days_employed": rng.choice([365243, -100, -2000, -20000], n),
+        "days_registration": rng.uniform(-15000, 0, n),
+        "days_id_publish": rng.integers(-6000, 0, n),
+        "flag_document_3": rng.integers(0, 2, n),
+        "flag_document_6": rng.integers(0, 2, n),
+        "flag_mobil": rng.integers(0, 2, n),
+        "flag_phone": rng.integers(0, 2, n),
+        "flag_email": rng.integers(0, 2, n),
+        "ext_source_1": rng.uniform(0, 1, n),
+        "ext_source_2": rng.uniform(0, 1, n),
+        "ext_source_3": rng.uniform(0, 1, n),
+        "name_income_type": rng.choice(["Working", "Pensioner"], n),
+    })
+    for col, share in [("ext_source_1", 0.5), ("ext_source_3", 0.2), ("amt_annuity", 0.01)]:
+        df.loc[rng.random(n) < share, col] = np.nan
+    return df
+
+
+@pytest.fixture
+def polars_preprocessor():
+    """Preprocessor utilisant le moteur polars pour transform()."""
+    preprocessor = DataPreprocessor(CONFIG_PATH)
+    preprocessor.engine = "polars"
+    return preprocessor
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestApplicationFeatures:
+    """Features applicatives : mêmes valeurs qu'avec pandas."""
+
+    def test_matches_pandas(self, application_rows):
+        """Ratios, âges, comptages et statistiques ext_source identiques."""
+        expected = FeatureEngineer._create_application_features_pandas(application_rows)
+        result = polars_engine.create_application_features(application_rows)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+
+    def test_all_ext_sources_missing(self, application_rows):
+        """Sans score externe : moyenne, min, max et écart-type manquants."""
+        application_rows[["ext_source_1", "ext_source_2", "ext_source_3"]] = np.nan
+        result = polars_engine.create_application_features(application_rows)
+
+        assert result[["ext_source_mean", "ext_source_std", "ext_source_min", "ext_source_max"]].isnull().all().all()
+
+    def test_unknown_engine(self):
+        """Un moteur inconnu est refusé."""
+        with pytest.raises(ValueError):
+            polars_engine.check_engine("spark")
+
+
+class TestPolarsTransform:
+    """Rejeu de l'état du preprocessing : mêmes résultats qu'avec pandas."""
+
+    @pytest.mark.parametrize("cap_outliers", [False, True])
+    def test_matches_pandas(self, polars_preprocessor, cap_outliers):
+        """Même DataFrame (valeurs, dtypes, catégories) que le moteur pandas."""
+        train = make_applications(2000, seed=1)
+        new = make_applications(500, seed=2)
+        polars_preprocessor.fit(train, cap_outliers=cap_outliers)
+
+        pandas_preprocessor = DataPreprocessor(CONFIG_PATH)
+        pandas_preprocessor.state = polars_preprocessor.state
+        expected = pandas_preprocessor.transform(new)
+
+        result = polars_preprocessor.transform(new)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-6)
+
+    def test_unseen_category_and_missing_indicator(self, polars_preprocessor):
+        """Catégorie inconnue -> manquante ; indicateur d'anomalie ajouté à 0."""
+        train = make_applications(1000)
+        polars_preprocessor.fit(train)
+        client = train[train["DAYS_EMPLOYED"] != 365243].head(2).drop(columns=["TARGET"])
+        client["NAME_INCOME_TYPE"] = ["Astronaut", "Working"]
+
+        result = polars_preprocessor.transform(client)
+
+        assert result["DAYS_EMPLOYED_ANOMALY"].tolist() == [0, 0]
+        assert pd.isna(result["NAME_INCOME_TYPE"].iloc[0])
+        assert result["NAME_INCOME_TYPE"].iloc[1] == "Working"
+        assert "TARGET" not in result.columns
@@ -0,0 +1,167 @@
+# =============================================================================
+# TESTS JOURNAL DES PRÉDICTIONS - Credit Risk Scoring
+# =============================================================================
+# Tests unitaires du writer asynchrone de credit_risk.predictions
+# Exécution : pytest tests/test_prediction_writer.py -v
+# =============================================================================
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.predictions import PredictionWriter, WRITER_RECORDS_DROPPED
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+class ListSink:
+    """Sink de test qui mémorise les lots écrits."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, records):
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append(list(records))
+        return len(records)
+
+    @property
+    def records(self):
+        return [r for batch in self.batches for r in batch]
+
+
+@pytest.fixture
+def record():
+    """Décision de crédit type."""
+    return {
+        "sk_id_curr": 100002,
+        "probability": 0.42,
+        "score": 619,
+        "decision": "Moyen",
+        "model_version": "v1.0.0",
+    }
+
+
+def wait_for(condition, timeout=2.0):
+    """Attend qu'une condition soit vraie (ou échoue après timeout)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestPredictionWriter:
+    """Tests du writer asynchrone."""
+
+    def test_flush_on_batch_size(self, record):
+        """Un lot complet doit être écrit sans attendre l'intervalle."""
+        sink = ListSink()
+        writer = PredictionWriter(sink, batch_size=5, flush_interval_seconds=30)
+        writer.start()
+        for _ in range(5):
+            assert writer.submit(record)
+
+        assert wait_for(lambda: len(sink.records) == 5)
+        assert len(sink.batches) == 1
+        writer.stop()
+
+    def test_flush_on_interval(self, record):
+        """Un lot partiel doit être écrit après flush_interval_seconds."""
+        sink = ListSink()
+        writer = PredictionWriter(sink, batch_size=100, flush_interval_seconds=0.05)
+        writer.start()
+        writer.submit(record)
+
+        assert wait_for(lambda: len(sink.records) == 1)
+        writer.stop()
+
+    def test_created_at_set_on_submit(self, record):
+        """La date de décision est celle de la soumission, pas de l'écriture."""
+        sink = ListSink()
+        writer = PredictionWriter(sink, batch_size=1)
+        writer.start()
+        writer.submit(record)
+
+        assert wait_for(lambda: len(sink.records) == 1)
+        assert sink.records[0]["created_at"] is not None
+        assert "created_at" not in record
+        writer.stop()
+
+    def test_stop_flushes_pending_records(self, record):
+        """stop() doit écrire les décisions encore en file."""
+        sink = ListSink()
+        writer = PredictionWriter(sink, batch_size=1000, flush_interval_seconds=30)
+        writer.start()
+        for _ in range(10):
+            writer.submit(record)
+        writer.stop()
+
+        assert len(sink.records) == 10
+        assert writer.pending == 0
+
+    def test_drop_when_queue_full(self, record):
+        """Avec la politique 'drop', une file pleine rejette sans bloquer."""
+        writer = PredictionWriter(ListSink(), queue_size=2, overflow_policy="drop")
+        dropped_before = WRITER_RECORDS_DROPPED.labels(reason="queue_full")._value.get()
+
+        # Thread non démarré : la file se remplit
+        assert writer.submit(record)
+        assert writer.submit(record)
+        start = time.monotonic()
+        assert not writer.submit(record)
+        assert time.monotonic() - start < 0.05
+
+        dropped_after = WRITER_RECORDS_DROPPED.labels(reason="queue_full")._value.get()
+        assert dropped_after == dropped_before + 1
+
+    def test_block_policy_waits_before_dropping(self, record):
+        """Avec la politique 'block', l'appelant attend block_timeout_seconds."""
+        writer = PredictionWriter(
+            ListSink(), queue_size=1, overflow_policy="block", block_timeout_seconds=0.1
+        )
+        writer.submit(record)
+
+        start = time.monotonic()
+        assert not writer.submit(record)
+        assert time.monotonic() - start >= 0.09
+
+    def test_sink_error_does_not_stop_writer(self, record):
+        """Une erreur d'écriture ne doit pas arrêter le thread."""
+        calls = []
+
+        def failing_then_ok(records):
+            calls.append(len(records))
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            return len(records)
+
+        writer = PredictionWriter(failing_then_ok, batch_size=1, flush_interval_seconds=0.01)
+        writer.start()
+        writer.submit(record)
+        assert wait_for(lambda: len(calls) == 1)
+        writer.submit(record)
+        assert wait_for(lambda: len(calls) == 2)
+        writer.stop()
+
+    def test_unknown_policy_rejected(self):
+        """Une politique inconnue doit lever une erreur."""
+        with pytest.raises(ValueError):
+            PredictionWriter(ListSink(), overflow_policy="retry")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
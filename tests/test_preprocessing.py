@@ -0,0 +1,248 @@
+# =============================================================================
+# TESTS PREPROCESSING - Credit Risk Scoring
+# =============================================================================
+# Tests unitaires du DataPreprocessor (fit / transform)
+# Exécution : pytest tests/test_preprocessing.py -v
+# =============================================================================
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.preprocessing import DataPreprocessor
+from src.data.sketches import KLLSketch, StreamingStatistics
+from src.data.statistics import compute_column_stats
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def preprocessor():
+    """Preprocessor configuré avec le config.yaml du projet."""
+    return DataPreprocessor(CONFIG_PATH)
+
+
+def make_applications(n, seed=42):
+    """Échantillon synthétique au format application_train."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "SK_ID_CURR": np.arange(100000, 100000 + n),
+        "TARGET": rng.integers(0, 2, n),
+        "AMT_INCOME_TOTAL": rng.lognormal(11.5, 0.6, n),
+        "AMT_CREDIT": rng.lognormal(13, 0.5, n),
+        "DAYS_EMPLOYED": rng.integers(-15000, -100, n),
+        "CNT_CHILDREN": rng.integers(0, 4, n),
+        "EXT_SOURCE_1": rng.uniform(0, 1, n),
+        "OWN_CAR_AGE": rng.uniform(0, 30, n),
+        "FLAG_OWN_CAR": rng.choice(["Y", "N"], n),
+        "NAME_INCOME_TYPE": rng.choice(["Working", "Pensioner", "State servant"], n),
+    })
+    df.loc[rng.choice(n, n // 10, replace=False), "DAYS_EMPLOYED"] = 365243
+    df.loc[rng.choice(n, n // 5, replace=False), "EXT_SOURCE_1"] = np.nan
+    df.loc[rng.choice(n, n * 9 // 10, replace=False), "OWN_CAR_AGE"] = np.nan
+    df["NAME_INCOME_TYPE"] = df["NAME_INCOME_TYPE"].astype(object)
+    df.loc[rng.choice(n, n // 25, replace=False), "NAME_INCOME_TYPE"] = np.nan
+    return df
+
+
+@pytest.fixture
+def applications():
+    """Échantillon synthétique de 500 demandes."""
+    return make_applications(500)
+
+
+def split_chunks(df, chunk_size):
+    """Découpe un DataFrame en chunks, comme pd.read_csv(chunksize=...)."""
+    return (df.iloc[i:i + chunk_size].copy() for i in range(0, len(df), chunk_size))
+
+
+def legacy_preprocess(preprocessor, df, cap_outliers):
+    """Pipeline historique (étape par étape) servant de référence."""
+    df = preprocessor.fix_anomalies(df)
+    df, _ = preprocessor.drop_high_missing_columns(df, threshold=0.7)
+    if cap_outliers:
+        exclude_cols = ["SK_ID_CURR", "TARGET"] + [c for c in df.columns if df[c].nunique() <= 2]
+        numeric_cols = [c for c in df.select_dtypes(include=[np.number]).columns if c not in exclude_cols]
+        df = preprocessor.cap_outliers(df, columns=numeric_cols)
+    df = preprocessor.impute_missing_values(df)
+    return preprocessor.optimize_dtypes(df)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestFitTransform:
+    """Tests du découpage fit / transform."""
+
+    @pytest.mark.parametrize("cap_outliers", [False, True])
+    def test_matches_legacy_pipeline(self, preprocessor, applications, cap_outliers):
+        """preprocess_application doit donner le même résultat que le pipeline historique."""
+        expected = legacy_preprocess(preprocessor, applications, cap_outliers)
+        result = preprocessor.preprocess_application(applications, cap_outliers=cap_outliers)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_transform_reuses_fitted_statistics(self, preprocessor, applications):
+        """Les nouvelles données sont imputées avec les médianes du fit."""
+        preprocessor.fit(applications)
+        median = applications["EXT_SOURCE_1"].median()
+
+        new = applications.head(3).copy()
+        new["EXT_SOURCE_1"] = [np.nan, 0.5, np.nan]
+        result = preprocessor.transform(new)
+
+        assert result["EXT_SOURCE_1"].tolist() == pytest.approx([median, 0.5, median], rel=1e-6)
+        assert "OWN_CAR_AGE" not in result.columns
+
+    def test_transform_keeps_fitted_columns(self, preprocessor, applications):
+        """Un client sans anomalie garde l'indicateur DAYS_EMPLOYED_ANOMALY."""
+        preprocessor.fit(applications)
+        client = applications[applications["DAYS_EMPLOYED"] != 365243].head(1).drop(columns=["TARGET"])
+
+        result = preprocessor.transform(client)
+
+        assert result["DAYS_EMPLOYED_ANOMALY"].tolist() == [0]
+        assert "TARGET" not in result.columns
+        assert result.isnull().sum().sum() == 0
+
+    def test_state_roundtrip(self, preprocessor, applications, tmp_path):
+        """L'état sauvegardé en JSON reproduit la même transformation."""
+        preprocessor.fit(applications, cap_outliers=True)
+        expected = preprocessor.transform(applications)
+        state_file = preprocessor.save_state(tmp_path / "preprocessing_state.json")
+
+        restored = DataPreprocessor(CONFIG_PATH)
+        restored.load_state(state_file)
+
+        pd.testing.assert_frame_equal(restored.transform(applications), expected)
+
+    def test_inplace_pipeline(self, preprocessor, applications):
+        """Le mode inplace donne le même résultat en modifiant le DataFrame fourni."""
+        expected = preprocessor.preprocess_application(applications.copy(), cap_outliers=True)
+        owned = applications.copy()
+        result = preprocessor.preprocess_application(owned, cap_outliers=True, inplace=True)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result is owned
+
+    def test_memory_report(self, preprocessor, applications):
+        """track_memory enregistre le pic de RSS de chaque étape."""
+        preprocessor.preprocess_application(applications, track_memory=True)
+        steps = preprocessor.stats["memory_steps"]
+
+        assert [s["step"] for s in steps] == [
+            "fix_anomalies", "fit_statistics", "apply_state"
+        ]
+        assert all(s["peak_mb"] >= s["start_mb"] > 0 for s in steps)
+
+    def test_transform_requires_fit(self, preprocessor, applications):
+        """transform sans état ajusté doit lever une erreur."""
+        with pytest.raises(RuntimeError):
+            preprocessor.transform(applications)
+
+
+class TestColumnStatistics:
+    """Tests du moteur de statistiques en une passe."""
+
+    def test_matches_pandas(self, applications):
+        """Nulls, cardinalité, médianes et quantiles identiques à pandas."""
+        stats = compute_column_stats(applications, quantiles=[0.01, 0.99], block_size=3)
+        numeric = applications.select_dtypes(include=[np.number])
+
+        pd.testing.assert_series_equal(stats.null_counts, applications.isnull().sum(), check_names=False)
+        pd.testing.assert_series_equal(stats.nunique, applications.nunique(), check_names=False)
+        pd.testing.assert_series_equal(stats.medians, numeric.median(), check_names=False)
+        pd.testing.assert_frame_equal(stats.quantiles, numeric.quantile([0.01, 0.99]))
+
+    def test_all_missing_and_constant_columns(self):
+        """Colonnes vides ou constantes : médiane NaN, cardinalité 0 ou 1."""
+        df = pd.DataFrame({"empty": [np.nan] * 4, "constant": [7.0] * 4})
+        stats = compute_column_stats(df, quantiles=[0.5])
+
+        assert stats.null_counts.tolist() == [4, 0]
+        assert stats.nunique.tolist() == [0, 1]
+        assert np.isnan(stats.medians["empty"])
+        assert stats.quantiles.at[0.5, "constant"] == 7.0
+
+
+class TestStreaming:
+    """Tests du mode streaming (sketches + Parquet partitionné)."""
+
+    def test_kll_rank_error(self):
+        """Les quantiles KLL restent à moins de 2% en rang, y compris après fusion."""
+        values = np.random.default_rng(0).lognormal(0, 1, 200_000)
+        left, right = KLLSketch(k=200, seed=1), KLLSketch(k=200, seed=2)
+        for chunk in np.array_split(values[:100_000], 10):
+            left.update(chunk)
+        for chunk in np.array_split(values[100_000:], 10):
+            right.update(chunk)
+        left.merge(right)
+
+        qs = [0.01, 0.5, 0.99]
+        ranks = [(values <= estimate).mean() for estimate in left.quantiles(qs)]
+        assert ranks == pytest.approx(qs, abs=0.02)
+
+    def test_streaming_statistics_exact_parts(self, applications):
+        """Nulls et cardinalités exacts ; médianes exactes sans compaction."""
+        sketch = StreamingStatistics(k=1000)
+        for chunk in split_chunks(applications, 120):
+            sketch.update(chunk)
+        stats = sketch.to_column_statistics()
+
+        pd.testing.assert_series_equal(stats.null_counts, applications.isnull().sum(), check_names=False)
+        pd.testing.assert_series_equal(stats.nunique, applications.nunique(), check_names=False)
+        pd.testing.assert_series_equal(
+            stats.medians, applications.select_dtypes(include=[np.number]).median(), check_names=False
+        )
+        assert sketch.mode("NAME_INCOME_TYPE") == applications["NAME_INCOME_TYPE"].mode()[0]
+
+    def test_fit_chunked_matches_fit(self, preprocessor):
+        """L'état streaming correspond à l'état en mémoire, aux tolérances près."""
+        df = make_applications(20_000, seed=7)
+        expected = DataPreprocessor(CONFIG_PATH).fit(df, cap_outliers=True).state
+        state = preprocessor.fit_chunked(chunks=split_chunks(df, 3_000), cap_outliers=True).state
+
+        for key in ["columns", "drop_columns", "anomaly_indicator", "dtypes", "categories"]:
+            assert state[key] == expected[key]
+        assert state["fill_values"]["NAME_INCOME_TYPE"] == expected["fill_values"]["NAME_INCOME_TYPE"]
+
+        # Tolérance en rang : value est un quantile q à ±2% près
+        fixed = preprocessor.fix_anomalies(df)
+
+        def within_rank(col, value, q, tol=0.02):
+            values = fixed[col].dropna()
+            return (values < value).mean() <= q + tol and (values <= value).mean() >= q - tol
+
+        for col, value in state["fill_values"].items():
+            if col in fixed.select_dtypes(include=[np.number]).columns:
+                assert within_rank(col, value, 0.5)
+        for col, (lower, upper) in state["cap_bounds"].items():
+            assert within_rank(col, lower, 0.01)
+            assert within_rank(col, upper, 0.99)
+
+    def test_transform_to_parquet(self, preprocessor, applications, tmp_path):
+        """Chaque chunk est écrit dans un fichier part-*.parquet au schéma commun."""
+        preprocessor.fit_chunked(chunks=split_chunks(applications, 200))
+        expected = preprocessor.transform(applications)
+
+        output = preprocessor.transform_to_parquet(
+            output_dir=tmp_path / "application_train_processed",
+            chunks=split_chunks(applications, 200)
+        )
+        result = pd.read_parquet(output)
+
+        assert len(list(output.glob("part-*.parquet"))) == 3
+        assert result.columns.tolist() == expected.columns.tolist()
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
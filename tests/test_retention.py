@@ -0,0 +1,229 @@
+# =============================================================================
+# TESTS RÉTENTION DES PRÉDICTIONS - Credit Risk Scoring
+# =============================================================================
+# Calcul des partitions mensuelles à archiver, export Parquet et rétention
+# Exécution : pytest tests/test_retention.py -v
+# =============================================================================
+
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import sys
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data import retention as retention_module
+from src.data.retention import PredictionRetention, archive_schema, partition_month, retention_cutoff
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+# Types information_schema de credit_risk.predictions (scripts/init_db.sql)
+PREDICTION_COLUMN_TYPES = {
+    "id": "bigint",
+    "sk_id_curr": "integer",
+    "probability": "numeric",
+    "score": "integer",
+    "decision": "character varying",
+    "model_version": "character varying",
+    "reasons": "jsonb",
+    "created_at": "timestamp without time zone",
+}
+
+
+def make_predictions(month, n):
+    """Lignes d'une partition mensuelle de credit_risk.predictions."""
+    rng = np.random.default_rng(n)
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "sk_id_curr": rng.integers(100001, 456255, n),
+        "probability": rng.uniform(0, 1, n),
+        "score": rng.integers(300, 851, n),
+        "decision": rng.choice(["Faible", "Moyen", "Élevé"], n),
+        "model_version": "v1.0.0",
+        "reasons": None,
+        "created_at": pd.Timestamp(month) + pd.to_timedelta(rng.integers(0, 27 * 86400, n), unit="s"),
+    })
+
+
+class FakeResult:
+    def __init__(self, value=None, rows=()):
+        self.value = value
+        self.rows = list(rows)
+
+    def scalar(self):
+        return self.value
+
+    def fetchall(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeDatabase:
+    """
+    Moteur simulé : partitions mensuelles en mémoire, requêtes de la
+    rétention (catalogue, COUNT, DETACH, DROP) enregistrées.
+    """
+
+    def __init__(self, partitions):
+        self.partitions = dict(partitions)
+        self.attached = {name: True for name in partitions}
+        self.statements = []
+
+    @contextmanager
+    def connect(self):
+        yield self
+
+    begin = connect
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append(sql)
+        if "FROM pg_class" in sql:
+            return FakeResult(rows=sorted(self.attached.items()))
+        if sql.startswith("SELECT COUNT(*)"):
+            name = sql.split(".")[-1].strip('"')
+            return FakeResult(len(self.partitions.get(name, ())))
+        if "DETACH PARTITION" in sql:
+            self.attached[sql.split(".")[-1].strip('"')] = False
+        elif sql.startswith("DROP TABLE"):
+            name = sql.split(".")[-1].strip('"')
+            self.partitions.pop(name, None)
+            self.attached.pop(name, None)
+        return FakeResult()
+
+    def read_chunks(self, engine, table_name, schema="credit_risk", chunk_size=1000):
+        frame = self.partitions[table_name]
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start:start + chunk_size].reset_index(drop=True)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase({
+        "predictions_2025_08": make_predictions("2025-08-01", 250),
+        "predictions_2025_09": make_predictions("2025-09-01", 120),
+        "predictions_2025_10": make_predictions("2025-10-01", 80),
+        "predictions_2026_10": make_predictions("2026-10-01", 40),
+    })
+    database.attached["predictions_2025_09"] = False  # détachée par une exécution interrompue
+    monkeypatch.setattr(retention_module, "read_table_chunks", database.read_chunks)
+    monkeypatch.setattr(retention_module, "get_column_types", lambda *args: dict(PREDICTION_COLUMN_TYPES))
+    return database
+
+
+@pytest.fixture
+def retention(database, tmp_path):
+    retention = PredictionRetention(CONFIG_PATH, engine=database)
+    retention.archive_path = tmp_path
+    retention.chunk_size = 100
+    return retention
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestPartitionMonth:
+    """Tests du nom de partition vers le mois."""
+
+    def test_monthly_partition(self):
+        """predictions_YYYY_MM donne le premier jour du mois."""
+        assert partition_month("predictions_2026_10") == date(2026, 10, 1)
+
+    def test_other_tables_ignored(self):
+        """La partition par défaut et les autres tables ne sont pas mensuelles."""
+        assert partition_month("predictions_default") is None
+        assert partition_month("predictions") is None
+
+
+class TestRetentionCutoff:
+    """Tests de la fenêtre de rétention."""
+
+    def test_current_month_only(self):
+        """Avec 1 mois de rétention, seul le mois courant est conservé."""
+        assert retention_cutoff(date(2026, 10, 19), 1) == date(2026, 10, 1)
+
+    def test_crosses_year_boundary(self):
+        """13 mois de rétention depuis octobre 2026 gardent depuis octobre 2025."""
+        assert retention_cutoff(date(2026, 10, 19), 13) == date(2025, 10, 1)
+        assert retention_cutoff(date(2026, 1, 1), 2) == date(2025, 12, 1)
+
+
+class TestArchiving:
+    """Export Parquet vérifié, détachement et suppression des partitions expirées."""
+
+    def test_export_partition(self, retention, database):
+        rows = retention.export_partition("predictions_2025_08")
+
+        archive = retention.archive_file("predictions_2025_08")
+        assert rows == 250
+        assert archive == retention.archive_path / "year=2025" / "month=08" / "predictions_2025_08.parquet"
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(archive).drop(columns="reasons"),
+            database.partitions["predictions_2025_08"].drop(columns="reasons"),
+            check_dtype=False,
+        )
+        assert pq.ParquetFile(archive).metadata.num_rows == 250
+
+    def test_null_then_json_reasons(self, retention, database):
+        """Raisons NULL (API) dans le premier lot, listes JSON (batch) ensuite : schéma fixe."""
+        frame = make_predictions("2025-08-01", 250)
+        reasons = [{"feature": "ext_source_mean", "impact": 0.31}, {"feature": "age_years", "impact": -0.12}]
+        frame["reasons"] = [None] * 150 + [reasons] * 100
+        database.partitions["predictions_2025_08"] = frame
+
+        assert retention.export_partition("predictions_2025_08") == 250
+
+        archive = pq.read_table(retention.archive_file("predictions_2025_08"))
+        assert archive.schema == archive_schema(PREDICTION_COLUMN_TYPES)
+        values = archive.column("reasons").to_pylist()
+        assert values[:150] == [None] * 150
+        assert json.loads(values[-1]) == reasons
+
+    def test_row_count_mismatch(self, retention, database, monkeypatch):
+        # Lecture interrompue : 10 lignes exportées sur 250
+        truncated = database.partitions["predictions_2025_08"].head(10)
+        monkeypatch.setattr(retention_module, "read_table_chunks", lambda *args, **kwargs: iter([truncated]))
+
+        with pytest.raises(RuntimeError):
+            retention.export_partition("predictions_2025_08")
+        assert not list(retention.archive_path.rglob("*.parquet*"))
+
+    def test_apply_retention(self, retention, database):
+        archived = retention.apply_retention(retention_months=13, today=date(2026, 10, 19))
+
+        # Mois avant octobre 2025 archivés, y compris la partition déjà détachée
+        assert archived == {"predictions_2025_08": 250, "predictions_2025_09": 120}
+        assert set(database.partitions) == {"predictions_2025_10", "predictions_2026_10"}
+        detached = [s for s in database.statements if "DETACH PARTITION" in s]
+        assert len(detached) == 1 and "predictions_2025_08" in detached[0]
+        for name in archived:
+            assert retention.archive_file(name).exists()
+
+    def test_drop_skipped_when_export_fails(self, retention, database, monkeypatch):
+        def failing_export(name):
+            raise RuntimeError("archive incomplete")
+
+        monkeypatch.setattr(retention, "export_partition", failing_export)
+        with pytest.raises(RuntimeError):
+            retention.apply_retention(retention_months=13, today=date(2026, 10, 19))
+        assert "predictions_2025_08" in database.partitions
+        assert not any(s.startswith("DROP TABLE") for s in database.statements)
+
+    def test_default_partition_rows(self, retention, database):
+        database.partitions["predictions_default"] = make_predictions("2026-02-01", 5)
+        assert retention.default_partition_rows() == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
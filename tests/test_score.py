@@ -0,0 +1,174 @@
+# =============================================================================
+# TESTS SCORING PAR LOTS - Credit Risk Scoring
+# =============================================================================
+# Scoring hors ligne du feature store (src/models/score.py)
+# Exécution : pytest tests/test_score.py -v
+# =============================================================================
+
+import pytest
+import json
+import joblib
+import shutil
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.features.encoding import load_category_registry
+from src.models.artifacts import load_production_artifacts, save_model_artifacts
+from src.models.calibration import credit_scores, risk_levels
+from src.models.score import BatchScorer, ModelScorer, SCORE_COLUMNS
+
+MODELS_DIR = Path(__file__).parent.parent / "models"
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def make_features(n: int, seed: int = 0) -> pd.DataFrame:
+    """Features synthétiques (catégories en texte, comme en sortie du feature engineering)."""
+    rng = np.random.default_rng(seed)
+    with open(MODELS_DIR / "feature_names.json") as f:
+        feature_names = json.load(f)
+    registry = load_category_registry(MODELS_DIR)
+
+    df = pd.DataFrame(rng.normal(0, 1, (n, len(feature_names))), columns=feature_names)
+    for col in [c for c in feature_names if c in registry]:
+        df[col] = rng.choice(registry.categories(col), n)
+    df.loc[rng.random(n) < 0.1, "ext_source_1"] = np.nan
+    df.insert(0, "sk_id_curr", 100000 + 1000 * seed + np.arange(n))
+    return df
+
+
+@pytest.fixture
+def features_dir(tmp_path):
+    """Deux partitions Parquet de features."""
+    path = tmp_path / "features"
+    path.mkdir()
+    make_features(700, seed=1).to_parquet(path / "part-0.parquet", index=False)
+    make_features(500, seed=2).to_parquet(path / "part-1.parquet", index=False)
+    return path
+
+
+@pytest.fixture
+def scorer():
+    return BatchScorer(CONFIG_PATH)
+
+
+def read_output(output_dir: Path) -> pd.DataFrame:
+    return pd.read_parquet(output_dir).sort_values("sk_id_curr").reset_index(drop=True)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestDecisionRules:
+    """Mêmes règles de décision que l'API."""
+
+    def test_risk_levels_and_scores(self):
+        proba = np.array([0.0, 0.29, 0.3, 0.59, 0.6, 1.0])
+        assert risk_levels(proba).tolist() == ["Faible", "Faible", "Moyen", "Moyen", "Élevé", "Élevé"]
+        assert credit_scores(proba).tolist() == [850, 690, 685, 525, 520, 300]
+
+
+class TestModelScorer:
+    """Scoring d'un lot avec le modèle de production."""
+
+    def test_matches_predict_proba(self):
+        """Probabilités identiques à model.predict_proba sur les features encodées."""
+        features = make_features(300)
+        results = ModelScorer(MODELS_DIR).score(features, "test")
+
+        model = joblib.load(MODELS_DIR / "xgboost_credit_risk_v1.pkl")
+        encoded = load_category_registry(MODELS_DIR).encode_frame(features.drop(columns="sk_id_curr"))
+        expected = model.predict_proba(encoded.astype(np.float32))[:, 1]
+
+        assert list(results.columns) == SCORE_COLUMNS
+        np.testing.assert_allclose(results["probability"], expected, atol=1e-6)
+        assert results["sk_id_curr"].tolist() == features["sk_id_curr"].tolist()
+        assert results["reasons"].isna().all()
+
+    def test_top_k_reasons(self):
+        """Au plus k raisons, contributions positives décroissantes."""
+        results = ModelScorer(MODELS_DIR, top_k_reasons=3).score(make_features(50), "test")
+
+        for reasons in results["reasons"].map(json.loads):
+            contributions = [r["contribution"] for r in reasons]
+            assert len(reasons) <= 3
+            assert all(c > 0 for c in contributions)
+            assert contributions == sorted(contributions, reverse=True)
+
+
+class TestBatchScorer:
+    """Scoring parallèle des partitions, reprise sur checkpoint."""
+
+    def test_parallel_matches_inline(self, scorer, features_dir, tmp_path):
+        """Mêmes résultats avec 1 ou 2 processus ; chaque client scoré une fois."""
+        stats = scorer.run(
+            features_dir, output_dir=tmp_path / "inline", n_jobs=1, chunk_size=256,
+            checkpoint_path=tmp_path / "inline.json"
+        )
+        scorer.run(
+            features_dir, output_dir=tmp_path / "parallel", n_jobs=2, chunk_size=256,
+            checkpoint_path=tmp_path / "parallel.json"
+        )
+
+        inline, parallel = read_output(tmp_path / "inline"), read_output(tmp_path / "parallel")
+        assert stats["rows"] == 1200
+        assert stats["chunks"] == 5  # 3 + 2 chunks de 256 lignes au plus
+        assert inline["sk_id_curr"].is_unique
+        pd.testing.assert_frame_equal(
+            inline.drop(columns="created_at"), parallel.drop(columns="created_at")
+        )
+
+    def test_resume_from_checkpoint(self, scorer, features_dir, tmp_path):
+        """Une relance ne réécrit que les lots absents du checkpoint."""
+        output_dir, checkpoint = tmp_path / "out", tmp_path / "checkpoint.json"
+        scorer.run(features_dir, output_dir=output_dir, n_jobs=1, chunk_size=256, checkpoint_path=checkpoint)
+
+        # Lot perdu : retiré du checkpoint et de la sortie
+        state = json.loads(checkpoint.read_text())
+        lost = state["done"].pop()
+        checkpoint.write_text(json.dumps(state))
+        for part in output_dir.glob("*.parquet"):
+            part.unlink()
+
+        stats = scorer.run(features_dir, output_dir=output_dir, n_jobs=1, chunk_size=256, checkpoint_path=checkpoint)
+
+        assert stats["chunks"] == 1
+        assert stats["skipped_chunks"] == 4
+        assert lost in json.loads(checkpoint.read_text())["done"]
+
+    def test_model_version_from_artifacts(self, scorer, features_dir, tmp_path):
+        """Version du manifeste enregistrée par défaut (modèle compressé : v1.0.0_compressed)."""
+        models_dir = tmp_path / "models"
+        shutil.copytree(MODELS_DIR, models_dir)
+        production = load_production_artifacts(models_dir)
+        save_model_artifacts(production.booster, models_dir, "xgboost_credit_risk_v1_compressed.ubj",
+                             production.feature_names, production.registry,
+                             f"{production.model_version}_compressed", calibration=production.calibration)
+        scorer.models_dir = models_dir
+        scorer.settings["model_filename"] = "xgboost_credit_risk_v1_compressed.ubj"
+
+        checkpoint = tmp_path / "checkpoint.json"
+        scorer.run(features_dir, output_dir=tmp_path / "out", n_jobs=1, chunk_size=512, checkpoint_path=checkpoint)
+
+        version = f"{production.model_version}_compressed"
+        assert set(read_output(tmp_path / "out")["model_version"]) == {version}
+        assert json.loads(checkpoint.read_text())["run"]["model_version"] == version
+
+    def test_checkpoint_of_another_run(self, scorer, features_dir, tmp_path):
+        """Un checkpoint d'un autre découpage est refusé."""
+        checkpoint = tmp_path / "checkpoint.json"
+        scorer.run(features_dir, output_dir=tmp_path / "out", n_jobs=1, chunk_size=256, checkpoint_path=checkpoint)
+
+        with pytest.raises(ValueError):
+            scorer.run(features_dir, output_dir=tmp_path / "out", n_jobs=1, chunk_size=100, checkpoint_path=checkpoint)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
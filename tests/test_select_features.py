@@ -0,0 +1,122 @@
+# =============================================================================
+# TESTS SÉLECTION DE FEATURES - Credit Risk Scoring
+# =============================================================================
+# Importance, corrélation et élimination récursive (src/models/select_features.py)
+# Exécution : pytest tests/test_select_features.py -v
+# =============================================================================
+
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.artifacts import load_model_artifacts
+from src.models.select_features import FeatureSelector, correlation_prune, feature_group
+from tests.test_train import make_feature_dataset
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+
+def make_noisy_dataset(n: int = 4000) -> pd.DataFrame:
+    """Dataset synthétique + colonnes de bruit et une copie bruitée d'ext_source_2."""
+    df = make_feature_dataset(n)
+    rng = np.random.default_rng(1)
+    for i in range(6):
+        df[f"bureau_noise_{i}"] = rng.normal(size=n)
+    df["ext_source_2_copy"] = df["ext_source_2"] + rng.normal(scale=0.01, size=n)
+    return df
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def selector(tmp_path):
+    """Sélecteur écrivant ses artefacts dans un dossier temporaire."""
+    selector = FeatureSelector(CONFIG_PATH)
+    selector.settings.update({"max_auc_drop": 0.01, "min_features": 2, "latency_repeats": 10,
+                              "output_dir": str(tmp_path / "selected")})
+    trainer = selector.trainer
+    trainer.models_dir = tmp_path
+    trainer.settings["early_stopping_rounds"] = 10
+    (tmp_path / "best_params.json").write_text(json.dumps({"n_estimators": 60, "max_depth": 3}))
+    return selector
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestHelpers:
+    """Groupes de features et élagage par corrélation."""
+
+    def test_feature_group(self):
+        assert feature_group("bureau_credit_sum") == "bureau"
+        assert feature_group("cc_balance_mean") == "credit_card"
+        assert feature_group("ext_source_2") == "application"
+
+    def test_correlation_prune_keeps_most_important(self):
+        df = make_noisy_dataset(1000)
+        kept = correlation_prune(df, ["ext_source_2_copy", "ext_source_2", "ext_source_3"], 0.95)
+        assert kept == ["ext_source_2_copy", "ext_source_3"]
+
+
+class TestElimination:
+    """Bornes AUC vérifiées dès la liste filtrée (importance + corrélation)."""
+
+    @staticmethod
+    def evaluation(features, valid_auc, test_auc):
+        return {"n_features": len(features), "features": features, "valid_auc": valid_auc,
+                "test_auc": test_auc, "seconds": 0.0,
+                "importance": {f: {"gain": 1.0, "shap": 1.0} for f in features}}
+
+    @pytest.mark.parametrize("valid_auc, test_auc", [(0.70, 0.75), (0.75, 0.70), (0.75, 0.75)])
+    def test_filtered_ranking_bounds(self, selector, tmp_path, monkeypatch, valid_auc, test_auc):
+        full = self.evaluation(["a", "b", "c", "d"], 0.75, 0.75)
+        monkeypatch.setattr("src.models.select_features._evaluate_subset",
+                            lambda cache_dir, features, **kwargs: self.evaluation(features, valid_auc, test_auc))
+        selector.settings["min_features"] = 4  # pas de tour d'élimination
+
+        selected, rounds = selector.eliminate(tmp_path, ["a", "b"], full, {}, n_jobs=1)
+
+        assert len(rounds) == 1
+        within = valid_auc >= 0.75 - 0.01 and test_auc >= 0.75 - 0.01
+        assert selected["features"] == (["a", "b"] if within else full["features"])
+
+
+class TestFeatureSelection:
+    """Liste réduite, modèle réentraîné et rapport AUC / latence."""
+
+    def test_selection(self, selector, tmp_path):
+        report = selector.run(make_noisy_dataset(8000), n_jobs=2)
+
+        features = report["features"]
+        assert "ext_source_2" in features or "ext_source_2_copy" in features
+        assert not {"ext_source_2", "ext_source_2_copy"} <= set(features)
+        assert not any(f.startswith("bureau_noise") for f in features)
+        assert report["valid_auc"]["selected"] >= report["valid_auc"]["full"] - 0.01
+        assert report["test_auc"]["selected"] >= report["test_auc"]["full"] - 0.01
+        assert "bureau" in report["skippable_feature_groups"]
+
+        output_dir = tmp_path / "selected"
+        saved = json.loads((output_dir / "selected_features.json").read_text())
+        assert saved["features"] == features
+        artifacts = load_model_artifacts(output_dir / "xgboost_credit_risk_v1.manifest.json")
+        assert artifacts.feature_names == features
+        assert {"predict_ms", "shap_ms"} <= set(report["retrained"]["selected_latency"])
+
+    def test_without_retraining(self, selector, tmp_path):
+        report = selector.run(make_noisy_dataset(2000), n_jobs=1, retrain=False)
+        assert report["n_features"]["selected"] <= report["n_features"]["correlation"]
+        assert len(report["rounds"]) > 1
+        assert "retrained" not in report
+        assert not (tmp_path / "selected" / "xgboost_credit_risk_v1.manifest.json").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
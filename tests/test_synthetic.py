@@ -0,0 +1,137 @@
+# =============================================================================
+# TESTS DONNÉES SYNTHÉTIQUES - Credit Risk Scoring
+# =============================================================================
+# Générateur des huit tables Home Credit (src/data/synthetic.py)
+# Exécution : pytest tests/test_synthetic.py -v
+# =============================================================================
+
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.preprocessing import DataPreprocessor
+from src.data.synthetic import DAYS_ANOMALY, SyntheticDataGenerator
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+SCALE = 0.01  # ~3 600 clients
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def make_generator(chunk_clients=1000):
+    """Générateur avec de petits lots (plusieurs générateurs par table)."""
+    generator = SyntheticDataGenerator(CONFIG_PATH)
+    generator.settings["chunk_clients"] = chunk_clients
+    return generator
+
+
+@pytest.fixture(scope="module")
+def raw_dir(tmp_path_factory):
+    """Tables générées une fois pour le module."""
+    output_dir = tmp_path_factory.mktemp("raw")
+    make_generator().generate(output_dir, scale=SCALE, seed=7)
+    return output_dir
+
+
+@pytest.fixture(scope="module")
+def tables(raw_dir):
+    generator = make_generator()
+    return {name: pd.read_csv(raw_dir / filename) for name, filename in generator.filenames.items()}
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestSchema:
+    """Mêmes fichiers, colonnes et ordre que les CSV Kaggle."""
+
+    def test_files_and_columns(self, tables):
+        assert len(tables) == 8
+        train, test = tables["application_train"], tables["application_test"]
+        assert train.shape[1] == 122
+        assert list(test.columns) == [c for c in train.columns if c != "TARGET"]
+        assert tables["bureau"].shape[1] == 17
+        assert list(tables["bureau_balance"].columns) == ["SK_ID_BUREAU", "MONTHS_BALANCE", "STATUS"]
+        assert tables["previous_application"].shape[1] == 37
+        assert tables["POS_CASH_balance"].shape[1] == 8
+        assert tables["installments_payments"].shape[1] == 8
+        assert tables["credit_card_balance"].shape[1] == 23
+
+    def test_scale(self, tables):
+        n_clients = len(tables["application_train"]) + len(tables["application_test"])
+        assert n_clients == round(356255 * SCALE)
+        assert len(tables["application_test"]) / n_clients == pytest.approx(0.137, abs=0.03)
+
+
+class TestKeys:
+    """Clés SK_ID_CURR / SK_ID_BUREAU / SK_ID_PREV cohérentes entre tables."""
+
+    def test_relationships(self, tables):
+        clients = pd.concat([tables["application_train"].SK_ID_CURR, tables["application_test"].SK_ID_CURR])
+        assert clients.is_unique
+        assert tables["bureau"].SK_ID_BUREAU.is_unique
+        assert tables["bureau"].SK_ID_CURR.isin(clients).all()
+        assert tables["bureau_balance"].SK_ID_BUREAU.isin(tables["bureau"].SK_ID_BUREAU).all()
+
+        previous = tables["previous_application"]
+        assert previous.SK_ID_PREV.is_unique
+        assert previous.SK_ID_CURR.isin(clients).all()
+        for name in ("POS_CASH_balance", "installments_payments", "credit_card_balance"):
+            child = tables[name].merge(previous[["SK_ID_PREV", "SK_ID_CURR"]], on="SK_ID_PREV", how="left",
+                                       suffixes=("", "_prev"))
+            assert (child.SK_ID_CURR == child.SK_ID_CURR_prev).all(), name
+            assert (tables[name].get("MONTHS_BALANCE", pd.Series([-1])) <= -1).all(), name
+
+
+class TestDistributions:
+    """Taux de défaut, valeurs manquantes et anomalies proches des données réelles."""
+
+    def test_target_and_missing(self, tables):
+        train = tables["application_train"]
+        assert 0.05 < train.TARGET.mean() < 0.12
+        assert train.EXT_SOURCE_1.isna().mean() == pytest.approx(0.56, abs=0.04)
+        assert train.OWN_CAR_AGE.isna().equals(train.FLAG_OWN_CAR == "N")
+        # Signal : les scores externes baissent avec le risque
+        assert train.EXT_SOURCE_2.corr(train.TARGET) < -0.1
+
+    def test_anomalies(self, tables):
+        train = tables["application_train"]
+        pensioners = train.NAME_INCOME_TYPE == "Pensioner"
+        assert (train.DAYS_EMPLOYED[pensioners] == DAYS_ANOMALY).all()
+        assert (train.DAYS_EMPLOYED[~train.NAME_INCOME_TYPE.isin(["Pensioner", "Unemployed"])] <= 0).all()
+        previous = tables["previous_application"]
+        assert (previous.DAYS_LAST_DUE == DAYS_ANOMALY).any()
+        assert previous.DAYS_FIRST_DUE[previous.NAME_CONTRACT_STATUS != "Approved"].isna().all()
+
+    def test_preprocessing_pipeline(self, raw_dir):
+        preprocessor = DataPreprocessor(CONFIG_PATH)
+        preprocessor.raw_path = raw_dir
+        df = preprocessor.load_data("application_train")
+        fixed = preprocessor.fix_anomalies(df)
+        assert fixed.DAYS_EMPLOYED.max() <= 0
+
+
+class TestDeterminism:
+    """Même graine et même taille de lot : fichiers identiques octet pour octet."""
+
+    def test_same_seed(self, raw_dir, tmp_path):
+        make_generator().generate(tmp_path / "again", scale=SCALE, seed=7)
+        make_generator().generate(tmp_path / "other", scale=SCALE, seed=8)
+        for filename in ("application_train.csv", "bureau.csv", "installments_payments.csv"):
+            expected = (raw_dir / filename).read_bytes()
+            assert (tmp_path / "again" / filename).read_bytes() == expected
+            assert (tmp_path / "other" / filename).read_bytes() != expected
+
+    def test_invalid_scale(self, tmp_path):
+        with pytest.raises(ValueError):
+            make_generator().generate(tmp_path, scale=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
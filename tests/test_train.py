@@ -0,0 +1,178 @@
+# =============================================================================
+# TESTS ENTRAÎNEMENT - Credit Risk Scoring
+# =============================================================================
+# Pipeline d'entraînement XGBoost (src/models/train.py)
+# Exécution : pytest tests/test_train.py -v
+# =============================================================================
+
+import pytest
+import json
+import joblib
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.features.encoding import CategoryRegistry, load_category_registry
+from src.models.artifacts import load_model_artifacts
+from src.models.train import ModelTrainer, booster_params
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def make_feature_dataset(n: int = 4000, seed: int = 0) -> pd.DataFrame:
+    """Dataset de features synthétique : la cible dépend des scores externes."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "sk_id_curr": np.arange(n),
+        "ext_source_2": rng.uniform(0, 1, n),
+        "ext_source_3": rng.uniform(0, 1, n),
+        "credit_income_ratio": rng.lognormal(1, 0.5, n),
+        "name_income_type": rng.choice(["Working", "Pensioner", "State servant"], n),
+        "occupation_type": rng.choice(["Drivers", "Core staff", None], n),
+    })
+    logit = -2.5 - 3 * (df["ext_source_2"] - 0.5) - 2 * (df["ext_source_3"] - 0.5) \
+        + 0.8 * (df["name_income_type"] == "Working")
+    df["target"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+@pytest.fixture
+def trainer(tmp_path):
+    """Trainer écrivant ses artefacts dans un dossier temporaire."""
+    trainer = ModelTrainer(CONFIG_PATH)
+    trainer.models_dir = tmp_path
+    trainer.settings["early_stopping_rounds"] = 10
+    (tmp_path / "best_params.json").write_text(json.dumps({"n_estimators": 60, "max_depth": 3}))
+    return trainer
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestTraining:
+    """Entraînement hist + QuantileDMatrix et artefacts."""
+
+    def test_artifacts_for_the_api(self, trainer, tmp_path):
+        """Modèle, features, catégories et métriques lisibles comme par l'API."""
+        df = make_feature_dataset()
+        metrics = trainer.run(df.copy(), save_plots=False)
+
+        model = joblib.load(tmp_path / "xgboost_credit_risk_v1.pkl")
+        native = load_model_artifacts(tmp_path / "xgboost_credit_risk_v1.manifest.json")
+        feature_names = json.loads((tmp_path / "feature_names.json").read_text())
+        registry = load_category_registry(tmp_path)
+        saved_metrics = json.loads((tmp_path / "metrics.json").read_text())
+
+        assert feature_names == [c for c in df.columns if c not in ("sk_id_curr", "target")]
+        encoded = registry.encode_frame(df[feature_names]).astype(np.float32)
+        proba = model.predict_proba(encoded)[:, 1]
+
+        assert proba.shape == (len(df),)
+        assert native.feature_names == feature_names
+        np.testing.assert_allclose(native.classifier.predict_proba(encoded)[:, 1], proba)
+        assert saved_metrics["auc_roc"] == pytest.approx(metrics["auc_roc"])
+        assert metrics["auc_roc"] > 0.6
+        assert metrics["n_train"] + metrics["n_valid"] + metrics["n_test"] == len(df)
+        assert metrics["n_test"] == pytest.approx(0.15 * len(df), abs=2)
+        assert metrics["training_time_seconds"] > 0
+        assert metrics["peak_memory_mb"] > 0
+        assert metrics["best_params"]["max_depth"] == 3  # best_params.json
+        assert metrics["num_boost_round"] <= 60
+        # Calibration fitted on the validation split, shipped with the manifest
+        assert native.calibration is not None
+        assert metrics["calibration"]["brier_calibrated"] <= metrics["calibration"]["brier_raw"]
+
+    def test_registry_codes_are_stable(self, trainer, tmp_path):
+        """Les codes existants ne bougent pas ; nouvelles catégories ajoutées à la fin."""
+        CategoryRegistry({"name_income_type": ["Working", "Pensioner"]}).save(tmp_path / "category_codes.json")
+        registry = trainer.fit_registry(make_feature_dataset(200))
+
+        assert registry.categories("name_income_type") == ["Working", "Pensioner", "State servant"]
+        assert registry.categories("occupation_type") == ["Core staff", "Drivers", "MISSING"]
+
+    def test_external_memory_matches_in_memory(self, trainer, tmp_path):
+        """Partitions Parquet en mémoire externe : même AUC qu'en mémoire, cache supprimé."""
+        partitions = tmp_path / "features"
+        partitions.mkdir()
+        df = make_feature_dataset(6000)
+        for i, start in enumerate(range(0, len(df), 2000)):
+            df.iloc[start:start + 2000].to_parquet(partitions / f"part-{i}.parquet", index=False)
+        trainer.settings.update({"external_cache_dir": str(tmp_path / "cache"),
+                                 "external_batch_rows": 500, "min_cache_page_mb": 0.01})
+
+        external = trainer.run_external(partitions)
+        in_memory = trainer.run_external(partitions, in_memory=True)
+
+        assert external["external_memory"] and external["external_cache_mb"] > 0
+        assert external["n_train"] + external["n_valid"] + external["n_test"] == len(df)
+        assert external["n_test"] == in_memory["n_test"]
+        assert external["auc_roc"] == pytest.approx(in_memory["auc_roc"], abs=0.01)
+        assert external["auc_roc"] > 0.6
+        assert list((tmp_path / "cache").iterdir()) == []
+        assert json.loads((tmp_path / "feature_names.json").read_text()) == \
+            [c for c in df.columns if c not in ("sk_id_curr", "target")]
+
+    def test_booster_params(self):
+        """Noms scikit-learn traduits pour xgb.train."""
+        native, rounds = booster_params({"n_estimators": 475, "random_state": 42, "n_jobs": -1,
+                                         "use_label_encoder": False, "max_depth": 3})
+        assert rounds == 475
+        assert native == {"seed": 42, "nthread": -1, "max_depth": 3}
+
+
+class TestIncremental:
+    """Mise à jour du modèle de production sur de nouvelles données."""
+
+    @pytest.fixture
+    def production(self, trainer):
+        """Modèle de production entraîné sur un premier lot."""
+        metrics = trainer.run(make_feature_dataset(3000, seed=0), save_plots=False)
+        return metrics["num_boost_round"]
+
+    @pytest.mark.parametrize("mode", ["continue", "refresh"])
+    def test_update_production_model(self, trainer, tmp_path, production, mode):
+        metrics = trainer.run_incremental(make_feature_dataset(3000, seed=1), mode=mode)
+
+        incremental = metrics["incremental"]
+        assert incremental["mode"] == mode
+        assert incremental["base_rounds"] == production
+        assert "full_retrain_valid_auc" in incremental
+        assert metrics["auc_roc"] > 0.6
+        if incremental["model"] == "incremental":
+            if mode == "continue":
+                assert metrics["num_boost_round"] >= production
+            else:
+                assert metrics["num_boost_round"] == production
+
+        model = joblib.load(tmp_path / "xgboost_credit_risk_v1.pkl")
+        assert model.get_booster().num_boosted_rounds() == metrics["num_boost_round"]
+
+    def test_guard_keeps_production_model(self, trainer, tmp_path, production):
+        """Tolérance négative : la mise à jour est rejetée, les artefacts de production restent intacts."""
+        artifacts = {path.name: path.read_bytes() for path in tmp_path.iterdir() if path.is_file()}
+        trainer.settings["incremental_auc_tolerance"] = -1.0
+
+        metrics = trainer.run_incremental(make_feature_dataset(3000, seed=1), mode="continue")
+
+        assert metrics["incremental"]["model"] == "production"
+        assert metrics["num_boost_round"] == production
+        assert {path.name: path.read_bytes() for path in tmp_path.iterdir() if path.is_file()} == artifacts
+
+    def test_without_production_model(self, trainer):
+        with pytest.raises(FileNotFoundError):
+            trainer.run_incremental(make_feature_dataset(500), guard=False)
+
+    def test_unknown_mode(self, trainer):
+        with pytest.raises(ValueError):
+            trainer.run_incremental(make_feature_dataset(500), mode="restart")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
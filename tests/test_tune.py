@@ -0,0 +1,75 @@
+# =============================================================================
+# TESTS OPTIMISATION DES HYPERPARAMÈTRES - Credit Risk Scoring
+# =============================================================================
+# Étude Optuna parallèle et reprenable (src/models/tune.py)
+# Exécution : pytest tests/test_tune.py -v
+# =============================================================================
+
+import pytest
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+optuna = pytest.importorskip("optuna")
+
+from src.models.tune import HyperparameterTuner, PruningCallback, create_pruner
+from tests.test_train import make_feature_dataset
+
+CONFIG_PATH = str(Path(__file__).parent.parent / "configs" / "config.yaml")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def tuner(tmp_path):
+    """Tuner sur une étude SQLite temporaire."""
+    tuner = HyperparameterTuner(CONFIG_PATH)
+    tuner.trainer.models_dir = tmp_path
+    tuner.settings["storage"] = f"sqlite:///{tmp_path / 'study.db'}"
+    tuner.settings["early_stopping_rounds"] = 10
+    return tuner
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestStudy:
+    """Étude partagée entre processus et reprise."""
+
+    def test_parallel_workers_and_resume(self, tuner, tmp_path):
+        """Deux processus alimentent la même étude ; une relance ajoute des trials."""
+        df = make_feature_dataset(2000)
+        study = tuner.run(df.copy(), n_trials=4, n_jobs=2, pruner="median")
+
+        finished = [t for t in study.trials if t.state.is_finished()]
+        assert 4 <= len(finished) <= 5  # un trial en cours peut dépasser le budget
+        assert json.loads((tmp_path / "best_params.json").read_text()) == study.best_params
+
+        study = tuner.run(df.copy(), n_trials=2, n_jobs=1, pruner="median")
+        assert len(study.trials) >= len(finished) + 2
+
+    def test_unknown_pruner(self, tuner):
+        with pytest.raises(ValueError):
+            create_pruner("random")
+
+
+class TestPruningCallback:
+    """Arrêt d'un trial peu prometteur pendant le boosting."""
+
+    def test_prunes_from_eval_log(self):
+        study = optuna.create_study(direction="maximize", pruner=optuna.pruners.ThresholdPruner(lower=0.7))
+        trial = study.ask()
+        callback = PruningCallback(trial)
+
+        assert callback.after_iteration(None, 0, {"valid": {"auc": [0.75]}}) is False
+        with pytest.raises(optuna.TrialPruned):
+            callback.after_iteration(None, 1, {"valid": {"auc": [0.75, 0.65]}})
+        assert trial.storage.get_trial(trial._trial_id).intermediate_values == {0: 0.75, 1: 0.65}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])